@@ -51,6 +51,7 @@ _RELAY_PUBLIC_URL_ENVS = (
     "TOKEN_PLACE_RELAY_PUBLIC_URL",
     "RELAY_PUBLIC_URL",
 )
+DEFAULT_RELAY_RETRIEVE_WAIT_SECONDS = 10.0
 
 
 def _coerce_admitted_ttl(value: object) -> float:
@@ -63,6 +64,19 @@ def _coerce_admitted_ttl(value: object) -> float:
         return 0.0
 
 
+def _relay_honoured_retrieve_wait(response: Any) -> bool:
+    """Return whether a pending retrieve already blocked on the relay.
+
+    Relays without long-poll support ignore ``wait_seconds`` and return at once,
+    so callers fall back to sleeping between polls.
+    """
+    try:
+        payload = response.json()
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and "wait_seconds" in payload
+
+
 @dataclass(frozen=True)
 class DistributedTargetSelection:
     """Resolved distributed relay target and diagnostics for provider logs."""
@@ -244,6 +258,9 @@ class DistributedApiV1ComputeProvider:
 
     base_url: str
     timeout_seconds: float = DEFAULT_INFERENCE_TRANSPORT_TIMEOUT_SECONDS
+    # Upper bound for each blocking retrieve; the relay parks the call until the
+    # response, progress, or a terminal state arrives instead of being polled.
+    retrieve_wait_seconds: float = DEFAULT_RELAY_RETRIEVE_WAIT_SECONDS
 
     def _relay_url(self, path: str) -> str:
         base_url = self.base_url.rstrip("/")
@@ -455,10 +472,12 @@ class DistributedApiV1ComputeProvider:
         poll_interval = self._poll_interval_seconds()
         while time.time() < deadline:
             try:
-                retrieve_timeout = min(poll_interval + 0.5, _remaining_timeout())
+                remaining = _remaining_timeout()
             except ComputeProviderError as exc:
                 _cancel_if_post_enqueue_timeout(exc)
                 raise
+            wait_seconds = max(min(float(self.retrieve_wait_seconds), remaining - poll_interval - 0.5), 0.0)
+            retrieve_timeout = min(wait_seconds + poll_interval + 0.5, remaining)
 
             try:
                 retrieve_response = requests.post(
@@ -466,6 +485,7 @@ class DistributedApiV1ComputeProvider:
                     json={
                         "client_public_key": crypto_manager.public_key_b64,
                         "request_id": relay_request_id,
+                        "wait_seconds": wait_seconds,
                     },
                     timeout=retrieve_timeout,
                 )
@@ -474,7 +494,8 @@ class DistributedApiV1ComputeProvider:
                 continue
 
             if retrieve_response.status_code == 202:
-                time.sleep(min(poll_interval, max(deadline - time.time(), 0.0)))
+                if not (wait_seconds > 0 and _relay_honoured_retrieve_wait(retrieve_response)):
+                    time.sleep(min(poll_interval, max(deadline - time.time(), 0.0)))
                 continue
 
             if retrieve_response.status_code == 410:
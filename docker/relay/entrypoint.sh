@@ -14,7 +14,16 @@ if [ ! -d "${WORKER_TMP_DIR}" ]; then
   mkdir -p "${WORKER_TMP_DIR}"
 fi
 
+# RELAY_SERVER_MODE=asyncio parks long-polls on an event loop instead of a
+# gunicorn thread each; see relay_asgi.py.
+if [ "${RELAY_SERVER_MODE:-threaded}" = "asyncio" ]; then
+  exec python /app/relay.py --server-mode asyncio --host "${HOST}" --port "${PORT}"
+fi
+
+# gunicorn.conf.py starts snapshot restore and the deadline reaper in the
+# worker; see its docstring.
 exec gunicorn \
+  --config /app/gunicorn.conf.py \
   --bind "${HOST}:${PORT}" \
   --workers "${WORKERS}" \
   --threads "${THREADS}" \
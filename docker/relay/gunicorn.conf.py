@@ -0,0 +1,36 @@
+"""Gunicorn hooks for the relay image (``relay:app``).
+
+``relay.serve()`` and ``relay.serve_asyncio()`` start the relay's housekeeping
+(snapshot restore/journaling and the deadline reaper) themselves; under
+gunicorn nothing calls them, so the worker starts it here after loading the
+app and before it accepts traffic.  Relay coordination state lives in each
+worker's memory, so two workers journaling one ``TOKEN_PLACE_RELAY_SNAPSHOT_DIR``
+would overwrite each other: the arbiter refuses to start in that case.
+"""
+
+from __future__ import annotations
+
+_stop_housekeeping = None
+
+
+def on_starting(server):
+    from relay_snapshot import snapshot_directory
+
+    if server.cfg.workers > 1 and snapshot_directory() is not None:
+        raise RuntimeError(
+            "TOKEN_PLACE_RELAY_SNAPSHOT_DIR requires RELAY_WORKERS=1: relay state is per worker process"
+        )
+
+
+def post_worker_init(worker):
+    global _stop_housekeeping
+    import relay
+
+    _stop_housekeeping = relay._start_relay_housekeeping()
+
+
+def worker_exit(server, worker):
+    global _stop_housekeeping
+    stop, _stop_housekeeping = _stop_housekeeping, None
+    if stop is not None:
+        stop()
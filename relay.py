@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
 import hashlib
+import heapq
 import json
 import logging
 import math
@@ -12,11 +15,16 @@ import socket
 import sys
 import threading
 import time
+from collections import OrderedDict
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Any, Dict
+from itertools import islice
+from typing import Any, Callable, Dict
 from urllib.parse import urlparse
 
 from release_metadata import get_release_metadata, resolve_asset_version, resolve_deploy_ref
+from relay_reaper import DeadlineReaper, ReaperThread
+from relay_snapshot import JournaledDict, RelaySnapshotter, SnapshotTable, snapshot_directory
 from utils.llm.model_profiles import build_model_aliases
 from utils.inference_timeout import DEFAULT_INFERENCE_TIMEOUT_SECONDS
 
@@ -227,6 +235,9 @@ def _enforce_api_v1_distributed_guardrail() -> None:
     )
 
 
+RELAY_SERVER_MODES = ("threaded", "asyncio")
+
+
 def _build_cli_parser(*, add_help: bool = True) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="token.place relay server", add_help=add_help)
     parser.add_argument(
@@ -245,6 +256,12 @@ def _build_cli_parser(*, add_help: bool = True) -> argparse.ArgumentParser:
         action="store_true",
         help="Use mock LLM for testing",
     )
+    parser.add_argument(
+        "--server-mode",
+        choices=RELAY_SERVER_MODES,
+        default="threaded",
+        help="threaded: Werkzeug thread per request; asyncio: ASGI event loop that parks long-polls without threads",
+    )
     return parser
 
 
@@ -463,6 +480,7 @@ OUTCOME_ENUM = (
     "failed",
 )
 EVICTION_REASON_ENUM = ("stale_lease", "unregistered", "capacity_loss")
+POLL_WAKEUP_RESULT_ENUM = ("work", "server_missing", "spurious")
 HTTP_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 BUILD_METADATA = get_release_metadata(None)
 
@@ -569,6 +587,15 @@ RELAY_COMPUTE_CONTROL_LEASE_RENEWALS_TOTAL = _collector(
         registry=RELAY_METRICS_REGISTRY,
     ),
 )
+RELAY_API_V1_POLL_WAKEUPS_TOTAL = _collector(
+    "tokenplace_relay_api_v1_poll_wakeups_total",
+    lambda: Counter(
+        "tokenplace_relay_api_v1_poll_wakeups_total",
+        "Notified API v1 long-poll wakeups by fixed result; spurious wakeups found no work for the node.",
+        ["result"],
+        registry=RELAY_METRICS_REGISTRY,
+    ),
+)
 BUILD_INFO = _collector(
     "tokenplace_build_info",
     lambda: Gauge("tokenplace_build_info", "token.place build metadata.", ["version", "revision"], registry=RELAY_METRICS_REGISTRY),
@@ -589,6 +616,8 @@ def _initialise_metric_labels() -> None:
         COMPUTE_NODE_EVICTIONS_TOTAL.labels(reason)
     for state in ("active", "cancelled", "expired", "acknowledged", "completed_unavailable"):
         RELAY_COMPUTE_CONTROL_REQUESTS_TOTAL.labels(state)
+    for result in POLL_WAKEUP_RESULT_ENUM:
+        RELAY_API_V1_POLL_WAKEUPS_TOTAL.labels(result)
     RELAY_QUEUE_DEPTH.labels("relay").set(0)
     RELAY_OLDEST_QUEUED_REQUEST_AGE_SECONDS.labels("relay").set(0)
     BUILD_INFO.labels(
@@ -635,6 +664,7 @@ def _normalise_http_route() -> str:
         "api_v1_relay_requests_cancel": "/api/v1/relay/requests/cancel",
         "api_v1_relay_responses": "/api/v1/relay/responses",
         "api_v1_relay_responses_retrieve": "/api/v1/relay/responses/retrieve",
+        "api_v1_relay_responses_events": "/api/v1/relay/responses/events",
         "api_v1_relay_progress": "/api/v1/relay/progress",
         "api_v1_relay_servers_register": "/api/v1/relay/servers/register",
         "api_v1_relay_servers_unregister": "/api/v1/relay/servers/unregister",
@@ -692,6 +722,7 @@ def _record_request_terminal_outcome_once(
         if request_id in recorded_ids:
             return False
         recorded_ids[request_id] = expires_at
+    _schedule_terminal_request_reap(client_public_key, request_id, expires_at)
     _record_terminal_outcome(outcome)
     return True
 
@@ -749,7 +780,7 @@ def _update_runtime_gauges() -> None:
     oldest_queued_age = 0.0
     with client_inference_requests_changed:
         for queued_requests in client_inference_requests.values():
-            if not isinstance(queued_requests, list):
+            if not isinstance(queued_requests, _NodeRequestQueue):
                 continue
             queue_depth += len(queued_requests)
             for item in queued_requests:
@@ -867,29 +898,324 @@ def _validate_server_registration():
     }), 401
 
 
-known_servers = {}
+class _KnownServerRegistry(JournaledDict):
+    """Registration-ordered ``known_servers`` map that keeps the API v1 scheduler index in sync.
+
+    Membership changes are mirrored into :data:`api_v1_scheduler_index`; payload
+    mutations are reported explicitly by the route handlers through
+    :func:`_refresh_api_v1_scheduler_entry`.
+    """
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        _refresh_api_v1_scheduler_entry(key)
+        _schedule_server_lease_reap(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        api_v1_scheduler_index.discard(key)
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        api_v1_scheduler_index.discard(key)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        api_v1_scheduler_index.discard(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        api_v1_scheduler_index.clear()
+
+
+known_servers = _KnownServerRegistry()
 server_round_robin_lock = threading.RLock()
+# Registration sequence of the next node eligible for the global round-robin
+# tie-break; per-tie-set cursors live in the filtered positions map.
 server_round_robin_next_index = 0
-api_v1_filtered_round_robin_next_positions: dict[tuple[str, ...], int] = {}
+api_v1_filtered_round_robin_next_positions: dict[tuple[Any, ...], int] = {}
+MAX_API_V1_FILTERED_ROUND_ROBIN_CURSORS = 4096
 API_V1_SELECTION_POLICY = "best_fit_smallest_capable_least_loaded_v1"
 API_V1_SERVER_MARKER = "api_v1_registered"
-client_inference_requests = {}
-client_responses = {}
+
+
+class _NodeRequestQueue(Sequence):
+    """One node's FIFO of queued envelopes, keyed for constant-time withdrawal.
+
+    Envelopes carrying ``client_public_key`` and ``request_id`` are keyed by
+    that pair, so cancel and cancel-token lookups go straight to the entry
+    instead of walking a queue that may hold thousands of requests. Other
+    payloads (legacy single-payload work, or a repeated pair) get a private
+    sequence key. Iteration, ``len``, indexing, ``pop`` and list equality
+    behave like the plain list it replaces, and snapshots store it as a list.
+    """
+
+    __slots__ = ("_entries", "_sequence", "_has_duplicates")
+
+    def __init__(self, items=()):
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        self._sequence = 0
+        self._has_duplicates = False
+        self.extend(items)
+
+    @staticmethod
+    def _request_key(item):
+        if not isinstance(item, dict):
+            return None
+        client_public_key = item.get("client_public_key")
+        request_id = item.get("request_id")
+        if isinstance(client_public_key, str) and client_public_key and isinstance(request_id, str) and request_id:
+            return client_public_key, request_id
+        return None
+
+    def append(self, item) -> None:
+        key = self._request_key(item)
+        if key is None or key in self._entries:
+            self._has_duplicates = self._has_duplicates or key is not None
+            self._sequence += 1
+            key = self._sequence
+        self._entries[key] = item
+
+    def extend(self, items) -> None:
+        for item in items:
+            self.append(item)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._has_duplicates = False
+
+    def find_request(self, client_public_key, request_id):
+        """Return the queued envelope for ``(client_public_key, request_id)``, if any."""
+        return self._entries.get((client_public_key, request_id))
+
+    def remove_request(self, client_public_key, request_id) -> int:
+        """Drop every queued envelope for the request; O(1) unless the pair was repeated."""
+        removed = int(self._entries.pop((client_public_key, request_id), None) is not None)
+        if self._has_duplicates:
+            for key, item in list(self._entries.items()):
+                if self._request_key(item) == (client_public_key, request_id):
+                    del self._entries[key]
+                    removed += 1
+        return removed
+
+    def _key_at(self, index: int):
+        size = len(self._entries)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("queue index out of range")
+        if index == 0:
+            return next(iter(self._entries))
+        if index == size - 1:
+            return next(reversed(self._entries))
+        return next(islice(self._entries, index, None))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self._entries[self._key_at(index)]
+
+    def __setitem__(self, index, items) -> None:
+        if index != slice(None):
+            raise TypeError("request queues only support whole-queue replacement")
+        items = list(items)
+        self.clear()
+        self.extend(items)
+
+    def pop(self, index: int = -1):
+        if not self._entries:
+            raise IndexError("pop from empty queue")
+        return self._entries.pop(self._key_at(index))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def __reversed__(self):
+        return reversed(self._entries.values())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, _NodeRequestQueue)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return _NodeRequestQueue, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"_NodeRequestQueue({list(self)!r})"
+
+
+class _NodeRequestQueues(JournaledDict):
+    """``client_inference_requests``: every stored value becomes a ``_NodeRequestQueue``."""
+
+    @staticmethod
+    def _as_queue(value):
+        if isinstance(value, _NodeRequestQueue) or value is None:
+            return value
+        return _NodeRequestQueue(value)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, self._as_queue(value))
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return self[key]
+
+
+# Coordination tables are JournaledDicts so snapshots (see ``relay_snapshot``)
+# re-encode only the entries touched since the previous scan.
+client_inference_requests = _NodeRequestQueues()
+client_responses = JournaledDict()
 client_responses_lock = threading.Lock()
-client_progress: dict[tuple[str, str], dict[str, Any]] = {}
+client_progress: dict[tuple[str, str], dict[str, Any]] = JournaledDict()
 client_progress_lock = threading.Lock()
-client_pending_request_ids = {}
-client_pending_request_deadlines = {}
+client_pending_request_ids = JournaledDict()
+client_pending_request_deadlines = JournaledDict()
 client_pending_request_ids_lock = threading.Lock()
-client_terminal_request_ids = {}
+client_terminal_request_ids = JournaledDict()
 client_terminal_request_ids_lock = threading.Lock()
 api_v1_terminal_transition_lock = threading.RLock()
-client_terminal_outcomes: dict[str, dict[str, float]] = {}
+client_terminal_outcomes: dict[str, dict[str, float]] = JournaledDict()
 client_terminal_outcomes_lock = threading.Lock()
 TERMINAL_REQUEST_TTL_SECONDS = float(os.getenv("TOKENPLACE_TERMINAL_REQUEST_TTL_SECONDS", "300"))
 PENDING_REQUEST_TTL_SECONDS = float(os.getenv("TOKENPLACE_PENDING_REQUEST_TTL_SECONDS", "300"))
+# Expiry deadlines for leases, in-flight entries, pending/terminal records and
+# control tombstones; request handlers fire only what is due via ``_reap_due``.
+relay_reaper = DeadlineReaper()
+relay_reaper_thread: ReaperThread | None = None
+relay_snapshotter: RelaySnapshotter | None = None
+RELAY_REAP_PER_REQUEST_LIMIT = 64
+_REAP_SLACK_SECONDS = 0.001
+
+
+class _KeyedWaiter:
+    __slots__ = ("condition", "parked", "listeners", "generation")
+
+    def __init__(self, lock) -> None:
+        self.condition = threading.Condition(lock)
+        self.parked = 0
+        self.listeners: set[Callable[[], None]] = set()
+        self.generation = 0
+
+    def idle(self) -> bool:
+        return self.parked <= 0 and not self.listeners
+
+
+class _KeyedWatch:
+    """Check-then-wait handle that cannot miss a notification between the two."""
+
+    __slots__ = ("_waiters", "_waiter", "_seen")
+
+    def __init__(self, waiters: "_KeyedWaiters", waiter: _KeyedWaiter) -> None:
+        self._waiters = waiters
+        self._waiter = waiter
+        self._seen = waiter.generation
+
+    def wait(self, timeout: float) -> bool:
+        with self._waiters.lock:
+            if self._waiter.generation == self._seen:
+                self._waiter.condition.wait(timeout=timeout)
+            notified = self._waiter.generation != self._seen
+            self._seen = self._waiter.generation
+            return notified
+
+
+class _KeyedWaiters(dict):
+    """Per-key Conditions over one shared lock, plus event-loop listeners.
+
+    Entries only exist while a thread is parked or a listener is registered, so
+    notifying a key nobody waits on costs a dict miss.
+    """
+
+    def __init__(self, lock) -> None:
+        super().__init__()
+        self.lock = lock
+
+    def _entry_locked(self, key) -> _KeyedWaiter:
+        waiter = self.get(key)
+        if waiter is None:
+            waiter = self[key] = _KeyedWaiter(self.lock)
+        return waiter
+
+    def _release_locked(self, key, waiter: _KeyedWaiter) -> None:
+        if waiter.idle() and self.get(key) is waiter:
+            self.pop(key, None)
+
+    def wait_locked(self, key, timeout: float) -> bool:
+        waiter = self._entry_locked(key)
+        waiter.parked += 1
+        try:
+            return waiter.condition.wait(timeout=timeout)
+        finally:
+            waiter.parked -= 1
+            self._release_locked(key, waiter)
+
+    @contextlib.contextmanager
+    def watching(self, key):
+        with self.lock:
+            waiter = self._entry_locked(key)
+            waiter.parked += 1
+        try:
+            yield _KeyedWatch(self, waiter)
+        finally:
+            with self.lock:
+                waiter.parked -= 1
+                self._release_locked(key, waiter)
+
+    def notify_locked(self, key) -> None:
+        waiter = self.get(key)
+        if waiter is None:
+            return
+        waiter.generation += 1
+        waiter.condition.notify_all()
+        for callback in tuple(waiter.listeners):
+            callback()
+
+    def add_listener(self, key, callback: Callable[[], None]) -> None:
+        """Call ``callback`` under ``lock`` on every notification for ``key``.
+
+        Lets the event-loop serving mode park requests without holding a thread;
+        callbacks must only schedule work, e.g. ``loop.call_soon_threadsafe``.
+        """
+
+        with self.lock:
+            self._entry_locked(key).listeners.add(callback)
+
+    def remove_listener(self, key, callback: Callable[[], None]) -> None:
+        with self.lock:
+            waiter = self.get(key)
+            if waiter is not None:
+                waiter.listeners.discard(callback)
+                self._release_locked(key, waiter)
+
+
 client_inference_requests_lock = threading.Lock()
 client_inference_requests_changed = threading.Condition(client_inference_requests_lock)
+# Long-polling nodes park on a per-node Condition that shares
+# ``client_inference_requests_lock`` so an enqueue wakes only the target node.
+client_inference_request_waiters = _KeyedWaiters(client_inference_requests_lock)
+# Blocking retrieves park per (client_public_key, request_id); the lock is a
+# leaf, so notifiers may hold any other relay lock.
+api_v1_response_waiters = _KeyedWaiters(threading.Lock())
 api_v1_in_flight_requests_lock = threading.Lock()
 streaming_sessions = {}
 streaming_sessions_by_client = {}
@@ -899,7 +1225,13 @@ IGNORED_LOG_ENDPOINTS = {"livez", "healthz", "metrics"}
 SERVER_STALE_SECONDS_ENV = "TOKEN_PLACE_RELAY_SERVER_TTL_SECONDS"
 DEFAULT_SERVER_STALE_SECONDS = 30
 API_V1_POLL_WAIT_SECONDS_ENV = "TOKEN_PLACE_API_V1_RELAY_POLL_WAIT_SECONDS"
+API_V1_POLL_PARK_ENVIRON = "tokenplace.relay.api_v1_poll_park"
 DEFAULT_API_V1_POLL_WAIT_SECONDS = 10
+API_V1_RETRIEVE_MAX_WAIT_SECONDS_ENV = "TOKEN_PLACE_API_V1_RELAY_RETRIEVE_MAX_WAIT_SECONDS"
+API_V1_RETRIEVE_PARK_ENVIRON = "tokenplace.relay.api_v1_retrieve_park"
+API_V1_RESPONSE_EVENTS_PARK_ENVIRON = "tokenplace.relay.api_v1_response_events_park"
+DEFAULT_API_V1_RETRIEVE_MAX_WAIT_SECONDS = 30
+API_V1_RESPONSE_EVENTS_KEEPALIVE_SECONDS = 15.0
 API_V1_LEASE_SECONDS_ENV = "TOKEN_PLACE_API_V1_RELAY_SERVER_LEASE_SECONDS"
 DEFAULT_API_V1_LEASE_SECONDS = 30
 API_V1_IN_FLIGHT_TTL_SECONDS_ENV = "TOKEN_PLACE_API_V1_IN_FLIGHT_TTL_SECONDS"
@@ -918,6 +1250,7 @@ API_V1_CONTROL_NEXT_POLL_MAX_SECONDS = 10.0
 API_V1_MAX_QUEUE_DEPTH_ENV = "TOKEN_PLACE_API_V1_MAX_QUEUE_DEPTH_PER_NODE"
 DEFAULT_CONTEXT_TIER = "8k-fast"
 MAX_API_V1_MODEL_IDS_PER_NODE = 64
+MAX_API_V1_POLL_ITEMS = 128
 CONTEXT_TIER_ORDER = {"8k-fast": 8192, "64k-full": 65536}
 DEFAULT_MODEL_IDS = ["qwen3-8b-instruct"]
 # Missing capability payloads are accepted for diagnostics, but fail closed for
@@ -956,6 +1289,17 @@ def _api_v1_poll_wait_seconds() -> float:
     return wait_seconds
 
 
+def _api_v1_retrieve_max_wait_seconds() -> float:
+    raw = os.environ.get(API_V1_RETRIEVE_MAX_WAIT_SECONDS_ENV, str(DEFAULT_API_V1_RETRIEVE_MAX_WAIT_SECONDS))
+    try:
+        wait_seconds = float(raw)
+    except ValueError:
+        return float(DEFAULT_API_V1_RETRIEVE_MAX_WAIT_SECONDS)
+    if not math.isfinite(wait_seconds) or wait_seconds < 0:
+        return 0.0
+    return wait_seconds
+
+
 def _api_v1_lease_seconds() -> int:
     raw = os.environ.get(API_V1_LEASE_SECONDS_ENV, str(DEFAULT_API_V1_LEASE_SECONDS))
     try:
@@ -1165,7 +1509,7 @@ def _normalise_api_v1_capabilities(value: Any) -> tuple[dict[str, Any] | None, s
     if backend_class not in ALLOWED_BACKEND_CLASSES:
         backend_class = "unknown"
 
-    return {
+    normalized = {
         "api_version": "v1",
         "supported_model_ids": supported_model_ids,
         "active_context_tier": active_context_tier,
@@ -1174,7 +1518,20 @@ def _normalise_api_v1_capabilities(value: Any) -> tuple[dict[str, Any] | None, s
         "maximum_output_tokens": maximum_output,
         "max_concurrency": max_concurrency,
         "backend_class": backend_class,
-    }, None
+    }
+    # Nodes hosting a model pool report which of their models are loaded.
+    model_residency = value.get("model_residency")
+    if model_residency is not None:
+        if not isinstance(model_residency, dict):
+            return None, "capabilities.model_residency must be an object"
+        normalized["model_residency"] = {
+            model_id.strip().lower(): state
+            for model_id, state in model_residency.items()
+            if isinstance(model_id, str)
+            and model_id.strip().lower() in supported_model_ids
+            and state in {"warm", "cold"}
+        }
+    return normalized, None
 
 
 def _context_tier_can_satisfy(active_tier: Any, requested_tier: str) -> bool:
@@ -1217,13 +1574,35 @@ def _api_v1_in_flight_entry_can_be_pruned(entry: Any, *, now_monotonic: float) -
     return deadline_monotonic is None or deadline_monotonic <= now_monotonic
 
 
-def _prune_api_v1_stale_in_flight_entries(payload: dict[str, Any], *, now_monotonic: float) -> int:
+def _api_v1_in_flight_entry_recheck_at(entry: Any, *, now_monotonic: float) -> float | None:
+    """Return when an unprunable in-flight entry can next become prunable."""
+
+    expires_at = entry.get("expires_at") if isinstance(entry, dict) else entry
+    if not isinstance(expires_at, (int, float)):
+        return None
+    if expires_at > now_monotonic:
+        return float(expires_at)
+    deadline_monotonic = (
+        _valid_request_deadline_monotonic(entry.get("request_deadline_monotonic"))
+        if isinstance(entry, dict)
+        else None
+    )
+    return deadline_monotonic
+
+
+def _prune_api_v1_stale_in_flight_entries(
+    payload: dict[str, Any],
+    *,
+    now_monotonic: float,
+    request_ids: Any = None,
+) -> int:
     """Expire deadline-backed in-flight work and drop legacy stale entries.
 
     Deadline-backed requests must use the normal terminal-state machinery so an
     expiry races atomically with response acceptance/cancellation and produces
     the owner-authenticated tombstone.  Only legacy entries without deadline
-    metadata may be raw-pruned.
+    metadata may be raw-pruned.  ``request_ids`` limits the check to those
+    entries instead of the node's whole table.
     """
     removed = 0
     expired_targets: list[tuple[str, str]] = []
@@ -1231,7 +1610,15 @@ def _prune_api_v1_stale_in_flight_entries(payload: dict[str, Any], *, now_monoto
         in_flight_requests = payload.get("api_v1_in_flight_requests")
         if not isinstance(in_flight_requests, dict):
             return 0
-        for request_id, entry in list(in_flight_requests.items()):
+        if request_ids is None:
+            candidates = list(in_flight_requests.items())
+        else:
+            candidates = [
+                (request_id, in_flight_requests[request_id])
+                for request_id in request_ids
+                if request_id in in_flight_requests
+            ]
+        for request_id, entry in candidates:
             if not _api_v1_in_flight_entry_can_be_pruned(entry, now_monotonic=now_monotonic):
                 continue
             deadline_monotonic = (
@@ -1247,6 +1634,8 @@ def _prune_api_v1_stale_in_flight_entries(payload: dict[str, Any], *, now_monoto
             removed += 1
         if not in_flight_requests:
             payload.pop("api_v1_in_flight_requests", None)
+    if removed:
+        _refresh_api_v1_scheduler_entry(payload.get("public_key"))
     for client_public_key, request_id in expired_targets:
         _cancel_api_v1_request(
             client_public_key,
@@ -1324,6 +1713,7 @@ def _api_v1_scheduler_candidate(
     if state in {"failed", "recovering", "draining", "unregistering"} or _api_v1_node_has_ineligible_flag(payload):
         return None
     if _api_v1_node_is_stale(payload, now_monotonic=now_monotonic):
+        relay_reaper.schedule("server_lease", server_public_key, now_monotonic, earliest=True)
         return None
     capabilities = payload.get("capabilities")
     if not isinstance(capabilities, dict):
@@ -1364,6 +1754,357 @@ def _api_v1_scheduler_candidate(
     }
 
 
+def _api_v1_node_stale_at_monotonic(payload: dict[str, Any], *, now_monotonic: float) -> float:
+    """Return the monotonic instant at which ``_api_v1_node_is_stale`` flips to true."""
+
+    stale_after = payload.get("last_ping_duration", _server_stale_seconds())
+    if not isinstance(stale_after, (int, float)):
+        stale_after = _server_stale_seconds()
+    stale_at = now_monotonic + max(float(stale_after), 1.0) - _server_ping_age_seconds(payload.get("last_ping"))
+    polling_until = payload.get("polling_until_monotonic")
+    if isinstance(polling_until, (int, float)):
+        stale_at = max(stale_at, float(polling_until))
+    return stale_at
+
+
+def _api_v1_next_in_flight_expiry(payload: dict[str, Any], *, now_monotonic: float) -> float:
+    """Return the earliest future in-flight accounting expiry for one node."""
+
+    earliest = math.inf
+    with api_v1_in_flight_requests_lock:
+        in_flight_requests = payload.get("api_v1_in_flight_requests")
+        if not isinstance(in_flight_requests, dict):
+            return earliest
+        for entry in in_flight_requests.values():
+            expires_at = entry.get("expires_at") if isinstance(entry, dict) else entry
+            if isinstance(expires_at, (int, float)) and now_monotonic < expires_at < earliest:
+                earliest = float(expires_at)
+    return earliest
+
+
+class _ApiV1SchedulerBucket:
+    """Load-ordered eligible nodes for one ``(model_id, context tier)`` pair.
+
+    Each load level keeps its nodes sorted by registration sequence so the
+    round-robin tie-break is a bisect, plus an order-independent membership
+    signature that identifies the tie set without materialising it. A lazily
+    pruned min-heap tracks the populated load levels.
+    """
+
+    __slots__ = ("levels", "signatures", "load_heap", "eligible_count", "capacity_limited_count")
+
+    def __init__(self) -> None:
+        self.levels: dict[float, list[tuple[int, str]]] = {}
+        self.signatures: dict[float, int] = {}
+        self.load_heap: list[float] = []
+        self.eligible_count = 0
+        self.capacity_limited_count = 0
+
+    def add(self, sequence: int, server_public_key: str, load_score: float, capacity_limited: bool) -> None:
+        if capacity_limited:
+            self.capacity_limited_count += 1
+            return
+        level = self.levels.get(load_score)
+        if level is None:
+            level = self.levels[load_score] = []
+            self.signatures[load_score] = 0
+            heapq.heappush(self.load_heap, load_score)
+        bisect.insort(level, (sequence, server_public_key))
+        self.signatures[load_score] = (self.signatures[load_score] + hash(server_public_key)) & _SIGNATURE_MASK
+        self.eligible_count += 1
+
+    def remove(self, sequence: int, server_public_key: str, load_score: float, capacity_limited: bool) -> None:
+        if capacity_limited:
+            self.capacity_limited_count -= 1
+            return
+        level = self.levels.get(load_score)
+        if level is None:
+            return
+        position = bisect.bisect_left(level, (sequence, server_public_key))
+        if position < len(level) and level[position] == (sequence, server_public_key):
+            del level[position]
+            self.signatures[load_score] = (self.signatures[load_score] - hash(server_public_key)) & _SIGNATURE_MASK
+            self.eligible_count -= 1
+        if not level:
+            del self.levels[load_score]
+            del self.signatures[load_score]
+            if len(self.load_heap) > 2 * len(self.levels) + 16:
+                self.load_heap = list(self.levels)
+                heapq.heapify(self.load_heap)
+
+    def least_loaded(self) -> tuple[float, list[tuple[int, str]]] | None:
+        while self.load_heap:
+            load_score = self.load_heap[0]
+            level = self.levels.get(load_score)
+            if level:
+                return load_score, level
+            heapq.heappop(self.load_heap)
+        return None
+
+    def is_empty(self) -> bool:
+        return not self.eligible_count and not self.capacity_limited_count
+
+
+_SIGNATURE_MASK = (1 << 64) - 1
+
+
+class _ApiV1SchedulerEntry:
+    __slots__ = ("sequence", "tier", "bucket_keys", "load_score", "capacity_limited", "refresh_at", "generation")
+
+    def __init__(self, sequence, tier, bucket_keys, load_score, capacity_limited, refresh_at, generation):
+        self.sequence = sequence
+        self.tier = tier
+        self.bucket_keys = bucket_keys
+        self.load_score = load_score
+        self.capacity_limited = capacity_limited
+        self.refresh_at = refresh_at
+        self.generation = generation
+
+
+class ApiV1SchedulerIndex:
+    """Persistent best-fit index over registered API v1 compute nodes.
+
+    Nodes are bucketed by ``(model_id, active context tier)`` (plus a ``None``
+    model wildcard) and ordered by load score, so selection only touches the
+    smallest populated tier and its least-loaded level instead of walking every
+    registration. Route handlers refresh a node whenever they change its
+    registration, heartbeat, queue, or in-flight accounting; time-driven changes
+    (lease staleness and in-flight expiry) are replayed from a due-time heap.
+    The chosen node is re-verified against live state before it is returned, so
+    out-of-band payload edits can only cost an extra refresh, never a wrong pick.
+
+    Callers must hold ``server_round_robin_lock`` and must not hold
+    ``client_inference_requests_changed`` or ``api_v1_in_flight_requests_lock``.
+    """
+
+    def __init__(self) -> None:
+        self._next_sequence = 0
+        self._sequences: dict[str, int] = {}
+        self._api_v1_keys: set[str] = set()
+        self._entries: dict[str, _ApiV1SchedulerEntry] = {}
+        self._buckets: dict[tuple[str | None, str], _ApiV1SchedulerBucket] = {}
+        self._refresh_heap: list[tuple[float, int, str]] = []
+        self._generation = 0
+
+    def clear(self) -> None:
+        self._sequences.clear()
+        self._api_v1_keys.clear()
+        self._entries.clear()
+        self._buckets.clear()
+        self._refresh_heap.clear()
+
+    def registered_count(self) -> int:
+        return len(self._api_v1_keys)
+
+    def sequence(self, server_public_key: str) -> int | None:
+        return self._sequences.get(server_public_key)
+
+    def discard(self, server_public_key: str) -> None:
+        self._remove_entry(server_public_key)
+        self._sequences.pop(server_public_key, None)
+        self._api_v1_keys.discard(server_public_key)
+
+    def _remove_entry(self, server_public_key: str) -> None:
+        entry = self._entries.pop(server_public_key, None)
+        if entry is None:
+            return
+        for bucket_key in entry.bucket_keys:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                continue
+            bucket.remove(entry.sequence, server_public_key, entry.load_score, entry.capacity_limited)
+            if bucket.is_empty():
+                del self._buckets[bucket_key]
+
+    def refresh(self, server_public_key: str, payload: Any, *, now_monotonic: float | None = None) -> None:
+        """Re-derive one node's bucket membership and load from its live payload."""
+
+        now_monotonic = time.monotonic() if now_monotonic is None else now_monotonic
+        self._remove_entry(server_public_key)
+        if not isinstance(payload, dict):
+            self.discard(server_public_key)
+            return
+        sequence = self._sequences.get(server_public_key)
+        if sequence is None:
+            sequence = self._sequences[server_public_key] = self._next_sequence
+            self._next_sequence += 1
+        if not bool(payload.get(API_V1_SERVER_MARKER)):
+            self._api_v1_keys.discard(server_public_key)
+            return
+        self._api_v1_keys.add(server_public_key)
+        candidate = _api_v1_scheduler_candidate(
+            server_public_key,
+            payload,
+            requested_model=None,
+            requested_context_tier=_SMALLEST_CONTEXT_TIER,
+            registration_index=sequence,
+            now_monotonic=now_monotonic,
+            include_capacity_limited=True,
+        )
+        if candidate is None:
+            return
+        tier = candidate["tier"]
+        bucket_keys = ((None, tier), *((model_id, tier) for model_id in candidate["capabilities"]["supported_model_ids"]))
+        refresh_at = min(
+            _api_v1_node_stale_at_monotonic(payload, now_monotonic=now_monotonic),
+            _api_v1_next_in_flight_expiry(payload, now_monotonic=now_monotonic),
+        )
+        self._generation += 1
+        entry = _ApiV1SchedulerEntry(
+            sequence,
+            tier,
+            bucket_keys,
+            candidate["load_score"],
+            candidate["capacity_limited"],
+            refresh_at,
+            self._generation,
+        )
+        self._entries[server_public_key] = entry
+        for bucket_key in bucket_keys:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = self._buckets[bucket_key] = _ApiV1SchedulerBucket()
+            bucket.add(sequence, server_public_key, entry.load_score, entry.capacity_limited)
+        if math.isfinite(refresh_at):
+            if len(self._refresh_heap) > 4 * len(self._entries) + 64:
+                self._refresh_heap = [
+                    (live.refresh_at, live.generation, key)
+                    for key, live in self._entries.items()
+                    if math.isfinite(live.refresh_at)
+                ]
+                heapq.heapify(self._refresh_heap)
+            else:
+                heapq.heappush(self._refresh_heap, (refresh_at, entry.generation, server_public_key))
+
+    def refresh_due(self, servers: dict[str, Any], *, now_monotonic: float) -> None:
+        """Replay lease staleness and in-flight expiry for nodes whose deadline passed."""
+
+        while self._refresh_heap and self._refresh_heap[0][0] <= now_monotonic:
+            _, generation, server_public_key = heapq.heappop(self._refresh_heap)
+            entry = self._entries.get(server_public_key)
+            if entry is None or entry.generation != generation:
+                continue
+            self.refresh(server_public_key, servers.get(server_public_key), now_monotonic=now_monotonic)
+
+    def tier_counts(self, requested_model: str | None, requested_context_tier: str) -> tuple[dict[str, int], dict[str, int]]:
+        eligible: dict[str, int] = {}
+        capacity_limited: dict[str, int] = {}
+        for tier in _context_tiers_satisfying(requested_context_tier):
+            bucket = self._buckets.get((requested_model, tier))
+            if bucket is None:
+                continue
+            if bucket.eligible_count:
+                eligible[tier] = bucket.eligible_count
+            if bucket.capacity_limited_count:
+                capacity_limited[tier] = bucket.capacity_limited_count
+        return eligible, capacity_limited
+
+    def select(
+        self,
+        servers: dict[str, Any],
+        *,
+        requested_model: str | None,
+        requested_context_tier: str,
+        start_sequences: dict[tuple[Any, ...], int],
+        default_start_sequence: int,
+        now_monotonic: float,
+    ) -> tuple[dict[str, Any], tuple[Any, ...], int] | None:
+        """Return the verified best-fit candidate, its tie-set key, and tie position.
+
+        The tie-set key is ``(model, tier, size, membership signature)`` so a
+        recurring set of equally loaded nodes resumes its own rotation, whatever
+        load level it currently shares.
+        """
+
+        self.refresh_due(servers, now_monotonic=now_monotonic)
+        for _attempt in range(len(self._entries) + 1):
+            chosen = None
+            for tier in _context_tiers_satisfying(requested_context_tier):
+                bucket_key = (requested_model, tier)
+                bucket = self._buckets.get(bucket_key)
+                least_loaded = bucket.least_loaded() if bucket is not None else None
+                if least_loaded is not None:
+                    chosen = (bucket_key, least_loaded)
+                    break
+            if chosen is None:
+                return None
+            bucket_key, (load_score, level) = chosen
+            tie_key = (*bucket_key, len(level), self._buckets[bucket_key].signatures[load_score])
+            start_sequence = start_sequences.get(tie_key, default_start_sequence)
+            position = bisect.bisect_left(level, (start_sequence, ""))
+            if position >= len(level):
+                position = 0
+            sequence, server_public_key = level[position]
+            payload = servers.get(server_public_key)
+            candidate = _api_v1_scheduler_candidate(
+                server_public_key,
+                payload,
+                requested_model=requested_model,
+                requested_context_tier=requested_context_tier,
+                registration_index=sequence,
+                now_monotonic=now_monotonic,
+                include_capacity_limited=True,
+            )
+            if (
+                candidate is not None
+                and not candidate["capacity_limited"]
+                and candidate["tier"] == bucket_key[1]
+                and candidate["load_score"] == load_score
+            ):
+                return candidate, tie_key, position
+            self.refresh(server_public_key, payload, now_monotonic=now_monotonic)
+        return None
+
+
+def _context_tiers_satisfying(requested_context_tier: str) -> list[str]:
+    return [tier for tier in _CONTEXT_TIERS_ASCENDING if _context_tier_can_satisfy(tier, requested_context_tier)]
+
+
+_CONTEXT_TIERS_ASCENDING = sorted(CONTEXT_TIER_ORDER, key=CONTEXT_TIER_ORDER.__getitem__)
+_SMALLEST_CONTEXT_TIER = _CONTEXT_TIERS_ASCENDING[0]
+api_v1_scheduler_index = ApiV1SchedulerIndex()
+
+
+def _refresh_api_v1_scheduler_entry(server_public_key: str, *, now_monotonic: float | None = None) -> None:
+    """Re-index one node after its registration, heartbeat, queue, or in-flight state changed."""
+
+    if not isinstance(server_public_key, str):
+        return
+    with server_round_robin_lock:
+        api_v1_scheduler_index.refresh(
+            server_public_key,
+            known_servers.get(server_public_key),
+            now_monotonic=now_monotonic,
+        )
+
+
+def _wait_for_client_inference_request_locked(public_key: str, timeout: float) -> bool:
+    """Park until ``public_key`` is notified or ``timeout`` elapses.
+
+    Must be called with ``client_inference_requests_changed`` held. Returns
+    ``True`` when the wakeup came from a notification rather than the timeout.
+    """
+
+    return client_inference_request_waiters.wait_locked(public_key, timeout)
+
+
+def _notify_client_inference_request_waiters_locked(public_key: str) -> None:
+    """Wake long-polls parked on ``public_key``; caller holds ``client_inference_requests_changed``."""
+
+    client_inference_request_waiters.notify_locked(public_key)
+
+
+def _notify_api_v1_response_waiters(client_public_key: Any, request_id: Any) -> None:
+    """Wake retrieves parked on a response, progress, or terminal change for one request."""
+
+    if not isinstance(client_public_key, str):
+        return
+    with api_v1_response_waiters.lock:
+        api_v1_response_waiters.notify_locked((client_public_key, request_id))
+        if request_id is not None:
+            api_v1_response_waiters.notify_locked((client_public_key, None))
+
+
 def _pop_next_api_v1_request(public_key: str):
     queued_requests = client_inference_requests.get(public_key, [])
     if not queued_requests:
@@ -1396,11 +2137,72 @@ def _pop_next_api_v1_request(public_key: str):
     return first_request
 
 
+def _server_lease_seconds(payload: dict[str, Any]) -> float:
+    stale_after = payload.get("last_ping_duration", _server_stale_seconds())
+    if not isinstance(stale_after, (int, float)):
+        stale_after = _server_stale_seconds()
+    return max(float(stale_after), 1.0)
+
+
+def _server_lease_recheck_at(payload: dict[str, Any], *, now_monotonic: float) -> float | None:
+    """Return when a node's lease should next be examined, or ``None`` when it is stale now.
+
+    Caller holds ``server_round_robin_lock``.
+    """
+
+    polling_until = payload.get("polling_until_monotonic")
+    if isinstance(polling_until, (int, float)) and polling_until > now_monotonic:
+        return float(polling_until)
+    if _api_v1_active_in_flight_count(payload, now_monotonic=now_monotonic) > 0:
+        return now_monotonic + _server_lease_seconds(payload)
+
+    in_flight_until = payload.get("api_v1_in_flight_until_monotonic")
+    if isinstance(in_flight_until, (int, float)) and in_flight_until > now_monotonic:
+        return float(in_flight_until)
+    payload.pop("api_v1_in_flight_until_monotonic", None)
+    payload.pop("api_v1_in_flight_request_id", None)
+    remaining = _server_lease_seconds(payload) - _server_ping_age_seconds(payload.get("last_ping"))
+    if remaining >= 0:
+        return now_monotonic + remaining + _REAP_SLACK_SECONDS
+    return None
+
+
+def _schedule_server_lease_reap(server_public_key: Any, payload: Any) -> None:
+    if not isinstance(server_public_key, str) or not isinstance(payload, dict):
+        return
+    now_monotonic = time.monotonic()
+    remaining = _server_lease_seconds(payload) - _server_ping_age_seconds(payload.get("last_ping"))
+    relay_reaper.schedule(
+        "server_lease",
+        server_public_key,
+        now_monotonic + remaining + _REAP_SLACK_SECONDS if remaining >= 0 else now_monotonic,
+        earliest=True,
+    )
+
+
+def _reap_server_lease_if_stale(server_public_key: Any) -> bool:
+    """Evict one node whose lease has lapsed without waiting for its reaper deadline."""
+
+    if not isinstance(server_public_key, str):
+        return False
+    now_monotonic = time.monotonic()
+    with server_round_robin_lock:
+        payload = known_servers.get(server_public_key)
+        if not isinstance(payload, dict) or _server_lease_recheck_at(payload, now_monotonic=now_monotonic) is not None:
+            return False
+    return _reap_server_lease(server_public_key, now_monotonic)
+
+
 def _evict_stale_servers() -> list[str]:
+    """Sweep every relay record for expiry and evict stale compute nodes.
+
+    This walks all state, so request handlers call :func:`_reap_due` instead;
+    the full sweep backs the reaper's periodic safety net and callers that
+    need everything settled at once.
+    """
     _prune_terminal_requests()
     _expire_stale_pending_requests()
     _prune_api_v1_control_tombstones()
-    default_stale_after = _server_stale_seconds()
     now_monotonic = time.monotonic()
     evicted: list[str] = []
     stale_candidates: list[tuple[str, int, float]] = []
@@ -1412,22 +2214,9 @@ def _evict_stale_servers() -> list[str]:
     with server_round_robin_lock:
         server_items = list(known_servers.items())
         for server_public_key, payload in server_items:
-            polling_until = payload.get("polling_until_monotonic")
-            if isinstance(polling_until, (int, float)) and polling_until > now_monotonic:
-                continue
-            if _api_v1_active_in_flight_count(payload, now_monotonic=now_monotonic) > 0:
-                continue
-
-            in_flight_until = payload.get("api_v1_in_flight_until_monotonic")
-            if isinstance(in_flight_until, (int, float)) and in_flight_until > now_monotonic:
-                continue
-            payload.pop("api_v1_in_flight_until_monotonic", None)
-            payload.pop("api_v1_in_flight_request_id", None)
-            stale_after = payload.get("last_ping_duration", default_stale_after)
-            if not isinstance(stale_after, (int, float)):
-                stale_after = default_stale_after
-            stale_after = max(float(stale_after), 1.0)
-            if _server_ping_age_seconds(payload.get("last_ping")) <= stale_after:
+            recheck_at = _server_lease_recheck_at(payload, now_monotonic=now_monotonic)
+            if recheck_at is not None:
+                relay_reaper.schedule("server_lease", server_public_key, recheck_at, earliest=True)
                 continue
             stale_candidates.append((server_public_key, id(payload), now_monotonic))
 
@@ -1442,6 +2231,273 @@ def _evict_stale_servers() -> list[str]:
     return evicted
 
 
+def _reap_server_lease(server_public_key: str, now_monotonic: float) -> bool:
+    with server_round_robin_lock:
+        payload = known_servers.get(server_public_key)
+        if not isinstance(payload, dict):
+            return False
+        recheck_at = _server_lease_recheck_at(payload, now_monotonic=now_monotonic)
+        expected_payload_id = id(payload)
+    if recheck_at is not None:
+        relay_reaper.schedule("server_lease", server_public_key, recheck_at, earliest=True)
+        return False
+    if _unregister_server(
+        server_public_key,
+        eviction_reason="stale_lease",
+        expected_payload_id=expected_payload_id,
+        stale_cutoff_monotonic=now_monotonic,
+    ):
+        return True
+    # Lost a race with a heartbeat or re-registration; look again from the new state.
+    with server_round_robin_lock:
+        payload = known_servers.get(server_public_key)
+    _schedule_server_lease_reap(server_public_key, payload)
+    return False
+
+
+def _reap_api_v1_in_flight_entry(key: tuple[str, str], now_monotonic: float) -> bool:
+    server_public_key, request_id = key
+    with server_round_robin_lock:
+        payload = known_servers.get(server_public_key)
+    if not isinstance(payload, dict):
+        return False
+    _prune_api_v1_stale_in_flight_entries(payload, now_monotonic=now_monotonic, request_ids=(request_id,))
+    with api_v1_in_flight_requests_lock:
+        in_flight_requests = payload.get("api_v1_in_flight_requests")
+        entry = in_flight_requests.get(request_id) if isinstance(in_flight_requests, dict) else None
+        recheck_at = (
+            _api_v1_in_flight_entry_recheck_at(entry, now_monotonic=now_monotonic)
+            if entry is not None
+            else None
+        )
+    if recheck_at is not None:
+        relay_reaper.schedule("in_flight", key, recheck_at)
+    return False
+
+
+def _reap_pending_request(key: tuple[str, str], now_monotonic: float) -> bool:
+    client_public_key, request_id = key
+    with client_pending_request_ids_lock:
+        pending_entry = client_pending_request_ids.get(client_public_key, {}).get(request_id)
+        deadline_ids = client_pending_request_deadlines.get(client_public_key)
+        deadline = deadline_ids.get(request_id) if isinstance(deadline_ids, dict) else None
+    if pending_entry is None:
+        return False
+    if not _pending_request_entry_is_expired(pending_entry, deadline_monotonic=deadline):
+        _schedule_pending_request_reap(client_public_key, request_id, pending_entry)
+        return False
+    if not _has_client_response_for_request(client_public_key, request_id):
+        _cancel_api_v1_request(
+            client_public_key,
+            request_id,
+            status="expired",
+            reason="pending_request_ttl_exceeded",
+        )
+    return False
+
+
+def _reap_terminal_request(key: tuple[str, str], now_monotonic: float) -> bool:
+    client_public_key, request_id = key
+    now = time.time()
+    retained_until = None
+    with client_terminal_request_ids_lock:
+        terminal_ids = client_terminal_request_ids.get(client_public_key)
+        terminal = terminal_ids.get(request_id) if isinstance(terminal_ids, dict) else None
+        if terminal is not None:
+            expires_at = terminal.get("expires_at") if isinstance(terminal, dict) else None
+            if not isinstance(expires_at, (int, float)) or expires_at <= now:
+                terminal_ids.pop(request_id, None)
+                if not terminal_ids:
+                    client_terminal_request_ids.pop(client_public_key, None)
+            else:
+                retained_until = expires_at
+    with client_terminal_outcomes_lock:
+        recorded_ids = client_terminal_outcomes.get(client_public_key)
+        if isinstance(recorded_ids, dict) and request_id in recorded_ids:
+            expires_at = recorded_ids[request_id]
+            if not isinstance(expires_at, (int, float)) or expires_at <= now:
+                recorded_ids.pop(request_id, None)
+                if not recorded_ids:
+                    client_terminal_outcomes.pop(client_public_key, None)
+            else:
+                retained_until = expires_at if retained_until is None else min(retained_until, expires_at)
+    if retained_until is not None:
+        _schedule_terminal_request_reap(client_public_key, request_id, retained_until)
+    return False
+
+
+def _reap_api_v1_control_tombstone(key: str, now_monotonic: float) -> bool:
+    with api_v1_control_tombstones_lock:
+        tombstone = api_v1_control_tombstones.get(key)
+        if tombstone is None:
+            return False
+        expires_at = tombstone.get("expires_at_monotonic") if isinstance(tombstone, dict) else None
+        if not isinstance(expires_at, (int, float)) or expires_at <= now_monotonic:
+            api_v1_control_tombstones.pop(key, None)
+            return False
+    relay_reaper.schedule("tombstone", key, expires_at)
+    return False
+
+
+_REAP_HANDLERS: dict[str, Callable[[Any, float], bool]] = {
+    "server_lease": _reap_server_lease,
+    "in_flight": _reap_api_v1_in_flight_entry,
+    "pending": _reap_pending_request,
+    "terminal": _reap_terminal_request,
+    "tombstone": _reap_api_v1_control_tombstone,
+}
+
+
+def _reap_due(*, now_monotonic: float | None = None, limit: int | None = RELAY_REAP_PER_REQUEST_LIMIT) -> list[str]:
+    """Run only the housekeeping whose deadline has passed; return evicted node keys.
+
+    Request handlers call this in place of the full :func:`_evict_stale_servers`
+    walk, so an idle heap costs one comparison.  ``limit`` bounds the work a
+    single request absorbs; the reaper thread drains the rest.
+    """
+    now_monotonic = time.monotonic() if now_monotonic is None else now_monotonic
+    evicted: list[str] = []
+    for kind, key in relay_reaper.pop_due(now_monotonic, limit=limit):
+        handler = _REAP_HANDLERS.get(kind)
+        if handler is None:
+            continue
+        try:
+            if handler(key, now_monotonic):
+                evicted.append(key)
+        except Exception:
+            LOGGER.exception("relay.reaper.handler_failed", extra={"reap_kind": kind})
+    return evicted
+
+
+def _start_relay_reaper() -> ReaperThread:
+    global relay_reaper_thread
+    if relay_reaper_thread is None or not relay_reaper_thread.is_alive():
+        relay_reaper_thread = ReaperThread(
+            lambda: _reap_due(limit=None),
+            full_sweep=_evict_stale_servers,
+            on_error=lambda exc: LOGGER.error("relay.reaper.failed", exc_info=exc),
+        )
+        relay_reaper_thread.start()
+    return relay_reaper_thread
+
+
+def _relay_snapshot_tables() -> tuple[SnapshotTable, ...]:
+    # ``known_servers`` comes last so re-registering restored nodes indexes
+    # them against already-restored queues.
+    return (
+        SnapshotTable("client_inference_requests", lambda: client_inference_requests, (client_inference_requests_lock,)),
+        SnapshotTable("client_pending_request_ids", lambda: client_pending_request_ids, (client_pending_request_ids_lock,)),
+        SnapshotTable(
+            "client_pending_request_deadlines",
+            lambda: client_pending_request_deadlines,
+            (client_pending_request_ids_lock,),
+            monotonic_values=True,
+        ),
+        SnapshotTable("client_responses", lambda: client_responses, (client_responses_lock,)),
+        SnapshotTable("client_progress", lambda: client_progress, (client_progress_lock,)),
+        SnapshotTable("client_terminal_request_ids", lambda: client_terminal_request_ids, (client_terminal_request_ids_lock,)),
+        SnapshotTable("client_terminal_outcomes", lambda: client_terminal_outcomes, (client_terminal_outcomes_lock,)),
+        SnapshotTable(
+            "api_v1_recently_unregistered_servers",
+            lambda: api_v1_recently_unregistered_servers,
+            (api_v1_recently_unregistered_servers_lock,),
+            monotonic_values=True,
+        ),
+        SnapshotTable("api_v1_control_tombstones", lambda: api_v1_control_tombstones, (api_v1_control_tombstones_lock,)),
+        SnapshotTable(
+            "known_servers",
+            lambda: known_servers,
+            (server_round_robin_lock, api_v1_in_flight_requests_lock),
+            # In-flight entries keep their expiry as ``expires_at``.
+            monotonic_fields=frozenset({"expires_at"}),
+        ),
+    )
+
+
+def _reschedule_restored_relay_state() -> None:
+    """Give restored state its reaper deadlines and restored nodes a fresh lease.
+
+    Nodes keep their queues across the restart and get one lease period to
+    heartbeat again before the usual stale-lease eviction applies.
+    """
+
+    now = datetime.now()
+    with server_round_robin_lock:
+        for server_public_key, payload in list(known_servers.items()):
+            if not isinstance(payload, dict):
+                continue
+            payload["last_ping"] = now
+            known_servers[server_public_key] = payload
+            in_flight_requests = payload.get("api_v1_in_flight_requests")
+            if isinstance(in_flight_requests, dict):
+                for request_id, entry in in_flight_requests.items():
+                    expires_at = entry.get("expires_at") if isinstance(entry, dict) else None
+                    if isinstance(expires_at, (int, float)):
+                        relay_reaper.schedule("in_flight", (server_public_key, request_id), expires_at)
+    with client_pending_request_ids_lock:
+        pending = [
+            (client_public_key, request_id, entry)
+            for client_public_key, entries in client_pending_request_ids.items()
+            for request_id, entry in entries.items()
+        ]
+    for client_public_key, request_id, entry in pending:
+        _schedule_pending_request_reap(client_public_key, request_id, entry)
+    with client_terminal_request_ids_lock:
+        terminal = [
+            (client_public_key, request_id, entry.get("expires_at") if isinstance(entry, dict) else None)
+            for client_public_key, entries in client_terminal_request_ids.items()
+            for request_id, entry in entries.items()
+        ]
+    with client_terminal_outcomes_lock:
+        terminal.extend(
+            (client_public_key, request_id, expires_at)
+            for client_public_key, entries in client_terminal_outcomes.items()
+            for request_id, expires_at in entries.items()
+        )
+    for client_public_key, request_id, expires_at in terminal:
+        if isinstance(expires_at, (int, float)):
+            _schedule_terminal_request_reap(client_public_key, request_id, expires_at)
+    with api_v1_control_tombstones_lock:
+        for key, tombstone in api_v1_control_tombstones.items():
+            expires_at = tombstone.get("expires_at_monotonic") if isinstance(tombstone, dict) else None
+            if isinstance(expires_at, (int, float)):
+                relay_reaper.schedule("tombstone", key, expires_at)
+
+
+def _start_relay_snapshots() -> RelaySnapshotter | None:
+    """Restore coordination state from ``TOKEN_PLACE_RELAY_SNAPSHOT_DIR`` and keep journaling it."""
+
+    global relay_snapshotter
+    directory = snapshot_directory()
+    if directory is None:
+        return None
+    snapshotter = RelaySnapshotter(
+        directory,
+        _relay_snapshot_tables(),
+        exclusive=(api_v1_terminal_transition_lock, server_round_robin_lock),
+    )
+    restored = snapshotter.restore()
+    _reschedule_restored_relay_state()
+    relay_snapshotter = snapshotter.start()
+    LOGGER.info("relay.snapshot.started", extra={"restored_entries": restored})
+    return relay_snapshotter
+
+
+def _start_relay_housekeeping() -> Callable[[], None]:
+    """Restore persisted state, start the reaper and return the matching stop."""
+
+    snapshotter = _start_relay_snapshots()
+    reaper = _start_relay_reaper()
+
+    def _stop() -> None:
+        reaper.stop()
+        if snapshotter is not None:
+            # Final flush after the server stopped, so a clean shutdown loses nothing.
+            snapshotter.stop()
+
+    return _stop
+
+
 def _live_server_diagnostics(*, api_v1_only: bool = False) -> list[dict[str, Any]]:
     diagnostics: list[dict[str, Any]] = []
     for server_public_key, payload in list(known_servers.items()):
@@ -1467,41 +2523,17 @@ def _live_server_diagnostics(*, api_v1_only: bool = False) -> list[dict[str, Any
     return diagnostics
 
 
-def _api_v1_round_robin_keys() -> list[str]:
-    """Return API v1-capable compute node keys in registration order."""
-
-    return [
-        server_public_key
-        for server_public_key, payload in known_servers.items()
-        if bool(payload.get(API_V1_SERVER_MARKER))
-    ]
-
-
 def _remove_known_server(server_public_key: str) -> bool:
-    """Remove a known server while preserving the API v1 round-robin cursor."""
+    """Remove a known server; later registrations keep their round-robin sequence."""
 
     global server_round_robin_next_index
     with server_round_robin_lock:
-        api_v1_ordered_keys = _api_v1_round_robin_keys()
         if server_public_key not in known_servers:
             return False
-
-        is_api_v1_candidate = server_public_key in api_v1_ordered_keys
-        if is_api_v1_candidate:
-            removed_position = api_v1_ordered_keys.index(server_public_key)
-            current_position = server_round_robin_next_index % len(api_v1_ordered_keys)
-
         known_servers.pop(server_public_key, None)
-
-        if is_api_v1_candidate:
-            remaining_count = len(api_v1_ordered_keys) - 1
-            if remaining_count <= 0:
-                server_round_robin_next_index = 0
-            elif removed_position < current_position:
-                server_round_robin_next_index = (current_position - 1) % remaining_count
-            else:
-                server_round_robin_next_index = current_position % remaining_count
-
+        api_v1_scheduler_index.discard(server_public_key)
+        if not api_v1_scheduler_index.registered_count():
+            server_round_robin_next_index = 0
         return True
 
 
@@ -1554,7 +2586,7 @@ def _unregister_server(
                 _record_api_v1_server_unregistered(server_public_key)
                 with client_inference_requests_changed:
                     dropped_requests = list(client_inference_requests.pop(server_public_key, []) or [])
-                    client_inference_requests_changed.notify_all()
+                    _notify_client_inference_request_waiters_locked(server_public_key)
             else:
                 dropped_requests = []
 
@@ -1716,7 +2748,7 @@ def metrics():
 
 @app.route("/healthz", methods=["GET"])
 def healthz():
-    _evict_stale_servers()
+    _reap_due()
     gpu_host = app.config.get("gpu_host")
     configured_servers = app.config.get("relay_configured_servers", [])
     require_upstream_health = _env_truthy(REQUIRE_UPSTREAM_HEALTH_ENV, default=False)
@@ -1893,7 +2925,13 @@ def _legacy_route_deprecated_response(route_name: str):
 
 
 def _select_best_fit_server_key(*, model: str | None = None, context_tier: str = DEFAULT_CONTEXT_TIER) -> tuple[str | None, dict[str, Any], dict[str, Any] | None]:
-    """Select an API v1 node by smallest capable tier, then least load, then RR tie-break."""
+    """Select an API v1 node by smallest capable tier, then least load, then RR tie-break.
+
+    Selection reads :data:`api_v1_scheduler_index`, so its cost is logarithmic
+    in the registered fleet instead of linear. Ties rotate in registration order
+    with one cursor per tie set; an unseen tie set starts from the global
+    round-robin sequence.
+    """
 
     global server_round_robin_next_index
     requested_model = model.strip().lower() if isinstance(model, str) and model.strip() else None
@@ -1901,34 +2939,22 @@ def _select_best_fit_server_key(*, model: str | None = None, context_tier: str =
         requested_model = MODEL_ALIASES.get(requested_model, requested_model)
     now_monotonic = time.monotonic()
     with server_round_robin_lock:
-        all_api_v1_keys = _api_v1_round_robin_keys()
-        registered_count = len(all_api_v1_keys)
-        current_index = server_round_robin_next_index % registered_count if registered_count else 0
-        capacity_limited_count = 0
-        capacity_limited_tier_counts: dict[str, int] = {}
-        candidates = []
-        for registration_index, server_public_key in enumerate(all_api_v1_keys):
-            candidate = _api_v1_scheduler_candidate(
-                server_public_key,
-                known_servers.get(server_public_key, {}),
-                requested_model=requested_model,
-                requested_context_tier=context_tier,
-                registration_index=registration_index,
-                now_monotonic=now_monotonic,
-                include_capacity_limited=True,
-            )
-            if candidate is not None and candidate["capacity_limited"]:
-                capacity_limited_count += 1
-                tier = candidate["tier"]
-                capacity_limited_tier_counts[tier] = capacity_limited_tier_counts.get(tier, 0) + 1
-            elif candidate is not None:
-                candidates.append(candidate)
-
-        eligible_tier_counts: dict[str, int] = {}
-        for candidate in candidates:
-            eligible_tier_counts[candidate["tier"]] = eligible_tier_counts.get(candidate["tier"], 0) + 1
-
-        if not candidates:
+        selected = api_v1_scheduler_index.select(
+            known_servers,
+            requested_model=requested_model,
+            requested_context_tier=context_tier,
+            start_sequences=api_v1_filtered_round_robin_next_positions,
+            default_start_sequence=server_round_robin_next_index,
+            now_monotonic=now_monotonic,
+        )
+        eligible_tier_counts, capacity_limited_tier_counts = api_v1_scheduler_index.tier_counts(
+            requested_model,
+            context_tier,
+        )
+        registered_count = api_v1_scheduler_index.registered_count()
+        eligible_count = sum(eligible_tier_counts.values())
+
+        if selected is None:
             return None, {
                 "eligible_count": 0,
                 "eligible_node_count": 0,
@@ -1936,56 +2962,49 @@ def _select_best_fit_server_key(*, model: str | None = None, context_tier: str =
                 "eligible_tier_counts": eligible_tier_counts or capacity_limited_tier_counts,
                 "capacity_limited_tier_counts": capacity_limited_tier_counts,
                 "registered_api_v1_count": registered_count,
-                "round_robin_index": current_index,
+                "round_robin_index": server_round_robin_next_index,
                 "round_robin_position": None,
                 "selection_policy": API_V1_SELECTION_POLICY,
-                "capacity_limited_node_count": capacity_limited_count,
+                "capacity_limited_node_count": sum(capacity_limited_tier_counts.values()),
             }, None
 
-        selected_tier_tokens = min(candidate["tier_tokens"] for candidate in candidates)
-        tier_candidates = [candidate for candidate in candidates if candidate["tier_tokens"] == selected_tier_tokens]
-        selected_load_score = min(candidate["load_score"] for candidate in tier_candidates)
-        load_candidates = [candidate for candidate in tier_candidates if candidate["load_score"] == selected_load_score]
-
-        eligible_key = tuple(candidate["server_public_key"] for candidate in load_candidates)
-        if eligible_key in api_v1_filtered_round_robin_next_positions:
-            selected_load_index = api_v1_filtered_round_robin_next_positions[eligible_key] % len(load_candidates)
-        else:
-            selected_load_index = min(
-                range(len(load_candidates)),
-                key=lambda index: (load_candidates[index]["registration_index"] - current_index) % registered_count,
-            )
-        selected = load_candidates[selected_load_index]
-        api_v1_filtered_round_robin_next_positions[eligible_key] = (selected_load_index + 1) % len(load_candidates)
-        server_round_robin_next_index = (selected["registration_index"] + 1) % registered_count
+        candidate, tie_key, position = selected
+        next_sequence = candidate["registration_index"] + 1
+        if (
+            tie_key not in api_v1_filtered_round_robin_next_positions
+            and len(api_v1_filtered_round_robin_next_positions) >= MAX_API_V1_FILTERED_ROUND_ROBIN_CURSORS
+        ):
+            api_v1_filtered_round_robin_next_positions.clear()
+        api_v1_filtered_round_robin_next_positions[tie_key] = next_sequence
+        server_round_robin_next_index = next_sequence
 
         requested_tokens = CONTEXT_TIER_ORDER[context_tier]
-        spillover = selected["tier_tokens"] > requested_tokens
+        spillover = candidate["tier_tokens"] > requested_tokens
         spillover_reason = None
         if spillover:
             spillover_reason = "no_smaller_eligible_node_available"
 
         selection = {
-            "eligible_count": len(candidates),
-            "eligible_node_count": len(candidates),
+            "eligible_count": eligible_count,
+            "eligible_node_count": eligible_count,
             "requested_model": requested_model,
             "eligible_tier_counts": eligible_tier_counts,
             "capacity_limited_tier_counts": capacity_limited_tier_counts,
             "round_robin_index": server_round_robin_next_index,
-            "round_robin_position": selected_load_index,
+            "round_robin_position": position,
             "selection_policy": API_V1_SELECTION_POLICY,
-            "selected_queue_depth": selected["queue_depth"],
-            "selected_in_flight_count": selected["in_flight_count"],
-            "selected_load_score": selected["load_score"],
+            "selected_queue_depth": candidate["queue_depth"],
+            "selected_in_flight_count": candidate["in_flight_count"],
+            "selected_load_score": candidate["load_score"],
             "spillover": spillover,
             "spillover_reason": spillover_reason,
         }
-        return selected["server_public_key"], selection, selected["selected_server"]
+        return candidate["server_public_key"], selection, candidate["selected_server"]
 
 
 def _select_next_server_payload(*, api_v1: bool = False):
     global server_round_robin_next_index
-    evicted = _evict_stale_servers()
+    evicted = _reap_due()
     with server_round_robin_lock:
         if not known_servers:
             server_round_robin_next_index = 0
@@ -2108,7 +3127,7 @@ def api_v1_relay_servers_next():
 @app.route('/relay/diagnostics', methods=['GET'])
 def relay_diagnostics():
     """Live diagnostics for legacy and API v1 relay registered compute nodes."""
-    _evict_stale_servers()
+    _reap_due()
     live_nodes = _live_server_diagnostics()
     api_v1_live_nodes = _live_server_diagnostics(api_v1_only=True)
     configured_servers = app.config.get("relay_configured_servers", [])
@@ -2258,11 +3277,11 @@ def _queue_client_response(client_public_key, envelope):
         existing = client_responses.get(client_public_key)
         if existing is None:
             client_responses[client_public_key] = envelope
-            return
-        if isinstance(existing, list):
+        elif isinstance(existing, list):
             existing.append(envelope)
-            return
-        client_responses[client_public_key] = [existing, envelope]
+        else:
+            client_responses[client_public_key] = [existing, envelope]
+    _notify_api_v1_response_waiters(client_public_key, envelope.get('request_id'))
 
 
 def _safe_key_fingerprint(value: Any) -> str:
@@ -2273,7 +3292,7 @@ def _safe_key_fingerprint(value: Any) -> str:
 
 _ALLOWED_API_V1_TERMINAL_STATUSES = {"cancelled", "expired"}
 _API_V1_UNREGISTER_TOMBSTONE_TTL_SECONDS = 300.0
-api_v1_recently_unregistered_servers: dict[str, float] = {}
+api_v1_recently_unregistered_servers: dict[str, float] = JournaledDict()
 api_v1_recently_unregistered_servers_lock = threading.Lock()
 
 
@@ -2308,7 +3327,7 @@ _ALLOWED_API_V1_TERMINAL_REASONS = {
     "pending_request_ttl_exceeded",
     "server_unregistered",
 }
-api_v1_control_tombstones: dict[str, dict[str, Any]] = {}
+api_v1_control_tombstones: dict[str, dict[str, Any]] = JournaledDict()
 api_v1_control_tombstones_lock = threading.Lock()
 
 
@@ -2371,9 +3390,10 @@ def _add_api_v1_control_tombstone(
         "control_credential_digest": owner_digest,
         "expires_at_monotonic": now + _api_v1_control_tombstone_ttl_seconds(),
     }
-    _prune_api_v1_control_tombstones(now_monotonic=now)
+    key = _control_tombstone_key(server_public_key, request_id)
     with api_v1_control_tombstones_lock:
-        api_v1_control_tombstones[_control_tombstone_key(server_public_key, request_id)] = tombstone
+        api_v1_control_tombstones[key] = tombstone
+    relay_reaper.schedule("tombstone", key, tombstone["expires_at_monotonic"])
 
 
 def _sanitize_terminal_status(value):
@@ -2390,17 +3410,31 @@ def _mark_request_terminal(client_public_key, request_id, *, status="cancelled",
     status = _sanitize_terminal_status(status)
     reason = _sanitize_terminal_reason(reason, status)
     expires_at = time.time() + max(TERMINAL_REQUEST_TTL_SECONDS, 1.0)
-    _prune_terminal_requests(now=time.time())
     with client_terminal_request_ids_lock:
         terminal_ids = client_terminal_request_ids.setdefault(client_public_key, {})
         if request_id in terminal_ids:
             return False
         terminal_ids[request_id] = {"status": status, "reason": reason, "expires_at": expires_at}
-    return _record_request_terminal_outcome_once(
+    _schedule_terminal_request_reap(client_public_key, request_id, expires_at)
+    recorded = _record_request_terminal_outcome_once(
         client_public_key,
         request_id,
         _terminal_outcome_from_status_reason(status, reason),
     )
+    _notify_api_v1_response_waiters(client_public_key, request_id)
+    return recorded
+
+
+def _schedule_terminal_request_reap(client_public_key, request_id, expires_at):
+    """Queue a wall-clock terminal record expiry on the monotonic reaper clock."""
+
+    remaining = max(float(expires_at) - time.time(), 0.0)
+    relay_reaper.schedule(
+        "terminal",
+        (client_public_key, request_id),
+        time.monotonic() + remaining + _REAP_SLACK_SECONDS,
+        earliest=True,
+    )
 
 
 def _prune_terminal_requests(*, now=None):
@@ -2449,36 +3483,39 @@ def _get_terminal_request(client_public_key, request_id):
         return terminal
 
 
-def _remove_request_from_server_queues(client_public_key, request_id):
+def _remove_request_from_server_queues(client_public_key, request_id, owner=None):
+    """Withdraw a queued request; with the owner index this touches one queue entry."""
+    if owner is None:
+        owner = _api_v1_request_owner(client_public_key, request_id)
     removed = 0
+    touched_servers = []
     with client_inference_requests_changed:
-        for server_public_key, queued_requests in list(client_inference_requests.items()):
-            if not isinstance(queued_requests, list):
+        if owner is None:
+            candidates = list(client_inference_requests.items())
+        else:
+            candidates = [
+                (server_public_key, client_inference_requests.get(server_public_key))
+                for server_public_key in owner
+            ]
+        for server_public_key, queued_requests in candidates:
+            if not isinstance(queued_requests, _NodeRequestQueue):
                 continue
-            kept = []
-            removed_for_server = 0
-            for item in queued_requests:
-                if (
-                    isinstance(item, dict)
-                    and item.get("client_public_key") == client_public_key
-                    and item.get("request_id") == request_id
-                ):
-                    removed += 1
-                    removed_for_server += 1
-                    LOGGER.info(
-                        "relay.api_v1.request_removed_from_queue",
-                        extra={
-                            "server_fingerprint": _safe_key_fingerprint(server_public_key),
-                        },
-                    )
-                    continue
-                kept.append(item)
-            if kept:
-                client_inference_requests[server_public_key] = kept
-            elif removed_for_server:
+            removed_for_server = queued_requests.remove_request(client_public_key, request_id)
+            if not removed_for_server:
+                continue
+            removed += removed_for_server
+            for _ in range(removed_for_server):
+                LOGGER.info(
+                    "relay.api_v1.request_removed_from_queue",
+                    extra={
+                        "server_fingerprint": _safe_key_fingerprint(server_public_key),
+                    },
+                )
+            if not queued_requests:
                 client_inference_requests.pop(server_public_key, None)
-        if removed:
-            client_inference_requests_changed.notify_all()
+            touched_servers.append(server_public_key)
+    for server_public_key in touched_servers:
+        _refresh_api_v1_scheduler_entry(server_public_key)
     return removed
 
 
@@ -2551,12 +3588,14 @@ def _cancel_api_v1_request(client_public_key, request_id, *, status="cancelled",
     with api_v1_terminal_transition_lock:
         _clear_client_progress(client_public_key, request_id)
         completed_won = _has_client_response_for_request(client_public_key, request_id)
-        removed = _remove_request_from_server_queues(client_public_key, request_id)
+        owner = _api_v1_request_owner(client_public_key, request_id)
+        removed = _remove_request_from_server_queues(client_public_key, request_id, owner)
         pending_removed = _clear_pending_request(client_public_key, request_id)
         in_flight_removed = 0
+        released_servers = []
         with server_round_robin_lock:
             with api_v1_in_flight_requests_lock:
-                for server_payload in known_servers.values():
+                for server_payload in _api_v1_owner_payloads(owner):
                     server_public_key = server_payload.get("public_key") if isinstance(server_payload, dict) else None
                     in_flight_requests = server_payload.get("api_v1_in_flight_requests")
                     if not isinstance(in_flight_requests, dict) or request_id not in in_flight_requests:
@@ -2577,9 +3616,14 @@ def _cancel_api_v1_request(client_public_key, request_id, *, status="cancelled",
                             )
                         if not in_flight_requests:
                             server_payload.pop("api_v1_in_flight_requests", None)
+                        released_servers.append(server_public_key)
+            for server_public_key in released_servers:
+                _refresh_api_v1_scheduler_entry(server_public_key)
         lifecycle_removed = bool(removed or pending_removed or in_flight_removed)
         if lifecycle_removed and not completed_won and not _has_client_response_for_request(client_public_key, request_id):
             _mark_request_terminal(client_public_key, request_id, status=status, reason=reason)
+        elif pending_removed:
+            _notify_api_v1_response_waiters(client_public_key, request_id)
     LOGGER.info(
         "relay.api_v1.request_cancelled",
         extra={
@@ -2606,6 +3650,20 @@ def _mark_request_pending(client_public_key, request_id, *, cancel_token=None, d
         pending_ids[request_id] = pending_entry
         if pending_entry["request_deadline_monotonic"] is not None:
             client_pending_request_deadlines.setdefault(client_public_key, {})[request_id] = pending_entry["request_deadline_monotonic"]
+    _schedule_pending_request_reap(client_public_key, request_id, pending_entry)
+
+
+def _schedule_pending_request_reap(client_public_key, request_id, pending_entry):
+    deadline = _valid_request_deadline_monotonic(pending_entry.get("request_deadline_monotonic"))
+    if deadline is None:
+        if PENDING_REQUEST_TTL_SECONDS <= 0:
+            return
+        try:
+            age = time.time() - float(pending_entry.get("queued_at"))
+        except (TypeError, ValueError):
+            age = PENDING_REQUEST_TTL_SECONDS
+        deadline = time.monotonic() + max(PENDING_REQUEST_TTL_SECONDS - age, 0.0)
+    relay_reaper.schedule("pending", (client_public_key, request_id), deadline + _REAP_SLACK_SECONDS)
 
 
 def _clear_pending_request(client_public_key, request_id):
@@ -2627,6 +3685,49 @@ def _clear_pending_request(client_public_key, request_id):
         return existed
 
 
+def _index_api_v1_request_owner(client_public_key, request_id, server_public_key):
+    """Record which node currently queues or runs a pending API v1 request.
+
+    The pending entry doubles as the lifecycle index keyed by
+    ``(client_public_key, request_id)``, so cancel and response acceptance can
+    go straight to the owning node's queue and in-flight table instead of
+    scanning the fleet. A request only ever moves from its node's queue to the
+    same node's in-flight table, so one key covers both.
+    """
+    if not client_public_key or not request_id:
+        return
+    with client_pending_request_ids_lock:
+        pending_entry = client_pending_request_ids.get(client_public_key, {}).get(request_id)
+        if isinstance(pending_entry, dict):
+            pending_entry["owner_server_public_key"] = server_public_key
+
+
+def _api_v1_request_owner(client_public_key, request_id):
+    """Return the node keys that may hold a request, or ``None`` when unindexed.
+
+    An empty tuple means the relay knows nothing is queued or in flight: the
+    request already reached a terminal outcome. ``None`` means the request was
+    never indexed (e.g. state seeded outside the relay's own transitions) and
+    callers must fall back to a full scan.
+    """
+    if not client_public_key or not request_id:
+        return None
+    with client_pending_request_ids_lock:
+        pending_entry = client_pending_request_ids.get(client_public_key, {}).get(request_id)
+        if isinstance(pending_entry, dict) and "owner_server_public_key" in pending_entry:
+            return (pending_entry["owner_server_public_key"],)
+    if pending_entry is None and _has_request_terminal_outcome(client_public_key, request_id):
+        return ()
+    return None
+
+
+def _api_v1_owner_payloads(owner):
+    """Known-server payloads to search for an in-flight entry; caller holds ``server_round_robin_lock``."""
+    if owner is None:
+        return list(known_servers.values())
+    return [known_servers[key] for key in owner if key in known_servers]
+
+
 def _clear_pending_requests_for_queued_items(queued_items):
     """Clear pending markers for queued API v1 envelopes that are being dropped."""
     for item in queued_items or []:
@@ -2711,21 +3812,22 @@ def _cancel_token_for_queued_or_in_flight_request(client_public_key, request_id)
     token = _get_pending_cancel_token(client_public_key, request_id)
     if token:
         return token
+    owner = _api_v1_request_owner(client_public_key, request_id)
     with client_inference_requests_changed:
-        for queued_requests in client_inference_requests.values():
-            if not isinstance(queued_requests, list):
+        if owner is None:
+            candidates = list(client_inference_requests.values())
+        else:
+            candidates = [client_inference_requests.get(server_public_key) for server_public_key in owner]
+        for queued_requests in candidates:
+            if not isinstance(queued_requests, _NodeRequestQueue):
                 continue
-            for item in queued_requests:
-                if (
-                    isinstance(item, dict)
-                    and item.get("client_public_key") == client_public_key
-                    and item.get("request_id") == request_id
-                ):
-                    token = item.get("cancel_token")
-                    return token if isinstance(token, str) and token else None
+            item = queued_requests.find_request(client_public_key, request_id)
+            if item is not None:
+                token = item.get("cancel_token")
+                return token if isinstance(token, str) and token else None
     with server_round_robin_lock:
         with api_v1_in_flight_requests_lock:
-            for server_payload in known_servers.values():
+            for server_payload in _api_v1_owner_payloads(owner):
                 in_flight_requests = server_payload.get("api_v1_in_flight_requests")
                 if not isinstance(in_flight_requests, dict):
                     continue
@@ -2817,7 +3919,7 @@ def api_v1_relay_servers_register():
     control_credential = ""
     with server_round_robin_lock:
         existing_payload = known_servers.get(public_key)
-        existing_api_v1_count = len(_api_v1_round_robin_keys())
+        existing_api_v1_count = api_v1_scheduler_index.registered_count()
         if existing_payload and existing_payload.get(API_V1_SERVER_MARKER):
             existing_payload['last_ping'] = datetime.now()
             log_event = "server.reregister"
@@ -2841,6 +3943,7 @@ def api_v1_relay_servers_register():
         known_servers[public_key]['capabilities'] = capabilities
         known_servers[public_key]['public_key'] = public_key
         control_credential = _store_api_v1_control_credential(known_servers[public_key])
+        _refresh_api_v1_scheduler_entry(public_key)
     LOGGER.info(log_event, extra={"server_fingerprint": _safe_key_fingerprint(public_key)})
 
     response_payload = {
@@ -2892,7 +3995,7 @@ def api_v1_relay_servers_poll():
     if auth_error:
         return auth_error
 
-    _evict_stale_servers()
+    _reap_due()
     data = request.get_json(silent=True)
     if not isinstance(data, dict):
         return jsonify({'error': {'message': 'Invalid request data', 'code': 400}}), 400
@@ -2900,6 +4003,7 @@ def api_v1_relay_servers_poll():
     public_key = data.get('server_public_key')
     if not public_key:
         return jsonify({'error': {'message': 'Missing server public key', 'code': 400}}), 400
+    _reap_server_lease_if_stale(public_key)
     capabilities = None
     if 'capabilities' in data:
         raw_capabilities = data.get('capabilities')
@@ -2908,8 +4012,28 @@ def api_v1_relay_servers_poll():
             if capability_error:
                 return jsonify({'error': {'message': capability_error, 'code': 'invalid_capabilities'}}), 400
 
+    max_items = None
+    if data.get('max_items') is not None:
+        max_items = _normalise_positive_int(data.get('max_items'), max_value=MAX_API_V1_POLL_ITEMS)
+        if max_items is None:
+            return jsonify({
+                'error': {
+                    'message': f'max_items must be an integer between 1 and {MAX_API_V1_POLL_ITEMS}',
+                    'code': 'invalid_max_items',
+                }
+            }), 400
+
     poll_wait_seconds = _api_v1_poll_wait_seconds()
     lease_seconds = _api_v1_lease_seconds()
+    # The event-loop serving mode runs each poll as short non-blocking passes and
+    # parks between them itself; it shares one deadline across passes.
+    poll_park = request.environ.get(API_V1_POLL_PARK_ENVIRON)
+    if not isinstance(poll_park, dict):
+        poll_park = None
+    deadline = time.monotonic() + max(poll_wait_seconds, 0.0)
+    if poll_park is not None:
+        deadline = poll_park.setdefault('deadline_monotonic', deadline)
+        poll_park['parked'] = False
     with server_round_robin_lock:
         server_payload = known_servers.get(public_key)
         if server_payload is None:
@@ -2918,7 +4042,22 @@ def api_v1_relay_servers_poll():
         server_payload['last_ping_duration'] = lease_seconds
         if capabilities is not None:
             server_payload['capabilities'] = capabilities
-        server_payload['polling_until_monotonic'] = time.monotonic() + max(poll_wait_seconds, 0.0)
+        server_payload['polling_until_monotonic'] = deadline
+        _refresh_api_v1_scheduler_entry(public_key)
+        # Batched claims never take more than the node's advertised free slots.
+        claim_limit = 1
+        if max_items is not None:
+            load = _api_v1_node_load_snapshot(public_key, server_payload)
+            claim_limit = min(max_items, load["max_concurrency"] - load["in_flight_count"])
+            if claim_limit < 1:
+                server_payload.pop('polling_until_monotonic', None)
+                _refresh_api_v1_scheduler_entry(public_key)
+                return jsonify({
+                    'message': 'No capacity available',
+                    'batch': [],
+                    'next_ping_in_x_seconds': 0 if poll_wait_seconds > 0 else lease_seconds,
+                    'poll_wait_seconds': poll_wait_seconds,
+                }), 200
     LOGGER.info("server.heartbeat", extra={"server_fingerprint": _safe_key_fingerprint(public_key)})
 
     def _mark_claimed_request_terminal(claimed_request):
@@ -2938,20 +4077,38 @@ def api_v1_relay_servers_poll():
         return jsonify({'error': {'message': 'Server with the specified public key not found', 'code': 404}}), 404
 
     first_request = None
-    deadline = time.monotonic() + poll_wait_seconds
+    extra_requests = []
+    expired_extra_requests = []
+    notified = bool(poll_park.pop('notified', False)) if poll_park is not None else False
     while True:
         server_missing = False
         with server_round_robin_lock:
             server_missing = public_key not in known_servers
         if server_missing:
+            if notified:
+                RELAY_API_V1_POLL_WAKEUPS_TOTAL.labels("server_missing").inc()
             return _server_not_found_response(first_request)
         with client_inference_requests_changed:
             first_request = _pop_next_api_v1_request(public_key)
+            if notified:
+                RELAY_API_V1_POLL_WAKEUPS_TOTAL.labels("spurious" if first_request is None else "work").inc()
+                notified = False
             if first_request is not None:
                 request_deadline_monotonic = _valid_request_deadline_monotonic(first_request.get('_request_deadline_monotonic'))
                 if request_deadline_monotonic is not None and request_deadline_monotonic <= time.monotonic():
                     first_request = dict(first_request)
                 else:
+                    # Claim the rest of the batch in the same critical section so
+                    # concurrent polls never split or duplicate it.
+                    while len(extra_requests) < claim_limit - 1:
+                        next_request = _pop_next_api_v1_request(public_key)
+                        if next_request is None:
+                            break
+                        next_deadline = _valid_request_deadline_monotonic(next_request.get('_request_deadline_monotonic'))
+                        if next_deadline is not None and next_deadline <= time.monotonic():
+                            expired_extra_requests.append(dict(next_request))
+                        else:
+                            extra_requests.append(next_request)
                     break
             if first_request is not None:
                 expired_request = first_request
@@ -2966,8 +4123,11 @@ def api_v1_relay_servers_poll():
                 pass
             elif poll_wait_seconds <= 0 or remaining <= 0:
                 break
+            elif poll_park is not None:
+                poll_park['parked'] = True
+                break
             else:
-                client_inference_requests_changed.wait(timeout=remaining)
+                notified = _wait_for_client_inference_request_locked(public_key, remaining)
         if expired_request is not None:
             _cancel_api_v1_request(
                 expired_request.get('client_public_key'),
@@ -2977,6 +4137,29 @@ def api_v1_relay_servers_poll():
             )
             continue
 
+    for expired_request in expired_extra_requests:
+        _cancel_api_v1_request(
+            expired_request.get('client_public_key'),
+            expired_request.get('request_id'),
+            status='expired',
+            reason='provider_timeout',
+        )
+
+    if poll_park is not None and poll_park['parked']:
+        return jsonify({'message': 'No requests available', 'poll_wait_seconds': poll_wait_seconds}), 200
+
+    claimed_requests = [first_request, *extra_requests] if first_request is not None else []
+
+    def _no_requests_response(next_ping_in_x_seconds):
+        body = {
+            'message': 'No requests available',
+            'next_ping_in_x_seconds': next_ping_in_x_seconds,
+            'poll_wait_seconds': poll_wait_seconds,
+        }
+        if max_items is not None:
+            body['batch'] = []
+        return jsonify(body), 200
+
     server_missing = False
     with server_round_robin_lock:
         server_payload = known_servers.get(public_key)
@@ -2987,55 +4170,81 @@ def api_v1_relay_servers_poll():
 
             if first_request is None:
                 server_payload['last_ping'] = datetime.now()
-                return jsonify({
-                    'message': 'No requests available',
-                    'next_ping_in_x_seconds': 0 if poll_wait_seconds > 0 else max(server_payload['last_ping_duration'], 1),
-                    'poll_wait_seconds': poll_wait_seconds,
-                }), 200
+            _refresh_api_v1_scheduler_entry(public_key)
+            if first_request is None:
+                return _no_requests_response(
+                    0 if poll_wait_seconds > 0 else max(server_payload['last_ping_duration'], 1)
+                )
     if server_missing:
+        for claimed_request in extra_requests:
+            _mark_claimed_request_terminal(claimed_request)
         return _server_not_found_response(first_request)
 
+    dispatched_requests = []
+    for index, claimed_request in enumerate(claimed_requests):
+        dispatched = _dispatch_api_v1_polled_request(public_key, claimed_request)
+        if dispatched is None:
+            for unrecorded_request in claimed_requests[index + 1:]:
+                _mark_claimed_request_terminal(unrecorded_request)
+            return _server_not_found_response(claimed_request)
+        if dispatched:
+            dispatched_requests.append(claimed_request)
+    if not dispatched_requests:
+        return _no_requests_response(0 if poll_wait_seconds > 0 else lease_seconds)
+
+    response_body = dict(dispatched_requests[0])
+    if max_items is not None:
+        response_body['batch'] = dispatched_requests
+    return jsonify(response_body), 200
+
+
+def _dispatch_api_v1_polled_request(public_key: str, claimed_request: dict[str, Any]) -> bool | None:
+    """Record one claimed envelope as in flight on ``public_key`` and prepare it for the node.
+
+    Returns ``False`` when the request expired before dispatch and ``None`` when
+    the node disappeared; the caller settles the envelope in that case.
+    """
+
     queue_wait_ms = None
-    queued_at = first_request.pop('_queued_at', None)
+    queued_at = claimed_request.pop('_queued_at', None)
     if isinstance(queued_at, (int, float)):
         queue_wait_ms = round(max((time.time() - float(queued_at)) * 1000.0, 0.0), 3)
-    request_id = first_request.get('request_id')
-    request_deadline_monotonic = _valid_request_deadline_monotonic(first_request.pop('_request_deadline_monotonic', None))
+    request_id = claimed_request.get('request_id')
+    request_deadline_monotonic = _valid_request_deadline_monotonic(claimed_request.pop('_request_deadline_monotonic', None))
     if request_deadline_monotonic is not None and request_deadline_monotonic <= time.monotonic():
         _cancel_api_v1_request(
-            first_request.get('client_public_key'),
+            claimed_request.get('client_public_key'),
             request_id,
             status='expired',
             reason='provider_timeout',
         )
-        return jsonify({
-            'message': 'No requests available',
-            'next_ping_in_x_seconds': 0 if poll_wait_seconds > 0 else lease_seconds,
-            'poll_wait_seconds': poll_wait_seconds,
-        }), 200
-    first_request.update(_api_v1_deadline_metadata(request_deadline_monotonic))
+        return False
+    claimed_request.update(_api_v1_deadline_metadata(request_deadline_monotonic))
     if isinstance(request_id, str) and request_id:
-        server_missing = False
         with server_round_robin_lock:
             server_payload = known_servers.get(public_key)
             if server_payload is None:
-                server_missing = True
-            else:
-                with api_v1_in_flight_requests_lock:
-                    in_flight_requests = server_payload.setdefault('api_v1_in_flight_requests', {})
-                    if isinstance(in_flight_requests, dict):
-                        in_flight_requests[request_id] = {
-                            'expires_at': min(
-                                time.monotonic() + _api_v1_in_flight_ttl_seconds(),
-                                request_deadline_monotonic if request_deadline_monotonic is not None else time.monotonic() + _api_v1_in_flight_ttl_seconds(),
-                            ),
-                            'started_at_monotonic': time.monotonic(),
-                            'client_public_key': first_request.get('client_public_key'),
-                            'cancel_token': first_request.get('cancel_token'),
-                            'request_deadline_monotonic': request_deadline_monotonic,
-                        }
-        if server_missing:
-            return _server_not_found_response(first_request)
+                return None
+            with api_v1_in_flight_requests_lock:
+                in_flight_requests = server_payload.setdefault('api_v1_in_flight_requests', {})
+                if isinstance(in_flight_requests, dict):
+                    in_flight_requests[request_id] = {
+                        'expires_at': min(
+                            time.monotonic() + _api_v1_in_flight_ttl_seconds(),
+                            request_deadline_monotonic if request_deadline_monotonic is not None else time.monotonic() + _api_v1_in_flight_ttl_seconds(),
+                        ),
+                        'started_at_monotonic': time.monotonic(),
+                        'client_public_key': claimed_request.get('client_public_key'),
+                        'cancel_token': claimed_request.get('cancel_token'),
+                        'request_deadline_monotonic': request_deadline_monotonic,
+                    }
+                    relay_reaper.schedule(
+                        'in_flight',
+                        (public_key, request_id),
+                        in_flight_requests[request_id]['expires_at'],
+                    )
+            _index_api_v1_request_owner(claimed_request.get('client_public_key'), request_id, public_key)
+            _refresh_api_v1_scheduler_entry(public_key)
 
     LOGGER.info(
         "relay.api_v1.request_dispatched",
@@ -3044,7 +4253,7 @@ def api_v1_relay_servers_poll():
             "queue_wait_ms": queue_wait_ms,
         },
     )
-    return jsonify(first_request), 200
+    return True
 
 
 @app.route('/api/v1/relay/servers/control', methods=['POST'])
@@ -3054,8 +4263,7 @@ def api_v1_relay_servers_control():
     if auth_error:
         return auth_error
 
-    _evict_stale_servers()
-    _prune_api_v1_control_tombstones()
+    _reap_due()
     data = request.get_json(silent=True)
     if not isinstance(data, dict):
         return jsonify({'error': {'message': 'Invalid request data', 'code': 400}}), 400
@@ -3166,7 +4374,7 @@ def api_v1_relay_servers_control():
 @app.route('/api/v1/relay/requests', methods=['POST'])
 def api_v1_relay_requests():
     """Queue an encrypted API v1 relay request envelope for a target compute node."""
-    _evict_stale_servers()
+    _reap_due()
     data = request.get_json()
     envelope, error = _extract_ciphertext_envelope(data, require_server_key=True)
     if _payload_has_plaintext_fields(data):
@@ -3200,10 +4408,12 @@ def api_v1_relay_requests():
             cancel_token=envelope.get('cancel_token'),
             deadline_monotonic=deadline_monotonic,
         )
+        _index_api_v1_request_owner(envelope.get('client_public_key'), envelope.get('request_id'), server_public_key)
         with client_inference_requests_changed:
             client_inference_requests.setdefault(server_public_key, []).append(envelope)
             queue_depth = len(client_inference_requests.get(server_public_key, []))
-            client_inference_requests_changed.notify_all()
+            _notify_client_inference_request_waiters_locked(server_public_key)
+        _refresh_api_v1_scheduler_entry(server_public_key)
     LOGGER.info(
         "relay.api_v1.request_queued",
         extra={
@@ -3289,19 +4499,23 @@ def api_v1_relay_responses():
                 status = terminal.get('status', 'cancelled')
                 return jsonify({'error': {'message': 'Request is no longer waiting for a response', 'code': status, 'status': status}}), 410
             lifecycle_owned = False
+            released_server = None
+            owner = _api_v1_request_owner(client_public_key, request_id)
             with server_round_robin_lock:
                 with api_v1_in_flight_requests_lock:
-                    for server_payload in known_servers.values():
+                    for server_payload in _api_v1_owner_payloads(owner):
                         in_flight_requests = server_payload.get('api_v1_in_flight_requests')
                         if not isinstance(in_flight_requests, dict) or request_id not in in_flight_requests:
                             continue
                         if _in_flight_entry_matches_client(in_flight_requests.get(request_id), client_public_key):
                             in_flight_requests.pop(request_id, None)
                             lifecycle_owned = True
+                            released_server = server_payload.get('public_key')
                             if not in_flight_requests:
                                 server_payload.pop('api_v1_in_flight_requests', None)
                             break
-            lifecycle_owned = _remove_request_from_server_queues(client_public_key, request_id) or lifecycle_owned
+                _refresh_api_v1_scheduler_entry(released_server)
+            lifecycle_owned = _remove_request_from_server_queues(client_public_key, request_id, owner) or lifecycle_owned
             lifecycle_owned = _clear_pending_request(client_public_key, request_id) or lifecycle_owned
             terminal = _get_terminal_request(client_public_key, request_id)
             if terminal is not None:
@@ -3387,32 +4601,29 @@ def api_v1_relay_progress():
         with client_progress_lock:
             replaced = (client_key, request_id) in client_progress
             client_progress[(client_key, request_id)] = envelope
+        _notify_api_v1_response_waiters(client_key, request_id)
     LOGGER.info("relay.api_v1.progress", extra={"progress_outcome": "replaced" if replaced else "accepted"})
     return jsonify({'message': 'Encrypted progress accepted'}), 202
 
 
-@app.route('/api/v1/relay/responses/retrieve', methods=['POST'])
-def api_v1_relay_responses_retrieve():
-    """Retrieve an encrypted API v1 response envelope by client public key."""
-    data = request.get_json()
-    if not data or 'client_public_key' not in data:
-        return jsonify({'error': {'message': 'Invalid request data', 'code': 400}}), 400
+def _api_v1_terminal_response(terminal):
+    status = terminal.get('status', 'cancelled')
+    return {'error': {'message': f'Request {status}', 'code': status, 'status': status, 'reason': terminal.get('reason', status)}}, 410
 
-    client_public_key = data['client_public_key']
-    request_id = data.get('request_id')
+
+def _api_v1_retrieve_response_once(client_public_key, request_id):
+    """Run one non-blocking retrieve pass, returning ``(payload, status_code)``."""
     terminal = _get_terminal_request(client_public_key, request_id)
     if terminal is not None:
         _remove_client_responses_for_request(client_public_key, request_id)
-        status = terminal.get('status', 'cancelled')
-        return jsonify({'error': {'message': f'Request {status}', 'code': status, 'status': status, 'reason': terminal.get('reason', status)}}), 410
+        return _api_v1_terminal_response(terminal)
 
     response = _pop_client_response(client_public_key, request_id)
     if response is None:
         _expire_pending_request_if_stale(client_public_key, request_id)
         terminal = _get_terminal_request(client_public_key, request_id)
         if terminal is not None:
-            status = terminal.get('status', 'cancelled')
-            return jsonify({'error': {'message': f'Request {status}', 'code': status, 'status': status, 'reason': terminal.get('reason', status)}}), 410
+            return _api_v1_terminal_response(terminal)
     if response is None:
         # Pending recheck and latest-progress removal are one lifecycle
         # transition.  Final/cancel paths take this lock before their nested
@@ -3426,18 +4637,17 @@ def api_v1_relay_responses_retrieve():
                 "relay.api_v1.response_pending",
                 extra={"client_fingerprint": _safe_key_fingerprint(client_public_key)},
             )
-            return jsonify({
+            return {
                 "status": "pending",
                 **_api_v1_deadline_metadata(deadline),
                 **({"encrypted_progress": progress} if progress else {}),
-            }), 202
+            }, 202
         terminal = _get_terminal_request(client_public_key, request_id)
         if terminal is not None:
-            status = terminal.get('status', 'cancelled')
-            return jsonify({'error': {'message': f'Request {status}', 'code': status, 'status': status, 'reason': terminal.get('reason', status)}}), 410
+            return _api_v1_terminal_response(terminal)
         if request_id:
-            return jsonify({'error': {'message': f'Unknown request_id: {request_id}', 'code': 404}}), 404
-        return jsonify({'error': {'message': 'No response available for the given public key', 'code': 404}}), 404
+            return {'error': {'message': f'Unknown request_id: {request_id}', 'code': 404}}, 404
+        return {'error': {'message': 'No response available for the given public key', 'code': 404}}, 404
 
     LOGGER.info(
         "relay.api_v1.response_retrieved",
@@ -3445,7 +4655,202 @@ def api_v1_relay_responses_retrieve():
             "client_fingerprint": _safe_key_fingerprint(client_public_key),
         },
     )
-    return jsonify(response), 200
+    return response, 200
+
+
+def _api_v1_retrieve_wait_seconds(data):
+    """Parse the opt-in ``wait_seconds`` long-poll bound; ``None`` means invalid."""
+    raw = data.get('wait_seconds', 0)
+    if isinstance(raw, bool) or not isinstance(raw, (int, float)):
+        return None
+    wait_seconds = float(raw)
+    if not math.isfinite(wait_seconds) or wait_seconds < 0:
+        return None
+    return min(wait_seconds, _api_v1_retrieve_max_wait_seconds())
+
+
+def _api_v1_retrieve_wait_key(data):
+    client_public_key = data.get('client_public_key')
+    if not isinstance(client_public_key, str) or not client_public_key:
+        return None
+    wait_seconds = _api_v1_retrieve_wait_seconds(data)
+    if not wait_seconds:
+        return None
+    request_id = data.get('request_id')
+    return client_public_key, request_id if isinstance(request_id, str) and request_id else None
+
+
+@app.route('/api/v1/relay/responses/retrieve', methods=['POST'])
+def api_v1_relay_responses_retrieve():
+    """Retrieve an encrypted API v1 response envelope by client public key.
+
+    ``wait_seconds`` opts into a long-poll: while the request is pending with no
+    new progress, the call parks until a response, progress update, or terminal
+    transition for that request is published, the wait elapses, or the request
+    deadline passes.
+    """
+    data = request.get_json()
+    if not data or 'client_public_key' not in data:
+        return jsonify({'error': {'message': 'Invalid request data', 'code': 400}}), 400
+    wait_seconds = _api_v1_retrieve_wait_seconds(data)
+    if wait_seconds is None:
+        return jsonify({'error': {'message': 'wait_seconds must be a non-negative number', 'code': 400}}), 400
+
+    client_public_key = data['client_public_key']
+    request_id = data.get('request_id')
+    wait_key = _api_v1_retrieve_wait_key(data)
+    if wait_key is None:
+        payload, status_code = _api_v1_retrieve_response_once(client_public_key, request_id)
+        return jsonify(payload), status_code
+
+    retrieve_park = request.environ.get(API_V1_RETRIEVE_PARK_ENVIRON)
+    if retrieve_park is not None:
+        # Event-loop serving mode: the ASGI layer owns the wait and re-runs
+        # this view on wakeup, so each pass just checks once.
+        wait_until = retrieve_park.setdefault('wait_until_monotonic', time.monotonic() + wait_seconds)
+        retrieve_park['parked'] = False
+        payload, status_code = _api_v1_retrieve_response_once(client_public_key, request_id)
+        if status_code == 202 and 'encrypted_progress' not in payload:
+            resume_at = _api_v1_retrieve_resume_at(client_public_key, request_id, wait_until)
+            if resume_at > time.monotonic():
+                retrieve_park['parked'] = True
+                retrieve_park['deadline_monotonic'] = resume_at
+        if status_code == 202:
+            payload['wait_seconds'] = wait_seconds
+        return jsonify(payload), status_code
+
+    wait_until = time.monotonic() + wait_seconds
+    with api_v1_response_waiters.watching(wait_key) as watch:
+        while True:
+            payload, status_code = _api_v1_retrieve_response_once(client_public_key, request_id)
+            if status_code != 202 or 'encrypted_progress' in payload:
+                break
+            remaining = _api_v1_retrieve_resume_at(client_public_key, request_id, wait_until) - time.monotonic()
+            if remaining <= 0:
+                break
+            watch.wait(remaining)
+    if status_code == 202:
+        payload['wait_seconds'] = wait_seconds
+    return jsonify(payload), status_code
+
+
+def _api_v1_sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _api_v1_response_events(client_public_key, request_id, first, park=None):
+    """Yield SSE frames for one request until its response or terminal state.
+
+    With ``park`` (event-loop serving mode) the generator never blocks: it
+    records ``deadline_monotonic``, sets ``parked`` and yields an empty chunk,
+    and the ASGI layer awaits the wakeup before pulling the next frame.
+    """
+    payload, status_code = first
+    outcome = "disconnected"
+    watching = (
+        contextlib.nullcontext()
+        if park is not None
+        else api_v1_response_waiters.watching((client_public_key, request_id))
+    )
+    with watching as watch:
+        if status_code == 202 and not payload.get("encrypted_progress"):
+            # Re-check once the watch is registered so nothing published since
+            # the view's first pass is missed.
+            payload, status_code = _api_v1_retrieve_response_once(client_public_key, request_id)
+        try:
+            while True:
+                if status_code == 200:
+                    yield _api_v1_sse_event("response", payload)
+                    outcome = "response"
+                    return
+                if status_code != 202:
+                    yield _api_v1_sse_event("terminal", payload)
+                    outcome = "terminal"
+                    return
+                progress = payload.get("encrypted_progress")
+                if progress:
+                    yield _api_v1_sse_event("progress", progress)
+                else:
+                    remaining = _api_v1_retrieve_resume_at(
+                        client_public_key,
+                        request_id,
+                        time.monotonic() + API_V1_RESPONSE_EVENTS_KEEPALIVE_SECONDS,
+                    ) - time.monotonic()
+                    if remaining > 0 and park is not None:
+                        park['notified'] = False
+                        park['deadline_monotonic'] = time.monotonic() + remaining
+                        park['parked'] = True
+                        yield ""
+                        if not park.get('notified'):
+                            yield ": keepalive\n\n"
+                    elif remaining > 0 and not watch.wait(remaining):
+                        # Comment frames keep proxies from idling the stream out.
+                        yield ": keepalive\n\n"
+                if DRAINING.is_set():
+                    outcome = "draining"
+                    return
+                payload, status_code = _api_v1_retrieve_response_once(client_public_key, request_id)
+        finally:
+            LOGGER.info(
+                "relay.api_v1.response_events_closed",
+                extra={
+                    "client_fingerprint": _safe_key_fingerprint(client_public_key),
+                    "events_outcome": outcome,
+                },
+            )
+
+
+def _api_v1_response_events_wait_key(data):
+    client_public_key = data.get('client_public_key')
+    request_id = data.get('request_id')
+    if not isinstance(client_public_key, str) or not client_public_key:
+        return None
+    if not isinstance(request_id, str) or not request_id:
+        return None
+    return client_public_key, request_id
+
+
+@app.route('/api/v1/relay/responses/events', methods=['POST'])
+def api_v1_relay_responses_events():
+    """Push encrypted progress and the final envelope for one request as SSE.
+
+    Emits ``progress`` events carrying each ``encrypted_progress`` envelope,
+    then a single ``response`` event with the encrypted response (or a
+    ``terminal`` event with the 410 error payload) and closes. Payloads are
+    exactly what ``responses/retrieve`` returns, so the stream stays
+    relay-blind ciphertext.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('client_public_key'), str) or not data['client_public_key']:
+        return jsonify({'error': {'message': 'Invalid request data', 'code': 400}}), 400
+    request_id = data.get('request_id')
+    if not isinstance(request_id, str) or not request_id:
+        return jsonify({'error': {'message': 'request_id is required', 'code': 400}}), 400
+
+    client_public_key = data['client_public_key']
+    first = _api_v1_retrieve_response_once(client_public_key, request_id)
+    if first[1] == 404:
+        return jsonify(first[0]), 404
+    return Response(
+        _api_v1_response_events(
+            client_public_key,
+            request_id,
+            first,
+            park=request.environ.get(API_V1_RESPONSE_EVENTS_PARK_ENVIRON),
+        ),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+def _api_v1_retrieve_resume_at(client_public_key, request_id, wait_until):
+    """Bound a parked retrieve by the request deadline so expiry surfaces as 410."""
+    deadline = _valid_request_deadline_monotonic(_pending_request_deadline(client_public_key, request_id))
+    if deadline is None:
+        return wait_until
+    # Wake just past the deadline so the next pass expires the request.
+    return min(wait_until, deadline + 0.001)
+
 
 @app.route('/faucet', methods=['POST'])
 def faucet():
@@ -3493,7 +4898,7 @@ def faucet():
     if not _legacy_routes_enabled():
         return _legacy_route_deprecated_response('/faucet')
 
-    _evict_stale_servers()
+    _reap_due()
     # Parse the request data
     data = request.get_json()
     if _payload_has_plaintext_fields(data):
@@ -3547,7 +4952,8 @@ def faucet():
             'iv': iv,  # Include the IV in the saved client's request
             'stream': stream_requested,
         })
-        client_inference_requests_changed.notify_all()
+        _notify_client_inference_request_waiters_locked(server_public_key)
+    _refresh_api_v1_scheduler_entry(server_public_key)
     return jsonify({'message': 'Request received'}), 200
 
 @app.route('/sink', methods=['POST'])
@@ -3567,7 +4973,7 @@ def sink():
     if not _legacy_routes_enabled():
         return _legacy_route_deprecated_response('/sink')
 
-    _evict_stale_servers()
+    _reap_due()
     auth_error = _validate_server_registration()
     if auth_error:
         return auth_error
@@ -3685,6 +5091,7 @@ def source():
             'cipherkey': encrypted_cipherkey,
             'iv': iv
         }
+    _notify_api_v1_response_waiters(client_public_key, None)
     return jsonify({'message': 'Response received and queued for client'}), 200
 
 
@@ -3803,9 +5210,11 @@ def serve(host: str, port: int) -> None:
         },
     )
 
+    stop_housekeeping = _start_relay_housekeeping()
     try:
         server.serve_forever()
     finally:
+        stop_housekeeping()
         if shutdown_thread is not None:
             shutdown_thread.join(timeout=1.0)
         ctx.pop()
@@ -3815,6 +5224,60 @@ def serve(host: str, port: int) -> None:
         )
 
 
+def create_asgi_app(*, max_workers: int | None = None):
+    """Build the event-loop serving app; long-polls park on per-key listeners."""
+
+    from relay_asgi import ParkedRoute, RelayAsgiApp
+
+    return RelayAsgiApp(
+        app,
+        parked_routes={
+            '/api/v1/relay/servers/poll': ParkedRoute(
+                environ_key=API_V1_POLL_PARK_ENVIRON,
+                wait_key=lambda data: data.get('server_public_key') if isinstance(data.get('server_public_key'), str) else None,
+                add_listener=client_inference_request_waiters.add_listener,
+                remove_listener=client_inference_request_waiters.remove_listener,
+            ),
+            '/api/v1/relay/responses/retrieve': ParkedRoute(
+                environ_key=API_V1_RETRIEVE_PARK_ENVIRON,
+                wait_key=_api_v1_retrieve_wait_key,
+                add_listener=api_v1_response_waiters.add_listener,
+                remove_listener=api_v1_response_waiters.remove_listener,
+            ),
+            '/api/v1/relay/responses/events': ParkedRoute(
+                environ_key=API_V1_RESPONSE_EVENTS_PARK_ENVIRON,
+                wait_key=_api_v1_response_events_wait_key,
+                add_listener=api_v1_response_waiters.add_listener,
+                remove_listener=api_v1_response_waiters.remove_listener,
+            ),
+        },
+        max_workers=max_workers,
+        on_shutdown=lambda: DRAINING.set(),
+    )
+
+
+def serve_asyncio(host: str, port: int) -> None:
+    """Run the relay routes from an asyncio event loop via uvicorn."""
+
+    from relay_asgi import run
+
+    LOGGER.info(
+        "relay.startup",
+        extra={
+            "host": host,
+            "port": port,
+            "upstream": app.config.get("upstream_url"),
+            "server_mode": "asyncio",
+        },
+    )
+    stop_housekeeping = _start_relay_housekeeping()
+    try:
+        run(create_asgi_app(), host=host, port=port)
+    finally:
+        stop_housekeeping()
+    LOGGER.info("relay.shutdown", extra={"requested": DRAINING.is_set()})
+
+
 def main(argv: list[str] | None = None) -> None:
     args = parse_cli_args(argv)
     host = os.environ.get("RELAY_HOST") or args.host
@@ -3826,7 +5289,11 @@ def main(argv: list[str] | None = None) -> None:
         port = args.port
 
     _configure_mock_mode(args.use_mock_llm)
-    serve(host, port)
+    server_mode = os.environ.get("RELAY_SERVER_MODE") or args.server_mode
+    if server_mode == "asyncio":
+        serve_asyncio(host, port)
+    else:
+        serve(host, port)
 
 
 if __name__ == '__main__':  # pragma: no cover
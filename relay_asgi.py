@@ -0,0 +1,330 @@
+"""Event-loop (ASGI) serving mode for the relay.
+
+``relay.serve()`` runs Werkzeug's threaded server, so every parked compute-node
+long-poll holds an OS thread for up to ``poll_wait_seconds``.  ``RelayAsgiApp``
+serves the same Flask application from an asyncio event loop instead: every
+request runs as a short pass on a bounded worker pool, so the JSON contract is
+whatever the Flask views already return.
+
+Routes registered as ``ParkedRoute`` hand their wait back to the event loop.
+The view reads a per-request dict from ``environ[route.environ_key]`` and, when
+it would otherwise block, records ``deadline_monotonic``, sets ``parked`` and
+returns immediately.  The loop then awaits an ``asyncio.Event`` that the relay
+signals through ``add_listener`` (or the shared deadline) and re-runs the view
+with ``notified`` set.  An idle long-poll therefore costs a coroutine and a
+socket, not a thread.  Streamed (SSE) responses on a parked route use the same
+dict between chunks: the generator parks and yields an empty chunk instead of
+blocking, so an idle stream does not pin a worker thread either.
+
+This module does not import ``relay``; ``relay.serve_asyncio`` wires it up so the
+relay's module-global state is shared even when it runs as ``__main__``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping
+
+ASGI_WORKER_THREADS_ENV = "TOKEN_PLACE_RELAY_ASGI_WORKER_THREADS"
+DEFAULT_ASGI_WORKER_THREADS = 32
+
+Listener = Callable[[], None]
+
+
+@dataclass(frozen=True, slots=True)
+class ParkedRoute:
+    """A POST route whose view can hand its wait back to the event loop."""
+
+    environ_key: str
+    wait_key: Callable[[dict[str, Any]], Any]
+    add_listener: Callable[[Any, Listener], None]
+    remove_listener: Callable[[Any, Listener], None]
+
+
+def asgi_worker_threads() -> int:
+    raw = os.environ.get(ASGI_WORKER_THREADS_ENV, str(DEFAULT_ASGI_WORKER_THREADS))
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return DEFAULT_ASGI_WORKER_THREADS
+    return max(value, 1)
+
+
+def _wsgi_environ(scope: Mapping[str, Any], body: bytes) -> dict[str, Any]:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    root_path = scope.get("root_path", "")
+    path = scope.get("path", "/")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": scope.get("method", "GET"),
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1] if server[1] is not None else 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": str(client[0]),
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _json_object(body: bytes) -> dict[str, Any]:
+    try:
+        data = json.loads(body or b"null")
+    except (TypeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class _WsgiResponse:
+    __slots__ = ("status", "headers", "body", "iterator")
+
+    def __init__(self, status: int, headers: list[tuple[bytes, bytes]]) -> None:
+        self.status = status
+        self.headers = headers
+        self.body: bytes | None = None
+        self.iterator: Any = None
+
+
+class RelayAsgiApp:
+    """ASGI 3 application serving a Flask/WSGI app with event-loop long-poll parking."""
+
+    def __init__(
+        self,
+        wsgi_app: Callable[..., Iterable[bytes]],
+        *,
+        parked_routes: Mapping[str, ParkedRoute] | None = None,
+        max_workers: int | None = None,
+        on_startup: Callable[[], None] | None = None,
+        on_shutdown: Callable[[], None] | None = None,
+    ) -> None:
+        self._wsgi_app = wsgi_app
+        self._parked_routes = dict(parked_routes or {})
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or asgi_worker_threads(),
+            thread_name_prefix="relay-asgi",
+        )
+        self._on_startup = on_startup
+        self._on_shutdown = on_shutdown
+        self.parked_requests = 0
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        route = self._parked_routes.get(scope.get("path", "")) if scope.get("method") == "POST" else None
+        if route is None:
+            response = await self._run_wsgi(_wsgi_environ(scope, body))
+        else:
+            await self._run_parked(route, scope, body, receive, send)
+            return
+        await self._send(response, send)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self._on_startup is not None:
+                    self._on_startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._on_shutdown is not None:
+                    self._on_shutdown()
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes | None:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    def _call_wsgi(self, environ: dict[str, Any]) -> _WsgiResponse:
+        captured: dict[str, Any] = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured["status"] = int(str(status).split(" ", 1)[0])
+            captured["headers"] = [
+                (name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in headers
+            ]
+            return lambda _data: None
+
+        result = self._wsgi_app(environ, start_response)
+        response = _WsgiResponse(captured["status"], captured["headers"])
+        # Buffered Flask responses carry Content-Length; anything else is a
+        # generator that may block between chunks, so it is drained lazily.
+        if any(name == b"content-length" for name, _value in response.headers):
+            try:
+                response.body = b"".join(result)
+            finally:
+                close = getattr(result, "close", None)
+                if close is not None:
+                    close()
+        else:
+            response.iterator = result
+        return response
+
+    async def _run_wsgi(self, environ: dict[str, Any]) -> _WsgiResponse:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call_wsgi, environ)
+
+    async def _run_parked(self, route: ParkedRoute, scope, body: bytes, receive, send) -> None:
+        wait_key = route.wait_key(_json_object(body))
+        if wait_key is None:
+            await self._send(await self._run_wsgi(_wsgi_environ(scope, body)), send)
+            return
+
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def _signal() -> None:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass
+
+        park: dict[str, Any] = {}
+        disconnect: list[asyncio.Future] = []
+        route.add_listener(wait_key, _signal)
+        try:
+            while True:
+                event.clear()
+                environ = _wsgi_environ(scope, body)
+                environ[route.environ_key] = park
+                response = await self._run_wsgi(environ)
+                if response.iterator is not None:
+                    await self._send(response, send, park=park, event=event, receive=receive, disconnect=disconnect)
+                    return
+                if not park.get("parked"):
+                    await self._send(response, send)
+                    return
+                if not await self._await_wakeup(park, event, receive, disconnect):
+                    return
+        finally:
+            route.remove_listener(wait_key, _signal)
+            if disconnect and not disconnect[0].done():
+                disconnect[0].cancel()
+
+    async def _await_wakeup(self, park: dict[str, Any], event: asyncio.Event, receive, disconnect: list) -> bool:
+        """Wait on the loop for a parked pass; ``False`` once the client disconnects."""
+
+        park["parked"] = False
+        remaining = float(park.get("deadline_monotonic", 0.0)) - time.monotonic()
+        if remaining <= 0:
+            park["notified"] = False
+            return True
+        if not disconnect:
+            disconnect.append(asyncio.ensure_future(receive()))
+        notified = asyncio.ensure_future(event.wait())
+        self.parked_requests += 1
+        try:
+            done, _pending = await asyncio.wait(
+                {notified, disconnect[0]},
+                timeout=remaining,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            self.parked_requests -= 1
+        if notified not in done:
+            notified.cancel()
+        if disconnect[0] in done and disconnect[0].result().get("type") == "http.disconnect":
+            return False
+        park["notified"] = notified in done
+        return True
+
+    async def _send(
+        self,
+        response: _WsgiResponse,
+        send,
+        *,
+        park: dict[str, Any] | None = None,
+        event: asyncio.Event | None = None,
+        receive=None,
+        disconnect: list | None = None,
+    ) -> None:
+        await send({"type": "http.response.start", "status": response.status, "headers": response.headers})
+        if response.iterator is None:
+            await send({"type": "http.response.body", "body": response.body or b""})
+            return
+        loop = asyncio.get_running_loop()
+        iterator = iter(response.iterator)
+        try:
+            while True:
+                if event is not None:
+                    event.clear()
+                chunk = await loop.run_in_executor(self._executor, next, iterator, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                if park is not None and park.get("parked"):
+                    if not await self._await_wakeup(park, event, receive, disconnect):
+                        return
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(response.iterator, "close", None)
+            if close is not None:
+                await loop.run_in_executor(self._executor, close)
+
+
+def run(asgi_app: RelayAsgiApp, *, host: str, port: int) -> None:
+    """Serve ``asgi_app`` with uvicorn, the relay's supported ASGI server."""
+
+    try:
+        import uvicorn
+    except ImportError as exc:  # pragma: no cover - depends on optional install
+        raise RuntimeError(
+            "The asyncio relay serving mode requires uvicorn; install config/requirements_relay.txt"
+        ) from exc
+
+    uvicorn.run(
+        asgi_app,
+        host=host,
+        port=port,
+        lifespan="on",
+        log_config=None,
+        access_log=False,
+        backlog=4096,
+    )
@@ -0,0 +1,171 @@
+"""Deadline-ordered housekeeping for relay state.
+
+Relay state that expires (node leases, in-flight accounting entries, pending
+requests, terminal records, control tombstones) is scheduled here by the code
+that creates or refreshes it.  ``DeadlineReaper.pop_due`` hands back only the
+entries whose deadline has passed, so housekeeping costs O(due · log n) instead
+of a walk over every record.
+
+Entries are revalidated by the caller's handler: the heap only says *when* to
+look at a key, never *what* to do, so a refreshed or already-removed item is
+simply rescheduled or dropped.  Rescheduling a key replaces its previous
+deadline; superseded heap entries are skipped lazily and compacted when they
+start to dominate the heap.
+
+This module does not import ``relay``; ``relay`` registers its handlers and
+starts :class:`ReaperThread` from its serving entrypoints.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+REAPER_INTERVAL_SECONDS_ENV = "TOKEN_PLACE_RELAY_REAPER_INTERVAL_SECONDS"
+DEFAULT_REAPER_INTERVAL_SECONDS = 1.0
+REAPER_FULL_SWEEP_SECONDS_ENV = "TOKEN_PLACE_RELAY_REAPER_FULL_SWEEP_SECONDS"
+DEFAULT_REAPER_FULL_SWEEP_SECONDS = 300.0
+_COMPACT_MIN_HEAP = 1024
+
+
+def _env_seconds(name: str, default: float) -> float:
+    raw = os.environ.get(name, str(default))
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    if value != value or value < 0:
+        return default
+    return value
+
+
+def reaper_interval_seconds() -> float:
+    return max(_env_seconds(REAPER_INTERVAL_SECONDS_ENV, DEFAULT_REAPER_INTERVAL_SECONDS), 0.05)
+
+
+def reaper_full_sweep_seconds() -> float:
+    return _env_seconds(REAPER_FULL_SWEEP_SECONDS_ENV, DEFAULT_REAPER_FULL_SWEEP_SECONDS)
+
+
+class DeadlineReaper:
+    """Min-heap of ``(deadline_monotonic, kind, key)`` with one live deadline per key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._heap: list[tuple[float, int, str, Hashable]] = []
+        self._deadlines: dict[tuple[str, Hashable], float] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._deadlines)
+
+    def schedule(self, kind: str, key: Hashable, deadline_monotonic: float, *, earliest: bool = False) -> None:
+        """Look at ``(kind, key)`` once ``deadline_monotonic`` has passed.
+
+        With ``earliest=True`` an already-scheduled earlier deadline is kept, so
+        callers that only know "no later than" cannot postpone a pending check.
+        """
+
+        deadline = float(deadline_monotonic)
+        with self._lock:
+            current = self._deadlines.get((kind, key))
+            if current == deadline or (earliest and current is not None and current <= deadline):
+                return
+            self._deadlines[(kind, key)] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._sequence), kind, key))
+            if len(self._heap) > max(2 * len(self._deadlines), _COMPACT_MIN_HEAP):
+                self._compact_locked()
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            self._deadlines.pop((kind, key), None)
+
+    def deadline(self, kind: str, key: Hashable) -> float | None:
+        with self._lock:
+            return self._deadlines.get((kind, key))
+
+    def next_deadline(self) -> float | None:
+        with self._lock:
+            self._drop_superseded_locked()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_monotonic: float | None = None, *, limit: int | None = None) -> list[tuple[str, Hashable]]:
+        """Remove and return every ``(kind, key)`` whose deadline is at or before ``now``."""
+
+        now = time.monotonic() if now_monotonic is None else now_monotonic
+        due: list[tuple[str, Hashable]] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                if limit is not None and len(due) >= limit:
+                    break
+                deadline, _sequence, kind, key = heapq.heappop(self._heap)
+                if self._deadlines.get((kind, key)) != deadline:
+                    continue
+                del self._deadlines[(kind, key)]
+                due.append((kind, key))
+        return due
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+            self._deadlines.clear()
+
+    def _drop_superseded_locked(self) -> None:
+        while self._heap:
+            deadline, _sequence, kind, key = self._heap[0]
+            if self._deadlines.get((kind, key)) == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def _compact_locked(self) -> None:
+        self._heap = [
+            (deadline, next(self._sequence), kind, key)
+            for (kind, key), deadline in self._deadlines.items()
+        ]
+        heapq.heapify(self._heap)
+
+
+class ReaperThread(threading.Thread):
+    """Daemon that runs due housekeeping, plus an occasional full sweep.
+
+    ``run_due`` is the cheap deadline-driven pass.  ``full_sweep`` is a safety
+    net for state that was never scheduled (e.g. restored or seeded directly);
+    a ``full_sweep_seconds`` of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        run_due: Callable[[], Any],
+        *,
+        full_sweep: Callable[[], Any] | None = None,
+        interval_seconds: float | None = None,
+        full_sweep_seconds: float | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        super().__init__(name="relay-reaper", daemon=True)
+        self._run_due = run_due
+        self._full_sweep = full_sweep
+        self._interval = reaper_interval_seconds() if interval_seconds is None else interval_seconds
+        self._full_sweep_seconds = reaper_full_sweep_seconds() if full_sweep_seconds is None else full_sweep_seconds
+        self._on_error = on_error
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        next_sweep = time.monotonic() + self._full_sweep_seconds
+        while not self._stopped.wait(self._interval):
+            try:
+                self._run_due()
+                if self._full_sweep is not None and self._full_sweep_seconds > 0 and time.monotonic() >= next_sweep:
+                    self._full_sweep()
+                    next_sweep = time.monotonic() + self._full_sweep_seconds
+            except Exception as exc:  # pragma: no cover - defensive logging path
+                if self._on_error is not None:
+                    self._on_error(exc)
@@ -0,0 +1,577 @@
+"""Crash-safe on-disk snapshots of relay coordination state.
+
+The relay keeps queued envelopes, node leases, pending/terminal records and
+retained responses in module dicts.  :class:`RelaySnapshotter` persists them to
+a local directory so a restart or rollout resumes with the same queues:
+
+``snapshot``
+    one framed record holding every table at generation ``G``.
+``journal-G``
+    framed change batches appended since that snapshot was written.
+
+A background thread diffs the registered tables every interval and appends one
+batch with the entries that changed or disappeared, then fsyncs.  Each frame is
+``<crc32 hex> <json>\\n``, so a batch torn by a crash fails its checksum and is
+dropped on restore together with everything after it.  When the journal
+outgrows the snapshot it is compacted: a ``G + 1`` snapshot is written to a
+temporary file, fsynced and renamed over ``snapshot``, and only then is
+``journal-G`` removed, so every crash point leaves a snapshot plus the journal
+of its own generation.
+
+Snapshots are periodic, not write-ahead: a crash loses at most the last
+interval of transitions, which clients observe as an expired or unknown
+request rather than as a duplicate.  ``time.monotonic`` readings are written
+as-is next to the writer's wall-minus-monotonic clock offset and moved onto the
+new process's clock on restore, so deadlines keep counting while the relay is
+down.
+
+This module does not import ``relay``; ``relay`` registers its tables and runs
+:meth:`RelaySnapshotter.restore` from its serving entrypoints before it accepts
+traffic.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import math
+import os
+import pickle
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterator, MutableMapping, Sequence
+
+LOGGER = logging.getLogger("relay.snapshot")
+
+SNAPSHOT_DIR_ENV = "TOKEN_PLACE_RELAY_SNAPSHOT_DIR"
+SNAPSHOT_INTERVAL_SECONDS_ENV = "TOKEN_PLACE_RELAY_SNAPSHOT_INTERVAL_SECONDS"
+DEFAULT_SNAPSHOT_INTERVAL_SECONDS = 1.0
+SNAPSHOT_COMPACT_BYTES_ENV = "TOKEN_PLACE_RELAY_SNAPSHOT_COMPACT_BYTES"
+DEFAULT_SNAPSHOT_COMPACT_BYTES = 4 * 1024 * 1024
+SNAPSHOT_FULL_SCAN_SECONDS_ENV = "TOKEN_PLACE_RELAY_SNAPSHOT_FULL_SCAN_SECONDS"
+DEFAULT_SNAPSHOT_FULL_SCAN_SECONDS = 60.0
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_FILENAME = "snapshot"
+_JOURNAL_PREFIX = "journal-"
+_MONOTONIC_SUFFIX = "_monotonic"
+
+
+class RelaySnapshotError(RuntimeError):
+    """Raised when a snapshot directory cannot be used."""
+
+
+def snapshot_directory() -> str | None:
+    """Return the configured snapshot directory, or ``None`` when disabled."""
+
+    value = os.environ.get(SNAPSHOT_DIR_ENV, "").strip()
+    return value or None
+
+
+def snapshot_interval_seconds() -> float:
+    raw = os.environ.get(SNAPSHOT_INTERVAL_SECONDS_ENV, str(DEFAULT_SNAPSHOT_INTERVAL_SECONDS))
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_SNAPSHOT_INTERVAL_SECONDS
+    if not math.isfinite(value) or value <= 0:
+        return DEFAULT_SNAPSHOT_INTERVAL_SECONDS
+    return max(value, 0.05)
+
+
+def snapshot_full_scan_seconds() -> float:
+    raw = os.environ.get(SNAPSHOT_FULL_SCAN_SECONDS_ENV, str(DEFAULT_SNAPSHOT_FULL_SCAN_SECONDS))
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_SNAPSHOT_FULL_SCAN_SECONDS
+    if not math.isfinite(value) or value <= 0:
+        return DEFAULT_SNAPSHOT_FULL_SCAN_SECONDS
+    return value
+
+
+def snapshot_compact_bytes() -> int:
+    raw = os.environ.get(SNAPSHOT_COMPACT_BYTES_ENV, str(DEFAULT_SNAPSHOT_COMPACT_BYTES))
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_SNAPSHOT_COMPACT_BYTES
+    return value if value > 0 else DEFAULT_SNAPSHOT_COMPACT_BYTES
+
+
+class JournaledDict(dict):
+    """``dict`` that remembers which keys may have changed since the last scan.
+
+    Relay code mutates nested values in place after a keyed lookup, so every
+    keyed access counts as a possible change; ``items``, ``values`` and
+    ``copy`` hand out every value and mark the whole table.  Scans then
+    re-encode only those keys instead of the whole table.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._touched: set[Any] = set()
+        self._all_touched = True
+
+    def take_touched(self) -> set[Any] | None:
+        """Return the keys touched since the last call, or ``None`` for all of them."""
+
+        touched, self._touched = self._touched, set()
+        if self._all_touched:
+            self._all_touched = False
+            return None
+        return touched
+
+    def _touch_all(self) -> None:
+        self._all_touched = True
+
+    def __getitem__(self, key: Any) -> Any:
+        self._touched.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self._touched.add(key)
+        return super().get(key, default)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self._touched.add(key)
+        return super().setdefault(key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._touched.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self._touched.add(key)
+        super().__delitem__(key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        self._touched.add(key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[Any, Any]:
+        self._touch_all()
+        return super().popitem()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._touch_all()
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self._touch_all()
+        super().clear()
+
+    def items(self):  # type: ignore[override]
+        self._touch_all()
+        return super().items()
+
+    def values(self):  # type: ignore[override]
+        self._touch_all()
+        return super().values()
+
+    def copy(self) -> dict[Any, Any]:
+        self._touch_all()
+        return dict(super().items())
+
+    def __ior__(self, other: Any) -> "JournaledDict":
+        self._touch_all()
+        return super().__ior__(other)
+
+
+@dataclass(frozen=True)
+class SnapshotTable:
+    """One relay mapping to persist.
+
+    ``source`` returns the live mapping; restore clears it and re-inserts every
+    entry through ``__setitem__`` so registries that index on insert rebuild
+    themselves.  ``locks`` are acquired in order around each scan, inside the
+    snapshotter's ``exclusive`` locks.  Numbers
+    under dict keys ending in ``_monotonic`` or listed in ``monotonic_fields``
+    are ``time.monotonic`` readings; ``monotonic_values`` marks every number
+    in the table as one.
+    """
+
+    name: str
+    source: Callable[[], MutableMapping[Any, Any]]
+    locks: tuple[Any, ...] = ()
+    monotonic_fields: frozenset[str] = frozenset()
+    monotonic_values: bool = False
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.timestamp()}
+    if isinstance(value, Sequence):
+        # List-like relay containers (e.g. per-node request queues) restore as lists.
+        return list(value)
+    raise TypeError(f"cannot snapshot {type(value).__name__}")
+
+
+# The C encoder keeps the per-interval scan cheap; tuples inside values come
+# back as lists, which the relay's payloads never distinguish.
+_VALUE_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_encode_default)
+
+
+def _encode_key(key: Any) -> str:
+    return _VALUE_ENCODER.encode({"$t": list(key)} if isinstance(key, tuple) else key)
+
+
+def _decode_key(value: Any) -> Any:
+    if isinstance(value, dict) and "$t" in value:
+        return tuple(value["$t"])
+    return value
+
+
+def _decode_value(value: Any, table: SnapshotTable, shift: float, monotonic: bool = False) -> Any:
+    """Rebuild datetimes and move monotonic readings onto this process's clock."""
+
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        if (monotonic or table.monotonic_values) and math.isfinite(value):
+            return float(value) + shift
+        return value
+    if isinstance(value, list):
+        return [_decode_value(item, table, shift) for item in value]
+    if "$dt" in value:
+        return datetime.fromtimestamp(float(value["$dt"]))
+    return {
+        key: _decode_value(item, table, shift, key.endswith(_MONOTONIC_SUFFIX) or key in table.monotonic_fields)
+        for key, item in value.items()
+    }
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _frame(body: str) -> bytes:
+    payload = body.encode("utf-8")
+    return b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+
+def _read_frames(path: str) -> Iterator[Any]:
+    """Yield each intact frame's record, stopping at the first torn one."""
+
+    with open(path, "rb") as handle:
+        for line in handle:
+            if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+                return
+            payload = line[9:-1]
+            try:
+                if int(line[:8], 16) != zlib.crc32(payload):
+                    return
+                record = json.loads(payload)
+            except ValueError:
+                return
+            yield record
+
+
+def _fsync_directory(directory: str) -> None:
+    with contextlib.suppress(OSError):
+        descriptor = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+class RelaySnapshotter:
+    """Journal relay tables to ``directory`` and restore them on startup."""
+
+    def __init__(
+        self,
+        directory: str,
+        tables: Sequence[SnapshotTable],
+        *,
+        exclusive: Sequence[Any] = (),
+        interval_seconds: float | None = None,
+        compact_bytes: int | None = None,
+        full_scan_seconds: float | None = None,
+    ) -> None:
+        names = [table.name for table in tables]
+        if len(set(names)) != len(names):
+            raise ValueError("snapshot table names must be unique")
+        self.directory = directory
+        self._tables = tuple(tables)
+        self._exclusive = tuple(exclusive)
+        self._interval = snapshot_interval_seconds() if interval_seconds is None else interval_seconds
+        self._compact_bytes = snapshot_compact_bytes() if compact_bytes is None else compact_bytes
+        self._full_scan_seconds = snapshot_full_scan_seconds() if full_scan_seconds is None else full_scan_seconds
+        self._next_full_scan = 0.0
+        # Wall clock minus monotonic clock, recorded with every snapshot so the
+        # next process can move monotonic deadlines onto its own clock.
+        self._clock_offset = time.time() - time.monotonic()
+        # Last persisted JSON of every entry, keyed by its encoded key.
+        self._persisted: dict[str, dict[str, str]] = {table.name: {} for table in self._tables}
+        self._generation = 0
+        self._snapshot_bytes = 0
+        self._journal: Any = None
+        self._journal_bytes = 0
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats = {"flushes": 0, "records": 0, "bytes": 0, "compactions": 0}
+
+    # -- restore ---------------------------------------------------------
+
+    def restore(self) -> int:
+        """Load the last snapshot plus its journal into the live tables.
+
+        Returns the number of restored entries and leaves a freshly compacted
+        snapshot behind, so journaling resumes from the restored state.
+        """
+
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        except OSError as exc:
+            raise RelaySnapshotError(f"cannot create snapshot directory {self.directory!r}: {exc}") from exc
+        state: dict[str, dict[str, Any]] = {table.name: {} for table in self._tables}
+        generation = 0
+        shift = 0.0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILENAME)
+        if os.path.exists(snapshot_path):
+            record = next(_read_frames(snapshot_path), None)
+            if not isinstance(record, dict) or record.get("format") != SNAPSHOT_FORMAT:
+                raise RelaySnapshotError(f"unreadable relay snapshot {snapshot_path!r}")
+            generation = int(record.get("generation", 0))
+            shift = float(record.get("clock_offset", self._clock_offset)) - self._clock_offset
+            for name, entries in (record.get("tables") or {}).items():
+                if name in state:
+                    state[name] = {_dumps(key): value for key, value in entries}
+        journal_path = self._journal_path(generation)
+        replayed = 0
+        if os.path.exists(journal_path):
+            for batch in _read_frames(journal_path):
+                for name, key, value in batch.get("set", ()):
+                    if name in state:
+                        state[name][_dumps(key)] = value
+                for name, key in batch.get("del", ()):
+                    if name in state:
+                        state[name].pop(_dumps(key), None)
+                replayed += 1
+
+        restored = 0
+        # Runs before traffic, so only the exclusive locks are taken: inserting
+        # into an indexing registry may itself need a table lock.
+        with self._exclusive_locks():
+            for table in self._tables:
+                mapping = table.source()
+                mapping.clear()
+                for key_json, value in state[table.name].items():
+                    mapping[_decode_key(json.loads(key_json))] = _decode_value(value, table, shift)
+                    restored += 1
+        self._generation = generation
+        self._remove_stale_files(keep=generation)
+        with self._flush_lock:
+            self._scan(full=True)
+            self._compact_locked()
+        LOGGER.info(
+            "relay.snapshot.restored",
+            extra={"entries": restored, "journal_batches": replayed, "generation": self._generation},
+        )
+        return restored
+
+    # -- journaling ------------------------------------------------------
+
+    def flush(self) -> int:
+        """Append the entries changed since the last flush; return how many."""
+
+        with self._flush_lock:
+            if self._journal is None:
+                raise RelaySnapshotError("restore() must run before flush()")
+            changed, removed = self._scan(full=time.monotonic() >= self._next_full_scan)
+            if not changed and not removed:
+                return 0
+            body = '{"set":[%s],"del":[%s]}' % (
+                ",".join(f"[{_dumps(name)},{key},{value}]" for name, key, value in changed),
+                ",".join(f"[{_dumps(name)},{key}]" for name, key in removed),
+            )
+            frame = _frame(body)
+            self._journal.write(frame)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal_bytes += len(frame)
+            records = len(changed) + len(removed)
+            self.stats["flushes"] += 1
+            self.stats["records"] += records
+            self.stats["bytes"] += len(frame)
+            if self._journal_bytes > max(self._compact_bytes, self._snapshot_bytes):
+                self._compact_locked()
+            return records
+
+    def compact(self) -> None:
+        with self._flush_lock:
+            self._scan(full=True)
+            self._compact_locked()
+
+    def _scan(self, *, full: bool) -> tuple[list[tuple[str, str, str]], list[tuple[str, str]]]:
+        """Diff the tables against the persisted encodings.
+
+        Only keys a :class:`JournaledDict` reports as touched are re-encoded;
+        ``full`` re-encodes everything, which also catches a nested value
+        mutated long after the lookup that handed it out.  Under the locks the
+        scan only pickles the entries it needs (several times cheaper than the
+        JSON encoding); encoding and diffing happen after the locks are
+        released, so dispatch and terminal transitions are not stalled by it.
+        """
+
+        if full:
+            self._next_full_scan = time.monotonic() + self._full_scan_seconds
+        captured: list[tuple[SnapshotTable, bool, list[tuple[Any, Any]], list[Any]]] = []
+        # The exclusive locks make one scan a consistent cut across tables.
+        with self._exclusive_locks():
+            for table in self._tables:
+                with self._table_locks(table):
+                    mapping = table.source()
+                    touched = mapping.take_touched() if isinstance(mapping, JournaledDict) else None
+                    rescan = full or touched is None
+                    if rescan:
+                        # ``dict.items`` so the scan itself does not mark the table.
+                        entries = [(key, self._capture(table, key, value)) for key, value in dict.items(mapping)]
+                        gone: list[Any] = []
+                    else:
+                        entries = []
+                        gone = []
+                        for key in touched:
+                            if dict.__contains__(mapping, key):
+                                entries.append((key, self._capture(table, key, dict.__getitem__(mapping, key))))
+                            else:
+                                gone.append(key)
+                captured.append((table, rescan, entries, gone))
+
+        changed: list[tuple[str, str, str]] = []
+        removed: list[tuple[str, str]] = []
+        for table, rescan, entries, gone in captured:
+            persisted = self._persisted[table.name]
+            live: dict[str, str] = {}
+            for key, frozen in entries:
+                encoded = self._encode(table, key, pickle.loads(frozen)) if isinstance(frozen, bytes) else frozen
+                if encoded is not None:
+                    live[encoded[0]] = encoded[1]
+            if rescan:
+                removed.extend((table.name, key_json) for key_json in persisted.keys() - live.keys())
+            for key in gone:
+                with contextlib.suppress(TypeError, ValueError):
+                    key_json = _encode_key(key)
+                    if persisted.pop(key_json, None) is not None:
+                        removed.append((table.name, key_json))
+            changed.extend(
+                (table.name, key_json, value_json)
+                for key_json, value_json in live.items()
+                if persisted.get(key_json) != value_json
+            )
+            if rescan:
+                self._persisted[table.name] = live
+            else:
+                persisted.update(live)
+        return changed, removed
+
+    @classmethod
+    def _capture(cls, table: SnapshotTable, key: Any, value: Any) -> Any:
+        """Freeze ``value`` under the table locks: pickled bytes, or the encoding itself."""
+
+        try:
+            return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return cls._encode(table, key, value)
+
+    @staticmethod
+    def _encode(table: SnapshotTable, key: Any, value: Any) -> tuple[str, str] | None:
+        try:
+            return _encode_key(key), _VALUE_ENCODER.encode(value)
+        except (TypeError, ValueError):
+            LOGGER.debug("relay.snapshot.entry_skipped", extra={"table": table.name})
+            return None
+
+    def _compact_locked(self) -> None:
+        generation = self._generation + 1
+        body = '{"format":%d,"generation":%d,"clock_offset":%r,"tables":{%s}}' % (
+            SNAPSHOT_FORMAT,
+            generation,
+            self._clock_offset,
+            ",".join(
+                f"{_dumps(name)}:[{','.join(f'[{key},{value}]' for key, value in entries.items())}]"
+                for name, entries in self._persisted.items()
+            ),
+        )
+        frame = _frame(body)
+        temporary = os.path.join(self.directory, SNAPSHOT_FILENAME + ".tmp")
+        with open(self._open_private(temporary), "wb") as handle:
+            handle.write(frame)
+            handle.flush()
+            os.fsync(handle.fileno())
+        journal = open(self._open_private(self._journal_path(generation)), "wb")
+        os.replace(temporary, os.path.join(self.directory, SNAPSHOT_FILENAME))
+        _fsync_directory(self.directory)
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = journal
+        self._journal_bytes = 0
+        self._snapshot_bytes = len(frame)
+        self._generation = generation
+        self._remove_stale_files(keep=generation)
+        self.stats["compactions"] += 1
+
+    # -- lifecycle -------------------------------------------------------
+
+    def start(self) -> "RelaySnapshotter":
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="relay-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread after a final flush."""
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self._interval * 2, 5.0))
+        try:
+            if self._journal is not None:
+                self.flush()
+        finally:
+            with self._flush_lock:
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:  # pragma: no cover - defensive logging path
+                LOGGER.exception("relay.snapshot.flush_failed")
+
+    # -- helpers ---------------------------------------------------------
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"{_JOURNAL_PREFIX}{generation}")
+
+    @staticmethod
+    def _open_private(path: str) -> int:
+        return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+    def _remove_stale_files(self, *, keep: int) -> None:
+        for name in os.listdir(self.directory):
+            if name.startswith(_JOURNAL_PREFIX) and name != f"{_JOURNAL_PREFIX}{keep}":
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.directory, name))
+
+    @contextlib.contextmanager
+    def _exclusive_locks(self) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            for lock in self._exclusive:
+                stack.enter_context(lock)
+            yield
+
+    @contextlib.contextmanager
+    def _table_locks(self, table: SnapshotTable) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            for lock in table.locks:
+                stack.enter_context(lock)
+            yield
@@ -1,7 +1,8 @@
 """Typed state-store boundary for relay coordination transitions.
 
 This module is deliberately not wired into the relay runtime yet.  It defines the
-memory-only contract that future shared backends must implement.
+contract and its process-local implementation; ``relay_state_store_sqlite``
+runs the same transitions against a SQLite database shared between processes.
 """
 
 from __future__ import annotations
@@ -19,6 +20,8 @@ from itertools import islice
 from dataclasses import dataclass, replace
 from typing import Callable, Protocol, runtime_checkable
 
+from relay_reaper import DeadlineReaper
+
 RELAY_STATE_SCHEMA_VERSION = 1
 CONTEXT_TIER_TOKEN_BOUNDS = {"8k-fast": 8192, "64k-full": 65536}
 ALLOWED_BACKEND_CLASSES = frozenset(
@@ -895,7 +898,11 @@ class InMemoryRelayStateStore:
         self._queued: dict[tuple[str, str], QueuedRequest] = {}
         self._queued_token_digests: dict[tuple[str, str], str] = {}
         self._cancellation_token_digests: dict[tuple[str, str], str] = {}
-        self._node_queues: dict[str, list[QueuedRequest]] = {}
+        # Per-node FIFO queues keyed by request identity: insertion order is
+        # enqueue (sequence) order and any entry can be removed in O(1).
+        self._node_queues: dict[
+            str, dict[tuple[str, str], QueuedRequest]
+        ] = {}
         self._claims: dict[tuple[str, str], ClaimRecord] = {}
         self._responses: dict[tuple[str, str], ResponseRecord] = {}
         self._terminals: dict[tuple[str, str], TerminalOutcomeRecord] = {}
@@ -911,6 +918,26 @@ class InMemoryRelayStateStore:
             str, dict[tuple[str, str], None]
         ] = {}
         self._deferred_deadline_identities: set[tuple[str, str]] = set()
+        # Expiry indexes, one per reaping phase.  A deadline is scheduled when
+        # its record is written and revalidated against the live record when
+        # it comes due, so reaping costs O(expired · log n) rather than a walk
+        # over every table.  Lease renewals and other in-place extensions are
+        # rescheduled lazily when their stale deadline is popped.
+        self._retained_expiry = DeadlineReaper()
+        self._request_deadlines = DeadlineReaper()
+        self._lease_expiry = DeadlineReaper()
+        self._reservation_expiry = DeadlineReaper()
+        # Exact counters for the bounds checked on every transition, and a
+        # (model, context tier) -> nodes index, so admission and selection do
+        # not recount the whole store.  Zero counts are removed.
+        self._client_reservation_counts: dict[str, int] = {}
+        self._client_queued_counts: dict[str, int] = {}
+        self._client_response_counts: dict[str, int] = {}
+        self._client_terminal_counts: dict[str, int] = {}
+        self._node_reservation_counts: dict[str, int] = {}
+        self._node_control_tombstone_counts: dict[str, int] = {}
+        self._fingerprint_counts: dict[str, int] = {}
+        self._capability_index: dict[tuple[str, str], dict[str, None]] = {}
         self._next_claim_generation = 0
         self._fairness_cursors: dict[str, tuple[str, int]] = {}
         self._fairness_activity = 0
@@ -966,10 +993,12 @@ class InMemoryRelayStateStore:
                 lease_expires_at_epoch=lease_deadline,
             )
             self._records[node_id] = record
+            self._index_capabilities_locked(node_id, existing, record)
+            self._lease_expiry.schedule("lease", node_id, lease_deadline)
             if existing is None:
                 self._scheduler_states[node_id] = SchedulerNodeState()
-                self._registration_order[node_id] = self._next_registration_order
                 self._next_registration_order += 1
+                self._registration_order[node_id] = self._next_registration_order - 1
             return replace(record)
 
     def renew(
@@ -999,6 +1028,7 @@ class InMemoryRelayStateStore:
                 lease_expires_at_epoch=lease_deadline,
             )
             self._records[node_id] = renewed
+            self._index_capabilities_locked(node_id, existing, renewed)
             return replace(renewed)
 
     def get(self, node_id: str) -> ComputeNodeRegistration | None:
@@ -1145,52 +1175,47 @@ class InMemoryRelayStateStore:
                 >= self.config.max_request_lifecycles
             ):
                 raise RelayStateNoCapacity("no scheduler capacity")
-            client_lifecycle_count = sum(
-                item.client_identity_digest == client_digest
-                for item in self._reservations.values()
-            ) + sum(
-                item.client_identity_digest == client_digest
-                for item in self._queued.values()
-            )
+            client_lifecycle_count = self._client_reservation_counts.get(
+                client_digest, 0
+            ) + self._client_queued_counts.get(client_digest, 0)
             if client_lifecycle_count >= self.config.max_reservations_per_client:
                 raise RelayStateNoCapacity("no scheduler capacity")
 
             eligible: list[tuple[int, int, int, str]] = []
             requested_tokens = CONTEXT_TIER_TOKEN_BOUNDS[tier]
-            reservation_counts: dict[str, int] = {}
-            for reservation in self._reservations.values():
-                node_id = reservation.selected_node_id
-                reservation_counts[node_id] = reservation_counts.get(node_id, 0) + 1
-            for node_id, record in self._records.items():
-                caps = record.capabilities
-                state = self._scheduler_states[node_id]
-                if (
-                    model_id not in caps.supported_model_ids
-                    or CONTEXT_TIER_TOKEN_BOUNDS[caps.active_context_tier]
-                    < requested_tokens
-                    or caps.maximum_total_context_tokens < requested_tokens
-                    or not state.healthy
-                    or state.draining
-                ):
-                    continue
-                reservations = reservation_counts.get(node_id, 0)
-                queued_count = len(self._node_queues.get(node_id, ()))
-                load = reservations + queued_count + state.claimed_work
-                if (
-                    load >= caps.max_concurrency
-                    or reservations >= self.config.max_reservations_per_node
-                    or reservations + queued_count
-                    >= self.config.max_queue_depth_per_node
-                ):
-                    continue
-                tier_size = CONTEXT_TIER_TOKEN_BOUNDS[caps.active_context_tier]
-                eligible.append(
-                    (tier_size, load, self._registration_order[node_id], node_id)
-                )
+            # The smallest sufficient tier wins outright, so only the first
+            # tier bucket with an eligible node is ever examined.
+            for tier_size, node_tier in sorted(
+                (size, name)
+                for name, size in CONTEXT_TIER_TOKEN_BOUNDS.items()
+                if size >= requested_tokens
+            ):
+                for node_id in self._capability_index.get((model_id, node_tier), ()):
+                    caps = self._records[node_id].capabilities
+                    state = self._scheduler_states[node_id]
+                    if (
+                        caps.maximum_total_context_tokens < requested_tokens
+                        or not state.healthy
+                        or state.draining
+                    ):
+                        continue
+                    reservations = self._node_reservation_counts.get(node_id, 0)
+                    queued_count = len(self._node_queues.get(node_id, ()))
+                    load = reservations + queued_count + state.claimed_work
+                    if (
+                        load >= caps.max_concurrency
+                        or reservations >= self.config.max_reservations_per_node
+                        or reservations + queued_count
+                        >= self.config.max_queue_depth_per_node
+                    ):
+                        continue
+                    eligible.append(
+                        (tier_size, load, self._registration_order[node_id], node_id)
+                    )
+                if eligible:
+                    break
             if not eligible:
                 raise RelayStateNoCapacity("no scheduler capacity")
-            smallest_tier = min(item[0] for item in eligible)
-            eligible = [item for item in eligible if item[0] == smallest_tier]
             least_load = min(item[1] for item in eligible)
             tied = sorted(
                 (item for item in eligible if item[1] == least_load), key=lambda x: x[2]
@@ -1222,7 +1247,9 @@ class InMemoryRelayStateStore:
             )
             if evicted_fingerprint is not None:
                 del self._fairness_cursors[evicted_fingerprint]
-            self._reservations[identity] = record
+            self._add_reservation_locked(identity, record)
+            self._request_deadlines.schedule("request", identity, deadline)
+            self._reservation_expiry.schedule("reservation", identity, expires)
             self._node_work_identities.setdefault(node_id, {})[identity] = None
             if cancellation_digest is not None:
                 self._cancellation_token_digests[identity] = cancellation_digest
@@ -1318,10 +1345,7 @@ class InMemoryRelayStateStore:
                 >= self.config.max_queue_depth_per_node
             ):
                 raise RelayStateNoCapacity("no scheduler capacity")
-            queued_for_client = sum(
-                item.client_identity_digest == client_digest
-                for item in self._queued.values()
-            )
+            queued_for_client = self._client_queued_counts.get(client_digest, 0)
             if (
                 len(self._queued) >= self.config.max_queued_requests
                 or queued_for_client >= self.config.max_queued_requests_per_client
@@ -1341,11 +1365,12 @@ class InMemoryRelayStateStore:
                 now,
                 self._next_queue_sequence,
             )
-            self._queued[identity] = queued
+            self._pop_reservation_locked(identity)
+            self._add_queued_locked(identity, queued)
             self._queued_token_digests[identity] = token_digest
             self._cancellation_token_digests[identity] = cancellation_digest
-            self._node_queues.setdefault(selected_node_id, []).append(queued)
-            del self._reservations[identity]
+            self._node_queues.setdefault(selected_node_id, {})[identity] = queued
+            self._reservation_expiry.discard("reservation", identity)
             return self._enqueue_result(queued, True)
 
     def list_reservations(self) -> tuple[ReservationRecord, ...]:
@@ -1365,7 +1390,7 @@ class InMemoryRelayStateStore:
             self._reap_locked(now)
             return tuple(
                 replace(record)
-                for record in self._node_queues.get(node_id, ())
+                for record in self._node_queues.get(node_id, {}).values()
                 if record.request_deadline_epoch > now
                 if (
                     (
@@ -1397,27 +1422,25 @@ class InMemoryRelayStateStore:
             if registration is None:
                 raise RelayStateCredentialMismatch("claim owner is invalid")
             self._require_digest(registration, control_credential_digest)
-            active_claims = tuple(
-                claim
-                for claim in self._claims.values()
-                if claim.lease_expires_at_epoch > now
-            )
-            node_claims = sum(
-                claim.selected_node_id == node_id for claim in active_claims
-            )
-            for queued in self._node_queues.get(node_id, ()):
-                identity = (
-                    queued.client_identity_digest,
-                    queued.request_identity_digest,
-                )
+            node_queue = self._node_queues.get(node_id, {})
+            # Entries ahead of the first claimable one hold live claims, so the
+            # scan is bounded by the node's in-flight work, not its queue depth.
+            for identity, queued in node_queue.items():
                 if queued.request_deadline_epoch <= now:
                     continue
                 existing = self._claims.get(identity)
                 if existing is not None and existing.lease_expires_at_epoch > now:
                     continue
+                # Every claim belongs to an entry of its node's queue, so the
+                # node's claims are counted there; the whole claim table is
+                # only walked once it could be at capacity.
+                node_claims = sum(
+                    claim is not None and claim.lease_expires_at_epoch > now
+                    for claim in map(self._claims.get, node_queue)
+                )
                 if (
-                    len(active_claims) >= self.config.max_claims
-                    or node_claims >= self.config.max_claims_per_node
+                    node_claims >= self.config.max_claims_per_node
+                    or self._claims_at_capacity_locked(now)
                 ):
                     raise RelayStateCapacityExceeded("claim capacity reached")
                 self._next_claim_generation += 1
@@ -1636,16 +1659,10 @@ class InMemoryRelayStateStore:
             client_digest = identity[0]
             if (
                 len(self._responses) >= self.config.max_responses
-                or sum(
-                    item.client_identity_digest == client_digest
-                    for item in self._responses.values()
-                )
+                or self._client_response_counts.get(client_digest, 0)
                 >= self.config.max_responses_per_client
                 or len(self._terminals) >= self.config.max_terminal_records
-                or sum(
-                    item.client_identity_digest == client_digest
-                    for item in self._terminals.values()
-                )
+                or self._client_terminal_counts.get(client_digest, 0)
                 >= self.config.max_terminal_records_per_client
             ):
                 raise RelayStateCapacityExceeded("response lifecycle capacity reached")
@@ -1683,9 +1700,12 @@ class InMemoryRelayStateStore:
                 ),
                 cancellation_token_digest=self._cancellation_token_digests[identity],
             )
-            self._responses[identity] = response
-            self._terminals[identity] = terminal
+            self._add_response_locked(identity, response)
+            self._add_terminal_locked(identity, terminal)
+            self._retained_expiry.schedule("response", identity, replay_expires)
+            self._retained_expiry.schedule("terminal", identity, terminal_expires)
             self._remove_queued_identity_locked(identity, queued)
+            self._request_deadlines.discard("request", identity)
             return self._response_result(response, True)
 
     def retrieve_encrypted_response(
@@ -1747,7 +1767,8 @@ class InMemoryRelayStateStore:
                 )
             ):
                 return ResponseRetrievalResult("invalid_acknowledgement")
-            del self._responses[identity]
+            self._pop_response_locked(identity)
+            self._retained_expiry.discard("response", identity)
             self._terminals[identity] = replace(
                 terminal, retrieval_state="acknowledged"
             )
@@ -1854,17 +1875,13 @@ class InMemoryRelayStateStore:
             tombstone_claim = claim
         if (
             len(self._terminals) >= self.config.max_terminal_records
-            or sum(
-                t.client_identity_digest == identity[0]
-                for t in self._terminals.values()
-            )
+            or self._client_terminal_counts.get(identity[0], 0)
             >= self.config.max_terminal_records_per_client
         ):
             raise RelayStateCapacityExceeded("terminal lifecycle capacity reached")
         if tombstone_claim is not None:
-            node_count = sum(
-                t.selected_node_id == tombstone_claim.selected_node_id
-                for t in self._control_tombstones.values()
+            node_count = self._node_control_tombstone_counts.get(
+                tombstone_claim.selected_node_id, 0
             )
             if (
                 len(self._control_tombstones) >= self.config.max_control_tombstones
@@ -1904,10 +1921,18 @@ class InMemoryRelayStateStore:
                 False,
                 min(now + self.config.control_tombstone_ttl_seconds, now + 300.0),
             )
-        self._terminals[identity] = terminal
+        self._add_terminal_locked(identity, terminal)
+        self._retained_expiry.schedule(
+            "terminal", identity, terminal.expires_at_epoch
+        )
         if tombstone is not None:
-            self._control_tombstones[identity] = tombstone
-        reservation = self._reservations.pop(identity, None)
+            self._add_control_tombstone_locked(identity, tombstone)
+            self._retained_expiry.schedule(
+                "control_tombstone", identity, tombstone.expires_at_epoch
+            )
+        self._request_deadlines.discard("request", identity)
+        self._reservation_expiry.discard("reservation", identity)
+        self._pop_reservation_locked(identity)
         queued = self._queued.get(identity)
         if queued is not None:
             self._remove_queued_identity_locked(identity, queued)
@@ -2025,6 +2050,8 @@ class InMemoryRelayStateStore:
             )
             # Eligibility is removed before any work batch is attempted.
             del self._records[node_id]
+            self._index_capabilities_locked(node_id, record, None)
+            self._lease_expiry.discard("lease", node_id)
             self._scheduler_states.pop(node_id, None)
             self._registration_order.pop(node_id, None)
             for fingerprint, cursor in tuple(self._fairness_cursors.items()):
@@ -2037,7 +2064,10 @@ class InMemoryRelayStateStore:
                     owner_key, cause, status, now, fence_expiry
                 )
             )
-            self._node_tombstones[node_digest] = NodeTombstoneRecord(
+            self._retained_expiry.schedule(
+                "former_authority", (node_digest, owner_key), fence_expiry
+            )
+            node_tombstone = NodeTombstoneRecord(
                 node_digest,
                 record.control_credential_digest,
                 cause,
@@ -2046,6 +2076,10 @@ class InMemoryRelayStateStore:
                 not self._node_work_identities.get(node_id),
                 min(now + self.config.node_tombstone_ttl_seconds, now + 300.0),
             )
+            self._node_tombstones[node_digest] = node_tombstone
+            self._retained_expiry.schedule(
+                "node_tombstone", node_digest, node_tombstone.expires_at_epoch
+            )
         else:
             if cause != pending.cause:
                 raise RelayStateConflict("node transition cause conflicts")
@@ -2106,6 +2140,11 @@ class InMemoryRelayStateStore:
                 owner_fences[pending.control_credential_digest],
                 expires_at_epoch=fence_expiry,
             )
+            self._retained_expiry.schedule(
+                "former_authority",
+                (pending.node_identity_digest, pending.control_credential_digest),
+                fence_expiry,
+            )
             self._pending_node_transitions.pop(node_id, None)
             tombstone = self._node_tombstones.get(pending.node_identity_digest)
             if tombstone is not None:
@@ -2130,18 +2169,31 @@ class InMemoryRelayStateStore:
         # Lease eviction consumes retained transition capacity, so reclaim
         # expired entries before attempting any new transition.
         self._reap_retained_locked(now)
-        expired = sorted(
-            (
-                record
-                for record in self._records.values()
-                if record.lease_expires_at_epoch <= now
-            ),
-            key=lambda record: record.node_id,
-        )
-        for record in expired:
-            self._transition_node_locked(
-                record.node_id, None, "registration_lease_expired", now
-            )
+        expired: list[ComputeNodeRegistration] = []
+        for _kind, node_id in self._lease_expiry.pop_due(now):
+            record = self._records.get(node_id)
+            if record is None:
+                continue
+            if record.lease_expires_at_epoch > now:
+                self._lease_expiry.schedule(
+                    "lease", node_id, record.lease_expires_at_epoch
+                )
+                continue
+            expired.append(record)
+        expired.sort(key=lambda record: record.node_id)
+        for index, record in enumerate(expired):
+            try:
+                self._transition_node_locked(
+                    record.node_id, None, "registration_lease_expired", now
+                )
+            except RelayStateStoreError:
+                # The popped leases are still due; keep them indexed so the
+                # next sweep retries them once capacity is reclaimed.
+                for remaining in expired[index:]:
+                    self._lease_expiry.schedule(
+                        "lease", remaining.node_id, remaining.lease_expires_at_epoch
+                    )
+                raise
         # One already-started transition is advanced per sweep.  It uses the
         # identical operation and batch bound; there is no weaker cleanup path.
         continuation = (
@@ -2173,79 +2225,244 @@ class InMemoryRelayStateStore:
 
         # Absolute request deadlines are lifecycle authority and must win a CAS
         # before ordinary node/short-reservation housekeeping deletes state.
-        due = [
-            (identity, record)
-            for identity, record in tuple(self._reservations.items())
-            if record.request_deadline_epoch <= now
-        ]
-        due.extend(
-            (identity, record)
-            for identity, record in tuple(self._queued.items())
-            if record.request_deadline_epoch <= now
+        # Capacity-deferred lifecycles stay due until a transition succeeds.
+        due = dict.fromkeys(
+            identity for _kind, identity in self._request_deadlines.pop_due(now)
         )
-        for identity, record in due:
-            if identity not in self._terminals and (
-                identity in self._reservations or identity in self._queued
-            ):
-                try:
-                    self._terminalize_locked(
-                        identity, record, "expired", "request_deadline_expired", now
-                    )
-                except RelayStateCapacityExceeded:
-                    # Keep the complete lifecycle for a later authoritative
-                    # transition, but do not let one capacity-bound identity
-                    # prevent reaping or unrelated store operations.
-                    self._deferred_deadline_identities.add(identity)
+        due.update(dict.fromkeys(sorted(self._deferred_deadline_identities)))
+        for identity in due:
+            if identity in self._terminals:
+                continue
+            record = self._reservations.get(identity) or self._queued.get(identity)
+            if record is None:
+                continue
+            if record.request_deadline_epoch > now:
+                self._request_deadlines.schedule(
+                    "request", identity, record.request_deadline_epoch
+                )
+                continue
+            try:
+                self._terminalize_locked(
+                    identity, record, "expired", "request_deadline_expired", now
+                )
+            except RelayStateCapacityExceeded:
+                # Keep the complete lifecycle for a later authoritative
+                # transition, but do not let one capacity-bound identity
+                # prevent reaping or unrelated store operations.
+                self._deferred_deadline_identities.add(identity)
         self._expire_locked(now)
-        for identity, reservation in tuple(self._reservations.items()):
-            if (
-                reservation.reservation_expires_at_epoch <= now
-                and identity not in self._deferred_deadline_identities
-            ):
-                del self._reservations[identity]
-                self._cancellation_token_digests.pop(identity, None)
-                self._discard_node_work_identity_locked(
-                    reservation.selected_node_id, identity
+        for _kind, identity in self._reservation_expiry.pop_due(now):
+            reservation = self._reservations.get(identity)
+            # A deferred reservation is removed by its terminal transition.
+            if reservation is None or identity in self._deferred_deadline_identities:
+                continue
+            if reservation.reservation_expires_at_epoch > now:
+                self._reservation_expiry.schedule(
+                    "reservation", identity, reservation.reservation_expires_at_epoch
                 )
+                continue
+            self._pop_reservation_locked(identity)
+            self._request_deadlines.discard("request", identity)
+            self._cancellation_token_digests.pop(identity, None)
+            self._discard_node_work_identity_locked(
+                reservation.selected_node_id, identity
+            )
 
     def _reap_retained_locked(self, now: float) -> None:
-        for identity, response in tuple(self._responses.items()):
-            if response.replay_expires_at_epoch <= now:
-                del self._responses[identity]
-                terminal = self._terminals.get(identity)
+        tables = {
+            "terminal": self._terminals,
+            "control_tombstone": self._control_tombstones,
+            "node_tombstone": self._node_tombstones,
+        }
+        removers = {
+            "terminal": self._pop_terminal_locked,
+            "control_tombstone": self._pop_control_tombstone_locked,
+            "node_tombstone": self._node_tombstones.pop,
+        }
+        pending_authorities: dict[str, str] | None = None
+        for kind, key in self._retained_expiry.pop_due(now):
+            if kind == "response":
+                response = self._responses.get(key)
+                if response is None:
+                    continue
+                if response.replay_expires_at_epoch > now:
+                    self._retained_expiry.schedule(
+                        kind, key, response.replay_expires_at_epoch
+                    )
+                    continue
+                self._pop_response_locked(key)
+                terminal = self._terminals.get(key)
                 if (
                     terminal is not None
                     and terminal.retrieval_state == "response_ready"
                 ):
-                    self._terminals[identity] = replace(
+                    self._terminals[key] = replace(
                         terminal, retrieval_state="retrieval_expired"
                     )
-        for identity, terminal in tuple(self._terminals.items()):
-            if terminal.expires_at_epoch <= now:
-                del self._terminals[identity]
-        for identity, tombstone in tuple(self._control_tombstones.items()):
-            if tombstone.expires_at_epoch <= now:
-                del self._control_tombstones[identity]
-        for node_digest, tombstone in tuple(self._node_tombstones.items()):
-            if tombstone.expires_at_epoch <= now:
-                del self._node_tombstones[node_digest]
-        pending_authorities = {
-            transition.node_identity_digest: transition.control_credential_digest
-            for transition in self._pending_node_transitions.values()
-        }
-        for node_digest, authorities in tuple(
-            self._former_node_authorities.items()
+            elif kind == "former_authority":
+                node_digest, owner_digest = key
+                authorities = self._former_node_authorities.get(node_digest)
+                authority = authorities.get(owner_digest) if authorities else None
+                if authority is None:
+                    continue
+                if authority.expires_at_epoch > now:
+                    self._retained_expiry.schedule(
+                        kind, key, authority.expires_at_epoch
+                    )
+                    continue
+                if pending_authorities is None:
+                    pending_authorities = {
+                        transition.node_identity_digest: (
+                            transition.control_credential_digest
+                        )
+                        for transition in self._pending_node_transitions.values()
+                    }
+                pending_owner_digest = pending_authorities.get(node_digest)
+                if pending_owner_digest is not None and hmac.compare_digest(
+                    pending_owner_digest, owner_digest
+                ):
+                    # Completing the transition refreshes and reschedules it.
+                    continue
+                del authorities[owner_digest]
+                if not authorities:
+                    del self._former_node_authorities[node_digest]
+            else:
+                table = tables[kind]
+                record = table.get(key)
+                if record is None:
+                    continue
+                if record.expires_at_epoch > now:
+                    self._retained_expiry.schedule(
+                        kind, key, record.expires_at_epoch
+                    )
+                    continue
+                removers[kind](key)
+
+    @staticmethod
+    def _adjust_count(counts: dict[str, int], key: str, delta: int) -> None:
+        count = counts.get(key, 0) + delta
+        if count:
+            counts[key] = count
+        else:
+            counts.pop(key, None)
+
+    def _index_capabilities_locked(
+        self,
+        node_id: str,
+        previous: ComputeNodeRegistration | None,
+        current: ComputeNodeRegistration | None,
+    ) -> None:
+        if (
+            previous is not None
+            and current is not None
+            and previous.capabilities == current.capabilities
         ):
-            pending_owner_digest = pending_authorities.get(node_digest)
-            for owner_digest, authority in tuple(authorities.items()):
-                reserved_by_pending = (
-                    pending_owner_digest is not None
-                    and hmac.compare_digest(pending_owner_digest, owner_digest)
-                )
-                if authority.expires_at_epoch <= now and not reserved_by_pending:
-                    del authorities[owner_digest]
-            if not authorities:
-                del self._former_node_authorities[node_digest]
+            return
+        if previous is not None:
+            caps = previous.capabilities
+            for model_id in caps.supported_model_ids:
+                key = (model_id, caps.active_context_tier)
+                nodes = self._capability_index.get(key)
+                if nodes is not None:
+                    nodes.pop(node_id, None)
+                    if not nodes:
+                        del self._capability_index[key]
+        if current is not None:
+            caps = current.capabilities
+            for model_id in caps.supported_model_ids:
+                self._capability_index.setdefault(
+                    (model_id, caps.active_context_tier), {}
+                )[node_id] = None
+
+    def _add_reservation_locked(
+        self, identity: tuple[str, str], record: ReservationRecord
+    ) -> None:
+        self._reservations[identity] = record
+        self._adjust_count(self._client_reservation_counts, identity[0], 1)
+        self._adjust_count(self._node_reservation_counts, record.selected_node_id, 1)
+        self._adjust_count(self._fingerprint_counts, record.scheduler_fingerprint, 1)
+
+    def _pop_reservation_locked(
+        self, identity: tuple[str, str]
+    ) -> ReservationRecord | None:
+        record = self._reservations.pop(identity, None)
+        if record is not None:
+            self._adjust_count(self._client_reservation_counts, identity[0], -1)
+            self._adjust_count(
+                self._node_reservation_counts, record.selected_node_id, -1
+            )
+            self._adjust_count(
+                self._fingerprint_counts, record.scheduler_fingerprint, -1
+            )
+        return record
+
+    def _add_queued_locked(
+        self, identity: tuple[str, str], queued: QueuedRequest
+    ) -> None:
+        self._queued[identity] = queued
+        self._adjust_count(self._client_queued_counts, identity[0], 1)
+        self._adjust_count(
+            self._fingerprint_counts,
+            self._scheduler_fingerprint(
+                queued.requested_model_id, queued.requested_context_tier
+            ),
+            1,
+        )
+
+    def _pop_queued_locked(self, identity: tuple[str, str]) -> QueuedRequest | None:
+        queued = self._queued.pop(identity, None)
+        if queued is not None:
+            self._adjust_count(self._client_queued_counts, identity[0], -1)
+            self._adjust_count(
+                self._fingerprint_counts,
+                self._scheduler_fingerprint(
+                    queued.requested_model_id, queued.requested_context_tier
+                ),
+                -1,
+            )
+        return queued
+
+    def _add_response_locked(
+        self, identity: tuple[str, str], response: ResponseRecord
+    ) -> None:
+        if identity not in self._responses:
+            self._adjust_count(self._client_response_counts, identity[0], 1)
+        self._responses[identity] = response
+
+    def _pop_response_locked(self, identity: tuple[str, str]) -> None:
+        if self._responses.pop(identity, None) is not None:
+            self._adjust_count(self._client_response_counts, identity[0], -1)
+
+    def _add_terminal_locked(
+        self, identity: tuple[str, str], terminal: TerminalOutcomeRecord
+    ) -> None:
+        if identity not in self._terminals:
+            self._adjust_count(self._client_terminal_counts, identity[0], 1)
+        self._terminals[identity] = terminal
+
+    def _pop_terminal_locked(self, identity: tuple[str, str]) -> None:
+        if self._terminals.pop(identity, None) is not None:
+            self._adjust_count(self._client_terminal_counts, identity[0], -1)
+
+    def _add_control_tombstone_locked(
+        self, identity: tuple[str, str], tombstone: ControlTombstoneRecord
+    ) -> None:
+        previous = self._control_tombstones.get(identity)
+        if previous is not None:
+            self._adjust_count(
+                self._node_control_tombstone_counts, previous.selected_node_id, -1
+            )
+        self._control_tombstones[identity] = tombstone
+        self._adjust_count(
+            self._node_control_tombstone_counts, tombstone.selected_node_id, 1
+        )
+
+    def _pop_control_tombstone_locked(self, identity: tuple[str, str]) -> None:
+        tombstone = self._control_tombstones.pop(identity, None)
+        if tombstone is not None:
+            self._adjust_count(
+                self._node_control_tombstone_counts, tombstone.selected_node_id, -1
+            )
 
     def _discard_node_work_identity_locked(
         self, node_id: str, identity: tuple[str, str]
@@ -2260,15 +2477,14 @@ class InMemoryRelayStateStore:
     def _remove_queued_identity_locked(
         self, identity: tuple[str, str], queued: QueuedRequest
     ) -> None:
-        self._queued.pop(identity, None)
+        self._pop_queued_locked(identity)
         self._queued_token_digests.pop(identity, None)
         self._cancellation_token_digests.pop(identity, None)
-        queue = self._node_queues.get(queued.selected_node_id, [])
-        remaining = [item for item in queue if item != queued]
-        if remaining:
-            self._node_queues[queued.selected_node_id] = remaining
-        else:
-            self._node_queues.pop(queued.selected_node_id, None)
+        queue = self._node_queues.get(queued.selected_node_id)
+        if queue is not None:
+            queue.pop(identity, None)
+            if not queue:
+                del self._node_queues[queued.selected_node_id]
         self._claims.pop(identity, None)
         self._discard_node_work_identity_locked(queued.selected_node_id, identity)
 
@@ -2277,44 +2493,38 @@ class InMemoryRelayStateStore:
             if reservation.selected_node_id == node_id:
                 if identity in self._deferred_deadline_identities:
                     continue
-                del self._reservations[identity]
+                self._pop_reservation_locked(identity)
                 self._cancellation_token_digests.pop(identity, None)
                 self._discard_node_work_identity_locked(node_id, identity)
 
     def _remove_node_queue_locked(self, node_id: str) -> None:
-        for queued in self._node_queues.pop(node_id, ()):
-            identity = (
-                queued.client_identity_digest,
-                queued.request_identity_digest,
-            )
+        queue = self._node_queues.get(node_id, {})
+        for identity in tuple(queue):
             if identity in self._deferred_deadline_identities:
-                self._node_queues.setdefault(node_id, []).append(queued)
                 continue
-            self._queued.pop(identity, None)
+            del queue[identity]
+            self._pop_queued_locked(identity)
             self._queued_token_digests.pop(identity, None)
             self._cancellation_token_digests.pop(identity, None)
             self._claims.pop(identity, None)
             self._discard_node_work_identity_locked(node_id, identity)
-
-    def _active_fairness_fingerprints_locked(self) -> set[str]:
-        active_fingerprints = {
-            reservation.scheduler_fingerprint
-            for reservation in self._reservations.values()
-        }
-        active_fingerprints.update(
-            self._scheduler_fingerprint(
-                queued.requested_model_id, queued.requested_context_tier
-            )
-            for queued in self._queued.values()
+        if not queue:
+            self._node_queues.pop(node_id, None)
+
+    def _claims_at_capacity_locked(self, now: float) -> bool:
+        if len(self._claims) < self.config.max_claims:
+            return False
+        active = sum(
+            claim.lease_expires_at_epoch > now for claim in self._claims.values()
         )
-        return active_fingerprints
+        return active >= self.config.max_claims
 
     def _cursor_eviction_candidate_locked(self, fingerprint: str) -> str | None:
         if fingerprint in self._fairness_cursors:
             return None
         if len(self._fairness_cursors) < self.config.max_scheduler_fingerprints:
             return None
-        active = self._active_fairness_fingerprints_locked()
+        active = self._fingerprint_counts
         candidate = min(
             (
                 (activity, existing_fingerprint)
@@ -0,0 +1,1236 @@
+"""Redis-protocol implementation of the relay state-store contract.
+
+``RedisRelayStateStore`` runs the identical transition code as
+``InMemoryRelayStateStore`` against a Redis or Valkey server, so several relay
+replicas can share one store.  The layout follows
+docs/architecture/valkey_relay_state_atomic_transitions_adr.md: every key
+starts with ``tokenplace:{<namespace>}:relay:v<schema>:``, whose single brace
+pair is the Redis Cluster hash tag.  Each private table of the in-memory store
+is a hash plus an ``:order`` sorted set that keeps dict insertion order; nested
+tables use one such pair per outer key, named by the SHA-256 digest of that
+key; expiry indexes are sorted sets scored by deadline.
+
+A transition is optimistic.  It reads through to the server and buffers its
+writes; the buffered writes are then applied by one Lua script that first
+re-checks, on the server, everything the transition read: each field it looked
+up still holds the value it saw, each deadline range it popped still holds the
+same members, each whole hash it walked still carries the version stamp it had
+(every write stamps the keys it touches), and each table length it compared
+against a capacity bound is still on the same side of that bound.  If any check
+fails the script applies nothing and the transition is re-run from scratch, so
+every committed transition is atomic and serializable, while transitions on
+different clients and nodes commit side by side instead of serializing on one
+counter.  The ``_next_*`` scalars are sequences: each increment is allocated
+with ``HINCRBY`` as it happens, so values are unique and increasing but a
+re-run or failed transition leaves a gap.  The same script
+publishes a wakeup on the ``wake`` channel when work is queued for a node, which
+``wait_for_queued_request`` uses to end parked polls on any replica; a lost
+wakeup only delays the poll to its next bounded re-check.  Exactly as in the
+SQLite store, a transition that raises ``RelayStateStoreError`` commits what the
+in-memory store would have kept; any other exception discards its writes.
+
+Deadlines in the expiry indexes stay authoritative.  Records that carry their
+own deadline additionally get a native per-field TTL (``HPEXPIRE``, Redis 7.4+
+or Valkey 9+) of that deadline plus ``expiry_grace_seconds``, the ADR's final
+memory guard for state that no relay is left to reap.
+
+Values use the SQLite store's JSON codec, so no pickles are read from a shared
+server.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import random
+import threading
+import time
+from collections.abc import Iterator, MutableMapping, MutableSet
+from typing import Any, Callable, Hashable
+
+from relay_state_store import (
+    InMemoryRelayStateStore,
+    RelayStateStoreConfig,
+    RelayStateStoreError,
+)
+from relay_state_store_sqlite import (
+    _DEADLINE_PHASES,
+    _JSON,
+    _NESTED_TABLES,
+    _SET_TABLES,
+    _TABLES,
+    _dump,
+    _dump_key,
+    _load,
+    _load_key,
+)
+
+SCHEMA_VERSION = 1
+MAX_TRANSITION_ATTEMPTS = 64
+DEFAULT_EXPIRY_GRACE_SECONDS = 3600.0
+WAKE_RECHECK_SECONDS = 1.0
+_LISTENER_POLL_SECONDS = 0.25
+
+# Record type -> attribute holding the deadline after which the record is
+# only kept until the reaper runs.
+_RECORD_DEADLINES = {
+    "ReservationRecord": "reservation_expires_at_epoch",
+    "QueuedRequest": "request_deadline_epoch",
+    "ClaimRecord": "request_deadline_epoch",
+    "ResponseRecord": "replay_expires_at_epoch",
+    "TerminalOutcomeRecord": "expires_at_epoch",
+    "ControlTombstoneRecord": "expires_at_epoch",
+    "NodeTombstoneRecord": "expires_at_epoch",
+    "_FormerNodeAuthority": "expires_at_epoch",
+}
+
+# Tables whose length the in-memory store only compares against these
+# capacity bounds.  Any two lengths below the band are indistinguishable to
+# those checks, so a length read stays valid while the table stays below its
+# band; reservations and queued requests split the shared lifecycle bound.
+# Truth-testing a table still checks its exact length.
+_LENGTH_BANDS: dict[str, Callable[[RelayStateStoreConfig], int]] = {
+    "_records": lambda config: config.max_compute_nodes,
+    "_reservations": lambda config: min(
+        config.max_reservations, config.max_request_lifecycles // 2
+    ),
+    "_queued": lambda config: min(
+        config.max_queued_requests,
+        config.max_request_lifecycles - config.max_request_lifecycles // 2,
+    ),
+    "_claims": lambda config: config.max_claims,
+    "_responses": lambda config: config.max_responses,
+    "_terminals": lambda config: config.max_terminal_records,
+    "_control_tombstones": lambda config: config.max_control_tombstones,
+    "_node_tombstones": lambda config: config.max_node_tombstones,
+    "_pending_node_transitions": lambda config: config.max_pending_node_transitions,
+    "_fairness_cursors": lambda config: config.max_scheduler_fingerprints,
+}
+
+# KEYS: the version-stamp hash.  ARGV: key prefix, number of check arguments,
+# the checks, then flat ops.  A commit without ops only runs the checks.
+_COMMIT_SCRIPT = """
+local versions = KEYS[1]
+local seq_key = ARGV[1] .. 'seq'
+local i = 3
+local checks_end = 2 + tonumber(ARGV[2])
+while i <= checks_end do
+  local check = ARGV[i]
+  if check == 'hv' then
+    local current = redis.call('HGET', ARGV[i + 1], ARGV[i + 2])
+    if ARGV[i + 3] == '0' then
+      if current then return 0 end
+    elseif current ~= ARGV[i + 4] then
+      return 0
+    end
+    i = i + 5
+  elseif check == 'zv' then
+    local current = redis.call('ZSCORE', ARGV[i + 1], ARGV[i + 2])
+    if ARGV[i + 3] == '0' then
+      if current then return 0 end
+    elseif not current or tonumber(current) ~= tonumber(ARGV[i + 4]) then
+      return 0
+    end
+    i = i + 5
+  elseif check == 'kv' then
+    if (redis.call('HGET', versions, ARGV[i + 1]) or '0') ~= ARGV[i + 2] then
+      return 0
+    end
+    i = i + 3
+  elseif check == 'hl' or check == 'zl' then
+    local length
+    if check == 'hl' then
+      length = redis.call('HLEN', ARGV[i + 1])
+    else
+      length = redis.call('ZCARD', ARGV[i + 1])
+    end
+    if length ~= tonumber(ARGV[i + 2])
+      and not (length >= tonumber(ARGV[i + 3]) and length < tonumber(ARGV[i + 4])) then
+      return 0
+    end
+    i = i + 5
+  elseif check == 'zr' then
+    local rows = redis.call('ZRANGEBYSCORE', ARGV[i + 1], '-inf', ARGV[i + 2], 'WITHSCORES')
+    local count = tonumber(ARGV[i + 3])
+    if #rows ~= 2 * count then return 0 end
+    for row = 0, count - 1 do
+      if rows[2 * row + 1] ~= ARGV[i + 4 + 2 * row]
+        or tonumber(rows[2 * row + 2]) ~= tonumber(ARGV[i + 5 + 2 * row]) then
+        return 0
+      end
+    end
+    i = i + 4 + 2 * count
+  else
+    return redis.error_reply('unknown relay state check')
+  end
+end
+local written = {}
+local seen = {}
+local function touch(key)
+  if not seen[key] then
+    seen[key] = true
+    written[#written + 1] = key
+  end
+end
+while i <= #ARGV do
+  local op = ARGV[i]
+  if op == 'hset' then
+    local key, field = ARGV[i + 1], ARGV[i + 2]
+    touch(key)
+    redis.call('HSET', key, field, ARGV[i + 3])
+    if ARGV[i + 4] == '1' then
+      redis.call('ZADD', key .. ':order', redis.call('INCR', seq_key), field)
+    end
+    local ttl = tonumber(ARGV[i + 5])
+    if ttl > 0 then
+      redis.call('HPEXPIRE', key, ttl, 'FIELDS', 1, field)
+    end
+    i = i + 6
+  elseif op == 'hdel' then
+    touch(ARGV[i + 1])
+    redis.call('HDEL', ARGV[i + 1], ARGV[i + 2])
+    redis.call('ZREM', ARGV[i + 1] .. ':order', ARGV[i + 2])
+    i = i + 3
+  elseif op == 'zset' then
+    touch(ARGV[i + 1])
+    redis.call('ZADD', ARGV[i + 1], ARGV[i + 3], ARGV[i + 2])
+    redis.call('HSET', ARGV[i + 1] .. ':seq', ARGV[i + 2], redis.call('INCR', seq_key))
+    i = i + 4
+  elseif op == 'zdel' then
+    touch(ARGV[i + 1])
+    redis.call('ZREM', ARGV[i + 1], ARGV[i + 2])
+    redis.call('HDEL', ARGV[i + 1] .. ':seq', ARGV[i + 2])
+    i = i + 3
+  elseif op == 'pub' then
+    redis.call('PUBLISH', ARGV[i + 1], ARGV[i + 2])
+    i = i + 3
+  else
+    return redis.error_reply('unknown relay state op')
+  end
+end
+if #written > 0 then
+  -- Stamps come from one counter, so a key that was emptied and refilled
+  -- never shows an old stamp again; an emptied key drops its stamp.
+  local stamp = redis.call('INCR', seq_key)
+  for _, key in ipairs(written) do
+    if redis.call('EXISTS', key) == 1 then
+      redis.call('HSET', versions, key, stamp)
+    else
+      redis.call('HDEL', versions, key)
+    end
+  end
+end
+return 1
+"""
+
+
+def _text(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _HashOverlay:
+    """One hash (plus its ``:order`` set) as seen by one transition attempt.
+
+    Reads of the server state are cached for the attempt and turned into the
+    commit's checks: single fields by value, a walk of the whole hash by its
+    version stamp (read before the walk) and a length by its band.
+    """
+
+    def __init__(self, session: "_Session", key: str) -> None:
+        self._session = session
+        self._client = session.client
+        self.key = key
+        self._band = session.store._length_bands.get(key, 0)
+        self._base: dict[str, str | None] = {}
+        self._base_len: int | None = None
+        self._base_order: list[str] | None = None
+        self._version: str | None = None
+        self._point_reads: set[str] = set()
+        self._len_checked = False
+        self.len_exact = False
+        self.changes: dict[str, str | None] = {}
+        self.appended: dict[str, None] = {}
+        self.ttls: dict[str, int] = {}
+        self._base_present: dict[str, bool] = {}
+        self.dangling: set[str] = set()
+
+    def _base_get(self, field: str) -> str | None:
+        if field not in self._base:
+            self._base[field] = _text(self._client.hget(self.key, field))
+            if self._version is None:
+                self._point_reads.add(field)
+        return self._base[field]
+
+    def get(self, field: str) -> str | None:
+        if field in self.changes:
+            return self.changes[field]
+        return self._base_get(field)
+
+    def _note_change(self, field: str) -> None:
+        if field not in self._base_present:
+            self._base_present[field] = self._base_get(field) is not None
+
+    def set(self, field: str, value: str, ttl: int) -> None:
+        present = self.get(field) is not None
+        self._note_change(field)
+        if not present:
+            self.appended[field] = None
+        self.changes[field] = value
+        self.ttls[field] = ttl
+
+    def delete(self, field: str) -> bool:
+        if self.get(field) is None:
+            return False
+        self._note_change(field)
+        self.changes[field] = None
+        self.appended.pop(field, None)
+        self.ttls.pop(field, None)
+        return True
+
+    def __len__(self) -> int:
+        if self._base_len is None:
+            self._base_len = int(self._client.hlen(self.key))
+            self._len_checked = self._version is None
+        return self._base_len + sum(
+            (value is not None) - self._base_present[field]
+            for field, value in self.changes.items()
+        )
+
+    def items(self) -> list[tuple[str, str]]:
+        if self._base_order is None:
+            if self._version is None:
+                self._version = self._session.key_version(self.key)
+            order = [_text(field) for field in self._client.zrange(f"{self.key}:order", 0, -1)]
+            missing = [field for field in order if field not in self._base]
+            if missing:
+                values = self._client.hmget(self.key, missing)
+                self._base.update(zip(missing, (_text(value) for value in values)))
+            self._base_order = order
+        result = []
+        for field in self._base_order:
+            if field in self.appended:
+                continue
+            value = self.changes[field] if field in self.changes else self._base[field]
+            if value is not None:
+                result.append((field, value))
+            elif field not in self.changes:
+                # The field outlived its TTL guard; drop its order entry too.
+                self.dangling.add(field)
+        result.extend((field, self.changes[field]) for field in self.appended)
+        return result
+
+    def checks(self) -> list[str]:
+        checks: list[str] = []
+        for field in self._point_reads:
+            value = self._base[field]
+            checks += ["hv", self.key, field, "0" if value is None else "1", value or ""]
+        if self._version is not None:
+            checks += ["kv", self.key, self._version]
+        if self._len_checked:
+            high = 0
+            if self._band and not self.len_exact:
+                added = sum(
+                    value is not None and not self._base_present[field]
+                    for field, value in self.changes.items()
+                )
+                if self._base_len < self._band - added:
+                    high = self._band - added
+            checks += ["hl", self.key, str(self._base_len), "0", str(high)]
+        return checks
+
+    def ops(self) -> list[str]:
+        ops: list[str] = []
+        for field in self.dangling:
+            if field not in self.changes:
+                ops += ["hdel", self.key, field]
+        for field, value in self.changes.items():
+            if self._base_present[field] and (value is None or field in self.appended):
+                ops += ["hdel", self.key, field]
+        for field, value in self.changes.items():
+            if value is not None and field not in self.appended:
+                ops += ["hset", self.key, field, value, "0", str(self.ttls[field])]
+        for field in self.appended:
+            ops += ["hset", self.key, field, self.changes[field], "1", str(self.ttls[field])]
+        return ops
+
+
+class _ZsetOverlay:
+    """One expiry index as seen by one transition attempt.
+
+    Ties between equal deadlines pop in scheduling order, as in
+    :class:`relay_reaper.DeadlineReaper`; the ``:seq`` hash keeps that order.
+    """
+
+    def __init__(self, session: "_Session", key: str) -> None:
+        self._session = session
+        self._client = session.client
+        self.key = key
+        self._base: dict[str, float | None] = {}
+        self._base_len: int | None = None
+        self._version: str | None = None
+        self._point_reads: set[str] = set()
+        self._len_checked = False
+        self._due_reads: list[tuple[float, list[tuple[str, float]]]] = []
+        self.changes: dict[str, float | None] = {}
+        self.scheduled: dict[str, None] = {}
+
+    def _base_score(self, member: str) -> float | None:
+        if member not in self._base:
+            score = self._client.zscore(self.key, member)
+            self._base[member] = None if score is None else float(score)
+            if self._version is None:
+                self._point_reads.add(member)
+        return self._base[member]
+
+    def _snapshot_version(self) -> None:
+        if self._version is None:
+            self._version = self._session.key_version(self.key)
+
+    def score(self, member: str) -> float | None:
+        if member in self.changes:
+            return self.changes[member]
+        return self._base_score(member)
+
+    def schedule(self, member: str, deadline: float, earliest: bool) -> None:
+        current = self.score(member)
+        if current == deadline or (earliest and current is not None and current <= deadline):
+            return
+        self._base_score(member)
+        self.changes[member] = deadline
+        self.scheduled.pop(member, None)
+        self.scheduled[member] = None
+
+    def discard(self, member: str) -> None:
+        if self.score(member) is None:
+            return
+        self.changes[member] = None
+        self.scheduled.pop(member, None)
+
+    def next_deadline(self) -> float | None:
+        self._snapshot_version()
+        candidates = [value for value in self.changes.values() if value is not None]
+        for member, score in self._client.zrange(
+            self.key, 0, len(self.changes), withscores=True
+        ):
+            if _text(member) not in self.changes:
+                candidates.append(float(score))
+                break
+        return min(candidates) if candidates else None
+
+    def pop_due(self, now: float, limit: int | None) -> list[str]:
+        fetch = None if limit is None else limit + len(self.changes)
+        if fetch is not None:
+            self._snapshot_version()
+        rows = self._client.zrangebyscore(
+            self.key, "-inf", now, withscores=True,
+            **({} if fetch is None else {"start": 0, "num": fetch}),
+        )
+        if self._version is None:
+            # Only the due range matters: deadlines scheduled into the future
+            # by other transitions do not invalidate this pop.
+            self._due_reads.append(
+                (now, [(_text(member), float(score)) for member, score in rows])
+            )
+        if fetch is not None and rows and len(rows) == fetch:
+            # Keep every tie at the cut-off so scheduling order decides it.
+            last = rows[-1][1]
+            rows = list(rows) + [
+                row for row in self._client.zrangebyscore(self.key, last, last, withscores=True)
+                if row not in rows
+            ]
+        base = [(_text(member), float(score)) for member, score in rows]
+        base = [(member, score) for member, score in base if member not in self.changes]
+        sequences = (
+            self._client.hmget(f"{self.key}:seq", [member for member, _ in base]) if base else []
+        )
+        entries = [
+            (score, 0, int(sequence or 0), member)
+            for (member, score), sequence in zip(base, sequences)
+        ]
+        entries += [
+            (self.changes[member], 1, index, member)
+            for index, member in enumerate(self.scheduled)
+            if self.changes[member] is not None and self.changes[member] <= now
+        ]
+        entries.sort()
+        if limit is not None:
+            entries = entries[:limit]
+        for _score, _origin, _sequence, member in entries:
+            self._base_score(member)
+            self.changes[member] = None
+            self.scheduled.pop(member, None)
+        return [member for *_rest, member in entries]
+
+    def __len__(self) -> int:
+        if self._base_len is None:
+            self._base_len = int(self._client.zcard(self.key))
+            self._len_checked = self._version is None
+        return self._base_len + sum(
+            (value is not None) - (self._base_score(member) is not None)
+            for member, value in self.changes.items()
+        )
+
+    def checks(self) -> list[str]:
+        checks: list[str] = []
+        for member in self._point_reads:
+            score = self._base[member]
+            checks += [
+                "zv", self.key, member, "0" if score is None else "1",
+                "" if score is None else repr(score),
+            ]
+        if self._version is not None:
+            checks += ["kv", self.key, self._version]
+        if self._len_checked:
+            checks += ["zl", self.key, str(self._base_len), "1", "0"]
+        for now, rows in self._due_reads:
+            checks += ["zr", self.key, repr(now), str(len(rows))]
+            for member, score in rows:
+                checks += [member, repr(score)]
+        return checks
+
+    def ops(self) -> list[str]:
+        ops: list[str] = []
+        for member, value in self.changes.items():
+            if value is None and self._base[member] is not None:
+                ops += ["zdel", self.key, member]
+        for member in self.scheduled:
+            ops += ["zset", self.key, member, repr(self.changes[member])]
+        return ops
+
+
+class _Session:
+    """Read-through view and write buffer of one transition attempt."""
+
+    def __init__(self, store: "RedisRelayStateStore", *, autocommit: bool = False) -> None:
+        self.store = store
+        self.client = store._client
+        self.autocommit = autocommit
+        self._hashes: dict[str, _HashOverlay] = {}
+        self._zsets: dict[str, _ZsetOverlay] = {}
+        self.wake: set[str] = set()
+        # Sequence values allocated, and last read, by this attempt.
+        self.sequences: dict[str, int] = {}
+        self.sequences_read: dict[str, int] = {}
+
+    def key_version(self, key: str) -> str:
+        return _text(self.client.hget(self.store._versions_key, key)) or "0"
+
+    def hash(self, key: str) -> _HashOverlay:
+        overlay = self._hashes.get(key)
+        if overlay is None:
+            overlay = self._hashes[key] = _HashOverlay(self, key)
+        return overlay
+
+    def zset(self, key: str) -> _ZsetOverlay:
+        overlay = self._zsets.get(key)
+        if overlay is None:
+            overlay = self._zsets[key] = _ZsetOverlay(self, key)
+        return overlay
+
+    def flush(self) -> None:
+        """Apply an autocommit session's writes immediately."""
+
+        if self.autocommit:
+            self.commit()
+            self._hashes.clear()
+            self._zsets.clear()
+            self.wake.clear()
+
+    def checks(self) -> list[str]:
+        if self.autocommit:
+            return []
+        checks: list[str] = []
+        for overlay in self._hashes.values():
+            checks += overlay.checks()
+        for overlay in self._zsets.values():
+            checks += overlay.checks()
+        return checks
+
+    def _run(self, checks: list[str], ops: list[str]) -> bool:
+        return bool(
+            self.store._commit(
+                keys=[self.store._versions_key],
+                args=[self.store._prefix, str(len(checks)), *checks, *ops],
+            )
+        )
+
+    def stale(self) -> bool:
+        checks = self.checks()
+        return bool(checks) and not self._run(checks, [])
+
+    def commit(self) -> bool:
+        ops: list[str] = []
+        for overlay in self._hashes.values():
+            ops += overlay.ops()
+        for overlay in self._zsets.values():
+            ops += overlay.ops()
+        if not ops:
+            return self.autocommit or not self.stale()
+        for node_digest in self.wake:
+            ops += ["pub", self.store._wake_channel, node_digest]
+        return self._run(self.checks(), ops)
+
+
+class _Transaction:
+    """Re-entrant store lock whose outermost holder owns one transition attempt."""
+
+    def __init__(self, store: "RedisRelayStateStore") -> None:
+        self._store = store
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._owner: int | None = None
+        self._session: _Session | None = None
+        # Attempts re-run after a failed commit check, for benchmarks.
+        self.conflicts = 0
+
+    def session(self) -> _Session:
+        if self._session is not None and self._owner == threading.get_ident():
+            return self._session
+        # Outside a transition every access stands alone, as with SQLite's
+        # autocommit mode.
+        return _Session(self._store, autocommit=True)
+
+    def _begin(self) -> None:
+        self._session = _Session(self._store)
+        self._owner = threading.get_ident()
+
+    def _end(self) -> None:
+        self._session = None
+        self._owner = None
+
+    def run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``function`` as one transition, re-running it on commit conflicts."""
+
+        with self._lock:
+            if self._depth:
+                return function(*args, **kwargs)
+            for attempt in range(MAX_TRANSITION_ATTEMPTS):
+                self._begin()
+                self._depth = 1
+                try:
+                    try:
+                        result, error = function(*args, **kwargs), None
+                    except RelayStateStoreError as exc:
+                        result, error = None, exc
+                    except BaseException:
+                        # A torn read of a concurrently changing store can
+                        # fail in any way; only a consistent failure counts.
+                        if self._session.stale():
+                            self.conflicts += 1
+                            continue
+                        raise
+                    if self._session.commit():
+                        if error is not None:
+                            raise error
+                        return result
+                finally:
+                    self._depth = 0
+                    self._end()
+                self.conflicts += 1
+                time.sleep(random.uniform(0, min(0.05, 0.001 * 2**attempt)))
+            raise RelayStateStoreError(
+                "relay state transition kept conflicting with other writers"
+            )
+
+    def __enter__(self) -> "_Transaction":
+        self._lock.acquire()
+        if self._depth == 0:
+            self._begin()
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                session, committed = self._session, False
+                self._end()
+                if exc_type is None or issubclass(exc_type, RelayStateStoreError):
+                    committed = session.commit()
+                    if not committed and exc_type is None:
+                        raise RelayStateStoreError(
+                            "relay state changed concurrently; retry the transition"
+                        )
+        finally:
+            self._lock.release()
+
+
+class _Table(MutableMapping):
+    """Insertion-ordered mapping stored as one hash and its order set."""
+
+    def __init__(self, store: "RedisRelayStateStore", key: str) -> None:
+        self._store = store
+        self._key = key
+
+    def _hash(self) -> tuple[_Session, _HashOverlay]:
+        session = self._store._lock.session()
+        return session, session.hash(self._key)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self._hash()[1].get(_dump_key(key))
+        if value is None:
+            raise KeyError(key)
+        return _load(value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._hash()[1].get(_dump_key(key))
+        return default if value is None else _load(value)
+
+    def __contains__(self, key: object) -> bool:
+        return self._hash()[1].get(_dump_key(key)) is not None
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        session, overlay = self._hash()
+        overlay.set(_dump_key(key), _dump(value), self._store._ttl_ms(value))
+        session.flush()
+
+    def __delitem__(self, key: Hashable) -> None:
+        session, overlay = self._hash()
+        if not overlay.delete(_dump_key(key)):
+            raise KeyError(key)
+        session.flush()
+
+    _MISSING = object()
+
+    def pop(self, key: Hashable, default: Any = _MISSING) -> Any:
+        session, overlay = self._hash()
+        field = _dump_key(key)
+        value = overlay.get(field)
+        if value is None:
+            if default is self._MISSING:
+                raise KeyError(key)
+            return default
+        overlay.delete(field)
+        session.flush()
+        return _load(value)
+
+    def __len__(self) -> int:
+        return len(self._hash()[1])
+
+    def __bool__(self) -> bool:
+        overlay = self._hash()[1]
+        overlay.len_exact = True
+        return bool(len(overlay))
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([_load_key(field) for field, _value in self._hash()[1].items()])
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        return [(_load_key(field), _load(value)) for field, value in self._hash()[1].items()]
+
+    def values(self) -> list[Any]:
+        return [value for _key, value in self.items()]
+
+    def clear(self) -> None:
+        session, overlay = self._hash()
+        for field, _value in overlay.items():
+            overlay.delete(field)
+        session.flush()
+
+
+class _NestedView(MutableMapping):
+    """The inner mapping of one outer key of a :class:`_NestedTable`."""
+
+    def __init__(self, table: "_NestedTable", outer: str) -> None:
+        self._table = table
+        self._outer = outer
+
+    def _hash(self) -> tuple[_Session, _HashOverlay]:
+        session = self._table._store._lock.session()
+        return session, session.hash(self._table.inner_key(self._outer))
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self._hash()[1].get(_dump_key(key))
+        if value is None:
+            raise KeyError(key)
+        return _load(value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._hash()[1].get(_dump_key(key))
+        return default if value is None else _load(value)
+
+    def __contains__(self, key: object) -> bool:
+        return self._hash()[1].get(_dump_key(key)) is not None
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        session, overlay = self._hash()
+        field = _dump_key(key)
+        added = overlay.get(field) is None
+        overlay.set(field, _dump(value), self._table._store._ttl_ms(value))
+        outers = session.hash(self._table.key)
+        if outers.get(self._outer) is None:
+            outers.set(self._outer, "1", -1)
+        if added and self._table.wakes:
+            session.wake.add(_digest(self._outer))
+        session.flush()
+
+    def _delete(self, session: _Session, overlay: _HashOverlay, field: str) -> None:
+        overlay.delete(field)
+        if not len(overlay):
+            session.hash(self._table.key).delete(self._outer)
+
+    def __delitem__(self, key: Hashable) -> None:
+        session, overlay = self._hash()
+        field = _dump_key(key)
+        if overlay.get(field) is None:
+            raise KeyError(key)
+        self._delete(session, overlay, field)
+        session.flush()
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        session, overlay = self._hash()
+        field = _dump_key(key)
+        value = overlay.get(field)
+        if value is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self._delete(session, overlay, field)
+        session.flush()
+        return _load(value)
+
+    def __len__(self) -> int:
+        return len(self._hash()[1])
+
+    def __bool__(self) -> bool:
+        return bool(len(self._hash()[1]))
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([_load_key(field) for field, _value in self._hash()[1].items()])
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        return [(_load_key(field), _load(value)) for field, value in self._hash()[1].items()]
+
+    def values(self) -> list[Any]:
+        return [value for _key, value in self.items()]
+
+
+class _NestedTable(MutableMapping):
+    """Mapping of mappings: an ordered outer-key hash plus one hash per outer key.
+
+    An outer key exists exactly while it has inner entries, matching the
+    in-memory store, which always drops an emptied inner dict.
+    """
+
+    def __init__(self, store: "RedisRelayStateStore", key: str, *, wakes: bool = False) -> None:
+        self._store = store
+        self.key = key
+        self.wakes = wakes
+
+    def inner_key(self, outer: str) -> str:
+        return f"{self.key}:{_digest(outer)}"
+
+    def _outers(self) -> _HashOverlay:
+        return self._store._lock.session().hash(self.key)
+
+    def __getitem__(self, outer: Hashable) -> _NestedView:
+        encoded = _dump_key(outer)
+        if self._outers().get(encoded) is None:
+            raise KeyError(outer)
+        return _NestedView(self, encoded)
+
+    def get(self, outer: Hashable, default: Any = None) -> Any:
+        encoded = _dump_key(outer)
+        if self._outers().get(encoded) is None:
+            return default
+        return _NestedView(self, encoded)
+
+    def setdefault(self, outer: Hashable, default: Any = None) -> _NestedView:
+        view = _NestedView(self, _dump_key(outer))
+        for key, value in (default or {}).items():
+            view.setdefault(key, value)
+        return view
+
+    def __contains__(self, outer: object) -> bool:
+        return self._outers().get(_dump_key(outer)) is not None
+
+    def _drop(self, encoded: str) -> None:
+        session = self._store._lock.session()
+        inner = session.hash(self.inner_key(encoded))
+        for field, _value in inner.items():
+            inner.delete(field)
+        session.hash(self.key).delete(encoded)
+        session.flush()
+
+    def __setitem__(self, outer: Hashable, mapping: Any) -> None:
+        encoded = _dump_key(outer)
+        self._drop(encoded)
+        view = _NestedView(self, encoded)
+        for key, value in mapping.items():
+            view[key] = value
+
+    def __delitem__(self, outer: Hashable) -> None:
+        # Emptying the last inner entry already removed the outer key, so the
+        # in-memory ``del`` that follows is a no-op here.
+        self._drop(_dump_key(outer))
+
+    def pop(self, outer: Hashable, *default: Any) -> Any:
+        encoded = _dump_key(outer)
+        if self._outers().get(encoded) is None:
+            if default:
+                return default[0]
+            raise KeyError(outer)
+        snapshot = dict(_NestedView(self, encoded).items())
+        self._drop(encoded)
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._outers())
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([_load_key(field) for field, _value in self._outers().items()])
+
+    def items(self) -> list[tuple[Hashable, _NestedView]]:
+        return [(outer, self[outer]) for outer in self]
+
+    def values(self) -> list[_NestedView]:
+        return [view for _outer, view in self.items()]
+
+
+class _KeySet(MutableSet):
+    """Insertion-ordered set stored as a hash of placeholder values."""
+
+    def __init__(self, store: "RedisRelayStateStore", key: str) -> None:
+        self._store = store
+        self._key = key
+
+    def _hash(self) -> tuple[_Session, _HashOverlay]:
+        session = self._store._lock.session()
+        return session, session.hash(self._key)
+
+    def __contains__(self, key: object) -> bool:
+        return self._hash()[1].get(_dump_key(key)) is not None
+
+    def add(self, key: Hashable) -> None:
+        session, overlay = self._hash()
+        field = _dump_key(key)
+        if overlay.get(field) is None:
+            overlay.set(field, "1", -1)
+            session.flush()
+
+    def discard(self, key: Hashable) -> None:
+        session, overlay = self._hash()
+        if overlay.delete(_dump_key(key)):
+            session.flush()
+
+    def __len__(self) -> int:
+        return len(self._hash()[1])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([_load_key(field) for field, _value in self._hash()[1].items()])
+
+
+class _DeadlineIndex:
+    """One reaping phase stored as a sorted set scored by deadline.
+
+    Mirrors the subset of :class:`relay_reaper.DeadlineReaper` the store uses:
+    one live deadline per ``(kind, key)``, popped in deadline order.
+    """
+
+    def __init__(self, store: "RedisRelayStateStore", key: str) -> None:
+        self._store = store
+        self._key = key
+
+    def _zset(self) -> tuple[_Session, _ZsetOverlay]:
+        session = self._store._lock.session()
+        return session, session.zset(self._key)
+
+    @staticmethod
+    def _member(kind: str, key: Hashable) -> str:
+        return _JSON.encode([kind, key])
+
+    def schedule(
+        self, kind: str, key: Hashable, deadline: float, *, earliest: bool = False
+    ) -> None:
+        session, overlay = self._zset()
+        overlay.schedule(self._member(kind, key), float(deadline), earliest)
+        session.flush()
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        session, overlay = self._zset()
+        overlay.discard(self._member(kind, key))
+        session.flush()
+
+    def deadline(self, kind: str, key: Hashable) -> float | None:
+        return self._zset()[1].score(self._member(kind, key))
+
+    def next_deadline(self) -> float | None:
+        return self._zset()[1].next_deadline()
+
+    def pop_due(
+        self, now: float, *, limit: int | None = None
+    ) -> list[tuple[str, Hashable]]:
+        session, overlay = self._zset()
+        members = overlay.pop_due(now, limit)
+        session.flush()
+        due = []
+        for member in members:
+            kind, key = _load(member)
+            due.append((kind, tuple(key) if isinstance(key, list) else key))
+        return due
+
+    def __len__(self) -> int:
+        return len(self._zset()[1])
+
+
+def _sequence(name: str) -> property:
+    """A ``_next_*`` scalar whose increments are allocated outside the commit.
+
+    Only ``+=`` is meaningful, and the value is read after the increment: the
+    setter advances the server counter by the difference from the value this
+    attempt last saw and the getter then returns that allocation, so
+    concurrent transitions never share a value.
+    """
+
+    def read(self: "RedisRelayStateStore") -> int:
+        return int(_text(self._client.hget(self._scalars_key, name)) or 0)
+
+    def getter(self: "RedisRelayStateStore") -> int:
+        session = self._lock.session()
+        if name in session.sequences:
+            return session.sequences[name]
+        value = session.sequences_read[name] = read(self)
+        return value
+
+    def setter(self: "RedisRelayStateStore", value: int) -> None:
+        session = self._lock.session()
+        current = session.sequences.get(name, session.sequences_read.get(name))
+        if current is None:
+            current = read(self)
+        session.sequences[name] = int(
+            self._client.hincrby(self._scalars_key, name, int(value) - current)
+        )
+
+    return property(getter, setter)
+
+
+def key_prefix(namespace: str) -> str:
+    """Key prefix of ``namespace``; the braces make it one Redis Cluster slot."""
+
+    return f"tokenplace:{{{namespace}}}:relay:v{SCHEMA_VERSION}:"
+
+
+class _WakeListener:
+    """Background subscriber that turns ``wake`` messages into condition signals."""
+
+    def __init__(self, client: Any, channel: str) -> None:
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+        self._condition = threading.Condition()
+        self._generations: dict[str, int] = {}
+        self._waiters: dict[str, int] = {}
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="relay-state-redis-wake", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            try:
+                message = self._pubsub.get_message(timeout=_LISTENER_POLL_SECONDS)
+            except Exception:  # pragma: no cover - connection loss; waiters re-check
+                if self._closed.wait(WAKE_RECHECK_SECONDS):
+                    return
+                continue
+            if message and message.get("type") == "message":
+                self.notify(_text(message["data"]))
+
+    def notify(self, node_digest: str) -> None:
+        with self._condition:
+            if node_digest in self._waiters:
+                self._generations[node_digest] += 1
+                self._condition.notify_all()
+
+    def register(self, node_digest: str) -> int:
+        with self._condition:
+            self._waiters[node_digest] = self._waiters.get(node_digest, 0) + 1
+            return self._generations.setdefault(node_digest, 0)
+
+    def unregister(self, node_digest: str) -> None:
+        with self._condition:
+            self._waiters[node_digest] -= 1
+            if not self._waiters[node_digest]:
+                del self._waiters[node_digest]
+                del self._generations[node_digest]
+
+    def wait(self, node_digest: str, generation: int, timeout: float) -> None:
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._generations[node_digest] != generation, timeout
+            )
+
+    def generation(self, node_digest: str) -> int:
+        with self._condition:
+            return self._generations[node_digest]
+
+    def close(self) -> None:
+        self._closed.set()
+        self._thread.join(timeout=_LISTENER_POLL_SECONDS * 4)
+        self._pubsub.close()
+
+
+class RedisRelayStateStore(InMemoryRelayStateStore):
+    """Redis/Valkey implementation of :class:`RelayStateStore`.
+
+    ``client`` is a ``redis.Redis`` (or compatible) client for the primary;
+    connection, TLS, auth and Sentinel discovery stay with the caller.  Every
+    store built on one server with the same namespace shares one state, and
+    construction never resets existing keys.  ``field_expiry=False`` skips the
+    per-field TTL guard on servers without ``HPEXPIRE``.
+    """
+
+    def __init__(
+        self,
+        config: RelayStateStoreConfig,
+        client: Any,
+        *,
+        acknowledgement_key: bytes,
+        epoch_time: Callable[[], float] = time.time,
+        field_expiry: bool = True,
+        expiry_grace_seconds: float = DEFAULT_EXPIRY_GRACE_SECONDS,
+    ) -> None:
+        if not isinstance(acknowledgement_key, bytes) or len(acknowledgement_key) < 32:
+            raise RelayStateStoreError(
+                "acknowledgement key must be bytes containing at least 256 bits"
+            )
+        self._config = config
+        self._acknowledgement_key = bytes(acknowledgement_key)
+        self._epoch_time = epoch_time
+        self._client = client
+        self._field_expiry = field_expiry
+        self._expiry_grace_seconds = float(expiry_grace_seconds)
+        self._prefix = key_prefix(config.namespace)
+        self._versions_key = f"{self._prefix}versions"
+        self._scalars_key = f"{self._prefix}scalars"
+        self._length_bands = {
+            f"{self._prefix}t:{_TABLES[attribute]}": band(config)
+            for attribute, band in _LENGTH_BANDS.items()
+        }
+        self._wake_channel = f"{self._prefix}wake"
+        self._commit = client.register_script(_COMMIT_SCRIPT)
+        self._wake_listener: _WakeListener | None = None
+        self._wake_listener_lock = threading.Lock()
+        self._initialize_meta()
+        self._lock = _Transaction(self)
+        for attribute, name in _TABLES.items():
+            setattr(self, attribute, _Table(self, f"{self._prefix}t:{name}"))
+        for attribute, name in _NESTED_TABLES.items():
+            setattr(
+                self,
+                attribute,
+                _NestedTable(
+                    self, f"{self._prefix}n:{name}", wakes=attribute == "_node_queues"
+                ),
+            )
+        for attribute, name in _SET_TABLES.items():
+            setattr(self, attribute, _KeySet(self, f"{self._prefix}s:{name}"))
+        for attribute, phase in _DEADLINE_PHASES.items():
+            setattr(self, attribute, _DeadlineIndex(self, f"{self._prefix}d:{phase}"))
+
+    def _initialize_meta(self) -> None:
+        meta_key = f"{self._prefix}meta"
+        expected = {"namespace": self._config.namespace, "schema_version": str(SCHEMA_VERSION)}
+        for key, value in expected.items():
+            self._client.hsetnx(meta_key, key, value)
+        stored = {
+            _text(key): _text(value) for key, value in self._client.hgetall(meta_key).items()
+        }
+        for key, value in expected.items():
+            if stored.get(key) != value:
+                raise RelayStateStoreError(
+                    f"relay state keyspace {key} does not match this store"
+                )
+        if self._field_expiry:
+            try:
+                self._client.execute_command("HPERSIST", meta_key, "FIELDS", 1, "namespace")
+            except Exception as exc:
+                raise RelayStateStoreError(
+                    "relay state server lacks hash-field expiry (Redis 7.4+ or Valkey 9+); "
+                    "pass field_expiry=False"
+                ) from exc
+
+    def _ttl_ms(self, value: Any) -> int:
+        # -1: no field expiry; otherwise milliseconds until the guard expires it.
+        if not self._field_expiry:
+            return -1
+        attribute = _RECORD_DEADLINES.get(type(value).__name__)
+        if attribute is None:
+            return -1
+        remaining = getattr(value, attribute) - self._epoch_time()
+        return max(int((remaining + self._expiry_grace_seconds) * 1000), 1)
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    def wait_for_queued_request(self, node_id: str, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for queued work on ``node_id``.
+
+        Wakes on an enqueue committed by any store sharing this server and
+        re-checks at least every ``WAKE_RECHECK_SECONDS``; returns whether
+        work is queued.  Claiming it is still a separate transition.
+        """
+
+        node_digest = _digest(_dump_key(node_id))
+        listener = self._listener()
+        deadline = time.monotonic() + max(float(timeout), 0.0)
+        generation = listener.register(node_digest)
+        try:
+            while True:
+                if self.queued_requests(node_id):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                listener.wait(node_digest, generation, min(remaining, WAKE_RECHECK_SECONDS))
+                generation = listener.generation(node_digest)
+        finally:
+            listener.unregister(node_digest)
+
+    def _listener(self) -> _WakeListener:
+        with self._wake_listener_lock:
+            if self._wake_listener is None:
+                self._wake_listener = _WakeListener(self._client, self._wake_channel)
+            return self._wake_listener
+
+    def close(self) -> None:
+        """Stop this store's wake subscriber; the client and keys are kept."""
+
+        with self._wake_listener_lock:
+            if self._wake_listener is not None:
+                self._wake_listener.close()
+                self._wake_listener = None
+
+    _next_registration_order = _sequence("_next_registration_order")
+    _next_claim_generation = _sequence("_next_claim_generation")
+    _fairness_activity = _sequence("_fairness_activity")
+    _next_queue_sequence = _sequence("_next_queue_sequence")
+
+
+def _transition(method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def run(self: RedisRelayStateStore, *args: Any, **kwargs: Any) -> Any:
+        return self._lock.run(method, self, *args, **kwargs)
+
+    return run
+
+
+# Every public operation is one optimistic transition; private helpers reached
+# from inside one share its attempt.
+for _name, _method in vars(InMemoryRelayStateStore).items():
+    if not _name.startswith("_") and inspect.isfunction(_method):
+        setattr(RedisRelayStateStore, _name, _transition(_method))
+del _name, _method
+
+__all__ = [
+    "MAX_TRANSITION_ATTEMPTS",
+    "SCHEMA_VERSION",
+    "RedisRelayStateStore",
+    "key_prefix",
+]
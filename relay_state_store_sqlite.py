@@ -0,0 +1,650 @@
+"""SQLite (WAL) implementation of the relay state-store contract.
+
+``InMemoryRelayStateStore`` keeps every table in process-local dicts, so the
+relay state it guards cannot outlive or be shared beyond one Python process.
+``SqliteRelayStateStore`` runs the identical transition code against a SQLite
+database instead: each private table of the in-memory store is an indexed
+SQLite table, the expiry indexes are one ``deadlines`` table indexed by
+``(phase, deadline)``, and the store lock is an ``IMMEDIATE`` transaction.
+Several relay worker processes on one host can therefore open the same file
+and observe one consistent store.
+
+Transactions follow the in-memory semantics exactly: a transition that raises
+``RelayStateStoreError`` commits whatever the in-memory store would have kept
+(for example records reaped before the bound was checked); any other exception
+rolls the whole transition back.
+
+Values are stored as JSON produced by a codec restricted to this module's
+frozen record dataclasses, never as pickles, so a shared database file cannot
+smuggle in arbitrary objects.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, MutableMapping, MutableSet
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Hashable
+
+from relay_state_store import (
+    ClaimRecord,
+    ComputeNodeCapabilities,
+    ComputeNodeRegistration,
+    ControlTombstoneRecord,
+    EncryptedRequestEnvelope,
+    EncryptedResponseEnvelope,
+    InMemoryRelayStateStore,
+    NodeTombstoneRecord,
+    QueuedRequest,
+    RelayStateStoreConfig,
+    RelayStateStoreError,
+    ReservationRecord,
+    ResponseRecord,
+    SchedulerNodeState,
+    TerminalOutcomeRecord,
+    _FormerNodeAuthority,
+    _PendingNodeTransition,
+)
+
+SCHEMA_VERSION = 1
+DEFAULT_BUSY_TIMEOUT_SECONDS = 30.0
+
+# Private attribute of ``InMemoryRelayStateStore`` -> SQLite table name.
+_TABLES = {
+    "_records": "registrations",
+    "_scheduler_states": "scheduler_states",
+    "_registration_order": "registration_order",
+    "_reservations": "reservations",
+    "_queued": "queued_requests",
+    "_queued_token_digests": "queued_token_digests",
+    "_cancellation_token_digests": "cancellation_token_digests",
+    "_claims": "claims",
+    "_responses": "responses",
+    "_terminals": "terminal_outcomes",
+    "_control_tombstones": "control_tombstones",
+    "_node_tombstones": "node_tombstones",
+    "_pending_node_transitions": "pending_node_transitions",
+    "_fairness_cursors": "fairness_cursors",
+    "_client_reservation_counts": "client_reservation_counts",
+    "_client_queued_counts": "client_queued_counts",
+    "_client_response_counts": "client_response_counts",
+    "_client_terminal_counts": "client_terminal_counts",
+    "_node_reservation_counts": "node_reservation_counts",
+    "_node_control_tombstone_counts": "node_control_tombstone_counts",
+    "_fingerprint_counts": "fingerprint_counts",
+}
+_NESTED_TABLES = {
+    "_node_queues": "node_queues",
+    "_node_work_identities": "node_work_identities",
+    "_former_node_authorities": "former_node_authorities",
+    "_capability_index": "capability_index",
+}
+_SET_TABLES = {"_deferred_deadline_identities": "deferred_deadline_identities"}
+_DEADLINE_PHASES = {
+    "_retained_expiry": "retained",
+    "_request_deadlines": "request",
+    "_lease_expiry": "lease",
+    "_reservation_expiry": "reservation",
+}
+_SCALARS = (
+    "_next_registration_order",
+    "_next_claim_generation",
+    "_fairness_activity",
+    "_next_queue_sequence",
+)
+# Instance attributes that stay process-local.
+_LOCAL_ATTRIBUTES = frozenset({"_config", "_acknowledgement_key", "_epoch_time", "_lock"})
+
+_RECORD_TYPES = {
+    cls.__name__: (cls, tuple(field.name for field in fields(cls)))
+    for cls in (
+        ClaimRecord,
+        ComputeNodeCapabilities,
+        ComputeNodeRegistration,
+        ControlTombstoneRecord,
+        EncryptedRequestEnvelope,
+        EncryptedResponseEnvelope,
+        NodeTombstoneRecord,
+        QueuedRequest,
+        ReservationRecord,
+        ResponseRecord,
+        SchedulerNodeState,
+        TerminalOutcomeRecord,
+        _FormerNodeAuthority,
+        _PendingNodeTransition,
+    )
+}
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, tuple):
+        return {"t": [_encode(item) for item in value]}
+    if is_dataclass(value) and type(value).__name__ in _RECORD_TYPES:
+        _cls, names = _RECORD_TYPES[type(value).__name__]
+        return {"r": type(value).__name__, "f": [_encode(getattr(value, name)) for name in names]}
+    raise TypeError(f"cannot store {type(value).__name__} in the relay state database")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "t" in value:
+            return tuple(_decode(item) for item in value["t"])
+        cls, names = _RECORD_TYPES[value["r"]]
+        record = object.__new__(cls)
+        for name, item in zip(names, value["f"]):
+            object.__setattr__(record, name, _decode(item))
+        return record
+    return value
+
+
+_JSON = json.JSONEncoder(separators=(",", ":"))
+
+
+def _dump(value: Any) -> str:
+    return _JSON.encode(_encode(value))
+
+
+def _load(text: str) -> Any:
+    return _decode(json.loads(text))
+
+
+def _dump_key(key: Hashable) -> str:
+    # Keys are node ids, digests, or tuples of them; JSON arrays round-trip
+    # back to tuples so they stay hashable.
+    return _JSON.encode(key)
+
+
+def _load_key(text: str) -> Hashable:
+    key = json.loads(text)
+    return tuple(key) if isinstance(key, list) else key
+
+
+def _row_count(connection: sqlite3.Connection, name: str) -> int:
+    # ``COUNT(*)`` walks the whole table; bounds checks read the
+    # trigger-maintained count instead.
+    return connection.execute(
+        "SELECT count FROM row_counts WHERE name = ?", (name,)
+    ).fetchone()[0]
+
+
+class _Transaction:
+    """Re-entrant store lock whose outermost holder owns a write transaction."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    def __enter__(self) -> "_Transaction":
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._connection.execute("BEGIN IMMEDIATE")
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                if exc_type is None or issubclass(exc_type, RelayStateStoreError):
+                    self._connection.execute("COMMIT")
+                else:
+                    self._connection.execute("ROLLBACK")
+        finally:
+            self._lock.release()
+
+
+class _Table(MutableMapping):
+    """Insertion-ordered mapping stored as ``(key, value)`` rows."""
+
+    def __init__(self, connection: sqlite3.Connection, name: str) -> None:
+        self._connection = connection
+        self._get_sql = f"SELECT value FROM {name} WHERE key = ?"
+        self._set_sql = (
+            f"INSERT INTO {name} (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+        )
+        self._delete_sql = f"DELETE FROM {name} WHERE key = ?"
+        self._keys_sql = f"SELECT key FROM {name} ORDER BY rowid"
+        self._items_sql = f"SELECT key, value FROM {name} ORDER BY rowid"
+        self._clear_sql = f"DELETE FROM {name}"
+        self._name = name
+
+    def _row(self, key: Hashable):
+        return self._connection.execute(self._get_sql, (_dump_key(key),)).fetchone()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        return _load(row[0])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        row = self._row(key)
+        return default if row is None else _load(row[0])
+
+    def __contains__(self, key: object) -> bool:
+        return self._row(key) is not None
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        # An upsert keeps the original rowid, so replacing a value keeps its
+        # position exactly as a dict assignment would.
+        self._connection.execute(self._set_sql, (_dump_key(key), _dump(value)))
+
+    def __delitem__(self, key: Hashable) -> None:
+        if not self._connection.execute(self._delete_sql, (_dump_key(key),)).rowcount:
+            raise KeyError(key)
+
+    _MISSING = object()
+
+    def pop(self, key: Hashable, default: Any = _MISSING) -> Any:
+        row = self._row(key)
+        if row is None:
+            if default is self._MISSING:
+                raise KeyError(key)
+            return default
+        self._connection.execute(self._delete_sql, (_dump_key(key),))
+        return _load(row[0])
+
+    def __len__(self) -> int:
+        return _row_count(self._connection, self._name)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        rows = self._connection.execute(self._keys_sql).fetchall()
+        return iter([_load_key(key) for (key,) in rows])
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        rows = self._connection.execute(self._items_sql).fetchall()
+        return [(_load_key(key), _load(value)) for key, value in rows]
+
+    def values(self) -> list[Any]:
+        return [value for _key, value in self.items()]
+
+    def clear(self) -> None:
+        self._connection.execute(self._clear_sql)
+
+
+class _NestedView(MutableMapping):
+    """The inner mapping of one outer key of a :class:`_NestedTable`."""
+
+    def __init__(self, table: "_NestedTable", outer: str) -> None:
+        self._table = table
+        self._outer = outer
+
+    def _row(self, key: Hashable):
+        return self._table.execute("get", self._outer, _dump_key(key)).fetchone()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        return _load(row[0])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        row = self._row(key)
+        return default if row is None else _load(row[0])
+
+    def __contains__(self, key: object) -> bool:
+        return self._row(key) is not None
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._table.execute("set", self._outer, _dump_key(key), _dump(value))
+
+    def __delitem__(self, key: Hashable) -> None:
+        if not self._table.execute("delete", self._outer, _dump_key(key)).rowcount:
+            raise KeyError(key)
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        row = self._row(key)
+        if row is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self._table.execute("delete", self._outer, _dump_key(key))
+        return _load(row[0])
+
+    def __len__(self) -> int:
+        return self._table.execute("count", self._outer).fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return self._table.execute("exists", self._outer).fetchone() is not None
+
+    def __iter__(self) -> Iterator[Hashable]:
+        rows = self._table.execute("keys", self._outer).fetchall()
+        return iter([_load_key(key) for (key,) in rows])
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        rows = self._table.execute("items", self._outer).fetchall()
+        return [(_load_key(key), _load(value)) for key, value in rows]
+
+    def values(self) -> list[Any]:
+        return [value for _key, value in self.items()]
+
+
+class _NestedTable(MutableMapping):
+    """Mapping of mappings stored as ``(outer, inner, value)`` rows.
+
+    An outer key exists exactly while it has inner rows, matching the in-memory
+    store, which always drops an emptied inner dict.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, name: str) -> None:
+        self._connection = connection
+        self._sql = {
+            "get": f"SELECT value FROM {name} WHERE outer_key = ? AND inner_key = ?",
+            "set": (
+                f"INSERT INTO {name} (outer_key, inner_key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (outer_key, inner_key) DO UPDATE SET value = excluded.value"
+            ),
+            "delete": f"DELETE FROM {name} WHERE outer_key = ? AND inner_key = ?",
+            "count": f"SELECT COUNT(*) FROM {name} WHERE outer_key = ?",
+            "exists": f"SELECT 1 FROM {name} WHERE outer_key = ? LIMIT 1",
+            "keys": f"SELECT inner_key FROM {name} WHERE outer_key = ? ORDER BY rowid",
+            "items": (
+                f"SELECT inner_key, value FROM {name} WHERE outer_key = ? ORDER BY rowid"
+            ),
+            "drop": f"DELETE FROM {name} WHERE outer_key = ?",
+            "outer_count": f"SELECT COUNT(DISTINCT outer_key) FROM {name}",
+            "outer_keys": (
+                f"SELECT outer_key FROM {name} GROUP BY outer_key ORDER BY MIN(rowid)"
+            ),
+        }
+
+    def execute(self, statement: str, *parameters: Any) -> sqlite3.Cursor:
+        return self._connection.execute(self._sql[statement], parameters)
+
+    def __getitem__(self, outer: Hashable) -> _NestedView:
+        encoded = _dump_key(outer)
+        if self.execute("exists", encoded).fetchone() is None:
+            raise KeyError(outer)
+        return _NestedView(self, encoded)
+
+    def get(self, outer: Hashable, default: Any = None) -> Any:
+        encoded = _dump_key(outer)
+        if self.execute("exists", encoded).fetchone() is None:
+            return default
+        return _NestedView(self, encoded)
+
+    def setdefault(self, outer: Hashable, default: Any = None) -> _NestedView:
+        view = _NestedView(self, _dump_key(outer))
+        for key, value in (default or {}).items():
+            view.setdefault(key, value)
+        return view
+
+    def __contains__(self, outer: object) -> bool:
+        return self.execute("exists", _dump_key(outer)).fetchone() is not None
+
+    def __setitem__(self, outer: Hashable, mapping: Any) -> None:
+        encoded = _dump_key(outer)
+        self.execute("drop", encoded)
+        view = _NestedView(self, encoded)
+        for key, value in mapping.items():
+            view[key] = value
+
+    def __delitem__(self, outer: Hashable) -> None:
+        # Emptying the last inner row already removed the outer key, so the
+        # in-memory ``del`` that follows is a no-op here.
+        self.execute("drop", _dump_key(outer))
+
+    def pop(self, outer: Hashable, *default: Any) -> Any:
+        encoded = _dump_key(outer)
+        if self.execute("exists", encoded).fetchone() is None:
+            if default:
+                return default[0]
+            raise KeyError(outer)
+        snapshot = dict(_NestedView(self, encoded).items())
+        self.execute("drop", encoded)
+        return snapshot
+
+    def __len__(self) -> int:
+        return self.execute("outer_count").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        rows = self.execute("outer_keys").fetchall()
+        return iter([_load_key(key) for (key,) in rows])
+
+    def items(self) -> list[tuple[Hashable, _NestedView]]:
+        return [(outer, self[outer]) for outer in self]
+
+    def values(self) -> list[_NestedView]:
+        return [view for _outer, view in self.items()]
+
+
+class _KeySet(MutableSet):
+    """Set of keys stored as single-column rows."""
+
+    def __init__(self, connection: sqlite3.Connection, name: str) -> None:
+        self._connection = connection
+        self._contains_sql = f"SELECT 1 FROM {name} WHERE key = ?"
+        self._add_sql = f"INSERT OR IGNORE INTO {name} (key) VALUES (?)"
+        self._discard_sql = f"DELETE FROM {name} WHERE key = ?"
+        self._keys_sql = f"SELECT key FROM {name} ORDER BY rowid"
+        self._name = name
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            self._connection.execute(self._contains_sql, (_dump_key(key),)).fetchone()
+            is not None
+        )
+
+    def add(self, key: Hashable) -> None:
+        self._connection.execute(self._add_sql, (_dump_key(key),))
+
+    def discard(self, key: Hashable) -> None:
+        self._connection.execute(self._discard_sql, (_dump_key(key),))
+
+    def __len__(self) -> int:
+        return _row_count(self._connection, self._name)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        rows = self._connection.execute(self._keys_sql).fetchall()
+        return iter([_load_key(key) for (key,) in rows])
+
+
+class _DeadlineIndex:
+    """One reaping phase of the shared ``deadlines`` table.
+
+    Mirrors the subset of :class:`relay_reaper.DeadlineReaper` the store uses:
+    one live deadline per ``(kind, key)``, popped in deadline order.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, phase: str) -> None:
+        self._connection = connection
+        self._phase = phase
+
+    def schedule(
+        self, kind: str, key: Hashable, deadline: float, *, earliest: bool = False
+    ) -> None:
+        # ``earliest`` keeps an already-scheduled earlier deadline.
+        self._connection.execute(
+            "INSERT INTO deadlines (phase, kind, key, deadline) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (phase, kind, key) DO UPDATE SET deadline = CASE WHEN ? "
+            "THEN MIN(deadline, excluded.deadline) ELSE excluded.deadline END",
+            (self._phase, kind, _dump_key(key), float(deadline), earliest),
+        )
+
+    def discard(self, kind: str, key: Hashable) -> None:
+        self._connection.execute(
+            "DELETE FROM deadlines WHERE phase = ? AND kind = ? AND key = ?",
+            (self._phase, kind, _dump_key(key)),
+        )
+
+    def deadline(self, kind: str, key: Hashable) -> float | None:
+        row = self._connection.execute(
+            "SELECT deadline FROM deadlines WHERE phase = ? AND kind = ? AND key = ?",
+            (self._phase, kind, _dump_key(key)),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def next_deadline(self) -> float | None:
+        return self._connection.execute(
+            "SELECT MIN(deadline) FROM deadlines WHERE phase = ?", (self._phase,)
+        ).fetchone()[0]
+
+    def pop_due(
+        self, now: float, *, limit: int | None = None
+    ) -> list[tuple[str, Hashable]]:
+        rows = self._connection.execute(
+            "SELECT rowid, kind, key FROM deadlines WHERE phase = ? AND deadline <= ? "
+            "ORDER BY deadline, rowid LIMIT ?",
+            (self._phase, now, -1 if limit is None else limit),
+        ).fetchall()
+        self._connection.executemany(
+            "DELETE FROM deadlines WHERE rowid = ?", [(rowid,) for rowid, _, _ in rows]
+        )
+        return [(kind, _load_key(key)) for _rowid, kind, key in rows]
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM deadlines WHERE phase = ?", (self._phase,)
+        ).fetchone()[0]
+
+
+def _scalar(name: str) -> property:
+    def getter(self: "SqliteRelayStateStore") -> int:
+        return self._connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (name,)
+        ).fetchone()[0]
+
+    def setter(self: "SqliteRelayStateStore", value: int) -> None:
+        self._connection.execute(
+            "UPDATE meta SET value = ? WHERE key = ?", (int(value), name)
+        )
+
+    return property(getter, setter)
+
+
+def _schema() -> list[str]:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)",
+        "CREATE TABLE IF NOT EXISTS deadlines ("
+        "phase TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, "
+        "deadline REAL NOT NULL, PRIMARY KEY (phase, kind, key))",
+        "CREATE INDEX IF NOT EXISTS deadlines_due ON deadlines (phase, deadline)",
+    ]
+    for name in _TABLES.values():
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {name} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+    for name in _NESTED_TABLES.values():
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {name} (outer_key TEXT NOT NULL, "
+            "inner_key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (outer_key, inner_key))"
+        )
+    for name in _SET_TABLES.values():
+        statements.append(f"CREATE TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY)")
+    statements.append(
+        "CREATE TABLE IF NOT EXISTS row_counts "
+        "(name TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+    )
+    # An upsert that updates in place fires neither trigger, so the counts
+    # stay exact.
+    for name in (*_TABLES.values(), *_SET_TABLES.values()):
+        statements.extend(
+            (
+                f"INSERT OR IGNORE INTO row_counts (name, count) VALUES ('{name}', 0)",
+                f"CREATE TRIGGER IF NOT EXISTS {name}_inserted AFTER INSERT ON {name} "
+                f"BEGIN UPDATE row_counts SET count = count + 1 WHERE name = '{name}'; END",
+                f"CREATE TRIGGER IF NOT EXISTS {name}_deleted AFTER DELETE ON {name} "
+                f"BEGIN UPDATE row_counts SET count = count - 1 WHERE name = '{name}'; END",
+            )
+        )
+    return statements
+
+
+class SqliteRelayStateStore(InMemoryRelayStateStore):
+    """Transactional SQLite implementation of :class:`RelayStateStore`.
+
+    Every store that opens ``path`` with the same namespace shares one state.
+    Construction never resets an existing database, so relay worker processes
+    can open it in any order.  ``path`` may be ``":memory:"`` for a private,
+    single-connection store.
+    """
+
+    def __init__(
+        self,
+        config: RelayStateStoreConfig,
+        path: str | os.PathLike[str],
+        *,
+        acknowledgement_key: bytes,
+        epoch_time: Callable[[], float] = time.time,
+        busy_timeout_seconds: float = DEFAULT_BUSY_TIMEOUT_SECONDS,
+    ) -> None:
+        if not isinstance(acknowledgement_key, bytes) or len(acknowledgement_key) < 32:
+            raise RelayStateStoreError(
+                "acknowledgement key must be bytes containing at least 256 bits"
+            )
+        self._config = config
+        self._acknowledgement_key = bytes(acknowledgement_key)
+        self._epoch_time = epoch_time
+        self._path = os.fspath(path)
+        # Autocommit mode: ``_Transaction`` issues BEGIN/COMMIT itself.
+        self._connection = sqlite3.connect(
+            self._path,
+            timeout=busy_timeout_seconds,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._lock = _Transaction(self._connection)
+            with self._lock:
+                for statement in _schema():
+                    self._connection.execute(statement)
+                self._initialize_meta_locked()
+        except BaseException:
+            self._connection.close()
+            raise
+        for attribute, name in _TABLES.items():
+            setattr(self, attribute, _Table(self._connection, name))
+        for attribute, name in _NESTED_TABLES.items():
+            setattr(self, attribute, _NestedTable(self._connection, name))
+        for attribute, name in _SET_TABLES.items():
+            setattr(self, attribute, _KeySet(self._connection, name))
+        for attribute, phase in _DEADLINE_PHASES.items():
+            setattr(self, attribute, _DeadlineIndex(self._connection, phase))
+
+    def _initialize_meta_locked(self) -> None:
+        stored = dict(self._connection.execute("SELECT key, value FROM meta"))
+        expected = {"namespace": self._config.namespace, "schema_version": SCHEMA_VERSION}
+        if not stored:
+            self._connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [*expected.items(), *((name, 0) for name in _SCALARS)],
+            )
+            return
+        for key, value in expected.items():
+            if stored.get(key) != value:
+                raise RelayStateStoreError(
+                    f"relay state database {key} does not match this store"
+                )
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def close(self) -> None:
+        """Close this process's connection; the database itself is kept."""
+
+        self._connection.close()
+
+    _next_registration_order = _scalar("_next_registration_order")
+    _next_claim_generation = _scalar("_next_claim_generation")
+    _fairness_activity = _scalar("_fairness_activity")
+    _next_queue_sequence = _scalar("_next_queue_sequence")
+
+
+__all__ = ["SCHEMA_VERSION", "SqliteRelayStateStore"]
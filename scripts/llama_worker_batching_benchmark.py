@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare llama worker throughput with and without continuous batching.
+
+``--requests`` rendered-prompt completions are sent to one llama worker
+subprocess (:class:`_SubprocessLlamaProxy`) from ``--sequences`` caller
+threads, first with ``TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES=1`` (commands
+run one after another) and then with it set to ``--sequences`` (commands share
+one llama context, each on its own KV sequence).
+
+The model is the stories15M tiny GGUF that CI provisions with
+``scripts/provision-ci-tiny-gguf.sh``; ``TOKEN_PLACE_ENV=testing`` lets the
+worker render prompts for it without chat-template metadata.  The report
+gives aggregate generated tokens per second and the speed-up from batching.
+It needs a real llama-cpp-python install; numbers are CPU-only unless the
+installed wheel offloads.
+
+Example::
+
+    scripts/provision-ci-tiny-gguf.sh /tmp/models/stories15M-q4_0.gguf
+    python scripts/llama_worker_batching_benchmark.py --model /tmp/models/stories15M-q4_0.gguf --sequences 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+_BATCH_SEQUENCES_ENV = "TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES"
+
+
+def _run(model_path: str, *, batch_sequences: int, callers: int, requests: int, max_tokens: int, n_ctx: int) -> dict:
+    from utils.llm.model_manager import _SubprocessLlamaProxy
+
+    os.environ[_BATCH_SEQUENCES_ENV] = str(batch_sequences)
+    proxy = _SubprocessLlamaProxy(model_path=model_path, n_ctx=n_ctx, verbose=False)
+    try:
+        def complete(index: int) -> int:
+            result = proxy.create_chat_completion_from_rendered_prompt(
+                [{"role": "user", "content": f"Once upon a time there was a story number {index}."}],
+                max_tokens=max_tokens,
+            )
+            return int(result["usage"]["completion_tokens"])
+
+        complete(-1)  # load weights and warm the page cache outside the timing
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            generated = sum(pool.map(complete, range(requests)))
+        elapsed = time.perf_counter() - started
+        return {
+            "worker_batch_sequences": proxy.batch_sequences,
+            "elapsed_seconds": round(elapsed, 3),
+            "generated_tokens": generated,
+            "tokens_per_second": round(generated / elapsed, 1),
+        }
+    finally:
+        proxy.close()
+
+
+def run_benchmark(*, model_path: str, sequences: int, requests: int, max_tokens: int) -> dict:
+    os.environ["TOKEN_PLACE_ENV"] = "testing"
+    # Every sequence must fit its prompt and output in the shared context.
+    n_ctx = max(512, sequences * (max_tokens + 64))
+    options = {"callers": sequences, "requests": requests, "max_tokens": max_tokens, "n_ctx": n_ctx}
+    sequential = _run(model_path, batch_sequences=1, **options)
+    batched = _run(model_path, batch_sequences=sequences, **options)
+    return {
+        "benchmark": "llama-worker-continuous-batching",
+        "model": os.path.basename(model_path),
+        "requests": requests,
+        "max_tokens": max_tokens,
+        "sequential": sequential,
+        "batched": batched,
+        "speedup": round(batched["tokens_per_second"] / sequential["tokens_per_second"], 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", required=True, help="path to the stories15M tiny GGUF")
+    parser.add_argument("--sequences", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--max-tokens", type=int, default=64)
+    args = parser.parse_args(argv)
+    report = run_benchmark(
+        model_path=os.path.abspath(args.model),
+        sequences=max(args.sequences, 2),
+        requests=max(args.requests, 1),
+        max_tokens=max(args.max_tokens, 1),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare llama worker frame throughput for frame protocols v2 and v3.
+
+One llama worker subprocess (:class:`_SubprocessLlamaProxy`) streams
+``--frames`` chat-completion chunks per run, first with
+``TOKEN_PLACE_LLAMA_WORKER_FRAME_PROTOCOL=2`` (prefixed JSON lines on the
+worker's stdout) and then with protocol v3 (length-prefixed records on a
+dedicated pipe, text-only chunks sent as bare text).  The worker imports a
+stub ``llama_cpp`` package written to a temporary directory that yields
+chunks as fast as it can, so the report isolates transport cost: frames per
+second delivered to the caller and the v3 speed-up.  No model or
+llama-cpp-python install is needed.  Protocol v3 is POSIX only.
+
+Example::
+
+    python scripts/llama_worker_frame_benchmark.py --frames 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+_FRAME_PROTOCOL_ENV = "TOKEN_PLACE_LLAMA_WORKER_FRAME_PROTOCOL"
+
+_STREAMING_STUB = '''
+class Llama:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def create_chat_completion(self, messages, stream=False, max_tokens=16, **kwargs):
+        base = {"id": "chatcmpl-benchmark", "object": "chat.completion.chunk", "created": 1, "model": "benchmark"}
+        for index in range(max_tokens):
+            yield {**base, "choices": [{"index": 0, "delta": {"content": " token%d" % index}, "finish_reason": None}]}
+'''
+
+
+def _run(*, protocol: int, frames: int) -> dict:
+    from utils.llm.model_manager import _SubprocessLlamaProxy
+
+    os.environ[_FRAME_PROTOCOL_ENV] = str(protocol)
+    proxy = _SubprocessLlamaProxy(model_path="benchmark.gguf", timeout_seconds=30)
+    try:
+        messages = [{"role": "user", "content": "benchmark"}]
+        sum(1 for _ in proxy.create_chat_completion(messages, stream=True, max_tokens=100))
+        started = time.perf_counter()
+        delivered = sum(1 for _ in proxy.create_chat_completion(messages, stream=True, max_tokens=frames))
+        elapsed = time.perf_counter() - started
+        return {
+            "frame_protocol": proxy.frame_protocol,
+            "frames": delivered,
+            "elapsed_seconds": round(elapsed, 3),
+            "frames_per_second": round(delivered / elapsed),
+        }
+    finally:
+        proxy.close()
+
+
+def run_benchmark(*, frames: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="token_place_frame_benchmark_") as stub_root:
+        package = Path(stub_root) / "llama_cpp"
+        package.mkdir()
+        (package / "__init__.py").write_text(_STREAMING_STUB, encoding="utf-8")
+        sys.path.insert(0, stub_root)
+        try:
+            v2 = _run(protocol=2, frames=frames)
+            v3 = _run(protocol=3, frames=frames)
+        finally:
+            sys.path.remove(stub_root)
+    return {
+        "benchmark": "llama-worker-frame-protocol",
+        "v2": v2,
+        "v3": v3,
+        "speedup": round(v3["frames_per_second"] / v2["frames_per_second"], 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=50000)
+    args = parser.parse_args(argv)
+    if os.name == "nt":
+        parser.error("frame protocol v3 is POSIX only")
+    report = run_benchmark(frames=max(args.frames, 1))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
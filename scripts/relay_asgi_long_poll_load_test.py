@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Park thousands of idle compute-node long-polls on one relay process in asyncio mode.
+
+The relay's ASGI app (``relay.create_asgi_app``, the callable uvicorn serves for
+``--server-mode asyncio``) is driven in-process through ``httpx.ASGITransport``.
+Each synthetic node polls from its own client address so the per-IP control
+plane limits behave as they would for a real fleet. Once every poll is parked
+the script records thread count and RSS, then enqueues work for a sample of
+nodes and reports wake-to-dispatch latency.
+
+Example::
+
+    python scripts/relay_asgi_long_poll_load_test.py --polls 10000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _capabilities() -> dict:
+    return {
+        "api_version": "v1",
+        "supported_model_ids": ["qwen3-8b-instruct"],
+        "active_context_tier": "8k-fast",
+        "maximum_total_context_tokens": 8192,
+        "default_output_token_reservation": 256,
+        "maximum_output_tokens": 512,
+        "max_concurrency": 1,
+        "backend_class": "cpu",
+    }
+
+
+def _client_address(index: int) -> tuple[str, int]:
+    return f"10.{index // 62500 % 250}.{index // 250 % 250}.{index % 250 + 1}", 40000
+
+
+def _rss_mib() -> float | None:
+    try:
+        import psutil
+    except ImportError:  # pragma: no cover - psutil ships with the relay requirements
+        return None
+    return round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 1)
+
+
+def _seed_nodes(relay, count: int) -> None:
+    now = datetime.now()
+    for index in range(count):
+        relay.known_servers[f"load-node-{index:06d}"] = {
+            "public_key": f"load-node-{index:06d}",
+            "last_ping": now,
+            "last_ping_duration": 3600,
+            relay.API_V1_SERVER_MARKER: True,
+            "capabilities": _capabilities(),
+        }
+
+
+async def run_load_test(*, polls: int, wake_sample: int, worker_threads: int, settle_timeout: float) -> dict:
+    import httpx
+    import relay
+
+    relay.known_servers.clear()
+    relay.client_inference_requests.clear()
+    _seed_nodes(relay, polls)
+    application = relay.create_asgi_app(max_workers=worker_threads)
+    clients = [
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=application, client=_client_address(index)),
+            base_url="http://relay.load",
+            timeout=None,
+        )
+        for index in range(polls)
+    ]
+    threads_before = threading.active_count()
+    rss_before = _rss_mib()
+    started = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(
+            client.post("/api/v1/relay/servers/poll", json={"server_public_key": f"load-node-{index:06d}"})
+        )
+        for index, client in enumerate(clients)
+    ]
+
+    parked = 0
+    settle_deadline = time.perf_counter() + settle_timeout
+    while time.perf_counter() < settle_deadline:
+        parked = application.parked_requests
+        if parked >= polls:
+            break
+        await asyncio.sleep(0.05)
+    parked_after_seconds = round(time.perf_counter() - started, 3)
+    threads_parked = threading.active_count()
+    rss_parked = _rss_mib()
+
+    wake_latencies_ms: list[float] = []
+    for index in range(0, polls, max(polls // max(wake_sample, 1), 1))[:wake_sample]:
+        enqueued = time.perf_counter()
+        response = await clients[index].post(
+            "/api/v1/relay/requests",
+            json={
+                "server_public_key": f"load-node-{index:06d}",
+                "client_public_key": f"load-client-{index}",
+                "request_id": f"load-request-{index}",
+                "chat_history": "ciphertext",
+                "cipherkey": "cipherkey",
+                "iv": "iv",
+            },
+        )
+        if response.status_code != 200:
+            continue
+        dispatched = await tasks[index]
+        if dispatched.status_code == 200 and dispatched.json().get("request_id") == f"load-request-{index}":
+            wake_latencies_ms.append((time.perf_counter() - enqueued) * 1000.0)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for client in clients:
+        await client.aclose()
+    application.close()
+    relay.known_servers.clear()
+    relay.client_inference_requests.clear()
+
+    ordered = sorted(wake_latencies_ms)
+    return {
+        "benchmark": "relay-asgi-idle-long-polls",
+        "polls": polls,
+        "parked": parked,
+        "parked_after_seconds": parked_after_seconds,
+        "worker_threads": worker_threads,
+        "threads_before": threads_before,
+        "threads_while_parked": threads_parked,
+        "rss_mib_before": rss_before,
+        "rss_mib_while_parked": rss_parked,
+        "woken": len(wake_latencies_ms),
+        "wake_to_dispatch_ms": {
+            "p50": round(statistics.median(ordered), 3) if ordered else None,
+            "p99": round(ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)], 3) if ordered else None,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=10_000)
+    parser.add_argument("--wake-sample", type=int, default=100)
+    parser.add_argument("--worker-threads", type=int, default=32)
+    parser.add_argument("--poll-wait-seconds", type=float, default=120.0)
+    parser.add_argument("--settle-timeout", type=float, default=300.0)
+    args = parser.parse_args(argv)
+    os.environ["TOKEN_PLACE_API_V1_RELAY_POLL_WAIT_SECONDS"] = str(args.poll_wait_seconds)
+    report = asyncio.run(
+        run_load_test(
+            polls=max(args.polls, 1),
+            wake_sample=max(args.wake_sample, 1),
+            worker_threads=max(args.worker_threads, 1),
+            settle_timeout=args.settle_timeout,
+        )
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["parked"] >= report["polls"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Measure compute-node throughput as API v1 work slots are added.
+
+``--requests`` API v1 envelopes are queued on an in-process relay (Flask test
+client) for one registered node.  A :class:`RelayClient` then drains them with
+``poll_api_v1_encrypted_work_continuously`` once per slot count in
+``--slots``, so claims follow free slots through the relay's ``max_items``
+poll.  Each claimed request runs the fake llama sidecar
+(``desktop-tauri/sidecar/fake_llama_sidecar.py``), which streams one token
+per prompt word every 50ms, and the node answers the relay when it exits.
+
+The report gives requests per second and the speed-up over one slot.  Decrypt,
+validation and the real llama worker are out of scope: the sidecar stands in
+for a generation backend that can serve several requests at once.
+
+Example::
+
+    python scripts/relay_client_concurrency_benchmark.py --requests 16 --slots 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.relay_reaper_benchmark import _reset  # noqa: E402
+
+SIDECAR = ROOT / "desktop-tauri" / "sidecar" / "fake_llama_sidecar.py"
+_NODE = "bench-concurrency-node"
+_CLIENT = "bench-concurrency-client"
+_UNLIMITED = "100000000/minute"
+
+
+def _capabilities(slots: int) -> dict:
+    return {
+        "api_version": "v1",
+        "supported_model_ids": ["qwen3-8b-instruct"],
+        "active_context_tier": "8k-fast",
+        "maximum_total_context_tokens": 8192,
+        "default_output_token_reservation": 256,
+        "maximum_output_tokens": 512,
+        "max_concurrency": slots,
+        "backend_class": "cpu",
+    }
+
+
+def _envelope(request_id: str) -> dict:
+    return {
+        "protocol": "tokenplace_api_v1_relay_e2ee",
+        "version": 1,
+        "client_public_key": _CLIENT,
+        "request_id": request_id,
+        "chat_history": "ciphertext",
+        "cipherkey": "cipherkey",
+        "iv": "iv",
+    }
+
+
+def _run_sidecar(model_path: str, prompt: str) -> None:
+    subprocess.run(  # nosec B603 - fixed interpreter and repo script
+        [sys.executable, str(SIDECAR), "--model", model_path, "--prompt", prompt],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _drain(relay, *, slots: int, requests: int, prompt: str, model_path: str) -> float:
+    from utils.networking import relay_client as relay_client_module
+
+    _reset(relay)
+    client = relay.app.test_client()
+    client.post(
+        "/api/v1/relay/servers/register",
+        json={"server_public_key": _NODE, "capabilities": _capabilities(slots)},
+    )
+    for index in range(requests):
+        client.post("/api/v1/relay/requests", json={"server_public_key": _NODE, **_envelope(f"bench-{slots}-{index}")})
+
+    os.environ["TOKEN_PLACE_API_V1_MAX_CONCURRENCY"] = str(slots)
+    node = relay_client_module.RelayClient("http://localhost", 5000, MagicMock(public_key_b64=_NODE), MagicMock())
+    node.stop_polling = False
+    answered = []
+    answered_lock = threading.Lock()
+    relay_url = "http://localhost:5000"
+
+    def poll(*, max_items=None):
+        claimed = node._pop_api_v1_claimed_backlog()
+        if claimed is not None:
+            return claimed
+        payload = client.post(
+            "/api/v1/relay/servers/poll",
+            json={"server_public_key": _NODE, "max_items": max_items or 1},
+        ).get_json()
+        batch = payload.pop("batch", [])
+        if not batch:
+            return {"message": "No requests available", "next_ping_in_x_seconds": 0.01}
+        node._stash_api_v1_claimed_backlog(relay_url, batch[1:])
+        return {**payload, "next_ping_in_x_seconds": 0}
+
+    def process(request_data):
+        _run_sidecar(model_path, prompt)
+        client.post("/api/v1/relay/responses", json=_envelope(request_data["request_id"]))
+        with answered_lock:
+            answered.append(request_data["request_id"])
+            if len(answered) == requests:
+                node.stop_polling = True
+
+    node.poll_api_v1_encrypted_work = poll
+    node.process_client_request_result = node.process_client_request = process
+    node.start = lambda: None
+    started = time.perf_counter()
+    node.poll_api_v1_encrypted_work_continuously()
+    elapsed = time.perf_counter() - started
+    if len(answered) != requests:
+        raise RuntimeError(f"answered {len(answered)} of {requests} requests with {slots} slots")
+    return elapsed
+
+
+def run_benchmark(*, requests: int, slot_counts: list[int], words: int) -> dict:
+    # The relay reads its rate limits at import; lift them so they do not cap the drain.
+    for name in ("API_RATE_LIMIT", "API_DAILY_QUOTA", "API_RELAY_CONTROL_PLANE_RATE_LIMIT", "API_RELAY_CONTROL_PLANE_IP_RATE_LIMIT"):
+        os.environ.setdefault(name, _UNLIMITED)
+    import relay
+
+    relay.app.config["TESTING"] = True
+    os.environ[relay.API_V1_POLL_WAIT_SECONDS_ENV] = "0"
+    prompt = " ".join(f"word{index}" for index in range(words))
+    results = {}
+    with tempfile.NamedTemporaryFile(prefix="bench-model-", suffix=".gguf") as model:
+        for slots in slot_counts:
+            elapsed = _drain(relay, slots=slots, requests=requests, prompt=prompt, model_path=model.name)
+            results[slots] = {
+                "elapsed_seconds": round(elapsed, 3),
+                "requests_per_second": round(requests / elapsed, 3),
+            }
+    _reset(relay)
+    baseline = results[slot_counts[0]]["requests_per_second"]
+    for summary in results.values():
+        summary["speedup"] = round(summary["requests_per_second"] / baseline, 2)
+    return {
+        "benchmark": "relay-client-work-slots",
+        "requests": requests,
+        "tokens_per_request": words,
+        "slots": {str(slots): summary for slots, summary in results.items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--slots", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--words", type=int, default=10)
+    args = parser.parse_args(argv)
+    # The relay and client log every claim at INFO; keep stdout to the JSON report.
+    logging.getLogger("tokenplace.relay").setLevel(logging.WARNING)
+    logging.disable(logging.INFO)
+    report = run_benchmark(
+        requests=max(args.requests, 1),
+        slot_counts=[max(slots, 1) for slots in args.slots],
+        words=max(args.words, 1),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
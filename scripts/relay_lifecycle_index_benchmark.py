@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Measure API v1 cancel and in-flight lookups with and without the lifecycle index.
+
+A synthetic fleet is seeded with ``--queued`` requests spread across
+``--nodes`` compute nodes; a quarter of them are moved to the owning node's
+in-flight table the way a poll dispatch does. Each request's pending entry
+records its owning node (the lifecycle index), so cancelling a queued or
+in-flight request only touches that node. The same fleet is then rebuilt with
+the owner stripped from every pending entry, which forces the pre-index scan
+over every queue and every node's in-flight table.
+
+Example::
+
+    python scripts/relay_lifecycle_index_benchmark.py --nodes 1000 --queued 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _reset(relay) -> None:
+    with relay.server_round_robin_lock:
+        relay.known_servers.clear()
+        relay.client_inference_requests.clear()
+    relay.client_pending_request_ids.clear()
+    relay.client_pending_request_deadlines.clear()
+    relay.client_terminal_request_ids.clear()
+    relay.client_terminal_outcomes.clear()
+    relay.api_v1_control_tombstones.clear()
+
+
+def _seed(relay, *, nodes: int, queued: int, indexed: bool) -> tuple[list, list]:
+    now = datetime.now()
+    deadline = time.monotonic() + 3600
+    for index in range(nodes):
+        relay.known_servers[f"bench-node-{index:06d}"] = {
+            "public_key": f"bench-node-{index:06d}",
+            "last_ping": now,
+            "last_ping_duration": 3600,
+            relay.API_V1_SERVER_MARKER: True,
+        }
+    queued_keys = []
+    in_flight_keys = []
+    for index in range(queued):
+        server_public_key = f"bench-node-{index % nodes:06d}"
+        client_public_key = f"bench-client-{index:06d}"
+        request_id = f"bench-request-{index:06d}"
+        relay._mark_request_pending(client_public_key, request_id, deadline_monotonic=deadline)
+        if indexed:
+            relay._index_api_v1_request_owner(client_public_key, request_id, server_public_key)
+        if index % 4 == 0:
+            relay.known_servers[server_public_key].setdefault("api_v1_in_flight_requests", {})[request_id] = {
+                "client_public_key": client_public_key,
+                "expires_at": deadline,
+                "started_at_monotonic": time.monotonic(),
+                "request_deadline_monotonic": deadline,
+            }
+            in_flight_keys.append((client_public_key, request_id))
+            continue
+        relay.client_inference_requests.setdefault(server_public_key, []).append({
+            "e2ee_v1": True,
+            "client_public_key": client_public_key,
+            "request_id": request_id,
+            "chat_history": "ciphertext",
+        })
+        queued_keys.append((client_public_key, request_id))
+    return queued_keys, in_flight_keys
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _summary(samples_ns: list[int]) -> dict:
+    micros = [sample / 1000.0 for sample in samples_ns]
+    return {
+        "p50_us": round(statistics.median(micros), 3),
+        "p99_us": round(_percentile(micros, 0.99), 3),
+        "mean_us": round(statistics.fmean(micros), 3),
+    }
+
+
+def _time_cancels(relay, keys, samples: int) -> list[int]:
+    step = max(len(keys) // max(samples, 1), 1)
+    timings = []
+    for client_public_key, request_id in keys[::step][:samples]:
+        started = time.perf_counter_ns()
+        relay._cancel_api_v1_request(client_public_key, request_id, status="cancelled", reason="requester_cancelled")
+        timings.append(time.perf_counter_ns() - started)
+    return timings
+
+
+def run_benchmark(*, nodes: int, queued: int, samples: int) -> dict:
+    import relay
+
+    results = {}
+    for mode, indexed in (("indexed", True), ("scan", False)):
+        _reset(relay)
+        queued_keys, in_flight_keys = _seed(relay, nodes=nodes, queued=queued, indexed=indexed)
+        results[mode] = {
+            "cancel_queued": _summary(_time_cancels(relay, queued_keys, samples)),
+            "cancel_in_flight": _summary(_time_cancels(relay, in_flight_keys, samples)),
+        }
+    _reset(relay)
+    return {
+        "benchmark": "relay-api-v1-lifecycle-index",
+        "nodes": nodes,
+        "queued": queued,
+        "samples": samples,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000)
+    parser.add_argument("--queued", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args(argv)
+    # Every cancel logs at INFO; keep stdout to the JSON report.
+    logging.getLogger("tokenplace.relay").setLevel(logging.WARNING)
+    report = run_benchmark(
+        nodes=max(args.nodes, 1),
+        queued=max(args.queued, 1),
+        samples=max(args.samples, 1),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
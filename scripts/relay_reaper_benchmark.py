@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Measure per-request relay housekeeping with the full sweep and the deadline reaper.
+
+A synthetic relay is seeded with ``--nodes`` live compute nodes (each holding
+one in-flight request) and ``--records`` retained lifecycle records split
+between pending requests, terminal records, and control tombstones. Every
+record is created through the relay's own helpers, so its expiry is scheduled
+on the reaper exactly as live traffic schedules it.
+
+``sweep`` times ``_evict_stale_servers()``, the O(total state) walk request
+handlers used to run; ``reap`` times ``_reap_due()``, which handlers run now
+and which only touches entries whose deadline has passed.
+
+Example::
+
+    python scripts/relay_reaper_benchmark.py --nodes 5000 --records 50000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _reset(relay) -> None:
+    with relay.server_round_robin_lock:
+        relay.known_servers.clear()
+        relay.client_inference_requests.clear()
+    relay.client_pending_request_ids.clear()
+    relay.client_pending_request_deadlines.clear()
+    relay.client_terminal_request_ids.clear()
+    relay.client_terminal_outcomes.clear()
+    relay.api_v1_control_tombstones.clear()
+    relay.relay_reaper.clear()
+
+
+def _seed(relay, *, nodes: int, records: int) -> None:
+    now = datetime.now()
+    deadline = time.monotonic() + 3600
+    for index in range(nodes):
+        server_public_key = f"bench-node-{index:06d}"
+        relay.known_servers[server_public_key] = {
+            "public_key": server_public_key,
+            "last_ping": now,
+            "last_ping_duration": 3600,
+            relay.API_V1_SERVER_MARKER: True,
+            "api_v1_in_flight_requests": {
+                f"bench-in-flight-{index:06d}": {
+                    "client_public_key": f"bench-in-flight-client-{index:06d}",
+                    "expires_at": deadline,
+                    "started_at_monotonic": time.monotonic(),
+                    "request_deadline_monotonic": deadline,
+                },
+            },
+        }
+        relay.relay_reaper.schedule("in_flight", (server_public_key, f"bench-in-flight-{index:06d}"), deadline)
+    for index in range(records):
+        client_public_key = f"bench-client-{index % 1000:04d}"
+        request_id = f"bench-request-{index:06d}"
+        kind = index % 3
+        if kind == 0:
+            relay._mark_request_pending(client_public_key, request_id, deadline_monotonic=deadline)
+        elif kind == 1:
+            relay._mark_request_terminal(client_public_key, request_id, status="cancelled", reason="requester_cancelled")
+        else:
+            relay._add_api_v1_control_tombstone(
+                f"bench-node-{index % nodes:06d}",
+                request_id,
+                client_public_key,
+                status="cancelled",
+                reason="requester_cancelled",
+                deadline_monotonic=deadline,
+                owner_digest="bench-digest",
+            )
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _summary(samples_ns: list[int]) -> dict:
+    micros = [sample / 1000.0 for sample in samples_ns]
+    return {
+        "p50_us": round(statistics.median(micros), 3),
+        "p99_us": round(_percentile(micros, 0.99), 3),
+        "mean_us": round(statistics.fmean(micros), 3),
+    }
+
+
+def _time_calls(function, samples: int) -> list[int]:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter_ns()
+        function()
+        timings.append(time.perf_counter_ns() - started)
+    return timings
+
+
+def run_benchmark(*, nodes: int, records: int, samples: int) -> dict:
+    import relay
+
+    _reset(relay)
+    _seed(relay, nodes=nodes, records=records)
+    scheduled = len(relay.relay_reaper)
+    results = {
+        "sweep": _summary(_time_calls(relay._evict_stale_servers, samples)),
+        "reap": _summary(_time_calls(relay._reap_due, samples)),
+    }
+    retained = len(relay.known_servers)
+    _reset(relay)
+    return {
+        "benchmark": "relay-housekeeping-reaper",
+        "nodes": nodes,
+        "records": records,
+        "samples": samples,
+        "scheduled_deadlines": scheduled,
+        "retained_nodes": retained,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=5_000)
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args(argv)
+    # Seeding logs every terminal transition at INFO; keep stdout to the JSON report.
+    logging.getLogger("tokenplace.relay").setLevel(logging.WARNING)
+    report = run_benchmark(
+        nodes=max(args.nodes, 1),
+        records=max(args.records, 0),
+        samples=max(args.samples, 1),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Measure API v1 best-fit selection latency against synthetic compute-node fleets.
+
+Every fake node is registered through ``relay.known_servers`` so the persistent
+scheduler index is maintained exactly as it is for live traffic. Each selection
+queues one synthetic envelope on the chosen node, which keeps load scores and
+round-robin cursors moving between iterations. ``--compare-linear`` also times
+the pre-index full scan (one ``_api_v1_scheduler_candidate`` call per node) on
+the same fleet for reference.
+
+Example::
+
+    python scripts/relay_scheduler_benchmark.py --nodes 10 1000 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+DEFAULT_NODE_COUNTS = (10, 1_000, 10_000)
+MODEL_IDS = ("qwen3-8b-instruct", "llama-3.1-8b-instruct")
+
+
+def _capabilities(tier: str, model_id: str) -> dict:
+    return {
+        "api_version": "v1",
+        "supported_model_ids": [model_id],
+        "active_context_tier": tier,
+        "maximum_total_context_tokens": 65536 if tier == "64k-full" else 8192,
+        "default_output_token_reservation": 1024,
+        "maximum_output_tokens": 1024,
+        "max_concurrency": 4,
+        "backend_class": "cpu",
+    }
+
+
+def _reset(relay) -> None:
+    with relay.server_round_robin_lock:
+        relay.known_servers.clear()
+        relay.client_inference_requests.clear()
+        relay.api_v1_filtered_round_robin_next_positions.clear()
+        relay.server_round_robin_next_index = 0
+
+
+def _populate(relay, node_count: int) -> None:
+    now = datetime.now()
+    for index in range(node_count):
+        tier = "64k-full" if index % 4 == 0 else "8k-fast"
+        relay.known_servers[f"bench-node-{index:06d}"] = {
+            "public_key": f"bench-node-{index:06d}",
+            "last_ping": now,
+            "last_ping_duration": 3600,
+            relay.API_V1_SERVER_MARKER: True,
+            "capabilities": _capabilities(tier, MODEL_IDS[index % len(MODEL_IDS)]),
+        }
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _summary(samples_ns: list[int]) -> dict:
+    micros = [sample / 1000.0 for sample in samples_ns]
+    return {
+        "p50_us": round(statistics.median(micros), 3),
+        "p99_us": round(_percentile(micros, 0.99), 3),
+        "mean_us": round(statistics.fmean(micros), 3),
+    }
+
+
+def _linear_scan(relay, model: str, context_tier: str) -> None:
+    now_monotonic = time.monotonic()
+    with relay.server_round_robin_lock:
+        for registration_index, (server_public_key, payload) in enumerate(list(relay.known_servers.items())):
+            relay._api_v1_scheduler_candidate(
+                server_public_key,
+                payload,
+                requested_model=model,
+                requested_context_tier=context_tier,
+                registration_index=registration_index,
+                now_monotonic=now_monotonic,
+                include_capacity_limited=True,
+            )
+
+
+def run_benchmark(node_counts, *, selections: int, compare_linear: bool) -> dict:
+    import relay
+
+    results = []
+    for node_count in node_counts:
+        _reset(relay)
+        _populate(relay, node_count)
+        indexed_ns: list[int] = []
+        for iteration in range(selections):
+            model = MODEL_IDS[iteration % len(MODEL_IDS)]
+            started = time.perf_counter_ns()
+            server_public_key, _selection, _payload = relay._select_best_fit_server_key(
+                model=model,
+                context_tier="8k-fast",
+            )
+            indexed_ns.append(time.perf_counter_ns() - started)
+            if server_public_key is None:
+                continue
+            with relay.client_inference_requests_changed:
+                queue = relay.client_inference_requests.setdefault(server_public_key, [])
+                queue.append({"e2ee_v1": True, "request_id": f"bench-{iteration}"})
+                if len(queue) > 2:
+                    queue.clear()
+            relay._refresh_api_v1_scheduler_entry(server_public_key)
+        row = {"nodes": node_count, "selections": selections, "indexed": _summary(indexed_ns)}
+        if compare_linear:
+            linear_ns: list[int] = []
+            for iteration in range(max(1, min(selections, 200))):
+                started = time.perf_counter_ns()
+                _linear_scan(relay, MODEL_IDS[iteration % len(MODEL_IDS)], "8k-fast")
+                linear_ns.append(time.perf_counter_ns() - started)
+            row["linear_scan"] = _summary(linear_ns)
+        results.append(row)
+    _reset(relay)
+    return {"benchmark": "relay-api-v1-scheduler-selection", "results": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=list(DEFAULT_NODE_COUNTS))
+    parser.add_argument("--selections", type=int, default=2000)
+    parser.add_argument("--no-compare-linear", dest="compare_linear", action="store_false")
+    args = parser.parse_args(argv)
+    report = run_benchmark(args.nodes, selections=max(args.selections, 1), compare_linear=args.compare_linear)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
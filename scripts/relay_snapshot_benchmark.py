@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Measure the cost of journaling relay coordination state to disk.
+
+A synthetic relay is seeded like ``relay_reaper_benchmark`` (``--nodes`` live
+compute nodes and ``--records`` retained lifecycle records), then:
+
+``flush``
+    times :meth:`RelaySnapshotter.flush` with 0, 1, 10 and 100 changed
+    entries.  The idle flush is the fixed cost paid every interval while the
+    relay locks are held; the rest divided by the change count is the journal
+    cost per transition (encode, append, fsync).  ``full_scan`` is the
+    periodic safety-net flush that re-encodes every table.
+``relay_cycle``
+    runs ``--cycles`` API v1 relay lifecycles (queue, poll, respond, retrieve)
+    through the Flask test client with snapshots off and then on, journaling
+    every ``--interval`` seconds in the background, and reports the added
+    microseconds per state transition.
+
+Example::
+
+    python scripts/relay_snapshot_benchmark.py --nodes 1000 --records 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.relay_reaper_benchmark import _reset, _seed, _summary  # noqa: E402
+
+# Queue, claim, respond and retrieve each change relay state once.
+_TRANSITIONS_PER_CYCLE = 4
+_UNLIMITED = "100000000/minute"
+
+
+def _capabilities() -> dict:
+    return {
+        "api_version": "v1",
+        "supported_model_ids": ["qwen3-8b-instruct"],
+        "active_context_tier": "8k-fast",
+        "maximum_total_context_tokens": 8192,
+        "default_output_token_reservation": 256,
+        "maximum_output_tokens": 512,
+        "max_concurrency": 1,
+        "backend_class": "cpu",
+    }
+
+
+def _envelope(request_id: str) -> dict:
+    return {
+        "client_public_key": "bench-cycle-client",
+        "request_id": request_id,
+        "chat_history": "ciphertext",
+        "cipherkey": "cipherkey",
+        "iv": "iv",
+    }
+
+
+def _time_flushes(relay, snapshotter, changes: int, samples: int) -> list[int]:
+    timings = []
+    for sample in range(samples):
+        for index in range(changes):
+            relay._mark_request_pending(f"bench-flush-client-{index}", f"bench-flush-{sample}-{index}")
+        started = time.perf_counter_ns()
+        snapshotter.flush()
+        timings.append(time.perf_counter_ns() - started)
+    return timings
+
+
+def _relay_cycles(relay, cycles: int) -> float:
+    client = relay.app.test_client()
+    client.post(
+        "/api/v1/relay/servers/register",
+        json={"server_public_key": "bench-cycle-node", "capabilities": _capabilities()},
+    )
+    started = time.perf_counter()
+    for index in range(cycles):
+        request_id = f"bench-cycle-{index}"
+        client.post("/api/v1/relay/requests", json={"server_public_key": "bench-cycle-node", **_envelope(request_id)})
+        client.post("/api/v1/relay/servers/poll", json={"server_public_key": "bench-cycle-node"})
+        client.post("/api/v1/relay/responses", json=_envelope(request_id))
+        client.post(
+            "/api/v1/relay/responses/retrieve",
+            json={"client_public_key": "bench-cycle-client", "request_id": request_id},
+        )
+    return time.perf_counter() - started
+
+
+def run_benchmark(*, nodes: int, records: int, samples: int, cycles: int, interval: float) -> dict:
+    # The relay reads its rate limits at import; lift them so they do not cap the cycle loop.
+    for name in ("API_RATE_LIMIT", "API_DAILY_QUOTA", "API_RELAY_CONTROL_PLANE_RATE_LIMIT", "API_RELAY_CONTROL_PLANE_IP_RATE_LIMIT"):
+        os.environ.setdefault(name, _UNLIMITED)
+    import relay
+
+    relay.app.config["TESTING"] = True
+    os.environ[relay.API_V1_POLL_WAIT_SECONDS_ENV] = "0"
+    with tempfile.TemporaryDirectory(prefix="relay-snapshot-bench-") as directory:
+        _reset(relay)
+        os.environ["TOKEN_PLACE_RELAY_SNAPSHOT_DIR"] = os.path.join(directory, "flush")
+        os.environ["TOKEN_PLACE_RELAY_SNAPSHOT_INTERVAL_SECONDS"] = "3600"
+        snapshotter = relay._start_relay_snapshots()
+        _seed(relay, nodes=nodes, records=records)
+        snapshotter.flush()
+        flush = {}
+        for changes in (0, 1, 10, 100):
+            timings = _time_flushes(relay, snapshotter, changes, samples)
+            summary = _summary(timings)
+            if changes:
+                summary["per_transition_us"] = round(statistics.median(timings) / 1000.0 / changes, 3)
+            flush[f"changes_{changes}"] = summary
+        full_scan = []
+        for _ in range(samples):
+            snapshotter._next_full_scan = 0.0
+            full_scan.extend(_time_flushes(relay, snapshotter, 0, 1))
+        flush["full_scan"] = _summary(full_scan)
+        snapshotter.stop()
+        relay.relay_snapshotter = None
+
+        _reset(relay)
+        baseline = _relay_cycles(relay, cycles)
+        _reset(relay)
+        os.environ["TOKEN_PLACE_RELAY_SNAPSHOT_DIR"] = os.path.join(directory, "cycle")
+        os.environ["TOKEN_PLACE_RELAY_SNAPSHOT_INTERVAL_SECONDS"] = str(interval)
+        snapshotter = relay._start_relay_snapshots()
+        journaled = _relay_cycles(relay, cycles)
+        snapshotter.stop()
+        relay.relay_snapshotter = None
+        stats = dict(snapshotter.stats)
+        _reset(relay)
+    transitions = cycles * _TRANSITIONS_PER_CYCLE
+    return {
+        "benchmark": "relay-snapshot-journal",
+        "nodes": nodes,
+        "records": records,
+        "samples": samples,
+        "flush": flush,
+        "relay_cycle": {
+            "cycles": cycles,
+            "interval_seconds": interval,
+            "baseline_us_per_transition": round(baseline / transitions * 1e6, 3),
+            "journaled_us_per_transition": round(journaled / transitions * 1e6, 3),
+            "overhead_us_per_transition": round((journaled - baseline) / transitions * 1e6, 3),
+            "journal": stats,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000)
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--cycles", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args(argv)
+    # Seeding and the relay cycle log every transition at INFO; keep stdout to the JSON report.
+    logging.getLogger("tokenplace.relay").setLevel(logging.WARNING)
+    logging.getLogger("relay.snapshot").setLevel(logging.WARNING)
+    report = run_benchmark(
+        nodes=max(args.nodes, 1),
+        records=max(args.records, 0),
+        samples=max(args.samples, 1),
+        cycles=max(args.cycles, 1),
+        interval=max(args.interval, 0.05),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
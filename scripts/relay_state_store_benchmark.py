@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Measure ``InMemoryRelayStateStore.select_and_reserve`` throughput at record maxima.
+
+A store is filled through its public transitions with ``--records`` of each
+record type: live reservations, queued requests, retained responses (each with
+its terminal record), control tombstones (each with its cancelled terminal
+record), and node tombstones. Every store bound is configured to exactly what
+that fill needs, so the store runs at its configured maxima. The clock is
+frozen, so nothing expires and every operation pays only for the reap check.
+
+``empty`` times the same selections against a store holding only the compute
+nodes; ``full`` times them against the filled store.
+
+``--mode churn`` instead fills every node's queue to ``--depth`` and times
+queue churn: cancelling a random queued request and enqueueing its
+replacement, and claiming the head of a queue and accepting its response.
+
+Example::
+
+    python scripts/relay_state_store_benchmark.py --records 4096 --selections 2000
+    python scripts/relay_state_store_benchmark.py --mode churn --nodes 32 --depth 128
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import secrets
+import statistics
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from relay_state_store import (  # noqa: E402
+    ComputeNodeCapabilities,
+    EncryptedRequestEnvelope,
+    EncryptedResponseEnvelope,
+    InMemoryRelayStateStore,
+    RelayStateStoreConfig,
+)
+
+_EPOCH = 1_700_000_000.0
+_MODEL_ID = "qwen3-8b-instruct"
+_TIER = "8k-fast"
+_PER_NODE_SLOTS = 128
+
+
+class _FrozenClock:
+    def __call__(self) -> float:
+        return _EPOCH
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _capabilities() -> ComputeNodeCapabilities:
+    return ComputeNodeCapabilities(
+        supported_model_ids=(_MODEL_ID,),
+        active_context_tier=_TIER,
+        maximum_total_context_tokens=8192,
+        default_output_token_reservation=1024,
+        maximum_output_tokens=2048,
+        max_concurrency=_PER_NODE_SLOTS,
+    )
+
+
+def _envelope(cls):
+    return cls(
+        protocol="tokenplace_api_v1_relay_e2ee",
+        version=1,
+        ciphertext="ciphertext",
+        cipherkey="cipherkey",
+        iv="iv",
+    )
+
+
+def _store(*, nodes: int, records: int, selections: int) -> InMemoryRelayStateStore:
+    lifecycles = 2 * records + selections
+    config = RelayStateStoreConfig(
+        namespace="bench.state-store",
+        max_compute_nodes=nodes + 1,
+        max_reservations=max(records + selections, 1),
+        max_reservations_per_node=_PER_NODE_SLOTS,
+        max_queue_depth_per_node=_PER_NODE_SLOTS,
+        max_request_lifecycles=max(lifecycles, 1),
+        max_queued_requests=max(records, 1),
+        max_claims=max(records, 1),
+        max_claims_per_node=_PER_NODE_SLOTS,
+        max_responses=max(records, 1),
+        max_terminal_records=max(2 * records, 1),
+        max_control_tombstones=max(records, 1),
+        max_control_tombstones_per_node=max(records, 1),
+        max_node_tombstones=max(records, 1),
+        max_removed_owner_fences=max(records, 1),
+        max_pending_node_transitions=max(records, 1),
+    )
+    store = InMemoryRelayStateStore(
+        config,
+        acknowledgement_key=secrets.token_bytes(32),
+        epoch_time=_FrozenClock(),
+    )
+    capabilities = _capabilities()
+    for index in range(nodes):
+        store.register(f"bench-node-{index:06d}", capabilities, _digest(f"owner-{index}"))
+    return store
+
+
+def _select(store, client_public_key: str, request_id: str):
+    return store.select_and_reserve(
+        client_public_key,
+        request_id,
+        _MODEL_ID,
+        _TIER,
+        _EPOCH + 1800.0,
+        cancellation_token=f"cancel-{request_id}",
+    )
+
+
+def _enqueue(store, client_public_key: str, request_id: str) -> str:
+    selection = _select(store, client_public_key, request_id)
+    store.enqueue_encrypted_request(
+        client_public_key,
+        request_id,
+        selection.reservation_token,
+        selection.selected_node_id,
+        _MODEL_ID,
+        _TIER,
+        _EPOCH + 1800.0,
+        _envelope(EncryptedRequestEnvelope),
+        f"cancel-{request_id}",
+    )
+    return selection.selected_node_id
+
+
+def _claim(store, node_id: str):
+    owner = _digest(f"owner-{int(node_id.rsplit('-', 1)[1])}")
+    return owner, store.claim_queued_request(node_id, owner, "bench-worker")
+
+
+def _fill(store, *, nodes: int, records: int) -> None:
+    for index in range(records):
+        client, request_id = f"bench-response-client-{index}", f"bench-response-{index}"
+        node_id = _enqueue(store, client, request_id)
+        owner, claim = _claim(store, node_id)
+        store.accept_encrypted_response(
+            node_id,
+            owner,
+            "bench-worker",
+            claim.client_public_key,
+            claim.request_id,
+            claim.generation,
+            _envelope(EncryptedResponseEnvelope),
+        )
+    for index in range(records):
+        client, request_id = f"bench-tombstone-client-{index}", f"bench-tombstone-{index}"
+        node_id = _enqueue(store, client, request_id)
+        _owner, claim = _claim(store, node_id)
+        store.cancel_or_expire_request(
+            claim.client_public_key, claim.request_id, f"cancel-{claim.request_id}"
+        )
+    for index in range(records):
+        _enqueue(store, f"bench-queued-client-{index}", f"bench-queued-{index}")
+    for index in range(records):
+        _select(store, f"bench-reserved-client-{index}", f"bench-reserved-{index}")
+    capabilities = _capabilities()
+    for index in range(records):
+        node_id = f"bench-removed-node-{index:06d}"
+        store.register(node_id, capabilities, _digest(node_id))
+        store.unregister(node_id, _digest(node_id))
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _summary(samples_ns: list[int]) -> dict:
+    micros = [sample / 1000.0 for sample in samples_ns]
+    return {
+        "p50_us": round(statistics.median(micros), 3),
+        "p99_us": round(_percentile(micros, 0.99), 3),
+        "mean_us": round(statistics.fmean(micros), 3),
+    }
+
+
+def _time_selections(store, selections: int) -> dict:
+    timings = []
+    for index in range(selections):
+        started = time.perf_counter_ns()
+        _select(store, f"bench-measured-client-{index}", f"bench-measured-{index}")
+        timings.append(time.perf_counter_ns() - started)
+    return {
+        "selections_per_second": round(selections / (sum(timings) / 1e9), 1),
+        **_summary(timings),
+    }
+
+
+def run_benchmark(*, nodes: int, records: int, selections: int) -> dict:
+    if (2 * records + selections) > nodes * _PER_NODE_SLOTS:
+        raise ValueError("not enough per-node slots for the requested fill")
+    empty = _store(nodes=nodes, records=records, selections=selections)
+    full = _store(nodes=nodes, records=records, selections=selections)
+    _fill(full, nodes=nodes, records=records)
+    retained = {
+        "reservations": len(full.list_reservations()),
+        "queued": sum(
+            len(full.queued_requests(f"bench-node-{index:06d}"))
+            for index in range(nodes)
+        ),
+        "responses": len(full.response_records()),
+        "terminals": len(full.terminal_records()),
+        "control_tombstones": len(full.control_tombstones()),
+        "node_tombstones": len(full.node_tombstones()),
+    }
+    return {
+        "benchmark": "relay-state-store-select-and-reserve",
+        "nodes": nodes,
+        "records": records,
+        "selections": selections,
+        "retained": retained,
+        "results": {
+            "empty": _time_selections(empty, selections),
+            "full": _time_selections(full, selections),
+        },
+    }
+
+
+def run_churn_benchmark(*, nodes: int, depth: int, cycles: int, seed: int = 0) -> dict:
+    if not 1 <= depth <= _PER_NODE_SLOTS:
+        raise ValueError(f"depth must be between 1 and {_PER_NODE_SLOTS}")
+    queued_total = nodes * depth
+    config = RelayStateStoreConfig(
+        namespace="bench.state-store-churn",
+        max_compute_nodes=nodes,
+        max_reservations_per_node=_PER_NODE_SLOTS,
+        max_queue_depth_per_node=depth,
+        max_reservations=queued_total,
+        max_request_lifecycles=queued_total,
+        max_queued_requests=queued_total,
+        max_claims=queued_total,
+        max_claims_per_node=_PER_NODE_SLOTS,
+        max_responses=max(cycles, 1),
+        max_terminal_records=max(2 * cycles, 1),
+    )
+    store = InMemoryRelayStateStore(
+        config,
+        acknowledgement_key=secrets.token_bytes(32),
+        epoch_time=_FrozenClock(),
+    )
+    capabilities = replace(_capabilities(), max_concurrency=depth)
+    for index in range(nodes):
+        store.register(f"bench-node-{index:06d}", capabilities, _digest(f"owner-{index}"))
+    live: list[tuple[str, str]] = []
+    for index in range(queued_total):
+        key = (f"bench-churn-client-{index}", f"bench-churn-{index}")
+        _enqueue(store, *key)
+        live.append(key)
+
+    rng = random.Random(seed)
+    serial = queued_total
+    cancel_timings: list[int] = []
+    claim_timings: list[int] = []
+    for _ in range(cycles):
+        position = rng.randrange(len(live))
+        client, request_id = live[position]
+        replacement = (f"bench-churn-client-{serial}", f"bench-churn-{serial}")
+        serial += 1
+        started = time.perf_counter_ns()
+        store.cancel_or_expire_request(client, request_id, f"cancel-{request_id}")
+        _enqueue(store, *replacement)
+        cancel_timings.append(time.perf_counter_ns() - started)
+        live[position] = replacement
+
+        node_id = f"bench-node-{rng.randrange(nodes):06d}"
+        replacement = (f"bench-churn-client-{serial}", f"bench-churn-{serial}")
+        serial += 1
+        started = time.perf_counter_ns()
+        owner, claim = _claim(store, node_id)
+        store.accept_encrypted_response(
+            node_id,
+            owner,
+            "bench-worker",
+            claim.client_public_key,
+            claim.request_id,
+            claim.generation,
+            _envelope(EncryptedResponseEnvelope),
+        )
+        _enqueue(store, *replacement)
+        claim_timings.append(time.perf_counter_ns() - started)
+        live[live.index((claim.client_public_key, claim.request_id))] = replacement
+    return {
+        "benchmark": "relay-state-store-queue-churn",
+        "nodes": nodes,
+        "depth": depth,
+        "cycles": cycles,
+        "results": {
+            "cancel_and_enqueue": _summary(cancel_timings),
+            "claim_accept_and_enqueue": _summary(claim_timings),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("select", "churn"), default="select")
+    parser.add_argument("--nodes", type=int, default=None)
+    parser.add_argument("--records", type=int, default=4096)
+    parser.add_argument("--selections", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=_PER_NODE_SLOTS)
+    parser.add_argument("--cycles", type=int, default=2000)
+    args = parser.parse_args(argv)
+    if args.mode == "churn":
+        report = run_churn_benchmark(
+            nodes=max(args.nodes or 32, 1),
+            depth=args.depth,
+            cycles=max(args.cycles, 1),
+        )
+    else:
+        report = run_benchmark(
+            nodes=max(args.nodes or 128, 1),
+            records=max(args.records, 0),
+            selections=max(args.selections, 1),
+        )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
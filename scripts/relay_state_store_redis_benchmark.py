@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Measure ``RedisRelayStateStore`` throughput and commit conflicts against the number of replicas.
+
+Every replica opens its own store and client on one shared server and
+registers its own compute node for its own model, so replicas share only the
+store, never a client or a queue. Each cycle runs four store transitions on
+that node: ``select_and_reserve``, ``enqueue_encrypted_request``,
+``claim_queued_request`` and ``accept_encrypted_response``. The report gives
+the aggregate transitions per second for each ``--replicas`` count and how
+many transition attempts were re-run because a commit check failed.
+
+Replicas are threads. Without ``--redis-url`` they share an in-process
+fakeredis server, which serializes every command, so only the conflict counts
+are meaningful; point ``--redis-url`` at a Redis 7.4+ or Valkey 9+ server for
+throughput numbers.
+
+Example::
+
+    python scripts/relay_state_store_redis_benchmark.py --replicas 1 2 4 8 --cycles 200
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import secrets
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from relay_state_store import (  # noqa: E402
+    ComputeNodeCapabilities,
+    EncryptedRequestEnvelope,
+    EncryptedResponseEnvelope,
+    RelayStateStoreConfig,
+)
+from relay_state_store_redis import RedisRelayStateStore  # noqa: E402
+
+_EPOCH = 1_700_000_000.0
+_TIER = "8k-fast"
+_TRANSITIONS_PER_CYCLE = 4
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _config(namespace: str, *, replicas: int, cycles: int) -> RelayStateStoreConfig:
+    total = max(replicas * cycles, 1)
+    return RelayStateStoreConfig(
+        namespace=namespace,
+        max_compute_nodes=replicas,
+        max_reservations=total,
+        max_request_lifecycles=total,
+        max_queued_requests=total,
+        max_claims=total,
+        max_responses=total,
+        max_terminal_records=total,
+    )
+
+
+def _envelope(cls):
+    return cls(
+        protocol="tokenplace_api_v1_relay_e2ee",
+        version=1,
+        ciphertext="ciphertext",
+        cipherkey="cipherkey",
+        iv="iv",
+    )
+
+
+def _run_cycles(store, replica: int, cycles: int) -> None:
+    model_id = f"bench-model-{replica}"
+    node_id = f"bench-node-{replica:03d}"
+    owner = _digest(node_id)
+    for index in range(cycles):
+        client = f"bench-client-{replica}-{index}"
+        request_id = f"bench-{replica}-{index}"
+        selection = store.select_and_reserve(
+            client, request_id, model_id, _TIER, _EPOCH + 1800.0
+        )
+        store.enqueue_encrypted_request(
+            client,
+            request_id,
+            selection.reservation_token,
+            node_id,
+            model_id,
+            _TIER,
+            _EPOCH + 1800.0,
+            _envelope(EncryptedRequestEnvelope),
+            f"cancel-{request_id}",
+        )
+        claim = store.claim_queued_request(node_id, owner, "bench-worker")
+        store.accept_encrypted_response(
+            node_id,
+            owner,
+            "bench-worker",
+            client,
+            request_id,
+            claim.generation,
+            _envelope(EncryptedResponseEnvelope),
+        )
+
+
+def _register(store, replica: int) -> None:
+    node_id = f"bench-node-{replica:03d}"
+    store.register(
+        node_id,
+        ComputeNodeCapabilities(
+            supported_model_ids=(f"bench-model-{replica}",),
+            active_context_tier=_TIER,
+            maximum_total_context_tokens=8192,
+            default_output_token_reservation=1024,
+            maximum_output_tokens=2048,
+            max_concurrency=1,
+        ),
+        _digest(node_id),
+    )
+
+
+def _client_factory(redis_url: str | None):
+    if redis_url is not None:
+        import redis
+
+        return lambda: redis.Redis.from_url(redis_url)
+    import fakeredis
+
+    server = fakeredis.FakeServer(version=(7, 4))
+    return lambda: fakeredis.FakeStrictRedis(server=server)
+
+
+def _run_replicas(new_client, replicas: int, cycles: int) -> dict:
+    namespace = f"bench.state-store-redis-{secrets.token_hex(4)}"
+    config = _config(namespace, replicas=replicas, cycles=cycles)
+    key = secrets.token_bytes(32)
+    stores = [
+        RedisRelayStateStore(
+            config, new_client(), acknowledgement_key=key, epoch_time=lambda: _EPOCH
+        )
+        for _ in range(replicas)
+    ]
+    for replica, store in enumerate(stores):
+        _register(store, replica)
+        store._lock.conflicts = 0
+    start = threading.Barrier(replicas + 1)
+    errors: list[BaseException] = []
+
+    def _worker(replica: int) -> None:
+        start.wait()
+        try:
+            _run_cycles(stores[replica], replica, cycles)
+        except BaseException as exc:  # reported below
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=_worker, args=(replica,)) for replica in range(replicas)
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    client = stores[0]._client
+    for name in list(client.scan_iter(match=f"{stores[0].prefix}*")):
+        client.delete(name)
+    for store in stores:
+        store.close()
+    if errors:
+        raise RuntimeError("a benchmark replica failed") from errors[0]
+    transitions = replicas * cycles * _TRANSITIONS_PER_CYCLE
+    conflicts = sum(store._lock.conflicts for store in stores)
+    return {
+        "replicas": replicas,
+        "transitions": transitions,
+        "seconds": round(elapsed, 3),
+        "ops_per_second": round(transitions / elapsed, 1),
+        "conflicts": conflicts,
+        "conflicts_per_transition": round(conflicts / transitions, 4),
+    }
+
+
+def run_benchmark(*, replicas: list[int], cycles: int, redis_url: str | None = None) -> dict:
+    new_client = _client_factory(redis_url)
+    return {
+        "benchmark": "relay-state-store-redis-replicas",
+        "server": "redis" if redis_url is not None else "fakeredis",
+        "cycles_per_replica": cycles,
+        "transitions_per_cycle": _TRANSITIONS_PER_CYCLE,
+        "results": [_run_replicas(new_client, count, cycles) for count in replicas],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args(argv)
+    report = run_benchmark(
+        replicas=[max(count, 1) for count in args.replicas],
+        cycles=max(args.cycles, 1),
+        redis_url=args.redis_url,
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Measure ``SqliteRelayStateStore`` throughput against the number of worker processes.
+
+Every worker process opens the same WAL database and registers its own compute
+node for its own model, so workers contend only on the database, never on each
+other's queues. Each cycle runs four store transitions on that node:
+``select_and_reserve``, ``enqueue_encrypted_request``, ``claim_queued_request``
+and ``accept_encrypted_response``. The report gives the aggregate transitions
+per second across all workers for each ``--workers`` count, next to a
+single-process ``InMemoryRelayStateStore`` running the same cycle.
+
+Example::
+
+    python scripts/relay_state_store_sqlite_benchmark.py --workers 1 2 4 8 --cycles 500
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import secrets
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from relay_state_store import (  # noqa: E402
+    ComputeNodeCapabilities,
+    EncryptedRequestEnvelope,
+    EncryptedResponseEnvelope,
+    InMemoryRelayStateStore,
+    RelayStateStoreConfig,
+)
+from relay_state_store_sqlite import SqliteRelayStateStore  # noqa: E402
+
+_EPOCH = 1_700_000_000.0
+_TIER = "8k-fast"
+_TRANSITIONS_PER_CYCLE = 4
+
+
+class _FrozenClock:
+    def __call__(self) -> float:
+        return _EPOCH
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _config(*, workers: int, cycles: int) -> RelayStateStoreConfig:
+    total = max(workers * cycles, 1)
+    return RelayStateStoreConfig(
+        namespace="bench.state-store-sqlite",
+        max_compute_nodes=workers,
+        max_reservations=total,
+        max_request_lifecycles=total,
+        max_queued_requests=total,
+        max_claims=total,
+        max_responses=total,
+        max_terminal_records=total,
+    )
+
+
+def _envelope(cls):
+    return cls(
+        protocol="tokenplace_api_v1_relay_e2ee",
+        version=1,
+        ciphertext="ciphertext",
+        cipherkey="cipherkey",
+        iv="iv",
+    )
+
+
+def _run_cycles(store, worker: int, cycles: int) -> None:
+    model_id = f"bench-model-{worker}"
+    node_id = f"bench-node-{worker:03d}"
+    owner = _digest(node_id)
+    store.register(
+        node_id,
+        ComputeNodeCapabilities(
+            supported_model_ids=(model_id,),
+            active_context_tier=_TIER,
+            maximum_total_context_tokens=8192,
+            default_output_token_reservation=1024,
+            maximum_output_tokens=2048,
+            max_concurrency=1,
+        ),
+        owner,
+    )
+    for index in range(cycles):
+        client = f"bench-client-{worker}-{index}"
+        request_id = f"bench-{worker}-{index}"
+        selection = store.select_and_reserve(
+            client, request_id, model_id, _TIER, _EPOCH + 1800.0
+        )
+        store.enqueue_encrypted_request(
+            client,
+            request_id,
+            selection.reservation_token,
+            node_id,
+            model_id,
+            _TIER,
+            _EPOCH + 1800.0,
+            _envelope(EncryptedRequestEnvelope),
+            f"cancel-{request_id}",
+        )
+        claim = store.claim_queued_request(node_id, owner, "bench-worker")
+        store.accept_encrypted_response(
+            node_id,
+            owner,
+            "bench-worker",
+            client,
+            request_id,
+            claim.generation,
+            _envelope(EncryptedResponseEnvelope),
+        )
+
+
+def _worker(path: str, workers: int, worker: int, cycles: int, key: bytes, start) -> None:
+    store = SqliteRelayStateStore(
+        _config(workers=workers, cycles=cycles),
+        path,
+        acknowledgement_key=key,
+        epoch_time=_FrozenClock(),
+    )
+    try:
+        start.wait()
+        _run_cycles(store, worker, cycles)
+    finally:
+        store.close()
+
+
+def _run_sqlite(workers: int, cycles: int, directory: str) -> dict:
+    path = str(Path(directory) / f"relay-state-{workers}.sqlite3")
+    key = secrets.token_bytes(32)
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(workers + 1)
+    processes = [
+        context.Process(target=_worker, args=(path, workers, worker, cycles, key, start))
+        for worker in range(workers)
+    ]
+    # Create the schema once so workers do not race on first open.
+    SqliteRelayStateStore(
+        _config(workers=workers, cycles=cycles), path, acknowledgement_key=key
+    ).close()
+    for process in processes:
+        process.start()
+    start.wait()
+    started = time.perf_counter()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+    if any(process.exitcode for process in processes):
+        raise RuntimeError("a benchmark worker failed")
+    transitions = workers * cycles * _TRANSITIONS_PER_CYCLE
+    return {
+        "workers": workers,
+        "transitions": transitions,
+        "seconds": round(elapsed, 3),
+        "ops_per_second": round(transitions / elapsed, 1),
+    }
+
+
+def _run_memory(cycles: int) -> dict:
+    store = InMemoryRelayStateStore(
+        _config(workers=1, cycles=cycles),
+        acknowledgement_key=secrets.token_bytes(32),
+        epoch_time=_FrozenClock(),
+    )
+    started = time.perf_counter()
+    _run_cycles(store, 0, cycles)
+    elapsed = time.perf_counter() - started
+    transitions = cycles * _TRANSITIONS_PER_CYCLE
+    return {
+        "workers": 1,
+        "transitions": transitions,
+        "seconds": round(elapsed, 3),
+        "ops_per_second": round(transitions / elapsed, 1),
+    }
+
+
+def run_benchmark(*, workers: list[int], cycles: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="relay-state-sqlite-") as directory:
+        sqlite_results = [_run_sqlite(count, cycles, directory) for count in workers]
+    return {
+        "benchmark": "relay-state-store-sqlite-workers",
+        "cycles_per_worker": cycles,
+        "transitions_per_cycle": _TRANSITIONS_PER_CYCLE,
+        "results": {"memory": _run_memory(cycles), "sqlite": sqlite_results},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--cycles", type=int, default=500)
+    args = parser.parse_args(argv)
+    report = run_benchmark(
+        workers=[max(count, 1) for count in args.workers],
+        cycles=max(args.cycles, 1),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 import json
 import importlib.util
 import io
+import os
 import threading
 from pathlib import Path
 from types import SimpleNamespace
@@ -568,6 +569,22 @@ def test_qwen64k_packaged_subprocess_token_id_fallback_passes_readiness_and_regi
         proxy.close()
 
 
+@pytest.mark.skipif(os.name == 'nt', reason='frame protocol v3 is POSIX only')
+@pytest.mark.parametrize('offered, negotiated', [('3', 3), ('2', 2)])
+def test_qwen64k_packaged_subprocess_negotiates_worker_frame_protocol(tmp_path, monkeypatch, offered, negotiated):
+    runtime_root = tmp_path / 'runtime'
+    _write_fake_llama_cpp_runtime(runtime_root)
+    monkeypatch.syspath_prepend(str(runtime_root))
+    monkeypatch.setenv('TOKEN_PLACE_LLAMA_WORKER_FRAME_PROTOCOL', offered)
+
+    proxy = model_manager_module._SubprocessLlamaProxy(model_path='model.gguf', type_k=8, type_v=8, timeout_seconds=5)
+    try:
+        assert proxy.frame_protocol == negotiated
+        assert proxy.render_and_tokenize_chat([{'role': 'user', 'content': 'hello'}]) == {'prompt_tokens': 42}
+    finally:
+        proxy.close()
+
+
 def test_qwen64k_packaged_subprocess_token_id_fallback_failure_reports_safe_category(tmp_path, monkeypatch):
     runtime_root = tmp_path / 'runtime'
     _write_fake_llama_cpp_runtime(runtime_root)
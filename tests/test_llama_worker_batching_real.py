@@ -0,0 +1,75 @@
+"""
+Real-runtime smoke tests for the llama worker's continuous batching.
+
+``_SequenceBatcher`` drives llama.cpp through raw ``llama_batch`` fields and
+the KV memory API, which the unit tests only reach through a fake
+``llama_cpp``.  These tests load a real llama-cpp-python build and the CI
+tiny GGUF (``scripts/provision-ci-tiny-gguf.sh``) from
+``TOKENPLACE_REAL_E2E_MODEL_PATH``, and skip when either is missing.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("llama_cpp")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import llama_worker_batching_benchmark as bench  # noqa: E402
+from utils.llm.model_manager import _SubprocessLlamaProxy  # noqa: E402
+
+MODEL_PATH = os.environ.get("TOKENPLACE_REAL_E2E_MODEL_PATH", "").strip()
+
+pytestmark = [
+    pytest.mark.real_llm,
+    pytest.mark.skipif(
+        not MODEL_PATH or not os.path.isfile(MODEL_PATH),
+        reason="TOKENPLACE_REAL_E2E_MODEL_PATH does not point to the provisioned CI tiny GGUF",
+    ),
+]
+
+
+@pytest.fixture
+def batching_env(monkeypatch):
+    monkeypatch.setenv("TOKEN_PLACE_ENV", "testing")
+    monkeypatch.setenv("TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES", "2")
+
+
+def test_batching_worker_generates_concurrent_sequences_on_a_real_runtime(batching_env):
+    proxy = _SubprocessLlamaProxy(model_path=MODEL_PATH, n_ctx=512, verbose=False)
+    try:
+        assert proxy.batch_sequences == 2
+
+        def complete(index):
+            return proxy.create_chat_completion_from_rendered_prompt(
+                [{"role": "user", "content": f"Once upon a time there was a story number {index}."}],
+                max_tokens=16,
+            )
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(complete, range(4)))
+    finally:
+        proxy.close()
+
+    for result in results:
+        choice = result["choices"][0]
+        assert choice["finish_reason"] in {"stop", "length"}
+        assert isinstance(choice["message"]["content"], str)
+        usage = result["usage"]
+        assert usage["prompt_tokens"] > 0
+        assert 0 <= usage["completion_tokens"] <= 16
+    assert sum(result["usage"]["completion_tokens"] for result in results) > 0
+
+
+def test_batching_benchmark_measures_both_worker_modes_on_a_real_runtime(batching_env):
+    report = bench.run_benchmark(model_path=MODEL_PATH, sequences=2, requests=4, max_tokens=16)
+
+    assert report["sequential"]["worker_batch_sequences"] == 1
+    assert report["batched"]["worker_batch_sequences"] == 2
+    for mode in ("sequential", "batched"):
+        assert report[mode]["generated_tokens"] > 0
+        assert report[mode]["tokens_per_second"] > 0
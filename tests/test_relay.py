@@ -58,6 +58,7 @@ def client():
     streaming_sessions_by_client.clear()
     relay_module.api_v1_recently_unregistered_servers.clear()
     relay_module.api_v1_control_tombstones.clear()
+    relay_module.relay_reaper.clear()
     for limiter in app.extensions.get("limiter", set()):
         storage = getattr(getattr(limiter, "limiter", None), "storage", None)
         if storage is None:
@@ -95,6 +96,7 @@ def client():
     streaming_sessions_by_client.clear()
     relay_module.api_v1_recently_unregistered_servers.clear()
     relay_module.api_v1_control_tombstones.clear()
+    relay_module.relay_reaper.clear()
     for limiter in app.extensions.get("limiter", set()):
         storage = getattr(getattr(limiter, "limiter", None), "storage", None)
         if storage is None:
@@ -463,6 +465,49 @@ def test_api_v1_best_fit_least_in_flight_within_64k_tier(client):
     assert payload["selected_in_flight_count"] == 0
 
 
+def test_api_v1_scheduler_index_matches_full_scan_best_fit(client, monkeypatch):
+    monkeypatch.setenv(relay_module.API_V1_MAX_QUEUE_DEPTH_ENV, "3")
+    servers = []
+    for index in range(8):
+        server = _server_key(f"index-scan-{index}")
+        tier = "64k-full" if index % 3 == 0 else "8k-fast"
+        models = ["model-a"] if index % 2 else ["model-a", "model-b"]
+        _register_api_v1_server_with_capabilities(client, server, _capabilities(tier, models))
+        servers.append(server)
+    for index, depth in enumerate([2, 0, 1, 3, 1, 0, 2, 1]):
+        for item in range(depth):
+            _queue_api_v1_request(client, server_public_key=servers[index], request_id=f"req-index-{index}-{item}")
+
+    def full_scan(model, tier):
+        now_monotonic = time.monotonic()
+        candidates = [
+            relay_module._api_v1_scheduler_candidate(
+                key,
+                payload,
+                requested_model=model,
+                requested_context_tier=tier,
+                registration_index=position,
+                now_monotonic=now_monotonic,
+            )
+            for position, (key, payload) in enumerate(known_servers.items())
+        ]
+        candidates = [candidate for candidate in candidates if candidate is not None]
+        tier_counts = {}
+        for candidate in candidates:
+            tier_counts[candidate["tier"]] = tier_counts.get(candidate["tier"], 0) + 1
+        smallest = min(candidate["tier_tokens"] for candidate in candidates)
+        best = [candidate for candidate in candidates if candidate["tier_tokens"] == smallest]
+        least = min(candidate["load_score"] for candidate in best)
+        return {candidate["server_public_key"] for candidate in best if candidate["load_score"] == least}, tier_counts
+
+    for model in (None, "model-a", "model-b"):
+        for tier in ("8k-fast", "64k-full"):
+            expected, tier_counts = full_scan(model, tier)
+            selected, selection, _ = relay_module._select_best_fit_server_key(model=model, context_tier=tier)
+            assert selected in expected
+            assert selection["eligible_tier_counts"] == tier_counts
+
+
 def test_api_v1_scheduler_helper_uses_only_safe_metadata():
     payload = {
         relay_module.API_V1_SERVER_MARKER: True,
@@ -846,6 +891,35 @@ def test_api_v1_diagnostics_expose_only_normalized_capabilities(client):
     assert "raw_vram" not in json.dumps(node)
 
 
+def test_api_v1_capabilities_keep_pooled_model_residency(client):
+    server = _server_key("pooled-models")
+    capabilities = _capabilities("8k-fast", ["qwen3-8b-instruct", "llama-3.1-8b-instruct"])
+    _register_api_v1_server_with_capabilities(
+        client,
+        server,
+        {
+            **capabilities,
+            "model_residency": {
+                "qwen3-8b-instruct": "warm",
+                "Llama-3.1-8B-Instruct": "cold",
+                "unadvertised-model": "warm",
+                "gpt-5-chat-latest": "loading",
+            },
+        },
+    )
+
+    assert known_servers[server]["capabilities"]["model_residency"] == {
+        "qwen3-8b-instruct": "warm",
+        "llama-3.1-8b-instruct": "cold",
+    }
+    rejected = client.post(
+        "/api/v1/relay/servers/register",
+        json={"server_public_key": server, "capabilities": {**capabilities, "model_residency": ["warm"]}},
+    )
+    assert rejected.status_code == 400
+    assert rejected.get_json()["error"]["code"] == "invalid_capabilities"
+
+
 def _queue_api_v1_request(client, *, server_public_key, request_id, client_public_key=None):
     response = client.post('/api/v1/relay/requests', json={
         'request_id': request_id,
@@ -858,6 +932,73 @@ def _queue_api_v1_request(client, *, server_public_key, request_id, client_publi
     assert response.status_code == 200
     return response
 
+def test_api_v1_poll_max_items_claims_up_to_free_capacity(client):
+    _register_api_v1_server_with_capabilities(
+        client, DUMMY_SERVER_PUB_KEY, {**_capabilities(), "max_concurrency": 3}
+    )
+    for index in range(5):
+        _queue_api_v1_request(client, server_public_key=DUMMY_SERVER_PUB_KEY, request_id=f'req-{index}')
+
+    poll = client.post(
+        '/api/v1/relay/servers/poll',
+        json={'server_public_key': DUMMY_SERVER_PUB_KEY, 'max_items': 10},
+    )
+    assert poll.status_code == 200
+    payload = poll.get_json()
+    assert [item['request_id'] for item in payload['batch']] == ['req-0', 'req-1', 'req-2']
+    assert payload['request_id'] == 'req-0'
+    assert all(item['request_deadline_remaining_seconds'] > 0 for item in payload['batch'])
+    assert not any('_queued_at' in item or '_request_deadline_monotonic' in item for item in payload['batch'])
+    in_flight = known_servers[DUMMY_SERVER_PUB_KEY]['api_v1_in_flight_requests']
+    assert sorted(in_flight) == ['req-0', 'req-1', 'req-2']
+    for request_id in in_flight:
+        assert relay_module.relay_reaper.deadline('in_flight', (DUMMY_SERVER_PUB_KEY, request_id)) is not None
+    assert [item['request_id'] for item in client_inference_requests[DUMMY_SERVER_PUB_KEY]] == ['req-3', 'req-4']
+
+    full = client.post(
+        '/api/v1/relay/servers/poll',
+        json={'server_public_key': DUMMY_SERVER_PUB_KEY, 'max_items': 2},
+    )
+    assert full.status_code == 200
+    assert full.get_json()['batch'] == []
+    assert len(client_inference_requests[DUMMY_SERVER_PUB_KEY]) == 2
+
+    single = client.post('/api/v1/relay/servers/poll', json={'server_public_key': DUMMY_SERVER_PUB_KEY})
+    assert single.get_json()['request_id'] == 'req-3'
+    assert 'batch' not in single.get_json()
+
+
+def test_api_v1_poll_max_items_skips_expired_envelopes(client):
+    _register_api_v1_server_with_capabilities(
+        client, DUMMY_SERVER_PUB_KEY, {**_capabilities(), "max_concurrency": 4}
+    )
+    for index in range(3):
+        _queue_api_v1_request(client, server_public_key=DUMMY_SERVER_PUB_KEY, request_id=f'batch-expiry-{index}')
+    client_inference_requests[DUMMY_SERVER_PUB_KEY][1]['_request_deadline_monotonic'] = time.monotonic() - 1
+
+    poll = client.post(
+        '/api/v1/relay/servers/poll',
+        json={'server_public_key': DUMMY_SERVER_PUB_KEY, 'max_items': 4},
+    )
+    assert [item['request_id'] for item in poll.get_json()['batch']] == ['batch-expiry-0', 'batch-expiry-2']
+    assert client_terminal_request_ids[f'{DUMMY_CLIENT_PUB_KEY}-batch-expiry-1']['batch-expiry-1']['status'] == 'expired'
+    assert 'batch-expiry-1' not in known_servers[DUMMY_SERVER_PUB_KEY]['api_v1_in_flight_requests']
+
+
+@pytest.mark.parametrize('max_items', [0, -1, True, '2', 1.5, relay_module.MAX_API_V1_POLL_ITEMS + 1])
+def test_api_v1_poll_rejects_invalid_max_items(client, max_items):
+    _register_api_v1_server(client, DUMMY_SERVER_PUB_KEY)
+    _queue_api_v1_request(client, server_public_key=DUMMY_SERVER_PUB_KEY, request_id='req-0')
+
+    poll = client.post(
+        '/api/v1/relay/servers/poll',
+        json={'server_public_key': DUMMY_SERVER_PUB_KEY, 'max_items': max_items},
+    )
+    assert poll.status_code == 400
+    assert poll.get_json()['error']['code'] == 'invalid_max_items'
+    assert len(client_inference_requests[DUMMY_SERVER_PUB_KEY]) == 1
+
+
 # --- Test /sink ---
 
 def test_sink_register_new_server(client):
@@ -2973,6 +3114,44 @@ def test_api_v1_poll_long_wait_dispatches_when_request_arrives(client, monkeypat
     assert '_queued_at' not in result['json']
 
 
+def test_api_v1_poll_long_wait_wakes_only_target_node(client, monkeypatch):
+    target = _server_key("wake-target")
+    bystander = _server_key("wake-bystander")
+    for server in (target, bystander):
+        _register_api_v1_server(client, server)
+    monkeypatch.setenv('TOKEN_PLACE_API_V1_RELAY_POLL_WAIT_SECONDS', '0.5')
+    woken = []
+    monkeypatch.setattr(
+        relay_module,
+        '_notify_client_inference_request_waiters_locked',
+        lambda key, _notify=relay_module._notify_client_inference_request_waiters_locked: (woken.append(key), _notify(key)),
+    )
+    results = {}
+
+    def _poll(server):
+        with app.test_client() as polling_client:
+            response = polling_client.post('/api/v1/relay/servers/poll', json={'server_public_key': server})
+            results[server] = response.get_json()
+
+    threads = {server: threading.Thread(target=_poll, args=(server,)) for server in (target, bystander)}
+    for thread in threads.values():
+        thread.start()
+    time.sleep(0.05)
+    assert set(relay_module.client_inference_request_waiters) == {target, bystander}
+
+    _queue_api_v1_request(client, server_public_key=target, request_id="req-targeted-wakeup")
+
+    threads[target].join(timeout=1.0)
+    assert not threads[target].is_alive()
+    assert results[target]['request_id'] == 'req-targeted-wakeup'
+    assert threads[bystander].is_alive()
+    assert woken == [target]
+
+    threads[bystander].join(timeout=1.0)
+    assert results[bystander]['message'] == 'No requests available'
+    assert relay_module.client_inference_request_waiters == {}
+
+
 def test_api_v1_poll_long_wait_timeout_returns_no_work(client, monkeypatch):
     server_payload = {'server_public_key': DUMMY_SERVER_PUB_KEY, 'capabilities': _capabilities('8k-fast')}
     assert client.post('/api/v1/relay/servers/register', json=server_payload).status_code == 200
@@ -3327,6 +3506,74 @@ def test_api_v1_cancel_token_lookup_scans_known_servers_under_registry_lock(clie
     assert checking_servers.values_checked_under_server_lock is True
 
 
+def test_api_v1_cancel_withdraws_queued_request_without_walking_the_node_queue(client, monkeypatch):
+    target = _server_key('deep-queue')
+    _register_api_v1_server(client, target)
+    client_key = f'{DUMMY_CLIENT_PUB_KEY}-deep'
+    with relay_module.client_inference_requests_changed:
+        for index in range(10_000):
+            request_id = f'req-deep-{index}'
+            relay_module._mark_request_pending(client_key, request_id, cancel_token=f'proof-{index}')
+            relay_module._index_api_v1_request_owner(client_key, request_id, target)
+            client_inference_requests.setdefault(target, []).append({
+                'request_id': request_id,
+                'client_public_key': client_key,
+                'cancel_token': f'proof-{index}',
+                'chat_history': 'ciphertext',
+                'e2ee_v1': True,
+            })
+
+    def _no_walk(self):
+        raise AssertionError('cancel walked the node queue')
+
+    monkeypatch.setattr(relay_module._NodeRequestQueue, '__iter__', _no_walk)
+    assert relay_module._cancel_api_v1_request(client_key, 'req-deep-5000', reason='requester_cancelled') >= 1
+    monkeypatch.undo()
+
+    queue = client_inference_requests[target]
+    assert len(queue) == 9_999
+    assert queue[0]['request_id'] == 'req-deep-0'
+    assert queue[5000]['request_id'] == 'req-deep-5001'
+    assert queue.find_request(client_key, 'req-deep-5000') is None
+
+
+def test_api_v1_lifecycle_index_targets_owning_node_for_cancel_and_response(client, monkeypatch):
+    target = _server_key('index-target')
+    bystanders = [_server_key(f'index-bystander-{index}') for index in range(3)]
+    for server in (target, *bystanders):
+        _register_api_v1_server(client, server)
+    monkeypatch.setenv('TOKEN_PLACE_API_V1_RELAY_POLL_WAIT_SECONDS', '0')
+    client_key = f'{DUMMY_CLIENT_PUB_KEY}-index'
+    _queue_api_v1_request(client, server_public_key=target, request_id='req-index-cancel', client_public_key=client_key)
+    _queue_api_v1_request(client, server_public_key=target, request_id='req-index-response', client_public_key=client_key)
+    assert relay_module._api_v1_request_owner(client_key, 'req-index-cancel') == (target,)
+
+    searched = []
+    original_owner_payloads = relay_module._api_v1_owner_payloads
+    monkeypatch.setattr(
+        relay_module,
+        '_api_v1_owner_payloads',
+        lambda owner: (searched.append(owner), original_owner_payloads(owner))[1],
+    )
+    relay_module._cancel_api_v1_request(client_key, 'req-index-cancel', reason='requester_cancelled')
+    assert searched == [(target,)]
+    assert [item['request_id'] for item in client_inference_requests[target]] == ['req-index-response']
+
+    dispatched = client.post('/api/v1/relay/servers/poll', json={'server_public_key': target})
+    assert dispatched.get_json()['request_id'] == 'req-index-response'
+    assert relay_module._api_v1_request_owner(client_key, 'req-index-response') == (target,)
+    searched.clear()
+    submitted = client.post('/api/v1/relay/responses', json={
+        **_api_v1_response_payload('req-index-response', client_public_key=client_key),
+        'protocol': 'tokenplace_api_v1_relay_e2ee',
+        'version': 1,
+    })
+    assert submitted.status_code == 200
+    assert searched == [(target,)]
+    assert 'api_v1_in_flight_requests' not in known_servers[target]
+    assert relay_module._api_v1_request_owner(client_key, 'req-index-response') == ()
+
+
 def test_api_v1_cancel_scans_known_servers_under_registry_lock(client, monkeypatch):
     request_id = 'req-cancel-lock-scan'
     checking_servers = _LockCheckingKnownServers({
@@ -4054,13 +4301,12 @@ def test_api_v1_cancel_only_clears_matching_client_in_flight_entry(client):
 def test_api_v1_pending_ttl_cleanup_runs_without_retrieve(client, monkeypatch):
     monkeypatch.setattr(relay_module, 'PENDING_REQUEST_TTL_SECONDS', 1.0)
     request_id = 'req-cleanup-without-retrieve'
-    client_pending_request_ids.setdefault(DUMMY_CLIENT_PUB_KEY, {})[request_id] = time.time()
+    relay_module._mark_request_pending(DUMMY_CLIENT_PUB_KEY, request_id)
     original_time = time.time
     monkeypatch.setattr(relay_module.time, 'time', lambda: original_time() + 2.0)
 
-    diagnostics = client.get('/relay/diagnostics')
+    relay_module._reap_due(now_monotonic=time.monotonic() + 2.0)
 
-    assert diagnostics.status_code == 200
     assert DUMMY_CLIENT_PUB_KEY not in client_pending_request_ids
     assert client_terminal_request_ids[DUMMY_CLIENT_PUB_KEY][request_id]['status'] == 'expired'
 
@@ -4072,9 +4318,8 @@ def test_api_v1_terminal_records_are_pruned_without_retrieve(client, monkeypatch
     original_time = time.time
     monkeypatch.setattr(relay_module.time, 'time', lambda: original_time() + 2.0)
 
-    diagnostics = client.get('/relay/diagnostics')
+    relay_module._reap_due(now_monotonic=time.monotonic() + 2.0)
 
-    assert diagnostics.status_code == 200
     assert DUMMY_CLIENT_PUB_KEY not in client_terminal_request_ids
 
 
@@ -5242,6 +5487,204 @@ def test_api_v1_buffered_progress_is_cleared_by_requester_cancellation(client):
     )
 
 
+def _start_blocking_retrieve(client_key, request_id, wait_seconds=5):
+    results = {}
+
+    def _retrieve():
+        with app.test_client() as retrieving_client:
+            started = time.monotonic()
+            response = retrieving_client.post('/api/v1/relay/responses/retrieve', json={
+                'client_public_key': client_key, 'request_id': request_id, 'wait_seconds': wait_seconds,
+            })
+            results['elapsed'] = time.monotonic() - started
+            results['status'] = response.status_code
+            results['body'] = response.get_json()
+
+    thread = threading.Thread(target=_retrieve)
+    thread.start()
+    deadline = time.monotonic() + 2.0
+    while (client_key, request_id) not in relay_module.api_v1_response_waiters and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert (client_key, request_id) in relay_module.api_v1_response_waiters
+    return thread, results
+
+
+def test_api_v1_retrieve_wait_wakes_on_progress_then_response(client):
+    server, client_key, request_id, _, progress_payload = _active_progress_request(client, 'retrieve-wait')
+
+    thread, results = _start_blocking_retrieve(client_key, request_id)
+    assert client.post('/api/v1/relay/progress', json=progress_payload).status_code == 202
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert results['status'] == 202
+    assert results['body']['encrypted_progress']['ciphertext'] == 'ciphertext-retrieve-wait'
+    assert results['body']['wait_seconds'] == 5
+    assert results['elapsed'] < 1.0
+
+    thread, results = _start_blocking_retrieve(client_key, request_id)
+    submitted = client.post('/api/v1/relay/responses', json={
+        **_api_v1_response_payload(request_id, client_public_key=client_key),
+        'protocol': 'tokenplace_api_v1_relay_e2ee',
+        'version': 1,
+    })
+    assert submitted.status_code == 200
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert results['status'] == 200
+    assert results['body']['request_id'] == request_id
+    assert relay_module.api_v1_response_waiters == {}
+
+
+def test_api_v1_retrieve_wait_wakes_on_cancellation(client):
+    _, client_key, request_id, _, _ = _active_progress_request(client, 'retrieve-wait-cancel')
+
+    thread, results = _start_blocking_retrieve(client_key, request_id)
+    cancelled = client.post('/api/v1/relay/requests/cancel', json={
+        'client_public_key': client_key,
+        'request_id': request_id,
+        'status': 'cancelled',
+        'reason': 'requester_cancelled',
+        'cancel_token': 'cancel-proof',
+    })
+    assert cancelled.status_code == 200
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert results['status'] == 410
+    assert results['body']['error']['reason'] == 'requester_cancelled'
+
+
+def test_api_v1_retrieve_wait_is_bounded_by_wait_and_request_deadline(client, monkeypatch):
+    _, client_key, request_id, _, _ = _active_progress_request(client, 'retrieve-wait-bounds')
+    monkeypatch.setenv(relay_module.API_V1_RETRIEVE_MAX_WAIT_SECONDS_ENV, '0.05')
+
+    started = time.monotonic()
+    pending = client.post('/api/v1/relay/responses/retrieve', json={
+        'client_public_key': client_key, 'request_id': request_id, 'wait_seconds': 30,
+    })
+    elapsed = time.monotonic() - started
+    assert pending.status_code == 202
+    assert pending.get_json()['wait_seconds'] == 0.05
+    assert 0.04 <= elapsed < 1.0
+
+    monkeypatch.setenv(relay_module.API_V1_RETRIEVE_MAX_WAIT_SECONDS_ENV, '30')
+    relay_module.client_pending_request_deadlines[client_key][request_id] = time.monotonic() + 0.05
+    relay_module.client_pending_request_ids[client_key][request_id]['request_deadline_monotonic'] = (
+        relay_module.client_pending_request_deadlines[client_key][request_id]
+    )
+    started = time.monotonic()
+    expired = client.post('/api/v1/relay/responses/retrieve', json={
+        'client_public_key': client_key, 'request_id': request_id, 'wait_seconds': 30,
+    })
+    assert expired.status_code == 410
+    assert expired.get_json()['error']['status'] == 'expired'
+    assert time.monotonic() - started < 1.0
+
+
+def _read_response_events(client_key, request_id, results):
+    with app.test_client() as streaming_client:
+        response = streaming_client.post('/api/v1/relay/responses/events', json={
+            'client_public_key': client_key, 'request_id': request_id,
+        })
+        results['status'] = response.status_code
+        results['mimetype'] = response.mimetype
+        results['frames'] = [frame for frame in response.get_data(as_text=True).split('\n\n') if frame]
+
+
+def _parse_sse_frames(frames):
+    events = []
+    for frame in frames:
+        if frame.startswith(':'):
+            events.append(('comment', frame[1:].strip()))
+            continue
+        fields = dict(line.split(': ', 1) for line in frame.split('\n'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_api_v1_response_events_push_progress_then_response_and_close(client, monkeypatch):
+    monkeypatch.setattr(relay_module, 'API_V1_RESPONSE_EVENTS_KEEPALIVE_SECONDS', 0.05)
+    _, client_key, request_id, _, progress_payload = _active_progress_request(client, 'events')
+    results = {}
+    thread = threading.Thread(target=_read_response_events, args=(client_key, request_id, results))
+    thread.start()
+    deadline = time.monotonic() + 2.0
+    while (client_key, request_id) not in relay_module.api_v1_response_waiters and time.monotonic() < deadline:
+        time.sleep(0.005)
+    time.sleep(0.1)
+
+    assert client.post('/api/v1/relay/progress', json=progress_payload).status_code == 202
+    while (client_key, request_id) in relay_module.client_progress and time.monotonic() < deadline:
+        time.sleep(0.005)
+    submitted = client.post('/api/v1/relay/responses', json={
+        **_api_v1_response_payload(request_id, client_public_key=client_key),
+        'protocol': 'tokenplace_api_v1_relay_e2ee',
+        'version': 1,
+    })
+    assert submitted.status_code == 200
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+
+    assert results['status'] == 200
+    assert results['mimetype'] == 'text/event-stream'
+    events = [event for event in _parse_sse_frames(results['frames']) if event[0] != 'comment']
+    assert ('comment', 'keepalive') in _parse_sse_frames(results['frames'])
+    assert [name for name, _ in events] == ['progress', 'response']
+    assert events[0][1]['ciphertext'] == 'ciphertext-events'
+    assert events[1][1]['chat_history'] == 'ciphertext-response'
+    assert events[1][1]['request_id'] == request_id
+    assert relay_module.api_v1_response_waiters == {}
+    retrieved = client.post('/api/v1/relay/responses/retrieve', json={
+        'client_public_key': client_key, 'request_id': request_id,
+    })
+    assert retrieved.status_code == 404
+
+
+def test_api_v1_response_events_close_with_terminal_event_on_cancellation(client):
+    _, client_key, request_id, _, _ = _active_progress_request(client, 'events-cancel')
+    results = {}
+    thread = threading.Thread(target=_read_response_events, args=(client_key, request_id, results))
+    thread.start()
+    deadline = time.monotonic() + 2.0
+    while (client_key, request_id) not in relay_module.api_v1_response_waiters and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    cancelled = client.post('/api/v1/relay/requests/cancel', json={
+        'client_public_key': client_key,
+        'request_id': request_id,
+        'status': 'cancelled',
+        'reason': 'requester_cancelled',
+        'cancel_token': 'cancel-proof',
+    })
+    assert cancelled.status_code == 200
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+
+    events = _parse_sse_frames(results['frames'])
+    assert len(events) == 1
+    name, payload = events[0]
+    assert name == 'terminal'
+    assert payload['error']['reason'] == 'requester_cancelled'
+
+
+def test_api_v1_response_events_rejects_unknown_or_missing_request_id(client):
+    unknown = client.post('/api/v1/relay/responses/events', json={
+        'client_public_key': DUMMY_CLIENT_PUB_KEY, 'request_id': 'req-never-queued',
+    })
+    assert unknown.status_code == 404
+    missing = client.post('/api/v1/relay/responses/events', json={'client_public_key': DUMMY_CLIENT_PUB_KEY})
+    assert missing.status_code == 400
+
+
+@pytest.mark.parametrize('wait_seconds', [-1, 'soon', True, float('nan')])
+def test_api_v1_retrieve_rejects_invalid_wait_seconds(client, wait_seconds):
+    response = client.post(
+        '/api/v1/relay/responses/retrieve',
+        data=json.dumps({'client_public_key': DUMMY_CLIENT_PUB_KEY, 'request_id': 'req', 'wait_seconds': wait_seconds}),
+        content_type='application/json',
+    )
+    assert response.status_code == 400
+
+
 def test_api_v1_buffered_progress_is_cleared_by_authoritative_deadline_pruning(client):
     (server, _, _, deadline, _), progress_key = _buffer_active_progress(
         client, 'cleanup-expiry'
@@ -222,7 +222,11 @@ def test_distributed_compute_provider_round_trip_uses_e2ee_envelope(monkeypatch)
         "client_public_key": fake_crypto.public_key_b64,
         "request_id": relay_request_id,
     }
-    assert retrieve_calls == [expected_retrieve_payload] * 8
+    assert len(retrieve_calls) == 8
+    for retrieve_call in retrieve_calls:
+        wait_seconds = retrieve_call.pop("wait_seconds")
+        assert 0 <= wait_seconds <= provider.retrieve_wait_seconds
+        assert retrieve_call == expected_retrieve_payload
     assert posted_payloads[0][0] == "https://node-a.example/api/v1/relay/requests"
     assert posted_payloads[1][0] == "https://node-a.example/api/v1/relay/responses/retrieve"
     touched_urls = [
@@ -237,6 +241,58 @@ def test_distributed_compute_provider_round_trip_uses_e2ee_envelope(monkeypatch)
     )
 
 
+def test_distributed_compute_provider_blocks_on_relay_retrieve_instead_of_sleeping(monkeypatch):
+    fake_crypto = _FakeCryptoManager()
+    retrieve_calls = []
+    sleeps = []
+
+    def fake_get(url, timeout, params=None):
+        return _FakeResponse(200, {"server_public_key": "server-public-key"})
+
+    def fake_post(url, json, timeout):
+        if url.endswith("/api/v1/relay/requests"):
+            return _FakeResponse(200, {"message": "Request received"})
+        if url.endswith("/api/v1/relay/responses/retrieve"):
+            retrieve_calls.append((copy.deepcopy(json), timeout))
+            if len(retrieve_calls) < 3:
+                return _FakeResponse(202, {"status": "pending", "wait_seconds": json["wait_seconds"]})
+            response_envelope = {
+                "protocol": "tokenplace_api_v1_relay_e2ee",
+                "version": 1,
+                "client_public_key": fake_crypto.public_key_b64,
+                "request_id": json["request_id"],
+                "api_v1_response": {"message": {"role": "assistant", "content": "parked reply"}},
+            }
+            return _FakeResponse(200, fake_crypto.encrypt_message(response_envelope, fake_crypto.public_key_b64))
+        raise AssertionError(f"unexpected URL {url}")
+
+    monkeypatch.setattr(
+        compute_provider.DistributedApiV1ComputeProvider,
+        "_build_request_crypto_manager",
+        lambda _self: fake_crypto,
+    )
+    monkeypatch.setattr(compute_provider.requests, "get", fake_get)
+    monkeypatch.setattr(compute_provider.requests, "post", fake_post)
+    monkeypatch.setattr(compute_provider.time, "sleep", sleeps.append)
+
+    provider = DistributedApiV1ComputeProvider(
+        base_url="https://node-a.example",
+        timeout_seconds=30,
+        retrieve_wait_seconds=4,
+    )
+    response = provider.complete_chat(
+        model_id="qwen3-8b-instruct",
+        messages=[{"role": "user", "content": "hi"}],
+    )
+
+    assert response["content"] == "parked reply"
+    assert sleeps == []
+    assert len(retrieve_calls) == 3
+    for payload, timeout in retrieve_calls:
+        assert payload["wait_seconds"] == 4
+        assert timeout > payload["wait_seconds"]
+
+
 def test_distributed_compute_provider_treats_retrieve_404_as_unknown_request(monkeypatch):
     fake_crypto = _FakeCryptoManager()
 
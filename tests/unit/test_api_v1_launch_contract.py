@@ -57,6 +57,7 @@ COMPUTE_NODE_CONTROL_PLANE_ROUTES = {
 
 INTERNAL_RELAY_LIFECYCLE_ROUTES = {
     ("POST", "/api/v1/relay/requests/cancel"),
+    ("POST", "/api/v1/relay/responses/events"),
     ("POST", "/relay/api/v1/chat/completions"),
     ("POST", "/relay/api/v1/source"),
 }
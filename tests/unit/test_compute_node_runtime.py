@@ -881,7 +881,8 @@ def test_compute_node_runtime_readiness_smoke_completion_passes(monkeypatch):
     model_manager.context_tier = "8k-fast"
     model_manager.context_window_tokens = 8192
     model_manager.api_model_id = "qwen3-8b-instruct"
-    model_manager.last_compute_diagnostics = {}
+    model_manager.last_compute_diagnostics = {"worker_init_ms": 840, "model_prefetch_ms": 310}
+    model_manager.llm = SimpleNamespace(first_token_ms=95)
     llm_runtime = SmokeRuntime()
     model_manager.get_llm_instance.return_value = llm_runtime
     relay_client = SimpleNamespace(
@@ -899,6 +900,9 @@ def test_compute_node_runtime_readiness_smoke_completion_passes(monkeypatch):
     assert diagnostics["api_v1_readiness_completion_smoke_result"] == "passed"
     assert diagnostics["api_v1_readiness_result"] == "passed"
     assert diagnostics["api_v1_readiness_model_profile_id"] == "qwen3-8b-q4-k-m"
+    assert diagnostics["api_v1_readiness_worker_init_ms"] == 840
+    assert diagnostics["api_v1_readiness_model_prefetch_ms"] == 310
+    assert diagnostics["api_v1_readiness_first_token_ms"] == 95
     assert llm_runtime.completion_kwargs["max_tokens"] == 64
     assert "stream" not in llm_runtime.completion_kwargs
     assert "stop" not in llm_runtime.completion_kwargs
@@ -207,6 +207,45 @@ def test_retrieve_chat_response_handles_pending_then_success(monkeypatch):
     ]
 
 
+def test_retrieve_chat_response_long_polls_relay_instead_of_sleeping(monkeypatch):
+    client = CryptoClient("https://test-server.com")
+    client.client_public_key_b64 = "client-key"
+    sent_payloads = []
+    sleep_calls = []
+    responses = iter([
+        _FakeResponse(202, {"status": "pending", "wait_seconds": 2}),
+        _FakeResponse(202, {"status": "pending", "wait_seconds": 2, "encrypted_progress": {"ciphertext": "c"}}),
+        _FakeResponse(202, {"status": "pending", "wait_seconds": 2, "encrypted_progress": {"ciphertext": "c"}}),
+        _FakeResponse(200, ENCRYPTED_RELAY_RESPONSE),
+    ])
+
+    def fake_post(url, json, timeout):
+        sent_payloads.append((dict(json), timeout))
+        return next(responses)
+
+    monkeypatch.setattr("utils.crypto_helpers.requests.post", fake_post)
+    monkeypatch.setattr("utils.crypto_helpers.time.sleep", sleep_calls.append)
+    monkeypatch.setattr(
+        client,
+        "decrypt_message",
+        lambda _encrypted: {
+            "protocol": "tokenplace_api_v1_relay_e2ee",
+            "request_id": "req-wait",
+            "api_v1_response": {"message": {"role": "assistant", "content": "ready"}},
+        },
+    )
+
+    assert client.retrieve_chat_response(
+        max_retries=2,
+        retry_delay=2,
+        expected_request_id="req-wait",
+    ) == [{"role": "assistant", "content": "ready"}]
+    assert sleep_calls == []
+    assert sent_payloads == [
+        ({"client_public_key": "client-key", "request_id": "req-wait", "wait_seconds": 2}, 12),
+    ] * 4
+
+
 def test_retrieve_chat_response_404_is_terminal(monkeypatch):
     client = CryptoClient("https://test-server.com")
     client.client_public_key_b64 = "client-key"
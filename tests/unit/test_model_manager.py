@@ -4,6 +4,7 @@ Unit tests for the model manager module.
 import logging
 import hashlib
 import importlib.util
+import mmap
 import os
 import queue
 import re
@@ -2944,6 +2945,298 @@ def test_download_file_in_chunks_handles_request_start_failures(standalone_model
         ) is False
 
 
+@pytest.fixture
+def ranged_model_server():
+    """Serve payloads from a local HTTP server that honours byte ranges."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    servers = []
+
+    def _serve(payload, *, fail_once=()):
+        state = {'ranges': [], 'fail_once': set(fail_once), 'accept_ranges': True}
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args):
+                pass
+
+            def do_GET(self):
+                requested = self.headers.get('Range')
+                state['ranges'].append(requested)
+                if requested is None or not state['accept_ranges']:
+                    self.send_response(200)
+                    if state['accept_ranges']:
+                        self.send_header('Accept-Ranges', 'bytes')
+                    self.send_header('ETag', '"v1"')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                start, end = (int(value) for value in requested[len('bytes='):].split('-'))
+                if start in state['fail_once']:
+                    state['fail_once'].discard(start)
+                    self.send_error(503)
+                    return
+                body = payload[start:end + 1]
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{len(payload)}')
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_address[1]}/Qwen3-8B-Q4_K_M.gguf', state
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _ranged_download_manager(tmp_path, monkeypatch, payload):
+    from utils.llm import model_manager as model_manager_module
+
+    monkeypatch.setattr(model_manager_module, '_MODEL_DOWNLOAD_SEGMENT_BYTES', 1024)
+    mock_config = MagicMock(is_production=True)
+    mock_config.get.side_effect = lambda key, default=None: {
+        'model.profile_id': 'qwen3-8b-q4-k-m',
+        'model.filename': 'Qwen3-8B-Q4_K_M.gguf',
+        'model.download_connections': 3,
+        'paths.models_dir': str(tmp_path),
+        'model.use_mock': False,
+    }.get(key, default)
+    manager = ModelManager(mock_config)
+    manager.model_profile['artifact_size_bytes'] = len(payload)
+    manager.model_profile['artifact_sha256'] = hashlib.sha256(payload).hexdigest()
+    return manager
+
+
+def test_download_file_in_chunks_fetches_byte_ranges_in_parallel(tmp_path, monkeypatch, ranged_model_server):
+    payload = b'GGUF' + bytes(range(256)) * 40
+    url, server = ranged_model_server(payload)
+    manager = _ranged_download_manager(tmp_path, monkeypatch, payload)
+
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is True
+
+    assert Path(manager.model_path).read_bytes() == payload
+    assert server['ranges'][0] is None
+    assert sorted(server['ranges'][1:]) == sorted(
+        f'bytes={start}-{min(start + 1024, len(payload)) - 1}' for start in range(0, len(payload), 1024)
+    )
+    assert manager._read_artifact_verification_receipt(hashlib.sha256(payload).hexdigest()) is True
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'Qwen3-8B-Q4_K_M.gguf', 'Qwen3-8B-Q4_K_M.gguf.segments.json', 'Qwen3-8B-Q4_K_M.gguf.sha256.verified.json',
+    ]
+
+
+def test_download_file_in_chunks_resumes_only_missing_ranges(tmp_path, monkeypatch, ranged_model_server):
+    payload = b'GGUF' + bytes(range(256)) * 40
+    url, server = ranged_model_server(payload, fail_once={2048, 8192})
+    manager = _ranged_download_manager(tmp_path, monkeypatch, payload)
+
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is False
+
+    assert not Path(manager.model_path).exists()
+    manifest = json.loads(Path(f'{manager.model_path}.part.json').read_text())
+    assert manifest['completed_segments'] == [0, 1, 3, 4, 5, 6, 7, 9, 10]
+    assert manifest['segment_sha256']['1'] == hashlib.sha256(payload[1024:2048]).hexdigest()
+
+    server['ranges'].clear()
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is True
+
+    assert sorted(server['ranges']) == ['bytes=2048-3071', 'bytes=8192-9215']
+    assert Path(manager.model_path).read_bytes() == payload
+    assert not Path(f'{manager.model_path}.part').exists()
+    assert not Path(f'{manager.model_path}.part.json').exists()
+
+    # A source that stops honouring ranges invalidates the partial file.
+    Path(manager.model_path).unlink()
+    server['fail_once'].add(0)
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is False
+    server['accept_ranges'] = False
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is False
+    assert not Path(f'{manager.model_path}.part').exists()
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is True
+    assert Path(manager.model_path).read_bytes() == payload
+
+
+def test_concurrent_downloaders_of_one_file_share_the_part_file_under_a_lock(
+    tmp_path, monkeypatch, ranged_model_server,
+):
+    payload = b'GGUF' + bytes(range(256)) * 40
+    url, server = ranged_model_server(payload)
+    first = _ranged_download_manager(tmp_path, monkeypatch, payload)
+    second = _ranged_download_manager(tmp_path, monkeypatch, payload)
+    fetching = threading.Event()
+    fetch_segment = first._fetch_download_segment
+
+    def _slow_fetch(*args, **kwargs):
+        fetching.set()
+        time.sleep(0.02)
+        return fetch_segment(*args, **kwargs)
+
+    first._fetch_download_segment = _slow_fetch
+    results = {}
+    first_thread = threading.Thread(
+        target=lambda: results.setdefault('first', first.download_file_in_chunks(first.model_path, url, 1))
+    )
+    first_thread.start()
+    assert fetching.wait(5)
+    second_thread = threading.Thread(
+        target=lambda: results.setdefault('second', second.download_file_in_chunks(second.model_path, url, 1))
+    )
+    second_thread.start()
+    first_thread.join(10)
+    second_thread.join(10)
+
+    assert results == {'first': True, 'second': True}
+    # The waiting downloader neither truncated the part file nor fetched again.
+    assert server['ranges'].count(None) == 1
+    assert len(server['ranges']) == 1 + -(-len(payload) // 1024)
+    assert Path(first.model_path).read_bytes() == payload
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'Qwen3-8B-Q4_K_M.gguf', 'Qwen3-8B-Q4_K_M.gguf.segments.json', 'Qwen3-8B-Q4_K_M.gguf.sha256.verified.json',
+    ]
+
+
+def test_suspect_artifact_is_verified_per_segment_and_only_damaged_ranges_are_refetched(
+    tmp_path, monkeypatch, ranged_model_server,
+):
+    payload = b'GGUF' + bytes(range(256)) * 40
+    url, server = ranged_model_server(payload)
+    manager = _ranged_download_manager(tmp_path, monkeypatch, payload)
+    manager.url = url
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is True
+    segments = json.loads(Path(f'{manager.model_path}.segments.json').read_text())
+    assert segments['segment_bytes'] == 1024
+    assert segments['segment_sha256'][3] == hashlib.sha256(payload[3072:4096]).hexdigest()
+
+    with open(manager.model_path, 'r+b') as model_file:
+        for offset in (1500, 9300):
+            model_file.seek(offset)
+            model_file.write(b'\xff\xff')
+    manager.last_runtime_init_error = 'runtime_model_load_failed'
+    server['ranges'].clear()
+
+    assert manager.download_model_if_needed() is True
+
+    assert manager.last_model_artifact_validation == {'valid': False, 'reason': 'checksum_mismatch'}
+    assert sorted(server['ranges']) == ['bytes=1024-2047', 'bytes=9216-10239']
+    assert Path(manager.model_path).read_bytes() == payload
+    assert manager._read_artifact_verification_receipt(hashlib.sha256(payload).hexdigest()) is True
+    assert manager._validate_existing_model_artifact(hash_if_suspect=True) == (True, 'valid')
+
+
+def _repairable_artifact(tmp_path, monkeypatch, ranged_model_server):
+    payload = b'GGUF' + bytes(range(256)) * 40
+    url, server = ranged_model_server(payload)
+    manager = _ranged_download_manager(tmp_path, monkeypatch, payload)
+    manager.url = url
+    assert manager.download_file_in_chunks(manager.model_path, url, 1) is True
+    server['ranges'].clear()
+    return manager, payload, server
+
+
+def test_segment_repair_replaces_a_mapped_artifact_instead_of_writing_into_it(
+    tmp_path, monkeypatch, ranged_model_server,
+):
+    manager, payload, server = _repairable_artifact(tmp_path, monkeypatch, ranged_model_server)
+    with open(manager.model_path, 'r+b') as model_file:
+        model_file.seek(9300)
+        model_file.write(b'\xff\xff')
+    damaged = Path(manager.model_path).read_bytes()
+    sha256 = hashlib.sha256(payload).hexdigest()
+
+    with open(manager.model_path, 'rb') as mapped_file, mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        mapped_inode = os.fstat(mapped_file.fileno()).st_ino
+        assert manager._repair_artifact_segments([9]) is True
+        # A worker that mapped the old file keeps reading the old pages.
+        assert mapped[:] == damaged
+
+    assert server['ranges'] == ['bytes=9216-10239']
+    assert os.stat(manager.model_path).st_ino != mapped_inode
+    assert Path(manager.model_path).read_bytes() == payload
+    assert manager._read_artifact_verification_receipt(sha256) is True
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'Qwen3-8B-Q4_K_M.gguf', 'Qwen3-8B-Q4_K_M.gguf.segments.json', 'Qwen3-8B-Q4_K_M.gguf.sha256.verified.json',
+    ]
+
+
+def test_segment_repair_rechecks_the_pinned_sha256_instead_of_trusting_the_segment_manifest(
+    tmp_path, monkeypatch, ranged_model_server,
+):
+    manager, payload, server = _repairable_artifact(tmp_path, monkeypatch, ranged_model_server)
+    sha256 = hashlib.sha256(payload).hexdigest()
+    with open(manager.model_path, 'r+b') as model_file:
+        for offset in (1500, 9300):
+            model_file.seek(offset)
+            model_file.write(b'\xff\xff')
+    damaged = Path(manager.model_path).read_bytes()
+    # A stale or tampered manifest vouches for the damaged segment 1.
+    manifest_path = Path(f'{manager.model_path}.segments.json')
+    manifest = json.loads(manifest_path.read_text())
+    manifest['segment_sha256'][1] = hashlib.sha256(damaged[1024:2048]).hexdigest()
+    manifest_path.write_text(json.dumps(manifest))
+
+    assert manager._validate_existing_model_artifact(hash_if_suspect=True) == (False, 'checksum_mismatch')
+    assert manager.damaged_artifact_segments == [9]
+    assert manager._repair_artifact_segments([9]) is False
+
+    assert server['ranges'] == ['bytes=9216-10239']
+    assert Path(manager.model_path).read_bytes() == damaged
+    assert manager._read_artifact_verification_receipt(sha256) is False
+    assert not Path(f'{manager.model_path}.repair').exists()
+
+
+def test_segment_repair_waits_for_the_download_lock(tmp_path, monkeypatch, ranged_model_server):
+    from utils.llm import model_manager as model_manager_module
+
+    manager, payload, server = _repairable_artifact(tmp_path, monkeypatch, ranged_model_server)
+    with open(manager.model_path, 'r+b') as model_file:
+        model_file.seek(9300)
+        model_file.write(b'\xff\xff')
+    results = {}
+    repair = threading.Thread(target=lambda: results.setdefault('repaired', manager._repair_artifact_segments([9])))
+
+    with model_manager_module._exclusive_download_lock(f'{manager.model_path}.part.lock'):
+        repair.start()
+        repair.join(0.3)
+        assert repair.is_alive()
+        assert server['ranges'] == []
+    repair.join(5)
+
+    assert results == {'repaired': True}
+    assert Path(manager.model_path).read_bytes() == payload
+
+
+def test_full_artifact_hash_records_segment_manifest_in_the_same_pass(tmp_path, monkeypatch):
+    from utils.llm import model_manager as model_manager_module
+
+    payload = b'GGUF' + bytes(range(256)) * 20
+    manager = _ranged_download_manager(tmp_path, monkeypatch, payload)
+    Path(manager.model_path).write_bytes(payload)
+
+    assert manager._validate_existing_model_artifact() == (True, 'valid')
+
+    segments = json.loads(Path(f'{manager.model_path}.segments.json').read_text())
+    parallel = model_manager_module._hash_file_segments(manager.model_path, 1024)
+    assert segments['segment_sha256'] == [parallel[index] for index in range(6)]
+
+    with open(manager.model_path, 'r+b') as model_file:
+        model_file.seek(5000)
+        model_file.write(b'!')
+    manager.download_file_in_chunks = MagicMock(return_value=False)
+    assert manager._validate_existing_model_artifact(hash_if_suspect=True) == (False, 'checksum_mismatch')
+    assert manager.damaged_artifact_segments == [4]
+    # Without a reachable source the bounded full repair still runs.
+    manager.url = 'http://127.0.0.1:9/unreachable.gguf'
+    manager.last_runtime_init_error = 'runtime_model_load_failed'
+    assert manager.download_model_if_needed() is False
+    manager.download_file_in_chunks.assert_called_once()
+
+
 def test_canonical_path_for_compare_returns_none_when_stringification_fails_twice():
     from utils.llm import model_manager as model_manager_module
 
@@ -6790,6 +7083,213 @@ def test_model_manager_cancellation_recreates_outside_non_reentrant_lock(monkeyp
     manager.log_warning.assert_not_called()
 
 
+def _hot_standby_manager(tmp_path, monkeypatch, *, memory_available):
+    from utils.llm import model_manager as model_manager_module
+
+    (tmp_path / 'test_model.gguf').write_bytes(b'fake')
+    monkeypatch.setenv('TOKEN_PLACE_LLAMA_HOT_STANDBY', '1')
+    monkeypatch.setattr(
+        model_manager_module.resource_monitor, 'can_allocate_system_memory', lambda *_args, **_kwargs: memory_available
+    )
+    manager = model_manager_module.ModelManager(_RestartTestConfig(tmp_path))
+    created = []
+
+    class _Worker(model_manager_module._SubprocessLlamaProxy):
+        def __init__(self, **kwargs):
+            self._process = None
+            self._closed = False
+            self.kwargs = kwargs
+            created.append(self)
+
+        def is_alive(self):
+            return not self._closed
+
+        def close(self):
+            self._closed = True
+
+    monkeypatch.setattr(
+        model_manager_module, '_import_llama_cpp_runtime',
+        lambda **_kwargs: SimpleNamespace(__file__='/fake/llama_cpp.py', Llama=_Worker),
+    )
+    monkeypatch.setattr(manager, '_resolve_compute_plan', lambda: {
+        'requested_mode': 'cpu', 'effective_mode': 'cpu', 'backend_available': 'cpu',
+        'backend_selected': 'cpu', 'backend_used': 'cpu', 'n_gpu_layers': 0,
+        'fallback_reason': None,
+    })
+    return manager, created
+
+
+def _wait_for_hot_standby(manager):
+    deadline = time.monotonic() + 5
+    while not manager.worker_lifecycle_status()['hot_standby_ready']:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_cancellation_promotes_hot_standby_worker_and_warms_the_next(tmp_path, monkeypatch):
+    manager, created = _hot_standby_manager(tmp_path, monkeypatch, memory_available=True)
+
+    first = manager.get_llm_instance()
+    _wait_for_hot_standby(manager)
+    assert created[0] is first and len(created) == 2
+    assert created[1].kwargs == first.kwargs
+
+    assert manager.terminate_active_worker_for_cancellation(reason='cancelled') is True
+
+    assert first._closed is True
+    assert manager.llm is created[1]
+    assert manager.worker_state == 'ready'
+    _wait_for_hot_standby(manager)
+    status = manager.worker_lifecycle_status()
+    assert len(created) == 3
+    assert status['hot_standby_enabled'] is True
+    assert status['hot_standby_promotions'] == 1
+    assert status['hot_standby_last_warm_ms'] is not None
+    assert status['worker_restart_count'] == 1
+
+
+def test_hot_standby_is_skipped_without_memory_headroom(tmp_path, monkeypatch):
+    manager, created = _hot_standby_manager(tmp_path, monkeypatch, memory_available=False)
+
+    first = manager.get_llm_instance()
+    deadline = time.monotonic() + 5
+    while manager.worker_lifecycle_status()['hot_standby_memory_skips'] == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert created == [first]
+
+    assert manager.terminate_active_worker_for_cancellation(reason='cancelled') is True
+
+    # The replacement is loaded the usual way.
+    assert manager.llm is created[1]
+    assert manager.worker_lifecycle_status()['hot_standby_promotions'] == 0
+
+
+def test_unload_worker_stops_worker_and_standby_without_counting_a_restart(tmp_path, monkeypatch):
+    manager, created = _hot_standby_manager(tmp_path, monkeypatch, memory_available=True)
+
+    first = manager.get_llm_instance()
+    _wait_for_hot_standby(manager)
+
+    assert manager.unload_worker() is True
+
+    assert [worker._closed for worker in created] == [True, True]
+    status = manager.worker_lifecycle_status()
+    assert status['worker_state'] == 'stopped'
+    assert status['worker_restart_count'] == 0
+    assert status['hot_standby_ready'] is False
+    # The next request loads a fresh worker.
+    assert manager.get_llm_instance() is not first
+    assert manager.unload_worker() is True
+    assert manager.unload_worker() is True
+
+
+def test_worker_start_prefetches_model_pages_and_requests_mlock(tmp_path, monkeypatch):
+    from utils.llm import model_manager as model_manager_module
+
+    monkeypatch.setenv('TOKEN_PLACE_LLAMA_PREFETCH', '1')
+    monkeypatch.setenv('TOKEN_PLACE_LLAMA_MLOCK', '1')
+    manager, created = _hot_standby_manager(tmp_path, monkeypatch, memory_available=False)
+
+    first = manager.get_llm_instance()
+
+    assert created[0] is first
+    assert first.kwargs['use_mlock'] is True
+    diagnostics = manager.last_compute_diagnostics
+    assert diagnostics['model_prefetch_enabled'] is True
+    assert diagnostics['model_mlock_requested'] is True
+    assert isinstance(diagnostics['worker_init_ms'], int)
+    assert diagnostics['model_prefetch_threads'] >= 1
+
+    monkeypatch.delenv('TOKEN_PLACE_LLAMA_MLOCK')
+    assert 'use_mlock' not in manager._runtime_init_kwargs(model_manager_module._SubprocessLlamaProxy, 0)
+
+
+def test_model_prefetch_timing_reaches_diagnostics_when_it_finishes_after_worker_init(tmp_path, monkeypatch):
+    from utils.llm import model_manager as model_manager_module
+
+    monkeypatch.setenv('TOKEN_PLACE_LLAMA_PREFETCH', '1')
+    release = threading.Event()
+    original_read_segments = model_manager_module._ModelPagePrefetch._read_segments
+
+    def _slow_read_segments(self):
+        release.wait(5)
+        original_read_segments(self)
+
+    monkeypatch.setattr(model_manager_module._ModelPagePrefetch, '_read_segments', _slow_read_segments)
+    manager, _created = _hot_standby_manager(tmp_path, monkeypatch, memory_available=False)
+
+    manager.get_llm_instance()
+
+    diagnostics = manager.last_compute_diagnostics
+    assert diagnostics['model_prefetch_completed'] is False
+    assert diagnostics['model_prefetch_ms'] is None
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while diagnostics['model_prefetch_ms'] is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert manager.last_compute_diagnostics is diagnostics
+    assert diagnostics['model_prefetch_completed'] is True
+    assert isinstance(diagnostics['model_prefetch_ms'], int)
+    assert diagnostics['model_prefetch_bytes'] == os.path.getsize(manager.model_path)
+
+
+def test_model_page_prefetch_reads_every_segment_in_parallel(tmp_path, monkeypatch):
+    from utils.llm import model_manager as model_manager_module
+
+    monkeypatch.setattr(model_manager_module, '_MODEL_PREFETCH_SEGMENT_BYTES', 1000)
+    monkeypatch.setattr(model_manager_module, '_MODEL_PREFETCH_READ_BYTES', 256)
+    model_path = tmp_path / 'model.gguf'
+    model_path.write_bytes(b'g' * 10_500)
+    reads = []
+    original_read_segments = model_manager_module._ModelPagePrefetch._read_segments
+
+    def _counting_read_segments(self):
+        reads.append(threading.current_thread().name)
+        original_read_segments(self)
+
+    monkeypatch.setattr(model_manager_module._ModelPagePrefetch, '_read_segments', _counting_read_segments)
+
+    prefetch = model_manager_module._ModelPagePrefetch(str(model_path), threads=3).start()
+
+    assert prefetch.wait(5) is True
+    diagnostics = prefetch.diagnostics()
+    assert diagnostics['model_prefetch_completed'] is True
+    assert diagnostics['model_prefetch_bytes'] == 10_500
+    assert isinstance(diagnostics['model_prefetch_ms'], int)
+    assert len(set(reads)) == 3
+    assert next(prefetch._offsets, None) is None
+
+    missing = model_manager_module._ModelPagePrefetch(str(tmp_path / 'missing.gguf')).start()
+    assert missing.wait(5) is True
+    assert missing.diagnostics()['model_prefetch_error'] == 'FileNotFoundError'
+
+
+def test_subprocess_proxy_records_first_token_latency_from_worker_progress(tmp_path, monkeypatch):
+    from utils.llm import model_manager as model_manager_module
+
+    proxy = object.__new__(model_manager_module._SubprocessLlamaProxy)
+    proxy._pending_lock = threading.Lock()
+    proxy._pending = {'c1': model_manager_module._CommandFrames()}
+    proxy._command_progress = {}
+    proxy._latest_progress = {}
+    proxy.first_token_ms = None
+
+    for phase, elapsed_ms in (('preparing', 0), ('prefill', 80), ('generating', 120), ('generating', 400)):
+        assert proxy._route_worker_frame({
+            'type': 'inference_progress', 'phase': phase, 'elapsed_ms': elapsed_ms,
+            'protocol_version': 2, 'command_id': 'c1',
+        }) is True
+
+    assert proxy.first_token_ms == 120
+    manager = model_manager_module.ModelManager(_RestartTestConfig(tmp_path))
+    manager.llm = proxy
+    monkeypatch.setattr(manager, '_llm_is_usable', lambda _llm: True)
+    assert manager.worker_lifecycle_status()['worker_first_token_ms'] == 120
+
+
 def test_close_llm_proxy_terminates_kills_and_ignores_process_edge_cases(tmp_path, monkeypatch, posix_os):
     _ = posix_os
     manager, _created = _restart_manager(tmp_path, monkeypatch, [])
@@ -8199,6 +8699,556 @@ class Llama:
         process.wait(timeout=5)
 
 
+_BATCHING_LLAMA_CPP = r'''
+import ctypes, json, time
+
+N_VOCAB = 32
+EOS = 31
+_logits = {}
+
+class _Params:
+    def __init__(self):
+        self.n_seq_max = 1
+        self.kv_unified = False
+
+def llama_context_default_params():
+    return _Params()
+
+class _Batch:
+    def __init__(self, n_tokens, n_seq_max):
+        self.token = [0] * n_tokens
+        self.pos = [0] * n_tokens
+        self.n_seq_id = [0] * n_tokens
+        self.seq_id = [[0] * n_seq_max for _ in range(n_tokens)]
+        self.logits = [0] * n_tokens
+        self.n_tokens = 0
+
+def llama_batch_init(n_tokens, embd, n_seq_max):
+    return _Batch(n_tokens, n_seq_max)
+
+def llama_n_seq_max(ctx):
+    return ctx.params.n_seq_max
+
+def llama_kv_self_seq_rm(ctx, seq_id, p0, p1):
+    return True
+
+def llama_decode(ctx, batch):
+    rows = []
+    _logits.clear()
+    for index in range(batch.n_tokens):
+        rows.append([batch.seq_id[index][0], batch.pos[index], batch.token[index]])
+        if batch.logits[index]:
+            # Each sequence counts upwards from its last token until EOS.
+            values = (ctypes.c_float * N_VOCAB)()
+            values[min(batch.token[index] + 1, EOS)] = 100.0
+            _logits[index] = values
+    with open('decodes.jsonl', 'a') as handle:
+        handle.write(json.dumps(rows) + '\n')
+    time.sleep(ctx.decode_delay)
+    return 0
+
+def llama_get_logits_ith(ctx, index):
+    return ctypes.cast(_logits[index], ctypes.POINTER(ctypes.c_float))
+
+class _Context:
+    def __init__(self, params, decode_delay):
+        self.params = params
+        self.decode_delay = decode_delay
+
+class Llama:
+    def __init__(self, *args, **kwargs):
+        params = llama_context_default_params()
+        self.n_batch = 4
+        self._ctx = type('Ctx', (), {})()
+        self._ctx.ctx = _Context(params, kwargs.get('decode_delay', 0.0))
+    def n_ctx(self):
+        return 256
+    def n_vocab(self):
+        return N_VOCAB
+    def token_eos(self):
+        return EOS
+    def reset(self):
+        pass
+    def apply_chat_template(self, messages, **kwargs):
+        return messages[-1]['content']
+    def tokenize(self, text, add_bos=True, special=False):
+        # Prompt "abc" starts counting at token len("abc").
+        return [1] * (len(text) - 1) + [len(text)]
+    def detokenize(self, tokens):
+        return ' '.join(str(token) for token in tokens).encode('utf-8')
+'''
+
+
+def _start_fake_llama_worker(tmp_path, *, env_overrides, llama_body=_BATCHING_LLAMA_CPP, init_kwargs=None):
+    package_dir = tmp_path / 'llama_cpp'
+    package_dir.mkdir()
+    (package_dir / '__init__.py').write_text(llama_body)
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join([str(tmp_path), str(Path(__file__).parent.parent.parent)])
+    env.update(env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, '-c', 'from utils.llm.model_manager import _LLAMA_CPP_RUNTIME_WORKER_CODE; exec(_LLAMA_CPP_RUNTIME_WORKER_CODE)'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, env=env, cwd=tmp_path,
+    )
+    read_frame = _start_bounded_frame_reader(process.stdout)
+    process.stdin.write(json.dumps({'args': [], 'kwargs': init_kwargs or {}}) + '\n')
+    process.stdin.flush()
+    return process, read_frame, read_frame(timeout=10)
+
+
+def _send_rendered_prompt(process, command_id, content, max_tokens):
+    process.stdin.write(json.dumps({
+        'method': 'create_chat_completion_from_rendered_prompt',
+        'args': [[{'role': 'user', 'content': content}]],
+        'kwargs': {'max_tokens': max_tokens},
+        'protocol_version': 2,
+        'command_id': command_id,
+    }) + '\n')
+    process.stdin.flush()
+
+
+def _read_until_results(read_frame, command_ids):
+    frames = {command_id: [] for command_id in command_ids}
+    pending = set(command_ids)
+    while pending:
+        frame = read_frame(timeout=10)
+        frames.setdefault(frame.get('command_id'), []).append(frame)
+        if frame.get('type') != 'inference_progress':
+            pending.discard(frame.get('command_id'))
+    return frames
+
+
+def test_llama_worker_batches_rendered_prompts_across_sequences(tmp_path):
+    process, read_frame, init = _start_fake_llama_worker(
+        tmp_path, env_overrides={'TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES': '4'}, init_kwargs={'decode_delay': 0.02},
+    )
+    try:
+        assert init['status'] == 'ok'
+        assert init['batch_sequences'] == 4
+        _send_rendered_prompt(process, 'c1', 'abcdef', 3)
+        _send_rendered_prompt(process, 'c2', 'abc', 5)
+        frames = _read_until_results(read_frame, ['c1', 'c2'])
+    finally:
+        process.kill()
+        process.wait(timeout=5)
+
+    first, second = frames['c1'][-1], frames['c2'][-1]
+    assert first['status'] == second['status'] == 'ok'
+    assert first['result']['choices'][0]['message']['content'] == '7 8 9'
+    assert first['result']['choices'][0]['finish_reason'] == 'length'
+    assert second['result']['choices'][0]['message']['content'] == '4 5 6 7 8'
+    assert second['result']['usage'] == {'prompt_tokens': 3, 'completion_tokens': 5, 'total_tokens': 8}
+    phases = [frame['phase'] for frame in frames['c2'] if frame.get('type') == 'inference_progress']
+    assert phases[0] == 'preparing' and 'prefill' in phases and phases[-1] == 'generating'
+
+    decodes = [json.loads(line) for line in (tmp_path / 'decodes.jsonl').read_text().splitlines()]
+    assert any({row[0] for row in rows} == {0, 1} for rows in decodes)
+    assert all(len(rows) <= 4 for rows in decodes)
+    for seq_id, prompt_length, generated in ((0, 6, 3), (1, 3, 5)):
+        positions = [row[1] for rows in decodes for row in rows if row[0] == seq_id]
+        # The last sampled token is returned without being decoded.
+        assert positions == list(range(prompt_length + generated - 1))
+
+
+def test_llama_worker_cancels_one_batched_sequence(tmp_path):
+    process, read_frame, init = _start_fake_llama_worker(
+        tmp_path, env_overrides={'TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES': '2'}, init_kwargs={'decode_delay': 0.02},
+    )
+    try:
+        assert init['batch_sequences'] == 2
+        _send_rendered_prompt(process, 'c1', 'abc', 20)
+        _send_rendered_prompt(process, 'c2', 'abc', 20)
+        _send_rendered_prompt(process, 'c3', 'abcd', 10)
+        while read_frame(timeout=10).get('phase') != 'generating':
+            pass
+        for target, command_id in (('c1', 'x1'), ('c3', 'x2'), ('missing', 'x3')):
+            process.stdin.write(json.dumps({
+                'method': '__cancel__', 'target_command_id': target,
+                'protocol_version': 2, 'command_id': command_id,
+            }) + '\n')
+        process.stdin.flush()
+        frames = _read_until_results(read_frame, ['c1', 'c2', 'c3', 'x1', 'x2', 'x3'])
+    finally:
+        process.kill()
+        process.wait(timeout=5)
+
+    for command_id in ('c1', 'c3'):
+        assert frames[command_id][-1]['status'] == 'error'
+        assert frames[command_id][-1]['diagnostics']['reason'] == 'cancelled'
+    assert [frames[command_id][-1]['result'] for command_id in ('x1', 'x2', 'x3')] == [
+        {'cancelled': True}, {'cancelled': True}, {'cancelled': False},
+    ]
+    assert frames['c2'][-1]['result']['choices'][0]['message']['content'].split()[-1] == '23'
+
+
+def test_llama_worker_batching_needs_the_low_level_api(tmp_path):
+    llama_body = '''
+class Llama:
+    def __init__(self, *args, **kwargs):
+        pass
+'''
+    process, _read_frame, init = _start_fake_llama_worker(
+        tmp_path, env_overrides={'TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES': '4'}, llama_body=llama_body,
+    )
+    process.kill()
+    process.wait(timeout=5)
+
+    assert init['status'] == 'ok'
+    assert init['batch_sequences'] == 1
+
+
+def test_subprocess_llama_proxy_cancel_request_targets_batched_commands():
+    from utils.llm import model_manager as model_manager_module
+
+    proxy = object.__new__(model_manager_module._SubprocessLlamaProxy)
+    proxy.batch_sequences = 2
+    proxy._timeout_seconds = 30.0
+    proxy._pending_lock = threading.Lock()
+    proxy._command_progress = {
+        'c4': {'request_id': 'req-a'},
+        'c5': {'request_id': 'req-b'},
+    }
+    sent = []
+
+    def _rpc(payload, **kwargs):
+        sent.append((payload, kwargs['stage']))
+        return {'status': 'ok', 'result': {'cancelled': True}}
+
+    proxy._rpc = _rpc
+
+    assert proxy.cancel_request('req-b') is True
+    assert sent == [({'method': '__cancel__', 'target_command_id': 'c5'}, 'llama_cpp_cancel')]
+    assert proxy.cancel_request('req-missing') is False
+    proxy.batch_sequences = 1
+    assert proxy.cancel_request('req-a') is False
+    assert len(sent) == 1
+
+
+_PREFIX_CACHING_LLAMA_CPP = r'''
+import numpy as np
+
+class _State:
+    def __init__(self, input_ids, n_tokens):
+        self.input_ids = input_ids.copy()
+        self.n_tokens = n_tokens
+        self.llama_state_size = n_tokens
+
+def _longest_prefix(left, right):
+    shared = 0
+    for held, wanted in zip(left, right):
+        if held != wanted:
+            break
+        shared += 1
+    return shared
+
+class Llama:
+    # Follows llama-cpp-python: input_ids is the fixed n_ctx buffer whose
+    # first n_tokens entries are evaluated; create_completion() restores the
+    # cached state only when it shares a longer prefix than the context,
+    # reuses the common prefix, evaluates the rest and saves prompt +
+    # completion afterwards.
+    def __init__(self, *args, **kwargs):
+        self.cache = None
+        self.input_ids = np.zeros((kwargs.get('n_ctx', 4096),), dtype=np.intc)
+        self.n_tokens = 0
+    @property
+    def _input_ids(self):
+        return self.input_ids[:self.n_tokens]
+    def set_cache(self, cache):
+        self.cache = cache
+    def save_state(self):
+        return _State(self.input_ids, self.n_tokens)
+    def load_state(self, state):
+        self.input_ids = state.input_ids.copy()
+        self.n_tokens = state.n_tokens
+    def eval(self, tokens):
+        self.input_ids[self.n_tokens:self.n_tokens + len(tokens)] = tokens
+        self.n_tokens += len(tokens)
+    def apply_chat_template(self, messages, **kwargs):
+        return messages[-1]['content']
+    def tokenize(self, text, add_bos=True, special=False):
+        return [int(word) for word in text.decode('utf-8').split()]
+    def create_completion(self, prompt, max_tokens=16, **kwargs):
+        tokens = self.tokenize(prompt.encode('utf-8'))
+        if self.cache:
+            try:
+                state = self.cache[tokens]
+                if _longest_prefix(state.input_ids.tolist(), tokens) > _longest_prefix(self._input_ids.tolist(), tokens):
+                    self.load_state(state)
+            except KeyError:
+                pass
+        reused = _longest_prefix(self._input_ids.tolist(), tokens)
+        self.n_tokens = reused
+        self.eval(tokens[reused:])
+        completion = [tokens[-1] + offset for offset in range(1, max_tokens + 1)]
+        self.eval(completion)
+        self.cache[tokens + completion] = self.save_state()
+        return {
+            'choices': [{'text': 'evaluated ' + str(len(tokens) - reused), 'finish_reason': 'length'}],
+            'usage': {'prompt_tokens': len(tokens), 'completion_tokens': max_tokens, 'total_tokens': len(tokens) + max_tokens},
+        }
+'''
+
+
+def test_llama_worker_prefix_cache_restores_longest_prefix_and_evicts_lru(tmp_path):
+    process, read_frame, init = _start_fake_llama_worker(
+        tmp_path,
+        env_overrides={'TOKEN_PLACE_LLAMA_PREFIX_CACHE_BYTES': '250'},
+        llama_body=_PREFIX_CACHING_LLAMA_CPP,
+    )
+
+    def complete(command_id, first, last):
+        _send_rendered_prompt(process, command_id, ' '.join(str(token) for token in range(first, last + 1)), 4)
+        return _read_until_results(read_frame, [command_id])[command_id][-1]
+
+    try:
+        assert init['status'] == 'ok'
+        first_turn = complete('c1', 1, 100)
+        other_conversation = complete('c2', 500, 599)
+        second_turn = complete('c3', 1, 120)
+        third_conversation = complete('c4', 900, 999)
+        evicted_conversation = complete('c5', 500, 610)
+    finally:
+        process.kill()
+        process.wait(timeout=5)
+
+    evaluated = [
+        frame['result']['choices'][0]['message']['content']
+        for frame in (first_turn, other_conversation, second_turn, third_conversation, evicted_conversation)
+    ]
+    # Turn two restores turn one's 104 tokens; the other conversation was
+    # evicted to fit the third one and is evaluated in full.
+    assert evaluated == ['evaluated 100', 'evaluated 100', 'evaluated 16', 'evaluated 100', 'evaluated 111']
+    assert second_turn['prefix_cache'] == {
+        'lookups': 3, 'hits': 1, 'tokens_saved': 104, 'evictions': 0,
+        'entries': 2, 'bytes': 228, 'capacity_bytes': 250,
+    }
+    assert evicted_conversation['prefix_cache']['hits'] == 1
+    assert evicted_conversation['prefix_cache']['evictions'] == 2
+    assert evicted_conversation['prefix_cache']['bytes'] <= 250
+
+
+_DISK_CACHING_LLAMA_CPP = _PREFIX_CACHING_LLAMA_CPP.replace(
+    '''class _State:
+    def __init__(self, input_ids, n_tokens):
+        self.input_ids = input_ids.copy()
+        self.n_tokens = n_tokens
+        self.llama_state_size = n_tokens
+''',
+    '''import json
+
+class LlamaState:
+    def __init__(self, input_ids, n_tokens):
+        self.input_ids = input_ids.copy()
+        self.n_tokens = n_tokens
+        self.llama_state = json.dumps(input_ids[:n_tokens].tolist()).encode('utf-8')
+        self.llama_state_size = len(self.llama_state)
+
+_State = LlamaState
+''',
+).replace(
+    '''    def load_state(self, state):
+        self.input_ids = state.input_ids.copy()
+''',
+    '''    def n_ctx(self):
+        return len(self.input_ids)
+    def load_state(self, state):
+        assert json.loads(bytes(state.llama_state)) == state.input_ids[:state.n_tokens].tolist()
+        self.input_ids = state.input_ids.copy()
+''',
+)
+
+
+def test_llama_worker_disk_prefix_cache_survives_restarts_per_runtime_profile(tmp_path):
+    cache_dir = tmp_path / 'kv-states'
+    model_path = tmp_path / 'model.gguf'
+    model_path.write_bytes(b'gguf')
+    env_overrides = {
+        'TOKEN_PLACE_LLAMA_PREFIX_CACHE_DIR': str(cache_dir),
+        'TOKEN_PLACE_LLAMA_PREFIX_CACHE_DISK_BYTES': '30000',
+    }
+
+    def saved_states():
+        return {path.name: path.stat().st_size for path in cache_dir.glob('*.kvstate')}
+
+    def run(worker_dir, requests, type_k='q8_0', writes=()):
+        worker_dir.mkdir()
+        process, read_frame, init = _start_fake_llama_worker(
+            worker_dir,
+            env_overrides=env_overrides,
+            llama_body=_DISK_CACHING_LLAMA_CPP,
+            init_kwargs={'model_path': str(model_path), 'type_k': type_k},
+        )
+        frames = []
+        try:
+            assert init['status'] == 'ok'
+            for index, (first, last) in enumerate(requests):
+                before = saved_states() if cache_dir.exists() else {}
+                _send_rendered_prompt(process, f'c{index}', ' '.join(str(token) for token in range(first, last + 1)), 4)
+                frames.append(_read_until_results(read_frame, [f'c{index}'])[f'c{index}'][-1])
+                # States are written in the background; wait for this one.
+                deadline = time.monotonic() + 5
+                while index in writes and (
+                    saved_states() == before or sum(saved_states().values()) > 30000 or list(cache_dir.glob('*.tmp'))
+                ):
+                    assert time.monotonic() < deadline
+                    time.sleep(0.01)
+        finally:
+            process.kill()
+            process.wait(timeout=5)
+        return [frame['result']['choices'][0]['message']['content'] for frame in frames], frames[-1]['prefix_cache']
+
+    evaluated, _stats = run(tmp_path / 'first', [(1, 1100)], writes={0})
+    assert evaluated == ['evaluated 1100']
+    assert len(saved_states()) == 1
+    assert [path.stat().st_mode & 0o077 for path in cache_dir.glob('*.kvstate')] == [0]
+
+    # A restarted worker loads the saved conversation instead of prefilling it.
+    evaluated, stats = run(
+        tmp_path / 'second',
+        [(1, 1120), (5000, 6100), (9000, 10100), (20000, 20010)],
+        writes={0, 1, 2},
+    )
+    assert evaluated == ['evaluated 16', 'evaluated 1101', 'evaluated 1101', 'evaluated 11']
+    assert stats['disk_hits'] == 1
+    assert stats['tokens_saved'] == 1104
+    assert stats['disk_evictions'] == 1
+    assert stats['disk_entries'] == 2
+    assert len(saved_states()) == 2
+    assert stats['disk_bytes'] <= 30000
+
+    # Files saved under another KV cache type are never loaded.
+    evaluated, stats = run(tmp_path / 'third', [(5000, 6110)], type_k='f16')
+    assert evaluated == ['evaluated 1111']
+    assert stats['disk_hits'] == 0
+
+
+_STREAMING_LLAMA_CPP = r'''
+class Llama:
+    def __init__(self, *args, **kwargs):
+        pass
+    def create_chat_completion(self, messages, stream=False, **kwargs):
+        base = {'id': 'chat-1', 'object': 'chat.completion.chunk', 'created': 1, 'model': 'fake'}
+        yield {**base, 'choices': [{'index': 0, 'delta': {'role': 'assistant'}, 'finish_reason': None}]}
+        for word in messages[-1]['content'].split():
+            yield {**base, 'choices': [{'index': 0, 'delta': {'content': word + ' '}, 'finish_reason': None}]}
+        yield {**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+'''
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='frame protocol v3 is POSIX only')
+def test_llama_worker_frame_protocol_v3_streams_packed_frames_over_pipe(tmp_path):
+    from utils.llm import model_manager as model_manager_module
+
+    package_dir = tmp_path / 'llama_cpp'
+    package_dir.mkdir()
+    (package_dir / '__init__.py').write_text(_STREAMING_LLAMA_CPP)
+    read_fd, write_fd = os.pipe()
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join([str(tmp_path), str(Path(__file__).parent.parent.parent)])
+    env['TOKEN_PLACE_LLAMA_WORKER_FRAME_FD'] = str(write_fd)
+    process = subprocess.Popen(
+        [sys.executable, '-c', 'from utils.llm.model_manager import _LLAMA_CPP_RUNTIME_WORKER_CODE; exec(_LLAMA_CPP_RUNTIME_WORKER_CODE)'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, env=env, cwd=tmp_path, pass_fds=(write_fd,),
+    )
+    os.close(write_fd)
+    kinds = []
+
+    class _RecordingPipe:
+        def __init__(self, stream):
+            self._stream = stream
+
+        def read(self, size):
+            data = self._stream.read(size)
+            if size == model_manager_module._WORKER_FRAME_HEADER.size and len(data) == size:
+                kinds.append(data[4])
+            return data
+
+    try:
+        process.stdin.write(json.dumps({'method': '__import__', 'protocol_version': 2, 'command_id': 'c1', 'frame_protocols': [3]}) + '\n')
+        process.stdin.write(json.dumps({'method': '__init__', 'args': [], 'kwargs': {}, 'protocol_version': 2, 'command_id': 'c2'}) + '\n')
+        process.stdin.write(json.dumps({
+            'method': 'create_chat_completion',
+            'args': [[{'role': 'user', 'content': 'one two three'}]],
+            'kwargs': {'stream': True},
+            'protocol_version': 2,
+            'command_id': 'c3',
+        }) + '\n')
+        process.stdin.close()
+        handshake = json.loads(process.stdout.readline().split(':', 1)[1])
+        with os.fdopen(read_fd, 'rb') as pipe:
+            frames = list(model_manager_module._read_worker_frames(_RecordingPipe(pipe)))
+        process.wait(timeout=10)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait(timeout=5)
+
+    assert handshake['frame_protocol'] == 3
+    assert frames[0]['command_id'] == 'c2' and frames[0]['status'] == 'ok'
+    stream = [frame for frame in frames if frame.get('command_id') == 'c3' and frame.get('type') != 'inference_progress']
+    text = ''.join(frame['chunk']['choices'][0]['delta'].get('content', '') for frame in stream if 'chunk' in frame)
+    assert text == 'one two three '
+    assert stream[2]['chunk'] == {
+        'id': 'chat-1', 'object': 'chat.completion.chunk', 'created': 1, 'model': 'fake',
+        'choices': [{'index': 0, 'delta': {'content': 'two '}, 'finish_reason': None}],
+    }
+    assert stream[-1] == {'status': 'ok', 'done': True, 'protocol_version': 2, 'command_id': 'c3'}
+    # The second and third words travel as bare text against the first one.
+    assert kinds.count(model_manager_module._WORKER_FRAME_CHUNK) == 2
+
+
+def test_worker_frame_decoder_round_trips_packed_progress():
+    import io
+    from utils.llm import model_manager as model_manager_module
+
+    header = model_manager_module._WORKER_FRAME_HEADER
+    body = model_manager_module._WORKER_FRAME_PROGRESS_BODY.pack(1, 4096, 1024, 2048, 0, 37)
+    stream = io.BytesIO(header.pack(len(body), model_manager_module._WORKER_FRAME_PROGRESS, 2) + b'c7' + body)
+
+    assert list(model_manager_module._read_worker_frames(stream)) == [{
+        'type': 'inference_progress', 'phase': 'prefill',
+        'total_prompt_tokens': 4096, 'cached_prompt_tokens': 1024, 'processed_prompt_tokens': 2048,
+        'generated_tokens': 0, 'elapsed_ms': 37, 'protocol_version': 2, 'command_id': 'c7',
+    }]
+
+
+def test_command_frames_wake_waiter_without_polling():
+    from utils.llm import model_manager as model_manager_module
+
+    frames = model_manager_module._CommandFrames()
+    threading.Timer(0.05, frames.wake).start()
+    started = time.monotonic()
+    assert frames.wait_frame(5) is None
+    assert time.monotonic() - started < 2
+    frames.put_nowait({'done': True})
+    assert frames.wait_frame(5) == {'done': True}
+
+
+def test_worker_lifecycle_status_reports_prefix_cache_metrics(tmp_path):
+    from utils.llm import model_manager as model_manager_module
+
+    manager = model_manager_module.ModelManager(_RestartTestConfig(tmp_path))
+    manager.llm = SimpleNamespace(prefix_cache_stats={
+        'lookups': 8, 'hits': 6, 'tokens_saved': 48000, 'evictions': 1,
+        'entries': 3, 'bytes': 3 << 30, 'capacity_bytes': 4 << 30,
+        'disk_hits': 2, 'disk_entries': 5, 'disk_bytes': 40 << 30,
+    })
+
+    status = manager.worker_lifecycle_status()
+
+    assert status['prefix_cache_enabled'] is True
+    assert status['prefix_cache_hit_rate'] == 0.75
+    assert status['prefix_cache_tokens_saved'] == 48000
+    assert status['prefix_cache_bytes'] == 3 << 30
+    assert status['prefix_cache_disk_hits'] == 2
+    assert status['prefix_cache_disk_bytes'] == 40 << 30
+    manager.llm = None
+    assert manager.worker_lifecycle_status()['prefix_cache_enabled'] is False
+
+
 def test_llama_worker_render_and_tokenize_chat_returns_only_token_count(tmp_path):
     response = _run_llama_worker_request(
         tmp_path,
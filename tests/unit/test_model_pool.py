@@ -0,0 +1,143 @@
+"""Tests for multi-model residency in utils.llm.model_pool."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from utils.llm import model_pool as model_pool_module
+from utils.llm.model_pool import ModelPool
+from utils.llm.model_profiles import LLAMA_3_1_8B_PROFILE_ID, LLAMA_FILENAME, QWEN3_8B_PROFILE_ID
+
+
+class _FakeManager:
+    def __init__(self, tmp_path, profile, size):
+        self.profile_id = profile['profile_id']
+        self.api_model_id = profile['api_model_id']
+        self.file_name = profile['filename']
+        self.model_path = str(tmp_path / profile['filename'])
+        self.model_profile = profile
+        self.use_mock_llm = False
+        self.llm = object()
+        self.unloads = 0
+        self.unload_gate = None
+        (tmp_path / profile['filename']).write_bytes(b'0' * size)
+
+    def unload_worker(self):
+        if self.unload_gate is not None:
+            self.unload_gate.wait(5)
+        self.unloads += 1
+        self.llm = None
+        return True
+
+
+def _pool(tmp_path, *, budget, sizes):
+    qwen = model_pool_module.get_model_profile(QWEN3_8B_PROFILE_ID)
+    primary = _FakeManager(tmp_path, qwen, sizes[0])
+
+    def factory(_primary, profile):
+        manager = _FakeManager(tmp_path, profile, sizes[1])
+        manager.llm = None
+        return manager
+
+    pool = ModelPool(primary, [LLAMA_3_1_8B_PROFILE_ID, 'no-such-model'], memory_budget_bytes=budget, manager_factory=factory)
+    return pool, primary, pool._entries[1].manager
+
+
+def test_cold_model_evicts_least_recently_used_idle_model_within_budget(tmp_path):
+    pool, qwen, llama = _pool(tmp_path, budget=100, sizes=(60, 50))
+    assert pool.model_states() == {'qwen3-8b-instruct': 'warm', 'llama-3.1-8b-instruct': 'cold'}
+
+    assert pool.acquire('llama-3.1-8b-instruct') is llama
+    llama.llm = object()
+    pool.release(llama)
+
+    assert qwen.unloads == 1
+    assert pool.model_states() == {'qwen3-8b-instruct': 'cold', 'llama-3.1-8b-instruct': 'warm'}
+    # Aliases and unknown ids stay with the primary, which reloads on demand.
+    assert pool.acquire('gpt-5-chat-latest') is qwen
+    pool.release(qwen)
+    assert llama.unloads == 1
+    assert (pool.loads, pool.evictions) == (2, 2)
+
+
+def test_warm_model_never_waits_for_another_models_eviction_or_load(tmp_path):
+    pool, qwen, llama = _pool(tmp_path, budget=100, sizes=(60, 50))
+    qwen.unload_gate = threading.Event()
+    acquired = []
+    cold = threading.Thread(target=lambda: acquired.append(pool.acquire('llama-3.1-8b-instruct')))
+    cold.start()
+    deadline = time.monotonic() + 5
+    while pool.evictions == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    # Llama is admitted only after qwen's worker has stopped.
+    time.sleep(0.05)
+    assert acquired == []
+    qwen.unload_gate.set()
+    cold.join(5)
+    assert acquired == [llama]
+    llama.llm = object()
+
+    # Llama is busy, so qwen's reload waits for it...
+    reload = threading.Thread(target=lambda: acquired.append(pool.acquire('qwen3-8b-instruct')))
+    reload.start()
+    time.sleep(0.05)
+    # ...while further llama requests are served at once.
+    started = time.monotonic()
+    assert pool.acquire('llama-3.1-8b-instruct') is llama
+    assert time.monotonic() - started < 0.5
+    assert acquired == [llama]
+    pool.release(llama)
+    pool.release(llama)
+    reload.join(5)
+    assert acquired == [llama, qwen]
+    assert llama.unloads == 1
+
+
+def test_cold_model_waits_for_busy_models_and_is_refused_when_it_never_fits(tmp_path):
+    pool, qwen, llama = _pool(tmp_path, budget=100, sizes=(60, 50))
+    assert pool.acquire('qwen3-8b-instruct') is qwen
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire('llama-3.1-8b-instruct')))
+    waiter.start()
+    time.sleep(0.1)
+    assert acquired == [] and qwen.unloads == 0
+
+    pool.release(qwen)
+    waiter.join(5)
+    assert acquired == [llama] and qwen.unloads == 1
+    pool.release(llama)
+
+    pool.memory_budget_bytes = 40
+    assert pool.acquire('qwen3-8b-instruct') is None
+    assert pool.admission_failures == 1
+
+
+def test_from_environment_builds_profile_managers_without_primary_artifact_overrides(tmp_path, monkeypatch):
+    config = SimpleNamespace(
+        is_production=False,
+        get=lambda key, default=None: {
+            'paths.models_dir': str(tmp_path),
+            'model.filename': 'custom-qwen.gguf',
+            'model.context_size': 65536,
+        }.get(key, default),
+    )
+    primary = SimpleNamespace(
+        config=config, profile_id=QWEN3_8B_PROFILE_ID, api_model_id='qwen3-8b-instruct', file_name='custom-qwen.gguf',
+        requested_compute_mode='cpu', default_n_gpu_layers=0,
+    )
+    monkeypatch.delenv('TOKEN_PLACE_MODEL_POOL_PROFILES', raising=False)
+    assert ModelPool.from_environment(primary) is None
+
+    monkeypatch.setenv('TOKEN_PLACE_MODEL_POOL_PROFILES', 'llama-3.1-8b-instruct, qwen3-8b-instruct')
+    monkeypatch.setenv('TOKEN_PLACE_MODEL_POOL_MEMORY_BYTES', '12000000000')
+    pool = ModelPool.from_environment(primary)
+
+    assert pool.memory_budget_bytes == 12000000000
+    assert len(pool._entries) == 2
+    llama = pool._entries[1].manager
+    assert llama.profile_id == LLAMA_3_1_8B_PROFILE_ID
+    assert llama.model_path == str(tmp_path / LLAMA_FILENAME)
+    assert llama.config.get('model.context_size') == 8192
+    assert (llama.requested_compute_mode, llama.default_n_gpu_layers) == ('cpu', 0)
+    assert pool.model_states() == {}
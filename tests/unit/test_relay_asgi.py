@@ -0,0 +1,244 @@
+"""Event-loop (ASGI) serving mode keeps the relay JSON contract without per-poll threads."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import relay
+
+
+@pytest.fixture()
+def asgi_app(monkeypatch):
+    relay.app.config["TESTING"] = True
+    relay.known_servers.clear()
+    relay.client_inference_requests.clear()
+    relay.client_pending_request_ids.clear()
+    relay.client_responses.clear()
+    relay.api_v1_filtered_round_robin_next_positions.clear()
+    relay.server_round_robin_next_index = 0
+    monkeypatch.setenv(relay.API_V1_POLL_WAIT_SECONDS_ENV, "15")
+    _reset_rate_limits()
+    application = relay.create_asgi_app(max_workers=2)
+    yield application
+    application.close()
+    relay.known_servers.clear()
+    relay.client_inference_requests.clear()
+    relay.client_pending_request_ids.clear()
+    relay.client_responses.clear()
+
+
+def _reset_rate_limits():
+    for limiter in relay.app.extensions.get("limiter", set()):
+        storage = getattr(getattr(limiter, "limiter", None), "storage", None)
+        if storage is not None and hasattr(storage, "reset"):
+            storage.reset()
+    control_plane_limiter = relay.app.config.get("relay_control_plane_rate_limiter")
+    control_plane_storage = getattr(control_plane_limiter, "storage", None)
+    if control_plane_storage is not None and hasattr(control_plane_storage, "reset"):
+        control_plane_storage.reset()
+
+
+def _capabilities():
+    return {
+        "api_version": "v1",
+        "supported_model_ids": ["qwen3-8b-instruct"],
+        "active_context_tier": "8k-fast",
+        "maximum_total_context_tokens": 8192,
+        "default_output_token_reservation": 256,
+        "maximum_output_tokens": 512,
+        "max_concurrency": 1,
+        "backend_class": "cpu",
+    }
+
+
+def _client(application, index=0):
+    transport = httpx.ASGITransport(app=application, client=(f"10.0.{index // 250}.{index % 250 + 1}", 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://relay.test")
+
+
+async def _register(client, server_public_key):
+    response = await client.post(
+        "/api/v1/relay/servers/register",
+        json={"server_public_key": server_public_key, "capabilities": _capabilities()},
+    )
+    assert response.status_code == 200
+
+
+async def _queue(client, server_public_key, request_id):
+    response = await client.post(
+        "/api/v1/relay/requests",
+        json={
+            "server_public_key": server_public_key,
+            "client_public_key": f"client-{request_id}",
+            "request_id": request_id,
+            "chat_history": "ciphertext",
+            "cipherkey": "cipherkey",
+            "iv": "iv",
+        },
+    )
+    assert response.status_code == 200
+
+
+def test_asgi_mode_matches_threaded_json_contract(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            livez = await client.get("/livez")
+            missing = await client.post("/api/v1/relay/servers/poll", json={"server_public_key": "missing-node"})
+            invalid = await client.post("/api/v1/relay/servers/poll", content=b"not-json")
+        return livez, missing, invalid
+
+    livez, missing, invalid = asyncio.run(scenario())
+    with relay.app.test_client() as threaded:
+        assert livez.status_code == threaded.get("/livez").status_code
+        threaded_missing = threaded.post("/api/v1/relay/servers/poll", json={"server_public_key": "missing-node"})
+        assert (missing.status_code, missing.json()) == (threaded_missing.status_code, threaded_missing.get_json())
+    assert invalid.status_code == 400
+
+
+def test_asgi_parked_poll_wakes_on_enqueue_without_holding_a_worker(asgi_app):
+    async def scenario():
+        async with _client(asgi_app) as client:
+            await _register(client, "node-a")
+            poll = asyncio.ensure_future(client.post("/api/v1/relay/servers/poll", json={"server_public_key": "node-a"}))
+            while not asgi_app.parked_requests:
+                await asyncio.sleep(0.01)
+            waiter = relay.client_inference_request_waiters["node-a"]
+            assert waiter.parked == 0
+            assert len(waiter.listeners) == 1
+            assert relay.known_servers["node-a"]["polling_until_monotonic"] > 0
+            await _queue(client, "node-a", "req-asgi-wake")
+            response = await asyncio.wait_for(poll, timeout=1.0)
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json()["request_id"] == "req-asgi-wake"
+    assert "node-a" not in relay.client_inference_request_waiters
+
+
+def test_asgi_parked_poll_times_out_with_threaded_idle_payload(asgi_app, monkeypatch):
+    monkeypatch.setenv(relay.API_V1_POLL_WAIT_SECONDS_ENV, "0.2")
+
+    async def scenario():
+        async with _client(asgi_app) as client:
+            await _register(client, "node-idle")
+            return await client.post("/api/v1/relay/servers/poll", json={"server_public_key": "node-idle"})
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "No requests available", "next_ping_in_x_seconds": 0, "poll_wait_seconds": 0.2}
+    assert "polling_until_monotonic" not in relay.known_servers["node-idle"]
+
+
+def test_asgi_many_idle_polls_share_a_small_worker_pool(asgi_app):
+    node_count = 200
+    threads_before = threading.active_count()
+
+    async def scenario():
+        clients = [_client(asgi_app, index) for index in range(node_count)]
+        try:
+            for index, client in enumerate(clients):
+                await _register(client, f"node-{index}")
+            polls = [
+                asyncio.ensure_future(client.post("/api/v1/relay/servers/poll", json={"server_public_key": f"node-{index}"}))
+                for index, client in enumerate(clients)
+            ]
+            deadline = time.monotonic() + 10.0
+            while asgi_app.parked_requests < node_count and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            parked = asgi_app.parked_requests
+            peak_threads = threading.active_count()
+            for index, client in enumerate(clients):
+                await _queue(client, f"node-{index}", f"req-{index}")
+            responses = await asyncio.wait_for(asyncio.gather(*polls), timeout=5.0)
+        finally:
+            for client in clients:
+                await client.aclose()
+        return parked, peak_threads, responses
+
+    parked, peak_threads, responses = asyncio.run(scenario())
+
+    assert parked == node_count
+    assert peak_threads - threads_before <= 2
+    assert sorted(response.json()["request_id"] for response in responses) == sorted(f"req-{index}" for index in range(node_count))
+
+
+def test_asgi_parked_retrieve_wakes_on_response_without_holding_a_worker(asgi_app):
+    relay._mark_request_pending("client-wait", "req-wait", deadline_monotonic=time.monotonic() + 30)
+
+    async def scenario():
+        async with _client(asgi_app) as client:
+            retrieve = asyncio.ensure_future(
+                client.post(
+                    "/api/v1/relay/responses/retrieve",
+                    json={"client_public_key": "client-wait", "request_id": "req-wait", "wait_seconds": 10},
+                )
+            )
+            while not asgi_app.parked_requests:
+                await asyncio.sleep(0.01)
+            waiter = relay.api_v1_response_waiters[("client-wait", "req-wait")]
+            assert waiter.parked == 0
+            assert len(waiter.listeners) == 1
+            relay._queue_client_response(
+                "client-wait",
+                {"request_id": "req-wait", "chat_history": "ciphertext", "cipherkey": "cipherkey", "iv": "iv"},
+            )
+            return await asyncio.wait_for(retrieve, timeout=1.0)
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json()["request_id"] == "req-wait"
+    assert relay.api_v1_response_waiters == {}
+
+
+def test_asgi_idle_response_event_streams_park_without_holding_workers(asgi_app):
+    stream_count = 64
+    deadline = time.monotonic() + 30
+    for index in range(stream_count):
+        relay._mark_request_pending(f"client-sse-{index}", f"req-sse-{index}", deadline_monotonic=deadline)
+    threads_before = threading.active_count()
+
+    async def scenario():
+        async with _client(asgi_app) as client:
+            streams = [
+                asyncio.ensure_future(
+                    client.post(
+                        "/api/v1/relay/responses/events",
+                        json={"client_public_key": f"client-sse-{index}", "request_id": f"req-sse-{index}"},
+                    )
+                )
+                for index in range(stream_count)
+            ]
+            wait_until = time.monotonic() + 10.0
+            while asgi_app.parked_requests < stream_count and time.monotonic() < wait_until:
+                await asyncio.sleep(0.05)
+            parked = asgi_app.parked_requests
+            peak_threads = threading.active_count()
+            # Every stream is idle, yet the two-thread pool still serves other routes.
+            livez = await asyncio.wait_for(client.get("/livez"), timeout=1.0)
+            for index in range(stream_count):
+                relay._queue_client_response(
+                    f"client-sse-{index}",
+                    {"request_id": f"req-sse-{index}", "chat_history": "ciphertext", "cipherkey": "cipherkey", "iv": "iv"},
+                )
+            responses = await asyncio.wait_for(asyncio.gather(*streams), timeout=5.0)
+        return parked, peak_threads, livez, responses
+
+    parked, peak_threads, livez, responses = asyncio.run(scenario())
+
+    assert parked == stream_count
+    assert peak_threads - threads_before <= 2
+    assert livez.status_code == 200
+    for index, response in enumerate(responses):
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith("event: response\n")
+        assert f'"request_id":"req-sse-{index}"' in response.text
+    assert relay.api_v1_response_waiters == {}
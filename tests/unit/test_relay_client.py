@@ -2338,6 +2338,43 @@ class TestRelayClient:
         assert result['next_ping_in_x_seconds'] == 0
         assert result['poll_wait_seconds'] == 10
 
+    @patch('utils.networking.relay_client.requests.post')
+    def test_poll_api_v1_encrypted_work_hands_out_a_batched_claim_one_envelope_at_a_time(
+        self, mock_post, relay_client
+    ):
+        register_ok = MagicMock(status_code=200)
+        register_ok.json.return_value = {'next_ping_in_x_seconds': 12, 'poll_wait_seconds': 10}
+        envelopes = [
+            {'request_id': f'req-{index}', 'request_deadline_remaining_seconds': 60.0, 'request_ttl_seconds': 60.0}
+            for index in range(3)
+        ]
+        poll_ok = MagicMock(status_code=200)
+        poll_ok.json.return_value = {**envelopes[0], 'batch': envelopes}
+        mock_post.side_effect = [register_ok, poll_ok]
+
+        claimed = [relay_client.poll_api_v1_encrypted_work() for _ in range(3)]
+
+        assert mock_post.call_count == 2
+        assert mock_post.call_args_list[1].kwargs['json']['max_items'] == 1
+        assert [item['request_id'] for item in claimed] == ['req-0', 'req-1', 'req-2']
+        assert all('batch' not in item and item['next_ping_in_x_seconds'] == 0 for item in claimed)
+        assert 0 < claimed[2]['request_deadline_remaining_seconds'] <= 60.0
+        assert relay_client._api_v1_response_relay_url() == 'http://localhost:5000'
+
+    def test_api_v1_claimed_backlog_drops_envelopes_past_their_deadline(self, relay_client, monkeypatch):
+        clock = iter([100.0, 130.0, 130.0])
+        monkeypatch.setattr(relay_client_module.time, 'monotonic', lambda: next(clock))
+        relay_client._stash_api_v1_claimed_backlog(
+            'http://localhost:5000',
+            [{'request_id': 'late', 'request_ttl_seconds': 20.0}, {'request_id': 'ok', 'request_ttl_seconds': 50.0}],
+        )
+
+        envelope = relay_client._pop_api_v1_claimed_backlog()
+
+        assert envelope['request_id'] == 'ok'
+        assert envelope['request_ttl_seconds'] == 20.0
+        assert relay_client._pop_api_v1_claimed_backlog() is None
+
     @patch('utils.networking.relay_client.requests.post')
     def test_poll_api_v1_encrypted_work_error_path_uses_register_backoff(self, mock_post, relay_client):
         register_ok = MagicMock(status_code=200)
@@ -4749,6 +4786,240 @@ def test_poll_api_v1_encrypted_work_continuously_sleeps_no_work_hint(monkeypatch
     assert 0.25 in sleeps
 
 
+@pytest.mark.parametrize(('raw', 'expected'), [(None, 1), ('4', 4), ('0', 1), ('many', 1), ('1000', 128)])
+def test_api_v1_max_concurrency_reads_and_clamps_env(monkeypatch, raw, expected):
+    if raw is None:
+        monkeypatch.delenv('TOKEN_PLACE_API_V1_MAX_CONCURRENCY', raising=False)
+    else:
+        monkeypatch.setenv('TOKEN_PLACE_API_V1_MAX_CONCURRENCY', raw)
+
+    assert relay_client_module._api_v1_max_concurrency() == expected
+
+
+def test_api_v1_work_slots_never_run_more_than_their_size():
+    slots = relay_client_module._ApiV1WorkSlots(2)
+    release = threading.Event()
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        release.wait(5)
+        with lock:
+            running.pop()
+
+    for _ in range(2):
+        assert slots.wait_for_free(lambda: False) >= 1
+        slots.submit(work)
+    assert slots.wait_for_free(lambda: True) == 0
+    release.set()
+    assert slots.wait_for_free(lambda: False) >= 1
+    slots.submit(work)
+    slots.shutdown()
+
+    assert max(peak) == 2
+    assert slots.wait_for_free(lambda: False) == 2
+
+
+def test_poll_api_v1_encrypted_work_continuously_claims_only_free_slots(monkeypatch):
+    monkeypatch.setenv('TOKEN_PLACE_API_V1_MAX_CONCURRENCY', '3')
+    client = _standalone_relay_client()
+    client.stop_polling = False
+    release = threading.Event()
+    lock = threading.Lock()
+    polls = []
+    processed = []
+
+    def fake_poll(*, max_items=None):
+        polls.append(max_items)
+        if len(polls) <= 3:
+            return {'protocol': 'tokenplace_api_v1_relay_e2ee', 'request_id': f'req-{len(polls)}'}
+        client.stop_polling = True
+        return {'message': 'No requests available', 'next_ping_in_x_seconds': 0}
+
+    def fake_process(request_data):
+        with lock:
+            processed.append((request_data['request_id'], client._api_v1_response_relay_url()))
+            if len(processed) == 3:
+                release.set()
+        release.wait(5)
+
+    monkeypatch.setattr(client, 'poll_api_v1_encrypted_work', fake_poll)
+    monkeypatch.setattr(client, 'process_client_request_result', fake_process)
+    client._last_api_v1_work_relay_url = 'http://relay-a.example'
+    monkeypatch.setattr(relay_client_module.time, 'sleep', lambda _secs: None)
+
+    client.poll_api_v1_encrypted_work_continuously()
+
+    # Every slot stays busy until all three run, so each claim asks for one fewer.
+    assert polls[:3] == [3, 2, 1]
+    assert sorted(processed) == [(f'req-{index}', 'http://relay-a.example') for index in range(1, 4)]
+    assert client._api_v1_active_requests == 0
+
+
+def test_api_v1_generation_cancelled_ignores_restarts_made_by_sibling_slots():
+    epoch = {'value': 5}
+    client = _standalone_relay_client()
+    client.model_manager = SimpleNamespace(
+        cancellation_generation_cancelled=lambda snapshot: epoch['value'] != snapshot[2],
+        cancellation_generation_snapshot=lambda: (0, None, epoch['value']),
+    )
+    snapshot = (0, None, 5)
+    client._api_v1_request_scope.restarts_at_start = client._api_v1_supervisor_restarts
+
+    assert client._api_v1_generation_cancelled(snapshot) is False
+    # A sibling slot's supervisor replaced the shared worker.
+    client._api_v1_supervisor_restarts += 1
+    epoch['value'] = 6
+    assert client._api_v1_generation_cancelled(snapshot) is False
+    # Any other epoch bump still cancels this request.
+    epoch['value'] = 7
+    assert client._api_v1_generation_cancelled(snapshot) is True
+    client._api_v1_request_scope.restarts_at_start = None
+    epoch['value'] = 6
+    assert client._api_v1_generation_cancelled(snapshot) is True
+
+
+@pytest.mark.parametrize('interruption', ['sibling_restart', 'own_cancellation'])
+def test_api_v1_slot_reruns_generation_cut_short_by_a_sibling_restart(interruption):
+    epoch = {'value': 5}
+    event = threading.Event()
+
+    def terminate(*, reason, recreate, fatal_callback):
+        epoch['value'] += 1
+        return True
+
+    client = _progress_request_client(capable=False)
+    client.model_manager = SimpleNamespace(
+        cancellation_generation_snapshot=lambda: (0, event, epoch['value']),
+        cancellation_generation_cancelled=lambda snapshot: epoch['value'] != snapshot[2],
+        terminate_active_worker_for_cancellation=terminate,
+    )
+    failed = {'api_v1_response': {'error': {'code': 'compute_node_internal_error'}}}
+    final = {'api_v1_response': {'choices': [{'message': {'content': 'ok'}}]}}
+    attempts = []
+
+    def supervise(_payload, *, local_deadline, progress_observer):
+        attempts.append(epoch['value'])
+        if len(attempts) > 1:
+            return _ApiV1SupervisorOutcome(response_envelope=final)
+        # A sibling slot's request is cancelled mid-generation and its
+        # supervisor replaces the shared worker under this slot.
+        if interruption == 'sibling_restart':
+            sibling = threading.Thread(
+                target=client._terminate_current_llama_worker, args=('request_cancelled',)
+            )
+            sibling.start()
+            sibling.join()
+        else:
+            epoch['value'] += 1
+        return _ApiV1SupervisorOutcome(response_envelope=failed)
+
+    client._supervise_api_v1_inference = MagicMock(side_effect=supervise)
+
+    result = client._process_api_v1_request_on_slot(TEST_VALID_RESPONSE.copy(), client.relay_url)
+
+    if interruption == 'sibling_restart':
+        assert attempts == [5, 6]
+        assert result.inference_succeeded is True
+        assert result.submitted is True
+        assert client._post_api_v1_response.call_args.args[0] is final
+        assert client._post_api_v1_response.call_args.kwargs['cancel_snapshot'][2] == 6
+    else:
+        assert attempts == [5]
+        assert result.submitted is False
+        assert result.safe_error_code == 'request_cancelled'
+        client._post_api_v1_response.assert_not_called()
+
+
+def test_api_v1_runtime_health_is_scoped_to_the_assigning_thread():
+    client = _standalone_relay_client()
+    client._last_api_v1_runtime_health = {'slot': 'main'}
+    seen = {}
+
+    def other_slot():
+        seen['before'] = getattr(client, '_last_api_v1_runtime_health', None)
+        client._last_api_v1_runtime_health = {'slot': 'other'}
+
+    worker = threading.Thread(target=other_slot)
+    worker.start()
+    worker.join()
+
+    assert seen['before'] is None
+    assert client._last_api_v1_runtime_health == {'slot': 'main'}
+
+
+def test_api_v1_pooled_request_runs_on_its_models_manager_and_advertises_residency(monkeypatch, tmp_path):
+    client = _standalone_relay_client()
+    primary = client.model_manager
+    llama_path = tmp_path / 'llama.gguf'
+    llama_path.write_bytes(b'gguf')
+    llama = SimpleNamespace(
+        api_model_id='llama-3.1-8b-instruct', profile_id='llama-3.1-8b-q4-k-m', file_name='llama.gguf',
+        model_path=str(llama_path), llm=None,
+    )
+    pool = MagicMock()
+    pool.acquire.return_value = llama
+    pool.model_states.return_value = {'qwen3-8b-instruct': 'warm', 'llama-3.1-8b-instruct': 'cold'}
+    client.model_pool = pool
+    seen = []
+
+    def fake_generate(**kwargs):
+        seen.append((kwargs['model_id'], client.model_manager))
+        return client._api_v1_response_envelope(kwargs['request_id'], message={'role': 'assistant', 'content': 'ok'})
+
+    monkeypatch.setattr(client, '_generate_api_v1_response_with_runtime_model', fake_generate)
+
+    client._api_v1_enter_model_scope('llama-3.1-8b-instruct')
+    assert client.model_manager is llama
+    other_thread = []
+    worker = threading.Thread(target=lambda: other_thread.append(client.model_manager))
+    worker.start()
+    worker.join()
+    outcome = client._supervise_api_v1_inference(
+        {
+            'request_id': 'req-pooled',
+            'model': 'llama-3.1-8b-instruct',
+            'messages': [{'role': 'user', 'content': 'hi'}],
+            'options': {},
+            'routing': {'context_tier': '8k-fast'},
+        },
+        local_deadline=time.monotonic() + 5,
+    )
+    client._api_v1_exit_model_scope()
+
+    assert outcome.response_envelope['api_v1_response']['message']['content'] == 'ok'
+    assert seen == [('llama-3.1-8b-instruct', llama)]
+    assert other_thread == [primary]
+    assert client.model_manager is primary
+    pool.acquire.assert_called_once_with('llama-3.1-8b-instruct')
+    pool.release.assert_called_once_with(llama)
+    capabilities = client._api_v1_compute_node_capabilities()
+    assert {'qwen3-8b-instruct', 'llama-3.1-8b-instruct'} <= set(capabilities['supported_model_ids'])
+    assert capabilities['model_residency'] == {'qwen3-8b-instruct': 'warm', 'llama-3.1-8b-instruct': 'cold'}
+
+
+def test_api_v1_heartbeat_stops_only_after_the_last_running_request(monkeypatch):
+    client = _standalone_relay_client()
+    client._api_v1_registered_relays.add('http://localhost:5000')
+    started = MagicMock()
+    stopped = MagicMock()
+    monkeypatch.setattr(client, '_api_v1_start_heartbeat_worker', started)
+    monkeypatch.setattr(client, '_api_v1_stop_heartbeat_worker', stopped)
+
+    client._api_v1_enter_request()
+    client._api_v1_enter_request()
+    client._api_v1_exit_request()
+    assert stopped.call_count == 0
+    client._api_v1_exit_request()
+
+    assert started.call_count == 2
+    assert stopped.call_count == 1
+
+
 def _standalone_relay_client():
     crypto = MagicMock()
     crypto.public_key_b64 = 'mock_public_key_b64'
@@ -8127,6 +8398,44 @@ def test_api_v1_terminal_cleanup_unblocks_and_drains_inference_before_return():
         release.set()
 
 
+
+def test_api_v1_cancel_drops_only_the_batched_sequence():
+    client = _standalone_relay_client()
+    client._last_api_v1_work_relay_url = 'https://relay.example'
+    client._api_v1_registered_relays.add('https://relay.example')
+    client._api_v1_control_credentials_by_relay['https://relay.example'] = 'cred'
+    release = threading.Event()
+
+    def _batched_generate(**_kwargs):
+        release.wait()
+        raise RuntimeError('cancelled')
+
+    def cancel_batched_request(request_id):
+        release.set()
+        return True
+
+    client.model_manager = SimpleNamespace(cancel_batched_request=MagicMock(side_effect=cancel_batched_request))
+    client._generate_api_v1_response_with_runtime_model = _batched_generate
+    client._post_api_v1_request_control = lambda **_kwargs: {'status': 'cancelled'}
+    client._terminate_current_llama_worker = MagicMock(return_value=True)
+
+    outcome = client._supervise_api_v1_inference({
+        'request_id': 'req-batched',
+        'model': 'llama-3-8b-instruct',
+        'messages': [],
+        'options': {},
+        'routing': {'context_tier': '8k-fast'},
+        'request_ttl_seconds': 30,
+    })
+
+    try:
+        assert outcome.terminal_code == 'cancelled'
+        assert outcome.recovery_succeeded is True
+        client.model_manager.cancel_batched_request.assert_called_once_with('req-batched')
+        client._terminate_current_llama_worker.assert_not_called()
+    finally:
+        release.set()
+
 def test_api_v1_completed_future_at_deadline_boundary_is_consumed_once():
     client = _standalone_relay_client()
     client._last_api_v1_work_relay_url = 'https://relay.example'
@@ -0,0 +1,15 @@
+import relay
+
+from scripts import relay_lifecycle_index_benchmark as bench
+
+
+def test_relay_lifecycle_index_benchmark_reports_indexed_and_scan_latency():
+    report = bench.run_benchmark(nodes=8, queued=64, samples=4)
+
+    assert report["benchmark"] == "relay-api-v1-lifecycle-index"
+    for mode in ("indexed", "scan"):
+        for operation in ("cancel_queued", "cancel_in_flight"):
+            assert report["results"][mode][operation]["p99_us"] >= report["results"][mode][operation]["p50_us"] > 0
+    assert not relay.known_servers
+    assert not relay.client_inference_requests
+    assert not relay.client_pending_request_ids
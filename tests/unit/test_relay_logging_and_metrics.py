@@ -6,6 +6,7 @@ import json
 import logging
 import os
 import re
+import threading
 import time
 from datetime import datetime, timedelta
 
@@ -44,6 +45,7 @@ def relay_client():
     streaming_sessions_by_client.clear()
     api_v1_recently_unregistered_servers.clear()
     relay_module.api_v1_control_tombstones.clear()
+    relay_module.relay_reaper.clear()
     api_v1_filtered_round_robin_next_positions.clear()
     relay_module.server_round_robin_next_index = 0
     for limiter in app.extensions.get("limiter", set()):
@@ -76,6 +78,7 @@ def relay_client():
     streaming_sessions_by_client.clear()
     api_v1_recently_unregistered_servers.clear()
     relay_module.api_v1_control_tombstones.clear()
+    relay_module.relay_reaper.clear()
     api_v1_filtered_round_robin_next_positions.clear()
     relay_module.server_round_robin_next_index = 0
     for limiter in app.extensions.get("limiter", set()):
@@ -268,12 +271,42 @@ def test_canonical_metrics_track_queue_in_flight_completion_and_eviction(relay_c
     assert _metric_value(body, 'tokenplace_relay_request_outcomes_total{outcome="completed"}') >= 1
 
     known_servers["server-key"]["last_ping"] = datetime.now() - timedelta(seconds=120)
-    relay_client.get("/healthz")
+    relay_module._evict_stale_servers()
     body = _metric_body(relay_client)
     assert _metric_value(body, "tokenplace_compute_nodes_registered") == 0
     assert _metric_value(body, 'tokenplace_compute_node_evictions_total{reason="stale_lease"}') >= 1
 
 
+def test_long_poll_wakeup_metric_counts_spurious_and_work_wakeups(relay_client, monkeypatch) -> None:
+    """Targeted long-poll notifications are counted by whether they found work."""
+
+    _register_node(relay_client)
+    monkeypatch.setenv(relay_module.API_V1_POLL_WAIT_SECONDS_ENV, "1")
+    before = _metric_body(relay_client)
+    spurious_before = _metric_value(before, 'tokenplace_relay_api_v1_poll_wakeups_total{result="spurious"}')
+    work_before = _metric_value(before, 'tokenplace_relay_api_v1_poll_wakeups_total{result="work"}')
+    result = {}
+
+    def _poll():
+        with app.test_client() as polling_client:
+            result["response"] = polling_client.post("/api/v1/relay/servers/poll", json={"server_public_key": "server-key"})
+
+    poll_thread = threading.Thread(target=_poll)
+    poll_thread.start()
+    time.sleep(0.05)
+    with relay_module.client_inference_requests_changed:
+        relay_module._notify_client_inference_request_waiters_locked("server-key")
+    time.sleep(0.05)
+    _queue_request(relay_client, request_id="request-wakeup")
+    poll_thread.join(timeout=2.0)
+
+    assert not poll_thread.is_alive()
+    assert result["response"].get_json()["request_id"] == "request-wakeup"
+    body = _metric_body(relay_client)
+    assert _metric_value(body, 'tokenplace_relay_api_v1_poll_wakeups_total{result="spurious"}') == spurious_before + 1
+    assert _metric_value(body, 'tokenplace_relay_api_v1_poll_wakeups_total{result="work"}') == work_before + 1
+
+
 def test_metrics_endpoint_optional_bearer_auth(relay_client, monkeypatch) -> None:
     """TOKENPLACE_METRICS_TOKEN protects /metrics without affecting health."""
 
@@ -711,7 +744,7 @@ def test_node_stale_registered_then_evicted_and_expired_in_flight_excluded(relay
     assert _metric_value(body, "tokenplace_relay_in_flight_requests") == 0
     assert "expired-in-flight" in stale_payload["api_v1_in_flight_requests"]
 
-    relay_client.get("/healthz")
+    relay_module._evict_stale_servers()
     body = _metric_body(relay_client)
     assert _metric_value(body, "tokenplace_compute_nodes_registered") == 0
     assert (
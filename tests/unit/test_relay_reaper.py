@@ -0,0 +1,135 @@
+"""Deadline-ordered relay housekeeping fires only due entries."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import relay
+from relay_reaper import DeadlineReaper, ReaperThread
+from scripts import relay_reaper_benchmark as bench
+
+
+@pytest.fixture(autouse=True)
+def _clean_relay_state():
+    bench._reset(relay)
+    yield
+    bench._reset(relay)
+
+
+def test_deadline_reaper_pops_only_due_entries_in_deadline_order():
+    reaper = DeadlineReaper()
+    reaper.schedule("pending", "late", 30.0)
+    reaper.schedule("terminal", "early", 10.0)
+    reaper.schedule("tombstone", "middle", 20.0)
+
+    assert reaper.pop_due(5.0) == []
+    assert reaper.pop_due(25.0) == [("terminal", "early"), ("tombstone", "middle")]
+    assert reaper.next_deadline() == 30.0
+    assert len(reaper) == 1
+
+
+def test_deadline_reaper_reschedule_replaces_deadline_unless_earliest():
+    reaper = DeadlineReaper()
+    reaper.schedule("server_lease", "node", 10.0)
+    reaper.schedule("server_lease", "node", 20.0)
+    assert reaper.pop_due(15.0) == []
+
+    reaper.schedule("server_lease", "node", 30.0, earliest=True)
+    assert reaper.deadline("server_lease", "node") == 20.0
+    reaper.schedule("server_lease", "node", 12.0, earliest=True)
+    assert reaper.pop_due(15.0) == [("server_lease", "node")]
+    assert reaper.pop_due(100.0) == []
+
+
+def test_deadline_reaper_discard_and_limit():
+    reaper = DeadlineReaper()
+    for index in range(5):
+        reaper.schedule("pending", index, float(index))
+    reaper.discard("pending", 0)
+
+    assert reaper.pop_due(10.0, limit=2) == [("pending", 1), ("pending", 2)]
+    assert reaper.pop_due(10.0) == [("pending", 3), ("pending", 4)]
+
+
+def test_deadline_reaper_compacts_superseded_heap_entries():
+    reaper = DeadlineReaper()
+    for deadline in range(5000):
+        reaper.schedule("server_lease", "node", float(deadline))
+
+    assert len(reaper._heap) <= 2048
+    assert reaper.pop_due(10_000.0) == [("server_lease", "node")]
+
+
+def test_reaper_thread_runs_due_pass_until_stopped():
+    calls = threading.Event()
+    thread = ReaperThread(calls.set, interval_seconds=0.01, full_sweep_seconds=0)
+    thread.start()
+    try:
+        assert calls.wait(1.0)
+    finally:
+        thread.stop()
+        thread.join(timeout=1.0)
+    assert not thread.is_alive()
+
+
+def test_reap_due_expires_only_the_records_whose_deadline_passed():
+    relay._mark_request_pending("client-a", "req-due", deadline_monotonic=time.monotonic() + 0.01)
+    relay._mark_request_pending("client-a", "req-later", deadline_monotonic=time.monotonic() + 60)
+    time.sleep(0.02)
+
+    relay._reap_due()
+
+    assert relay.client_terminal_request_ids["client-a"]["req-due"]["status"] == "expired"
+    assert "req-later" in relay.client_pending_request_ids["client-a"]
+    assert relay.relay_reaper.deadline("pending", ("client-a", "req-later")) is not None
+
+
+def test_reap_due_evicts_lapsed_lease_and_reschedules_refreshed_node():
+    relay.known_servers["node-stale"] = {
+        "public_key": "node-stale",
+        "last_ping": datetime.now() - timedelta(seconds=120),
+        "last_ping_duration": 10,
+        relay.API_V1_SERVER_MARKER: True,
+    }
+    relay.known_servers["node-live"] = {
+        "public_key": "node-live",
+        "last_ping": datetime.now() - timedelta(seconds=120),
+        "last_ping_duration": 10,
+        relay.API_V1_SERVER_MARKER: True,
+    }
+    relay.known_servers["node-live"]["last_ping"] = datetime.now()
+
+    assert relay._reap_due() == ["node-stale"]
+    assert "node-live" in relay.known_servers
+    assert relay.relay_reaper.deadline("server_lease", "node-live") > time.monotonic() + 5
+
+
+def test_reap_due_prunes_expired_tombstones_and_terminal_records(monkeypatch):
+    monkeypatch.setattr(relay, "TERMINAL_REQUEST_TTL_SECONDS", 1.0)
+    monkeypatch.setenv(relay.API_V1_CONTROL_TOMBSTONE_TTL_SECONDS_ENV, "1")
+    relay._mark_request_terminal("client-a", "req-terminal", status="cancelled")
+    relay._add_api_v1_control_tombstone("node-a", "req-terminal", "client-a", status="cancelled", reason=None)
+    original_time = time.time
+    monkeypatch.setattr(relay.time, "time", lambda: original_time() + 2.0)
+
+    relay._reap_due(now_monotonic=time.monotonic() + 2.0)
+
+    assert "client-a" not in relay.client_terminal_request_ids
+    assert "client-a" not in relay.client_terminal_outcomes
+    assert relay.api_v1_control_tombstones == {}
+
+
+def test_relay_reaper_benchmark_reports_sweep_and_reap_latency():
+    report = bench.run_benchmark(nodes=8, records=60, samples=4)
+
+    assert report["benchmark"] == "relay-housekeeping-reaper"
+    assert report["scheduled_deadlines"] == 8 * 2 + 60
+    assert report["retained_nodes"] == 8
+    for mode in ("sweep", "reap"):
+        assert report["results"][mode]["p99_us"] >= report["results"][mode]["p50_us"] > 0
+    assert not relay.known_servers
+    assert not relay.client_pending_request_ids
@@ -0,0 +1,15 @@
+import relay
+
+from scripts import relay_scheduler_benchmark as bench
+
+
+def test_relay_scheduler_benchmark_reports_indexed_and_linear_latency():
+    report = bench.run_benchmark([3, 12], selections=20, compare_linear=True)
+
+    assert report["benchmark"] == "relay-api-v1-scheduler-selection"
+    assert [row["nodes"] for row in report["results"]] == [3, 12]
+    for row in report["results"]:
+        assert row["indexed"]["p99_us"] >= row["indexed"]["p50_us"] > 0
+        assert row["linear_scan"]["p50_us"] > 0
+    assert not relay.known_servers
+    assert relay.api_v1_scheduler_index.registered_count() == 0
@@ -0,0 +1,333 @@
+"""Relay coordination state survives a restart through the snapshot journal."""
+
+from __future__ import annotations
+
+import os
+import runpy
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import relay
+from relay_snapshot import JournaledDict, RelaySnapshotError, RelaySnapshotter, SnapshotTable
+from scripts import relay_reaper_benchmark as bench
+
+
+def _capabilities():
+    return {
+        "api_version": "v1",
+        "supported_model_ids": ["qwen3-8b-instruct"],
+        "active_context_tier": "8k-fast",
+        "maximum_total_context_tokens": 8192,
+        "default_output_token_reservation": 256,
+        "maximum_output_tokens": 512,
+        "max_concurrency": 2,
+        "backend_class": "cpu",
+    }
+
+
+def _envelope(request_id, client_public_key="client-a"):
+    return {
+        "client_public_key": client_public_key,
+        "request_id": request_id,
+        "chat_history": "ciphertext",
+        "cipherkey": "cipherkey",
+        "iv": "iv",
+    }
+
+
+def _reset_relay():
+    bench._reset(relay)
+    relay.client_responses.clear()
+    relay.client_progress.clear()
+    relay.api_v1_recently_unregistered_servers.clear()
+
+
+@pytest.fixture
+def relay_client():
+    relay.app.config["TESTING"] = True
+    _reset_relay()
+    yield relay.app.test_client()
+    if relay.relay_snapshotter is not None:
+        relay.relay_snapshotter.stop()
+        relay.relay_snapshotter = None
+    _reset_relay()
+
+
+def _tables(state):
+    return [
+        SnapshotTable("queues", lambda: state["queues"]),
+        SnapshotTable("deadlines", lambda: state["deadlines"], monotonic_values=True),
+    ]
+
+
+def _open(directory, state, **overrides):
+    overrides.setdefault("interval_seconds", 60.0)
+    return RelaySnapshotter(str(directory), _tables(state), **overrides)
+
+
+def _write(directory, queues=None, deadlines=None, **overrides):
+    """Start from an empty directory, then hold ``queues``/``deadlines`` as live state."""
+
+    state = {"queues": {}, "deadlines": {}}
+    snapshotter = _open(directory, state, **overrides)
+    snapshotter.restore()
+    state["queues"].update(queues or {})
+    state["deadlines"].update(deadlines or {})
+    return snapshotter, state
+
+
+def test_restore_round_trips_tuples_datetimes_and_monotonic_deadlines(tmp_path):
+    deadline = time.monotonic() + 120.0
+    pinged = datetime(2026, 1, 2, 3, 4, 5)
+    writer, _state = _write(
+        tmp_path,
+        {("client-a", "req-1"): {"last_ping": pinged, "request_deadline_monotonic": deadline, "ids": ["x"]}},
+        {"client-a": {"req-1": deadline}},
+    )
+    writer.stop()
+
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+
+    entry = restored["queues"][("client-a", "req-1")]
+    assert entry["last_ping"] == pinged
+    assert entry["ids"] == ["x"]
+    assert entry["request_deadline_monotonic"] == pytest.approx(deadline, abs=0.05)
+    assert restored["deadlines"]["client-a"]["req-1"] == pytest.approx(deadline, abs=0.05)
+
+
+def test_flush_journals_only_changed_and_removed_entries(tmp_path):
+    snapshotter, state = _write(tmp_path, {"a": 1, "b": 2})
+
+    assert snapshotter.flush() == 2
+    assert snapshotter.flush() == 0
+    state["queues"]["a"] = 10
+    del state["queues"]["b"]
+    state["queues"]["c"] = 3
+    assert snapshotter.flush() == 3
+    snapshotter.stop()
+
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+    assert restored["queues"] == {"a": 10, "c": 3}
+
+
+def test_journaled_dict_reports_keyed_access_and_whole_table_hand_outs():
+    table = JournaledDict(a={"n": 1}, b={"n": 2})
+    assert table.take_touched() is None
+
+    table.get("a")["n"] = 10
+    table.pop("missing", None)
+    assert table.take_touched() == {"a", "missing"}
+    assert table.take_touched() == set()
+    list(table.values())
+    assert table.take_touched() is None
+
+
+def test_scans_re_encode_touched_keys_and_full_scans_catch_the_rest(tmp_path):
+    state = {"queues": JournaledDict(), "deadlines": JournaledDict()}
+    snapshotter = _open(tmp_path, state, full_scan_seconds=3600.0)
+    snapshotter.restore()
+    state["queues"]["a"] = {"n": 1}
+    state["queues"]["b"] = {"n": 1}
+    assert snapshotter.flush() == 2
+
+    state["queues"]["a"]["n"] = 2
+    untracked = dict.__getitem__(state["queues"], "b")
+    untracked["n"] = 2
+    assert snapshotter.flush() == 1
+    snapshotter._next_full_scan = 0.0
+    assert snapshotter.flush() == 1
+    snapshotter.stop()
+
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+    assert restored["queues"] == {"a": {"n": 2}, "b": {"n": 2}}
+
+
+def test_scans_encode_entries_after_releasing_the_relay_locks(tmp_path, monkeypatch):
+    import relay_snapshot
+
+    dispatch_lock = threading.Lock()
+    state = {"queues": JournaledDict(), "deadlines": JournaledDict()}
+    snapshotter = _open(tmp_path, state, exclusive=(dispatch_lock,))
+    snapshotter.restore()
+    state["queues"]["a"] = {"issued_at": datetime.now(), "items": [{"n": 1}]}
+    encoder = relay_snapshot._VALUE_ENCODER
+    encoded_under_lock = []
+
+    class _CheckingEncoder:
+        def encode(self, value):
+            encoded_under_lock.append(dispatch_lock.locked())
+            return encoder.encode(value)
+
+    monkeypatch.setattr(relay_snapshot, "_VALUE_ENCODER", _CheckingEncoder())
+    assert snapshotter.flush() == 1
+    snapshotter._next_full_scan = 0.0
+    assert snapshotter.flush() == 0
+    snapshotter.stop()
+
+    assert encoded_under_lock and not any(encoded_under_lock)
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+    assert restored["queues"]["a"]["items"] == [{"n": 1}]
+
+
+def test_torn_journal_tail_is_dropped_with_its_whole_batch(tmp_path):
+    snapshotter, state = _write(tmp_path, {"kept": 1})
+    snapshotter.flush()
+    state["queues"]["torn-a"] = 2
+    state["queues"]["torn-b"] = 3
+    snapshotter.flush()
+    journal = snapshotter._journal_path(snapshotter._generation)
+    snapshotter._journal.close()
+    snapshotter._journal = None
+    with open(journal, "r+b") as handle:
+        handle.truncate(os.path.getsize(journal) - 5)
+
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+    assert restored["queues"] == {"kept": 1}
+
+
+def test_compaction_rotates_the_journal_generation(tmp_path):
+    snapshotter, state = _write(tmp_path, compact_bytes=256)
+    first_generation = snapshotter._generation
+    for index in range(40):
+        state["queues"][f"request-{index}"] = "x" * 32
+        snapshotter.flush()
+    snapshotter.stop()
+
+    assert snapshotter._generation > first_generation
+    assert sorted(name for name in os.listdir(tmp_path) if name.startswith("journal-")) == [
+        f"journal-{snapshotter._generation}"
+    ]
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+    assert restored["queues"] == state["queues"]
+
+
+def test_journals_of_other_generations_are_ignored(tmp_path):
+    snapshotter, _state = _write(tmp_path, {"a": 1})
+    snapshotter.stop()
+    # A crash after a compaction created the next journal but before it renamed the snapshot.
+    stray = tmp_path / f"journal-{snapshotter._generation + 1}"
+    stray.write_bytes(b"00000000 {}\n")
+
+    restored = {"queues": {}, "deadlines": {}}
+    _open(tmp_path, restored).restore()
+    assert restored["queues"] == {"a": 1}
+    # Restore compacts into that generation, starting its journal afresh.
+    assert stray.read_bytes() == b""
+
+
+def test_unreadable_snapshot_refuses_to_start(tmp_path):
+    (tmp_path / "snapshot").write_bytes(b"not a snapshot\n")
+
+    with pytest.raises(RelaySnapshotError, match="unreadable"):
+        _open(tmp_path, {"queues": {}, "deadlines": {}}).restore()
+
+
+def test_snapshot_files_are_private(tmp_path):
+    snapshotter, _state = _write(tmp_path / "state", {"a": 1})
+    snapshotter.stop()
+
+    assert (tmp_path / "state").stat().st_mode & 0o077 == 0
+    assert all((tmp_path / "state" / name).stat().st_mode & 0o077 == 0 for name in os.listdir(tmp_path / "state"))
+
+
+def test_relay_warm_restart_keeps_queues_claims_and_responses(relay_client, monkeypatch, tmp_path):
+    monkeypatch.setenv("TOKEN_PLACE_RELAY_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setenv(relay.API_V1_POLL_WAIT_SECONDS_ENV, "0")
+    relay._start_relay_snapshots()
+    assert relay_client.post(
+        "/api/v1/relay/servers/register",
+        json={"server_public_key": "node-a", "capabilities": _capabilities()},
+    ).status_code == 200
+    for request_id in ("answered", "claimed", "queued"):
+        queued = relay_client.post("/api/v1/relay/requests", json={"server_public_key": "node-a", **_envelope(request_id)})
+        assert queued.status_code == 200
+    for _ in range(2):
+        assert relay_client.post("/api/v1/relay/servers/poll", json={"server_public_key": "node-a"}).status_code == 200
+    assert relay_client.post("/api/v1/relay/responses", json=_envelope("answered")).status_code == 200
+    relay.relay_snapshotter.stop()
+
+    # A new process starts from empty module state.
+    _reset_relay()
+    relay._start_relay_snapshots()
+
+    assert list(relay.known_servers) == ["node-a"]
+    assert relay.api_v1_scheduler_index.registered_count() == 1
+    assert relay.relay_reaper.deadline("in_flight", ("node-a", "claimed")) is not None
+    assert relay.relay_reaper.deadline("pending", ("client-a", "queued")) is not None
+    polled = relay_client.post("/api/v1/relay/servers/poll", json={"server_public_key": "node-a"})
+    assert polled.get_json()["request_id"] == "queued"
+    retrieved = relay_client.post(
+        "/api/v1/relay/responses/retrieve",
+        json={"client_public_key": "client-a", "request_id": "answered"},
+    )
+    assert retrieved.status_code == 200
+    assert retrieved.get_json()["request_id"] == "answered"
+    assert relay_client.post("/api/v1/relay/responses", json=_envelope("claimed")).status_code == 200
+
+
+def test_gunicorn_worker_restores_snapshots_and_refuses_several_workers(relay_client, monkeypatch, tmp_path):
+    hooks = runpy.run_path(str(Path(__file__).resolve().parents[2] / "docker" / "relay" / "gunicorn.conf.py"))
+    monkeypatch.setenv("TOKEN_PLACE_RELAY_SNAPSHOT_DIR", str(tmp_path))
+    relay._start_relay_snapshots()
+    relay.known_servers["node-a"] = {"public_key": "node-a", "last_ping": datetime.now(), "last_ping_duration": 10}
+    relay.relay_snapshotter.stop()
+    relay.relay_snapshotter = None
+    _reset_relay()
+
+    with pytest.raises(RuntimeError, match="RELAY_WORKERS=1"):
+        hooks["on_starting"](SimpleNamespace(cfg=SimpleNamespace(workers=2)))
+    hooks["on_starting"](SimpleNamespace(cfg=SimpleNamespace(workers=1)))
+    stops = []
+    monkeypatch.setattr(relay, "_start_relay_reaper", lambda: SimpleNamespace(stop=lambda: stops.append("reaper")))
+    hooks["post_worker_init"](SimpleNamespace())
+
+    assert list(relay.known_servers) == ["node-a"]
+    hooks["worker_exit"](None, SimpleNamespace())
+    assert stops == ["reaper"]
+
+
+def test_relay_journal_stays_consistent_under_concurrent_transitions(relay_client, monkeypatch, tmp_path):
+    monkeypatch.setenv("TOKEN_PLACE_RELAY_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setenv("TOKEN_PLACE_RELAY_SNAPSHOT_INTERVAL_SECONDS", "0.05")
+    monkeypatch.setenv(relay.API_V1_POLL_WAIT_SECONDS_ENV, "0")
+    relay._start_relay_snapshots()
+    relay_client.post(
+        "/api/v1/relay/servers/register",
+        json={"server_public_key": "node-a", "capabilities": _capabilities()},
+    )
+    stop = threading.Event()
+
+    def flush_continuously():
+        while not stop.is_set():
+            relay.relay_snapshotter.flush()
+
+    flusher = threading.Thread(target=flush_continuously)
+    flusher.start()
+    try:
+        for index in range(30):
+            relay_client.post("/api/v1/relay/requests", json={"server_public_key": "node-a", **_envelope(f"r-{index}")})
+            if index % 2:
+                relay_client.post("/api/v1/relay/servers/poll", json={"server_public_key": "node-a"})
+    finally:
+        stop.set()
+        flusher.join()
+    expected_queue = [envelope["request_id"] for envelope in relay.client_inference_requests["node-a"]]
+    expected_in_flight = sorted(relay.known_servers["node-a"]["api_v1_in_flight_requests"])
+    relay.relay_snapshotter.stop()
+
+    _reset_relay()
+    relay._start_relay_snapshots()
+
+    assert [envelope["request_id"] for envelope in relay.client_inference_requests["node-a"]] == expected_queue
+    assert sorted(relay.known_servers["node-a"]["api_v1_in_flight_requests"]) == expected_in_flight
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import hashlib
 import inspect
+import random
 import secrets
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import FrozenInstanceError, fields, replace
 from threading import Barrier
@@ -30,6 +32,8 @@ from relay_state_store import RelayStateStoreError
 from relay_state_store import ResponseAcceptanceResult
 from relay_state_store import ResponseRetrievalResult
 from relay_state_store import SchedulerNodeState
+from relay_state_store_redis import RedisRelayStateStore
+from relay_state_store_sqlite import SqliteRelayStateStore
 
 # isort: on
 
@@ -42,12 +46,16 @@ class EpochClock:
         return self.value
 
 
-@pytest.fixture(params=["memory"])
-def store_factory(request):
-    """Factory seam to parameterize over real Valkey in a future slice."""
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store_factory(request, tmp_path):
+    """Factory seam that runs every contract test against each backend."""
+
+    stores = []
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer(version=(7, 4))
 
     def make(*, clock=None, acknowledgement_key=None, **config_overrides):
-        assert request.param == "memory"
         if (
             "terminal_retention_seconds" in config_overrides
             and "control_tombstone_ttl_seconds" not in config_overrides
@@ -58,13 +66,37 @@ def store_factory(request):
         config = RelayStateStoreConfig(
             namespace="testing.cluster-a", **config_overrides
         )
-        return InMemoryRelayStateStore(
-            config,
-            acknowledgement_key=acknowledgement_key or secrets.token_bytes(32),
-            epoch_time=clock or EpochClock(),
-        )
+        acknowledgement_key = acknowledgement_key or secrets.token_bytes(32)
+        if request.param == "memory":
+            return InMemoryRelayStateStore(
+                config,
+                acknowledgement_key=acknowledgement_key,
+                epoch_time=clock or EpochClock(),
+            )
+        if request.param == "redis":
+            # Each store gets its own namespace, as each SQLite store gets
+            # its own file.
+            store = RedisRelayStateStore(
+                RelayStateStoreConfig(
+                    namespace=f"testing.cluster-{len(stores)}", **config_overrides
+                ),
+                fakeredis.FakeStrictRedis(server=server),
+                acknowledgement_key=acknowledgement_key,
+                epoch_time=clock or EpochClock(),
+            )
+        else:
+            store = SqliteRelayStateStore(
+                config,
+                tmp_path / f"relay-state-{len(stores)}.sqlite3",
+                acknowledgement_key=acknowledgement_key,
+                epoch_time=clock or EpochClock(),
+            )
+        stores.append(store)
+        return store
 
-    return make
+    yield make
+    for store in stores:
+        store.close()
 
 
 @pytest.fixture
@@ -343,6 +375,62 @@ def test_retained_reaping_is_linear_and_preserves_pending_authority(
     assert len(store._former_node_authorities) == pending_count
 
 
+def test_reaping_uses_expiry_indexes_without_scanning_tables(
+    store_factory, capabilities
+):
+    class NoScanDict(dict):
+        def __iter__(self):
+            raise AssertionError("table scan")
+
+        def items(self):
+            raise AssertionError("table scan")
+
+        def values(self):
+            raise AssertionError("table scan")
+
+    clock = EpochClock()
+    store, _ = registered_store(
+        store_factory,
+        replace(capabilities, max_concurrency=8),
+        clock=clock,
+        lease_ttl_seconds=1000,
+        terminal_retention_seconds=1,
+        control_tombstone_ttl_seconds=1,
+        response_replay_ttl_seconds=1,
+        node_tombstone_ttl_seconds=1,
+    )
+    assert accept_response(store, claimed_work(store, "request-c")).new_outcome
+    claimed_work(store, "request-t")
+    assert store.cancel_or_expire_request(
+        "client-key", "request-t", "cancel-proof-request-t"
+    ).new_outcome
+    queued_work(store, "request-q")
+    reserve(store, "request-r")
+    store.register("node-b", capabilities, digest("owner-b"))
+    assert store.unregister("node-b", digest("owner-b"))
+    for name in (
+        "_records",
+        "_reservations",
+        "_queued",
+        "_responses",
+        "_terminals",
+        "_control_tombstones",
+        "_node_tombstones",
+        "_former_node_authorities",
+    ):
+        setattr(store, name, NoScanDict(getattr(store, name)))
+
+    clock.value += 50
+    store._reap_locked(clock.value)
+
+    assert len(store._reservations) == 0
+    assert len(store._queued) == 1
+    assert len(store._responses) == len(store._terminals) == 0
+    assert len(store._control_tombstones) == len(store._node_tombstones) == 0
+    assert len(store._former_node_authorities) == 0
+    assert len(store._records) == 1
+
+
 @pytest.mark.parametrize("operation", ["response", "cancellation"])
 def test_terminal_operation_racing_unregister_is_exactly_once(
     store_factory, capabilities, operation
@@ -846,6 +934,216 @@ def test_transition_batch_uses_node_index_without_scanning_global_work(
     assert not result.continuation_required
 
 
+def assert_indexes_match_recount(store):
+    reservations = store._reservations.values()
+    queued = store._queued.values()
+    assert store._client_reservation_counts == dict(
+        Counter(record.client_identity_digest for record in reservations)
+    )
+    assert store._client_queued_counts == dict(
+        Counter(record.client_identity_digest for record in queued)
+    )
+    assert store._client_response_counts == dict(
+        Counter(record.client_identity_digest for record in store._responses.values())
+    )
+    assert store._client_terminal_counts == dict(
+        Counter(record.client_identity_digest for record in store._terminals.values())
+    )
+    assert store._node_reservation_counts == dict(
+        Counter(record.selected_node_id for record in reservations)
+    )
+    assert store._node_control_tombstone_counts == dict(
+        Counter(
+            record.selected_node_id for record in store._control_tombstones.values()
+        )
+    )
+    assert store._fingerprint_counts == dict(
+        Counter(record.scheduler_fingerprint for record in reservations)
+        + Counter(
+            store._scheduler_fingerprint(
+                record.requested_model_id, record.requested_context_tier
+            )
+            for record in queued
+        )
+    )
+    expected_index: dict[tuple[str, str], set[str]] = {}
+    for node_id, record in store._records.items():
+        caps = record.capabilities
+        for model_id in caps.supported_model_ids:
+            expected_index.setdefault(
+                (model_id, caps.active_context_tier), set()
+            ).add(node_id)
+    assert {
+        key: set(nodes) for key, nodes in store._capability_index.items()
+    } == expected_index
+    expected_queues: dict[str, list[tuple[int, tuple[str, str]]]] = {}
+    for identity, record in store._queued.items():
+        expected_queues.setdefault(record.selected_node_id, []).append(
+            (record.sequence, identity)
+        )
+    assert {node_id: list(queue) for node_id, queue in store._node_queues.items()} == {
+        node_id: [identity for _sequence, identity in sorted(entries)]
+        for node_id, entries in expected_queues.items()
+    }
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_scheduler_indexes_match_brute_force_recount_across_transitions(
+    store_factory, capabilities, seed
+):
+    rng = random.Random(seed)
+    clock = EpochClock()
+    store = store_factory(
+        clock=clock,
+        lease_ttl_seconds=30,
+        reservation_ttl_seconds=8,
+        claim_ttl_seconds=10,
+        response_replay_ttl_seconds=20,
+        terminal_retention_seconds=40,
+        control_tombstone_ttl_seconds=20,
+        node_tombstone_ttl_seconds=10,
+        max_reservations_per_client=4,
+        max_queued_requests_per_client=3,
+        max_responses_per_client=2,
+        max_terminal_records_per_client=6,
+        max_control_tombstones_per_node=3,
+        max_scheduler_fingerprints=2,
+    )
+    node_capabilities = [
+        replace(capabilities, max_concurrency=3),
+        replace(
+            capabilities,
+            supported_model_ids=("qwen3-8b-instruct", "llama-3-8b"),
+            max_concurrency=4,
+        ),
+        replace(
+            capabilities,
+            supported_model_ids=("llama-3-8b",),
+            active_context_tier="64k-full",
+            maximum_total_context_tokens=65536,
+        ),
+    ]
+    models = ("qwen3-8b-instruct", "llama-3-8b")
+    tiers = ("8k-fast", "64k-full")
+    nodes = [f"node-{index}" for index in range(4)]
+    selections = {}
+    claims = {}
+    retrievals = {}
+    owners = {}
+
+    for step in range(400):
+        operation = rng.choice(
+            (
+                "register",
+                "renew",
+                "unregister",
+                "expire",
+                "health",
+                "reserve",
+                "reserve",
+                "enqueue",
+                "claim",
+                "accept",
+                "cancel",
+                "retrieve",
+                "tick",
+            )
+        )
+        node_id = rng.choice(nodes)
+        if operation == "register" and store.get(node_id) is None:
+            # Removed owners stay fenced, so a re-registration needs a new one.
+            owners[node_id] = digest(f"owner-{node_id}-{step}")
+        owner = owners.get(node_id, digest("unregistered"))
+        try:
+            if operation == "register":
+                store.register(node_id, rng.choice(node_capabilities), owner)
+            elif operation == "renew":
+                store.renew(
+                    node_id, owner, capabilities=rng.choice(node_capabilities + [None])
+                )
+            elif operation == "unregister":
+                store.unregister(node_id, owner)
+            elif operation == "expire":
+                store.expire()
+            elif operation == "health":
+                store.set_scheduler_state(
+                    node_id,
+                    owner,
+                    SchedulerNodeState(
+                        healthy=rng.random() > 0.2, draining=rng.random() < 0.2
+                    ),
+                )
+            elif operation == "reserve":
+                client = f"client-{rng.randrange(3)}"
+                request_id = f"request-{step}"
+                selection = store.select_and_reserve(
+                    client,
+                    request_id,
+                    rng.choice(models),
+                    rng.choice(tiers),
+                    clock.value + rng.uniform(1, 60),
+                    "cancel-proof-" + request_id,
+                )
+                selections[(client, request_id)] = selection
+            elif operation == "enqueue" and selections:
+                (client, request_id), selection = rng.choice(
+                    list(selections.items())[-4:]
+                )
+                store.enqueue_encrypted_request(
+                    client,
+                    request_id,
+                    selection.reservation_token,
+                    selection.selected_node_id,
+                    selection.requested_model_id,
+                    selection.requested_context_tier,
+                    selection.request_deadline_epoch,
+                    envelope(),
+                    "cancel-proof-" + request_id,
+                )
+            elif operation == "claim":
+                claim = store.claim_queued_request(node_id, owner, "worker")
+                if claim.state != "empty":
+                    claims[(claim.client_public_key, claim.request_id)] = (
+                        node_id,
+                        owner,
+                        claim.generation,
+                    )
+            elif operation == "accept" and claims:
+                (client, request_id), (claim_node, claim_owner, generation) = (
+                    rng.choice(list(claims.items())[-4:])
+                )
+                store.accept_encrypted_response(
+                    claim_node,
+                    claim_owner,
+                    "worker",
+                    client,
+                    request_id,
+                    generation,
+                    response_envelope(),
+                )
+                retrievals[(client, request_id)] = selections[
+                    (client, request_id)
+                ].reservation_token
+            elif operation == "cancel" and selections:
+                client, request_id = rng.choice(list(selections)[-8:])
+                store.cancel_or_expire_request(
+                    client, request_id, "cancel-proof-" + request_id
+                )
+            elif operation == "retrieve" and retrievals:
+                (client, request_id), token = rng.choice(sorted(retrievals.items()))
+                result = store.retrieve_encrypted_response(client, request_id, token)
+                if result.acknowledgement_token is not None:
+                    store.retrieve_encrypted_response(
+                        client, request_id, token, result.acknowledgement_token
+                    )
+            elif operation == "tick":
+                clock.value += rng.uniform(0, 4)
+        except RelayStateStoreError:
+            pass
+        with store._lock:
+            assert_indexes_match_recount(store)
+
+
 def test_authenticated_cancellation_and_owner_bound_acknowledgement(
     store_factory, capabilities
 ):
@@ -0,0 +1,28 @@
+from scripts import relay_state_store_benchmark as bench
+
+
+def test_relay_state_store_benchmark_fills_every_record_type_to_its_maximum():
+    report = bench.run_benchmark(nodes=2, records=6, selections=4)
+
+    assert report["benchmark"] == "relay-state-store-select-and-reserve"
+    assert report["retained"] == {
+        "reservations": 6,
+        "queued": 6,
+        "responses": 6,
+        "terminals": 12,
+        "control_tombstones": 6,
+        "node_tombstones": 6,
+    }
+    for mode in ("empty", "full"):
+        result = report["results"][mode]
+        assert result["p99_us"] >= result["p50_us"] > 0
+        assert result["selections_per_second"] > 0
+
+
+def test_relay_state_store_churn_benchmark_keeps_queues_full():
+    report = bench.run_churn_benchmark(nodes=2, depth=4, cycles=6)
+
+    assert report["benchmark"] == "relay-state-store-queue-churn"
+    for operation in ("cancel_and_enqueue", "claim_accept_and_enqueue"):
+        result = report["results"][operation]
+        assert result["p99_us"] >= result["p50_us"] > 0
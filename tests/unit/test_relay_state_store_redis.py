@@ -0,0 +1,345 @@
+"""Redis-specific behaviour; the shared contract runs in test_relay_state_store."""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import relay_state_store_redis
+import relay_state_store_sqlite
+from relay_state_store import ComputeNodeCapabilities
+from relay_state_store import EncryptedRequestEnvelope
+from relay_state_store import EncryptedResponseEnvelope
+from relay_state_store import InMemoryRelayStateStore
+from relay_state_store import RelayStateCapacityExceeded
+from relay_state_store import RelayStateStoreConfig
+from relay_state_store import RelayStateStoreError
+from relay_state_store_redis import RedisRelayStateStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+EPOCH = 1_700_000_000.0
+KEY = secrets.token_bytes(32)
+
+
+def digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def capabilities() -> ComputeNodeCapabilities:
+    return ComputeNodeCapabilities(
+        supported_model_ids=("qwen3-8b-instruct",),
+        active_context_tier="8k-fast",
+        maximum_total_context_tokens=8192,
+        default_output_token_reservation=1024,
+        maximum_output_tokens=2048,
+        max_concurrency=2,
+    )
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer(version=(7, 4))
+
+
+def open_store(server, namespace="testing.cluster-a", **overrides):
+    return RedisRelayStateStore(
+        RelayStateStoreConfig(namespace=namespace, **overrides),
+        fakeredis.FakeStrictRedis(server=server),
+        acknowledgement_key=KEY,
+        epoch_time=lambda: EPOCH,
+    )
+
+
+def enqueue(store, request_id, client="client-key"):
+    selection = store.select_and_reserve(
+        client, request_id, "qwen3-8b-instruct", "8k-fast", EPOCH + 100.0
+    )
+    return store.enqueue_encrypted_request(
+        client,
+        request_id,
+        selection.reservation_token,
+        selection.selected_node_id,
+        "qwen3-8b-instruct",
+        "8k-fast",
+        EPOCH + 100.0,
+        EncryptedRequestEnvelope(
+            protocol="tokenplace_api_v1_relay_e2ee",
+            version=1,
+            ciphertext="ciphertext",
+            cipherkey="cipherkey",
+            iv="iv",
+        ),
+        "cancel-proof-" + request_id,
+    )
+
+
+def test_every_in_memory_table_is_backed_by_redis():
+    in_memory = InMemoryRelayStateStore(
+        RelayStateStoreConfig(namespace="testing.cluster-a"), acknowledgement_key=KEY
+    )
+    mapped = (
+        set(relay_state_store_sqlite._TABLES)
+        | set(relay_state_store_sqlite._NESTED_TABLES)
+        | set(relay_state_store_sqlite._SET_TABLES)
+        | set(relay_state_store_sqlite._DEADLINE_PHASES)
+        | set(relay_state_store_sqlite._SCALARS)
+        | relay_state_store_sqlite._LOCAL_ATTRIBUTES
+    )
+
+    assert set(vars(in_memory)) == mapped
+
+
+def test_replicas_on_one_server_share_state(server):
+    first = open_store(server)
+    first.register("node-a", capabilities(), digest("owner"))
+    enqueue(first, "request-a")
+    second = open_store(server)
+
+    claim = second.claim_queued_request("node-a", digest("owner"), "worker-a")
+
+    assert claim.request_id == "request-a"
+    assert [record.generation for record in first.active_claims("node-a")] == [
+        claim.generation
+    ]
+    assert first.claim_queued_request("node-a", digest("owner"), "worker-b").state == (
+        "empty"
+    )
+
+
+def test_concurrent_replicas_commit_every_transition_once(server):
+    stores = [open_store(server, max_compute_nodes=16) for _ in range(8)]
+
+    def register(index):
+        return stores[index].register(f"node-{index}", capabilities(), digest("owner"))
+
+    with ThreadPoolExecutor(max_workers=len(stores)) as pool:
+        list(pool.map(register, range(len(stores))))
+
+    assert sorted(record.node_id for record in stores[0].list()) == [
+        f"node-{index}" for index in range(8)
+    ]
+    # Registration order is a sequence: unique, but re-runs leave gaps.
+    orders = [stores[0]._registration_order[f"node-{index}"] for index in range(8)]
+    assert len(set(orders)) == 8
+    assert stores[0]._next_registration_order >= 8
+
+
+def test_commit_is_rejected_after_a_concurrent_commit_to_what_it_read(server):
+    store = open_store(server)
+    other = open_store(server)
+
+    with pytest.raises(RelayStateStoreError, match="concurrently"):
+        with store._lock:
+            assert "node-a" not in store._records
+            store._registration_order["node-a"] = 99
+            other.register("node-a", capabilities(), digest("owner"))
+
+    assert store._registration_order["node-a"] == 0
+    assert [record.node_id for record in store.list()] == ["node-a"]
+
+
+def test_commit_beside_a_concurrent_commit_to_other_keys_succeeds(server):
+    store = open_store(server)
+    other = open_store(server)
+
+    with store._lock:
+        assert "node-a" not in store._records
+        store._registration_order["node-a"] = 99
+        other.register("node-b", capabilities(), digest("owner"))
+
+    assert store._registration_order["node-a"] == 99
+
+
+def test_sequences_stay_unique_across_replicas_without_conflicting(server):
+    store = open_store(server)
+    other = open_store(server)
+
+    with store._lock:
+        store._next_queue_sequence += 1
+        with other._lock:
+            other._next_queue_sequence += 1
+            assert other._next_queue_sequence == 2
+        assert store._next_queue_sequence == 1
+
+    assert store._lock.conflicts == 0
+
+
+def run_cycle(store, node, client, request_id, model_id):
+    selection = store.select_and_reserve(
+        client, request_id, model_id, "8k-fast", EPOCH + 100.0
+    )
+    store.enqueue_encrypted_request(
+        client,
+        request_id,
+        selection.reservation_token,
+        node,
+        model_id,
+        "8k-fast",
+        EPOCH + 100.0,
+        EncryptedRequestEnvelope(
+            protocol="tokenplace_api_v1_relay_e2ee",
+            version=1,
+            ciphertext="ciphertext",
+            cipherkey="cipherkey",
+            iv="iv",
+        ),
+        "cancel-proof-" + request_id,
+    )
+    claim = store.claim_queued_request(node, digest(node), "worker")
+    store.accept_encrypted_response(
+        node,
+        digest(node),
+        "worker",
+        client,
+        request_id,
+        claim.generation,
+        EncryptedResponseEnvelope(
+            protocol="tokenplace_api_v1_relay_e2ee",
+            version=1,
+            ciphertext="ciphertext",
+            cipherkey="cipherkey",
+            iv="iv",
+        ),
+    )
+
+
+def register_model_node(store, node, model_id):
+    store.register(
+        node,
+        ComputeNodeCapabilities(
+            supported_model_ids=(model_id,),
+            active_context_tier="8k-fast",
+            maximum_total_context_tokens=8192,
+            default_output_token_reservation=1024,
+            maximum_output_tokens=2048,
+            max_concurrency=2,
+        ),
+        digest(node),
+    )
+
+
+def test_request_cycles_for_other_clients_and_nodes_do_not_invalidate_a_transition(server):
+    first = open_store(server)
+    second = open_store(server)
+    register_model_node(first, "node-a", "model-a")
+    register_model_node(second, "node-b", "model-b")
+    run_cycle(first, "node-a", "client-a", "warm-a", "model-a")
+    run_cycle(second, "node-b", "client-b", "warm-b", "model-b")
+
+    # One open transition of the first replica spans a whole request cycle;
+    # the second replica commits two full cycles of its own meanwhile.
+    with first._lock:
+        run_cycle(first, "node-a", "client-a", "request-a", "model-a")
+        run_cycle(second, "node-b", "client-b", "request-b1", "model-b")
+        run_cycle(second, "node-b", "client-b", "request-b2", "model-b")
+
+    assert first._lock.conflicts == second._lock.conflicts == 0
+    assert {record.request_id for record in first.response_records()} == {
+        "warm-a", "warm-b", "request-a", "request-b1", "request-b2",
+    }
+
+
+def test_concurrent_replicas_run_request_cycles_without_exhausting_retries(server):
+    replicas, cycles = 8, 12
+    stores = [open_store(server) for _ in range(replicas)]
+    for index, store in enumerate(stores):
+        register_model_node(store, f"node-{index}", f"model-{index}")
+    barrier = threading.Barrier(replicas)
+
+    def work(index):
+        barrier.wait()
+        for cycle in range(cycles):
+            run_cycle(
+                stores[index], f"node-{index}", f"client-{index}-{cycle}",
+                f"request-{index}-{cycle}", f"model-{index}",
+            )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=replicas) as pool:
+        list(pool.map(work, range(replicas)))
+    elapsed = time.perf_counter() - started
+
+    transitions = replicas * cycles * 4
+    conflicts = sum(store._lock.conflicts for store in stores)
+    assert len(stores[0].response_records()) == replicas * cycles
+    # Replicas on disjoint clients and nodes only meet below the capacity
+    # bands, so no commit check fails however the threads interleave.
+    assert conflicts == 0, (conflicts, transitions, elapsed)
+
+
+def test_store_errors_commit_and_other_exceptions_roll_back(server):
+    store = open_store(server, max_compute_nodes=1)
+    store.register("node-a", capabilities(), digest("owner"))
+
+    with pytest.raises(RelayStateCapacityExceeded):
+        store.register("node-b", capabilities(), digest("owner-b"))
+    with pytest.raises(RuntimeError):
+        with store._lock:
+            store._records.pop("node-a")
+            raise RuntimeError("boom")
+
+    assert [record.node_id for record in store.list()] == ["node-a"]
+
+
+def test_reopening_rejects_another_schema(server):
+    store = open_store(server)
+    store._client.hset(f"{store.prefix}meta", "schema_version", "2")
+
+    with pytest.raises(RelayStateStoreError, match="schema_version"):
+        open_store(server)
+
+
+def test_parked_wait_wakes_on_enqueue_from_another_replica(server, monkeypatch):
+    # Only the pub/sub wakeup can end the wait before the re-check interval.
+    monkeypatch.setattr(relay_state_store_redis, "WAKE_RECHECK_SECONDS", 30.0)
+    poller = open_store(server)
+    producer = open_store(server)
+    producer.register("node-a", capabilities(), digest("owner"))
+    result = {}
+
+    def wait():
+        started = time.monotonic()
+        result["queued"] = poller.wait_for_queued_request("node-a", 20.0)
+        result["elapsed"] = time.monotonic() - started
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    time.sleep(0.2)
+    enqueue(producer, "request-a")
+    thread.join(timeout=20)
+    poller.close()
+
+    assert result["queued"] is True
+    assert result["elapsed"] < 10
+
+
+def test_wait_times_out_without_work(server):
+    store = open_store(server)
+    store.register("node-a", capabilities(), digest("owner"))
+
+    assert store.wait_for_queued_request("node-a", 0.05) is False
+    store.close()
+
+
+def test_keys_hold_only_digests_and_records_carry_ttl_guards(server):
+    store = open_store(server)
+    store.register("node-secret", capabilities(), digest("owner"))
+    enqueue(store, "request-secret", client="client-secret")
+
+    names = [name.decode() for name in store._client.keys("*")]
+    assert all(name.startswith(store.prefix) for name in names)
+    assert not any("secret" in name for name in names)
+    fields = store._client.hkeys(f"{store.prefix}t:queued_requests")
+    (ttl,) = store._client.hpttl(f"{store.prefix}t:queued_requests", *fields)
+    expected_ms = (100.0 + relay_state_store_redis.DEFAULT_EXPIRY_GRACE_SECONDS) * 1000
+    assert expected_ms - 5000 < ttl <= expected_ms
+    (registration_ttl,) = store._client.hpttl(
+        f"{store.prefix}t:registrations", '"node-secret"'
+    )
+    assert registration_ttl == -1
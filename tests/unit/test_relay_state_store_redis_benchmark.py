@@ -0,0 +1,18 @@
+import pytest
+
+pytest.importorskip("fakeredis")
+
+from scripts import relay_state_store_redis_benchmark as bench  # noqa: E402
+
+
+def test_redis_benchmark_reports_ops_and_conflicts_per_replica_count():
+    report = bench.run_benchmark(replicas=[1, 4], cycles=5)
+
+    assert report["benchmark"] == "relay-state-store-redis-replicas"
+    assert report["server"] == "fakeredis"
+    assert [row["replicas"] for row in report["results"]] == [1, 4]
+    for row in report["results"]:
+        assert row["transitions"] == row["replicas"] * 5 * bench._TRANSITIONS_PER_CYCLE
+        assert row["ops_per_second"] > 0
+        # Replicas on their own clients and nodes never invalidate each other.
+        assert row["conflicts"] == 0
@@ -0,0 +1,150 @@
+"""SQLite-specific behaviour; the shared contract runs in test_relay_state_store."""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+
+import pytest
+
+import relay_state_store_sqlite
+from relay_state_store import ComputeNodeCapabilities
+from relay_state_store import EncryptedRequestEnvelope
+from relay_state_store import InMemoryRelayStateStore
+from relay_state_store import RelayStateCapacityExceeded
+from relay_state_store import RelayStateStoreConfig
+from relay_state_store import RelayStateStoreError
+from relay_state_store_sqlite import SqliteRelayStateStore
+
+EPOCH = 1_700_000_000.0
+KEY = secrets.token_bytes(32)
+
+
+def digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def capabilities() -> ComputeNodeCapabilities:
+    return ComputeNodeCapabilities(
+        supported_model_ids=("qwen3-8b-instruct",),
+        active_context_tier="8k-fast",
+        maximum_total_context_tokens=8192,
+        default_output_token_reservation=1024,
+        maximum_output_tokens=2048,
+        max_concurrency=2,
+    )
+
+
+def open_store(path, namespace="testing.cluster-a", **overrides):
+    return SqliteRelayStateStore(
+        RelayStateStoreConfig(namespace=namespace, **overrides),
+        path,
+        acknowledgement_key=KEY,
+        epoch_time=lambda: EPOCH,
+    )
+
+
+def enqueue(store, request_id):
+    selection = store.select_and_reserve(
+        "client-key", request_id, "qwen3-8b-instruct", "8k-fast", EPOCH + 100.0
+    )
+    return store.enqueue_encrypted_request(
+        "client-key",
+        request_id,
+        selection.reservation_token,
+        selection.selected_node_id,
+        "qwen3-8b-instruct",
+        "8k-fast",
+        EPOCH + 100.0,
+        EncryptedRequestEnvelope(
+            protocol="tokenplace_api_v1_relay_e2ee",
+            version=1,
+            ciphertext="ciphertext",
+            cipherkey="cipherkey",
+            iv="iv",
+        ),
+        "cancel-proof-" + request_id,
+    )
+
+
+def test_every_in_memory_table_is_backed_by_sqlite():
+    in_memory = InMemoryRelayStateStore(
+        RelayStateStoreConfig(namespace="testing.cluster-a"), acknowledgement_key=KEY
+    )
+    mapped = (
+        set(relay_state_store_sqlite._TABLES)
+        | set(relay_state_store_sqlite._NESTED_TABLES)
+        | set(relay_state_store_sqlite._SET_TABLES)
+        | set(relay_state_store_sqlite._DEADLINE_PHASES)
+        | set(relay_state_store_sqlite._SCALARS)
+        | relay_state_store_sqlite._LOCAL_ATTRIBUTES
+    )
+
+    assert set(vars(in_memory)) == mapped
+
+
+def test_stores_opened_on_one_file_share_state(tmp_path):
+    path = tmp_path / "relay.sqlite3"
+    first = open_store(path)
+    first.register("node-a", capabilities(), digest("owner"))
+    enqueue(first, "request-a")
+    second = open_store(path)
+
+    claim = second.claim_queued_request("node-a", digest("owner"), "worker-a")
+
+    assert claim.request_id == "request-a"
+    assert [record.generation for record in first.active_claims("node-a")] == [
+        claim.generation
+    ]
+    assert first.claim_queued_request("node-a", digest("owner"), "worker-b").state == (
+        "empty"
+    )
+    first.close()
+    second.close()
+
+
+def test_reopening_keeps_counters_and_rejects_other_namespaces(tmp_path):
+    path = tmp_path / "relay.sqlite3"
+    store = open_store(path)
+    store.register("node-a", capabilities(), digest("owner"))
+    store.close()
+
+    reopened = open_store(path)
+    assert reopened.register("node-b", capabilities(), digest("owner-b"))
+    assert [record.node_id for record in reopened.list()] == ["node-a", "node-b"]
+    assert reopened._next_registration_order == 2
+    reopened.close()
+
+    with pytest.raises(RelayStateStoreError, match="namespace"):
+        open_store(path, namespace="testing.cluster-b")
+
+
+def test_store_errors_commit_and_other_exceptions_roll_back(tmp_path):
+    store = open_store(tmp_path / "relay.sqlite3", max_compute_nodes=1)
+    store.register("node-a", capabilities(), digest("owner"))
+
+    with pytest.raises(RelayStateCapacityExceeded):
+        store.register("node-b", capabilities(), digest("owner-b"))
+    with pytest.raises(RuntimeError):
+        with store._lock:
+            store._records.pop("node-a")
+            raise RuntimeError("boom")
+
+    assert [record.node_id for record in store.list()] == ["node-a"]
+    store.close()
+
+
+def test_trigger_row_counts_match_table_counts(tmp_path):
+    store = open_store(tmp_path / "relay.sqlite3")
+    store.register("node-a", capabilities(), digest("owner"))
+    for index in range(2):
+        enqueue(store, f"request-{index}")
+    store.cancel_or_expire_request("client-key", "request-1", "cancel-proof-request-1")
+    store.claim_queued_request("node-a", digest("owner"), "worker-a")
+
+    counts = dict(store._connection.execute("SELECT name, count FROM row_counts"))
+    for name, count in counts.items():
+        actual = store._connection.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+        assert count == actual, name
+    assert counts["queued_requests"] == 1
+    store.close()
@@ -0,0 +1,12 @@
+from scripts import relay_state_store_sqlite_benchmark as bench
+
+
+def test_sqlite_benchmark_reports_ops_per_worker_count():
+    report = bench.run_benchmark(workers=[1, 2], cycles=5)
+
+    assert report["benchmark"] == "relay-state-store-sqlite-workers"
+    assert report["results"]["memory"]["transitions"] == 20
+    assert [row["workers"] for row in report["results"]["sqlite"]] == [1, 2]
+    for row in report["results"]["sqlite"]:
+        assert row["transitions"] == row["workers"] * 5 * bench._TRANSITIONS_PER_CYCLE
+        assert row["ops_per_second"] > 0
@@ -527,3 +527,21 @@ def test_resource_monitor_source_avoids_runtime_pep604_alias_assignment() -> Non
         encoding="utf-8"
     )
     assert "GpuMetrics = Dict[str, float | int | bool]" not in source
+
+
+def test_can_allocate_system_memory_applies_headroom(monkeypatch):
+    from utils.system import resource_monitor as rm
+
+    with patch.object(rm.psutil, 'virtual_memory', return_value=MagicMock(available=4_500_000_000)):
+        assert rm.can_allocate_system_memory(4_000_000_000, headroom_percent=0.1) is True
+        assert rm.can_allocate_system_memory(4_000_000_000, headroom_percent=0.2) is False
+        assert rm.can_allocate_system_memory(0) is True
+
+
+def test_can_allocate_system_memory_refuses_without_psutil(monkeypatch):
+    from utils.system import resource_monitor as rm
+
+    monkeypatch.setattr(rm, 'psutil', None)
+
+    assert rm.can_allocate_system_memory(1024) is False
+    assert rm.can_allocate_system_memory(0) is True
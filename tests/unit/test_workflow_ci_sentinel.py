@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import ast
 import hashlib
 import os
 import re
@@ -417,6 +418,54 @@ def test_canonical_relay_image_copies_release_metadata_module() -> None:
     assert "release_metadata.py /app/" in dockerfile
 
 
+def _root_modules_imported_by(module: str, root_modules: set[str]) -> set[str]:
+    seen: set[str] = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        tree = ast.parse(Path(f"{current}.py").read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            pending.extend(name.split(".", 1)[0] for name in names if name.split(".", 1)[0] in root_modules)
+    return seen
+
+
+def test_canonical_relay_image_copies_every_root_module_relay_imports() -> None:
+    dockerfile = Path("Dockerfile").read_text(encoding="utf-8")
+    copied = {
+        token[:-3]
+        for line in dockerfile.splitlines()
+        if line.startswith("COPY ") and line.rstrip().endswith("/app/")
+        for token in line.split()
+        if token.endswith(".py")
+    }
+    root_modules = {path.stem for path in Path(".").glob("*.py")}
+
+    missing = _root_modules_imported_by("relay", root_modules) - copied
+
+    assert missing == set(), f"Dockerfile must COPY {sorted(missing)} or gunicorn fails to import relay"
+
+
+def test_ci_image_smoke_imports_relay_inside_the_container() -> None:
+    workflow_data = _load_workflow(WORKFLOW_DIR / "ci-image.yml")
+    runs = [
+        str(step.get("run", ""))
+        for job in workflow_data["jobs"].values()
+        for step in job.get("steps", [])
+        if isinstance(step, dict)
+    ]
+
+    assert any("--entrypoint python tokenplace-relay:smoke" in run and "import relay" in run for run in runs)
+
+
 def test_canonical_chart_version_is_bumped_for_main_latest_default() -> None:
     chart = yaml.safe_load(
         Path("charts/tokenplace/Chart.yaml").read_text(encoding="utf-8")
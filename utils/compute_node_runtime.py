@@ -988,6 +988,9 @@ class ComputeNodeRuntime:
                 "llama_cpp_constructor_signature_inspectable": yarn_diagnostics.get("constructor_signature_inspectable"),
                 "llama_cpp_qwen_64k_yarn_support": yarn_diagnostics.get("support_classification"),
                 "llama_cpp_runtime_profile_backend": diagnostics.get("llama_cpp_runtime_profile_backend"),
+                "api_v1_readiness_worker_init_ms": diagnostics.get("worker_init_ms"),
+                "api_v1_readiness_model_prefetch_ms": diagnostics.get("model_prefetch_ms"),
+                "api_v1_readiness_model_mlock_requested": diagnostics.get("model_mlock_requested"),
             })
             for _key in (
                 "qwen_64k_runtime_profile_id",
@@ -1408,6 +1411,10 @@ class ComputeNodeRuntime:
                         )
                     diagnostics["api_v1_readiness_repair_retry_attempted"] = False
                     diagnostics["api_v1_readiness_recovery_succeeded"] = False
+                first_token_ms = getattr(getattr(self.model_manager, "llm", None), "first_token_ms", None)
+                diagnostics["api_v1_readiness_first_token_ms"] = (
+                    first_token_ms if isinstance(first_token_ms, int) else None
+                )
                 diagnostics["api_v1_runtime_ready"] = bool(admitted)
                 diagnostics["api_v1_readiness_result"] = "passed" if admitted else "failed"
                 if diagnostics.get("api_v1_readiness_qwen_64k_runtime_profile_id"):
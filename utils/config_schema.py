@@ -81,6 +81,7 @@ class ModelSettings(TypedDict, total=False):
     supported_context_tiers: List[str]
     rope_scaling_policy: Optional[Dict[str, Any]]
     download_chunk_size_mb: int
+    download_connections: int
 
 
 class ConstantsSettings(TypedDict, total=False):
@@ -170,6 +171,7 @@ DEFAULT_CONFIG: AppConfig = {
         "supported_context_tiers": _DEFAULT_MODEL_PROFILE["supported_context_tiers"],
         "rope_scaling_policy": _DEFAULT_MODEL_PROFILE["rope_scaling_policy"],
         "download_chunk_size_mb": 10,
+        "download_connections": 4,
     },
     "constants": {
         "KB": 1024,
@@ -357,9 +357,8 @@ class CryptoClient:
 
         logger.debug("Message sent successfully, waiting for processing")
 
-        # Wait for processing
-        time.sleep(3)
-
+        # The relay parks each retrieve until this request has news, so there
+        # is no fixed processing delay before the first attempt.
         # Retrieve the response for this request id without sharing mutable
         # in-flight state across concurrent sends on the same client instance.
         return self.retrieve_chat_response(
@@ -380,7 +379,10 @@ class CryptoClient:
 
         Args:
             max_retries: Maximum number of retry attempts
-            retry_delay: Delay between retries in seconds
+            retry_delay: Delay between retries in seconds. When positive it is
+                also sent as ``wait_seconds`` so the relay blocks a pending
+                retrieve until a response, progress update, or terminal state
+                arrives; relays that honour it skip the client-side sleep.
             expected_request_id: Optional API v1 relay request id to retrieve.
             chat_history: Original chat history for the matching request.
 
@@ -392,17 +394,23 @@ class CryptoClient:
         }
         if expected_request_id:
             payload['request_id'] = expected_request_id
+        request_timeout = 10
+        if retry_delay > 0:
+            payload['wait_seconds'] = retry_delay
+            request_timeout += retry_delay
 
         max_attempts = max(int(max_retries), 1)
         logger.debug(f"Attempting to retrieve response, max retries: {max_retries}")
         pending_deadline = time.time() + max(max_attempts * max(retry_delay, 0), 1)
-        for attempt in range(max_attempts):
-            logger.debug(f"Retrieve attempt {attempt + 1}/{max_attempts}")
+        attempt = 0
+        while attempt < max_attempts:
+            attempt += 1
+            logger.debug(f"Retrieve attempt {attempt}/{max_attempts}")
             try:
                 raw_response = requests.post(
                     f"{self.base_url}/api/v1/relay/responses/retrieve",
                     json=payload,
-                    timeout=10,
+                    timeout=request_timeout,
                 )
             except Exception as e:
                 logger.error(
@@ -417,7 +425,15 @@ class CryptoClient:
                     logger.error("Timed out while waiting on pending API v1 relay response")
                     return None
                 logger.debug("API v1 relay response is pending for request_id %s", expected_request_id)
-                time.sleep(retry_delay)
+                try:
+                    pending = raw_response.json()
+                except ValueError:
+                    pending = None
+                if not isinstance(pending, dict) or 'wait_seconds' not in pending:
+                    time.sleep(retry_delay)
+                elif 'encrypted_progress' in pending:
+                    # Progress ends a relay-side wait early; it is not a failed attempt.
+                    attempt -= 1
                 continue
             if raw_response.status_code == 404:
                 logger.warning("API v1 relay response request_id %s not found", expected_request_id)
@@ -6,9 +6,12 @@ import ntpath
 import time
 import logging
 import math
+import mmap
 import struct
 import hashlib
 import uuid
+import contextlib
+import shutil
 from utils.llm.llama_module_identity import (
     canonical_llama_module_identity_input as _shared_canonical_llama_module_identity_input,
     llama_module_identity_supplied,
@@ -30,7 +33,7 @@ import sysconfig
 from pathlib import Path
 from threading import Lock
 from typing import Callable, Dict, List, Any, Optional, Iterable, Tuple, NoReturn
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as _FutureTimeoutError
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as _FutureTimeoutError, as_completed
 
 from utils.system import resource_monitor
 from utils.llm.model_profiles import get_model_profile, resolve_profile_id
@@ -2724,6 +2727,122 @@ def _teardown_worker_process(
     return _poll_dead()
 
 
+# Worker frame transport v3.  Frames leave the worker on a dedicated pipe as
+# length-prefixed records instead of prefixed JSON lines on a stdout that also
+# carries llama.cpp noise.  A record is a header (body length, kind, command id
+# length), the command id and the body: compact JSON, or a packed form for the
+# two per-token frame types, progress counters and text-only stream chunks.
+# The worker code below carries the matching encoder.
+_WORKER_FRAME_FD_ENV = 'TOKEN_PLACE_LLAMA_WORKER_FRAME_FD'
+_WORKER_FRAME_PROTOCOL_ENV = 'TOKEN_PLACE_LLAMA_WORKER_FRAME_PROTOCOL'
+_WORKER_FRAME_HEADER = struct.Struct('<IBB')
+_WORKER_FRAME_JSON = 1
+_WORKER_FRAME_PROGRESS = 2
+_WORKER_FRAME_CHUNK = 3
+_WORKER_FRAME_PROGRESS_BODY = struct.Struct('<B5I')
+_WORKER_PROGRESS_PHASES = ('preparing', 'prefill', 'generating')
+_WORKER_PROGRESS_COUNTERS = (
+    'total_prompt_tokens', 'cached_prompt_tokens', 'processed_prompt_tokens', 'generated_tokens', 'elapsed_ms',
+)
+_WORKER_CHUNK_FRAME_KEYS = frozenset({'status', 'chunk', 'done', 'protocol_version', 'command_id'})
+
+
+def _worker_frame_protocol_offered() -> bool:
+    return os.name != 'nt' and os.environ.get(_WORKER_FRAME_PROTOCOL_ENV, '3').strip() != '2'
+
+
+def _stream_chunk_text(frame: Dict[str, Any]) -> Optional[str]:
+    """Return the delta text of a chunk frame that only differs from its
+    neighbours by that text, else None."""
+    if set(frame) != _WORKER_CHUNK_FRAME_KEYS or frame.get('status') != 'ok' or frame.get('done') is not False:
+        return None
+    choices = frame['chunk'].get('choices') if isinstance(frame['chunk'], dict) else None
+    if not isinstance(choices, list) or len(choices) != 1 or not isinstance(choices[0], dict):
+        return None
+    delta = choices[0].get('delta')
+    if not isinstance(delta, dict) or set(delta) != {'content'} or not isinstance(delta['content'], str):
+        return None
+    return delta['content']
+
+
+def _stream_chunk_with_text(template: Dict[str, Any], text: str) -> Dict[str, Any]:
+    return {**template, 'choices': [{**template['choices'][0], 'delta': {'content': text}}]}
+
+
+def _read_worker_frames(stream: Any) -> Iterable[Dict[str, Any]]:
+    """Decode v3 records from ``stream`` until EOF."""
+    chunk_templates: Dict[str, Dict[str, Any]] = {}
+    while True:
+        header = stream.read(_WORKER_FRAME_HEADER.size)
+        if len(header) < _WORKER_FRAME_HEADER.size:
+            return
+        body_length, kind, command_id_length = _WORKER_FRAME_HEADER.unpack(header)
+        command_id = stream.read(command_id_length).decode('utf-8')
+        body = stream.read(body_length)
+        if len(body) < body_length:
+            return
+        if kind == _WORKER_FRAME_PROGRESS:
+            phase, *counters = _WORKER_FRAME_PROGRESS_BODY.unpack(body)
+            frame = {'type': 'inference_progress', 'phase': _WORKER_PROGRESS_PHASES[phase]}
+            frame.update(zip(_WORKER_PROGRESS_COUNTERS, counters))
+            frame.update({'protocol_version': 2, 'command_id': command_id})
+            yield frame
+            continue
+        if kind == _WORKER_FRAME_CHUNK:
+            chunk = _stream_chunk_with_text(chunk_templates[command_id], body.decode('utf-8'))
+            yield {'status': 'ok', 'chunk': chunk, 'done': False, 'protocol_version': 2, 'command_id': command_id}
+            continue
+        frame = json.loads(body)
+        # Mirror the worker: a JSON text chunk becomes the template for the
+        # packed chunks after it, and any terminal frame drops the template.
+        if isinstance(frame, dict) and frame.get('type') != 'inference_progress':
+            if _stream_chunk_text(frame) is not None:
+                chunk_templates[command_id] = frame['chunk']
+            elif 'chunk' not in frame:
+                chunk_templates.pop(command_id, None)
+        yield frame
+
+
+class _CommandFrames(queue.Queue):
+    """Per-command frame queue whose waiter can also be woken for progress."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._woken = False
+
+    def wake(self) -> None:
+        with self.not_empty:
+            self._woken = True
+            self.not_empty.notify()
+
+    def wait_frame(self, timeout: Optional[float]) -> Any:
+        """Return the next frame, or None once woken or after ``timeout``."""
+        with self.not_empty:
+            if not self._qsize() and not self._woken:
+                self.not_empty.wait(timeout)
+            self._woken = False
+            if not self._qsize():
+                return None
+            item = self._get()
+            self.not_full.notify()
+            return item
+
+
+def _next_command_frame(target: queue.Queue, timeout: Optional[float]) -> Any:
+    """Wait for a frame on ``target``; None means "check progress and retry".
+
+    Command queues created by the proxy wake their waiter for progress, so it
+    sleeps until something happens.  Plain queues fall back to short slices.
+    """
+    wait_frame = getattr(target, 'wait_frame', None)
+    if callable(wait_frame):
+        return wait_frame(timeout)
+    try:
+        return target.get(timeout=0.05 if timeout is None else min(timeout, 0.05))
+    except queue.Empty:
+        return None
+
+
 class _SubprocessLlamaProxy:
     """Minimal llama_cpp.Llama proxy for no-SIGALRM runtimes."""
 
@@ -2761,6 +2880,16 @@ class _SubprocessLlamaProxy:
         # but cancellation never needs this lock: the manager can signal the
         # process while this thread is waiting on its command queue.
         self._pending_lock = Lock()
+        # Batched workers take rendered-prompt commands from several callers at
+        # once; whole command lines must still reach stdin one at a time.
+        self._send_lock = Lock()
+        self.batch_sequences = 1
+        # Latest prompt-prefix cache counters reported by the worker, if it
+        # has a cache (TOKEN_PLACE_LLAMA_PREFIX_CACHE_BYTES).
+        self.prefix_cache_stats: Optional[Dict[str, int]] = None
+        # Worker-measured latency to the first sampled token of the first
+        # completion this worker served.
+        self.first_token_ms: Optional[int] = None
         self._pending: Dict[str, queue.Queue] = {}
         self._completed_commands: set[str] = set()
         self._command_sequence = 0
@@ -2795,12 +2924,19 @@ class _SubprocessLlamaProxy:
             command = [sys.executable, '-u', '-c', code]
         env = _llama_cpp_runtime_worker_env()
         cwd = _llama_cpp_probe_subprocess_cwd()
+        self.frame_protocol = 2
+        self._frame_read_fd: Optional[int] = None
+        frame_write_fd: Optional[int] = None
         try:
             popen_platform: Dict[str, Any] = {}
             if os.name == 'nt':
                 popen_platform['creationflags'] = getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0)
             else:
                 popen_platform['start_new_session'] = True
+            if _worker_frame_protocol_offered():
+                self._frame_read_fd, frame_write_fd = os.pipe()
+                env[_WORKER_FRAME_FD_ENV] = str(frame_write_fd)
+                popen_platform['pass_fds'] = (frame_write_fd,)
             self._process = subprocess.Popen(
                 command,
                 stdin=subprocess.PIPE,
@@ -2813,6 +2949,7 @@ class _SubprocessLlamaProxy:
                 **popen_platform,
             )
         except OSError:
+            self._close_frame_pipe()
             # Popen failed; clean up the temp file if one was created (when
             # self._worker_tmpfile is None we were already using the -c fallback).
             if self._worker_tmpfile:
@@ -2822,6 +2959,10 @@ class _SubprocessLlamaProxy:
                     pass
                 self._worker_tmpfile = None
             raise
+        finally:
+            if frame_write_fd is not None:
+                # Only the worker keeps the write end, so its exit reads as EOF.
+                os.close(frame_write_fd)
         self._process._token_place_command = [command[0], '<runtime-worker-script>' if self._worker_tmpfile else '<runtime-worker-code>']  # type: ignore[attr-defined]
         self._process._token_place_cwd = cwd  # type: ignore[attr-defined]
         self._process._token_place_import_root = env.get('TOKEN_PLACE_PYTHON_IMPORT_ROOT', '')  # type: ignore[attr-defined]
@@ -2836,7 +2977,16 @@ class _SubprocessLlamaProxy:
         self._stdout_reader_thread: Optional[threading.Thread] = None
         self._start_stderr_tail_reader()
         try:
-            import_message = self._rpc({'method': '__import__'}, timeout_seconds=self._timeout_seconds, stage='llama_cpp_import', check_health=False)
+            import_payload: Dict[str, Any] = {'method': '__import__'}
+            if self._frame_read_fd is not None:
+                import_payload['frame_protocols'] = [3]
+            import_message = self._rpc(import_payload, timeout_seconds=self._timeout_seconds, stage='llama_cpp_import', check_health=False)
+            if import_message.get('frame_protocol') == 3 and self._frame_read_fd is not None:
+                self.frame_protocol = 3
+                self._start_frame_pipe_reader()
+            else:
+                # A worker without v3 keeps framing on stdout.
+                self._close_frame_pipe()
             imported_worker_module_path = import_message.get('module_path')
             imported_worker_identity = llama_module_identity_from_path(imported_worker_module_path)
             expected_identity = self._expected_llama_module_identity
@@ -2862,6 +3012,9 @@ class _SubprocessLlamaProxy:
             init_stderr_sequence = int(getattr(self._process, '_token_place_stderr_sequence', 0) or 0)
             init_message = self._rpc({'method': '__init__', 'args': args, 'kwargs': kwargs}, timeout_seconds=self._timeout_seconds, stage='llama_cpp_model_initialization', check_health=False)
             self.child_model_path_exists = bool(init_message.get('child_model_path_exists'))
+            batch_sequences = init_message.get('batch_sequences')
+            if isinstance(batch_sequences, int) and not isinstance(batch_sequences, bool) and batch_sequences > 1:
+                self.batch_sequences = batch_sequences
             # The RPC response and stderr are drained by different readers.  Wait
             # for a bounded quiet period after the completed init RPC so a slow
             # stderr reader cannot make current-attempt diagnostics disappear.
@@ -2954,84 +3107,17 @@ class _SubprocessLlamaProxy:
                         frame = json.loads(line.split(':', 1)[1].strip())
                     except (json.JSONDecodeError, ValueError):
                         continue
-                    if not isinstance(frame, dict):
-                        continue
-                    if frame.get('protocol_version') != 2:
-                        try:
-                            self._legacy_frames.put_nowait(frame)
-                        except queue.Full:
-                            pass
-                        continue
-                    command_id = frame.get('command_id')
-                    if not isinstance(command_id, str):
-                        try:
-                            self._unclaimed_frames.put_nowait(frame)
-                        except queue.Full:
-                            pass
-                        continue
-                    with self._pending_lock:
-                        target = self._pending.get(command_id)
-                    if target is None:
-                        try:
-                            self._unclaimed_frames.put_nowait(frame)
-                        except queue.Full:
-                            pass
-                        continue
-                    if frame.get('type') == 'inference_progress':
-                        # Progress is coalesced (latest value wins) and never
-                        # dispatched from this thread: a slow or raising
-                        # observer must never delay stdout drainage or another
-                        # command's authoritative frames. The command's own
-                        # waiting caller thread dispatches it.
-                        with self._pending_lock:
-                            context = self._command_progress.get(command_id)
-                            if context is not None:
-                                context['sequence'] += 1
-                                event = {
-                                    key: frame[key] for key in (
-                                        'type', 'phase', 'total_prompt_tokens',
-                                        'cached_prompt_tokens', 'processed_prompt_tokens',
-                                        'generated_tokens', 'elapsed_ms'
-                                    ) if key in frame
-                                }
-                                event.update({
-                                    'request_id': context['request_id'] or 'local',
-                                    'worker_generation': context['worker_generation'],
-                                    'sequence': context['sequence'],
-                                })
-                                self._latest_progress[command_id] = event
-                        continue
-                    with self._pending_lock:
-                        if command_id in self._completed_commands:
-                            continue
-                    # Per-command queues are unbounded, so this cannot raise
-                    # queue.Full under normal operation. If delivery still
-                    # fails for any reason, the transport can no longer be
-                    # trusted: fail every pending command with a typed
-                    # transport error and stop reading, rather than silently
-                    # dropping the frame and leaving a waiter hanging forever.
-                    # Deliberately marked completed only *after* a successful
-                    # put: a failed delivery must never be mistaken for one
-                    # that succeeded, or _fail_pending would wrongly skip it.
-                    try:
-                        target.put_nowait(frame)
-                    except Exception:
-                        self._closed = True
-                        self._fail_pending(
-                            LlamaCppWorkerEOFError('llama_cpp worker transport frame delivery failed')
-                        )
+                    if not self._route_worker_frame(frame):
                         return
-                    if frame.get('done') is not False:
-                        with self._pending_lock:
-                            self._completed_commands.add(command_id)
             finally:
                 # Real versioned production workers only ever reach EOF when
                 # the process has actually died, so this must always close
                 # the transport and fail every still-pending command. The
                 # sole exception is a deterministic test fixture that opts in
                 # explicitly via _legacy_fixture_transport (never inferred
-                # from queue contents).
-                if not getattr(self, '_legacy_fixture_transport', False):
+                # from queue contents). Under frame protocol v3 the frame
+                # pipe reader owns that decision instead.
+                if getattr(self, 'frame_protocol', 2) != 3 and not getattr(self, '_legacy_fixture_transport', False):
                     self._closed = True
                     self._fail_pending(LlamaCppWorkerEOFError('llama_cpp worker transport reached unexpected EOF'))
 
@@ -3040,6 +3126,122 @@ class _SubprocessLlamaProxy:
         )
         self._stdout_reader_thread.start()
 
+    def _route_worker_frame(self, frame: Any) -> bool:
+        """Deliver one decoded worker frame; False once the transport is unusable."""
+        if not isinstance(frame, dict):
+            return True
+        if frame.get('protocol_version') != 2:
+            try:
+                self._legacy_frames.put_nowait(frame)
+            except queue.Full:
+                pass
+            with self._pending_lock:
+                targets = list(self._pending.values())
+            for target in targets:
+                if hasattr(target, 'wake'):
+                    target.wake()
+            return True
+        command_id = frame.get('command_id')
+        if not isinstance(command_id, str):
+            try:
+                self._unclaimed_frames.put_nowait(frame)
+            except queue.Full:
+                pass
+            return True
+        with self._pending_lock:
+            target = self._pending.get(command_id)
+        if target is None:
+            try:
+                self._unclaimed_frames.put_nowait(frame)
+            except queue.Full:
+                pass
+            return True
+        if frame.get('type') == 'inference_progress':
+            if frame.get('phase') == 'generating' and getattr(self, 'first_token_ms', None) is None:
+                self.first_token_ms = frame.get('elapsed_ms')
+            # Progress is coalesced (latest value wins) and never
+            # dispatched from this thread: a slow or raising observer must
+            # never delay frame drainage or another command's authoritative
+            # frames. The command's own waiting caller thread dispatches it
+            # once woken.
+            with self._pending_lock:
+                context = self._command_progress.get(command_id)
+                if context is not None:
+                    context['sequence'] += 1
+                    event = {
+                        key: frame[key] for key in (
+                            'type', 'phase', 'total_prompt_tokens',
+                            'cached_prompt_tokens', 'processed_prompt_tokens',
+                            'generated_tokens', 'elapsed_ms'
+                        ) if key in frame
+                    }
+                    event.update({
+                        'request_id': context['request_id'] or 'local',
+                        'worker_generation': context['worker_generation'],
+                        'sequence': context['sequence'],
+                    })
+                    self._latest_progress[command_id] = event
+            if context is not None and hasattr(target, 'wake'):
+                target.wake()
+            return True
+        with self._pending_lock:
+            if command_id in self._completed_commands:
+                return True
+        # Per-command queues are unbounded, so this cannot raise queue.Full
+        # under normal operation. If delivery still fails for any reason, the
+        # transport can no longer be trusted: fail every pending command with
+        # a typed transport error and stop reading, rather than silently
+        # dropping the frame and leaving a waiter hanging forever.
+        # Deliberately marked completed only *after* a successful put: a
+        # failed delivery must never be mistaken for one that succeeded, or
+        # _fail_pending would wrongly skip it.
+        try:
+            target.put_nowait(frame)
+        except Exception:
+            self._closed = True
+            self._fail_pending(
+                LlamaCppWorkerEOFError('llama_cpp worker transport frame delivery failed')
+            )
+            return False
+        if frame.get('done') is not False:
+            with self._pending_lock:
+                self._completed_commands.add(command_id)
+        return True
+
+    def _start_frame_pipe_reader(self) -> None:
+        """Drain protocol v3 records from the dedicated frame pipe."""
+        stream = os.fdopen(self._frame_read_fd, 'rb')
+        self._frame_read_fd = None
+
+        def _reader() -> None:
+            try:
+                with stream:
+                    for frame in _read_worker_frames(stream):
+                        if not self._route_worker_frame(frame):
+                            return
+            except (OSError, ValueError, KeyError, struct.error):
+                pass
+            finally:
+                # Once frames moved to the pipe, its EOF (not stdout's) is
+                # the authoritative sign that the worker is gone.
+                if not getattr(self, '_legacy_fixture_transport', False):
+                    self._closed = True
+                    self._fail_pending(LlamaCppWorkerEOFError('llama_cpp worker transport reached unexpected EOF'))
+
+        self._frame_reader_thread = threading.Thread(
+            target=_reader, name='llama_cpp_frame_reader', daemon=True
+        )
+        self._frame_reader_thread.start()
+
+    def _close_frame_pipe(self) -> None:
+        read_fd = getattr(self, '_frame_read_fd', None)
+        self._frame_read_fd = None
+        if read_fd is not None:
+            try:
+                os.close(read_fd)
+            except OSError:
+                pass
+
     def _fail_pending(self, error: BaseException) -> None:
         with self._pending_lock:
             # Commands whose terminal frame was already delivered don't need
@@ -3090,28 +3292,27 @@ class _SubprocessLlamaProxy:
     def _wait_with_progress(
         self, command_id: str, target: queue.Queue, timeout_seconds: Optional[float]
     ) -> Any:
-        """Block for the next frame on `target` in short slices.
-
-        Dispatches coalesced progress for `command_id` between slices so a
-        long wait (e.g. prefill on a large prompt) still surfaces progress
-        promptly instead of only once the awaited frame finally arrives.
-        Raises `queue.Empty` once `timeout_seconds` elapses with nothing
-        delivered, matching a plain bounded `target.get(timeout=...)`.
+        """Block for the next frame on `target`.
+
+        Dispatches coalesced progress for `command_id` whenever the reader
+        wakes the waiter for it, so a long wait (e.g. prefill on a large
+        prompt) still surfaces progress promptly instead of only once the
+        awaited frame finally arrives. Raises `queue.Empty` once
+        `timeout_seconds` elapses with nothing delivered, matching a plain
+        bounded `target.get(timeout=...)`.
         """
         deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
         while True:
             self._dispatch_pending_progress(command_id)
             if deadline is None:
-                wait_seconds = 0.05
+                remaining = None
             else:
                 remaining = deadline - time.monotonic()
                 if remaining <= 0:
                     raise queue.Empty()
-                wait_seconds = min(remaining, 0.05)
-            try:
-                return target.get(timeout=wait_seconds)
-            except queue.Empty:
-                continue
+            frame = _next_command_frame(target, remaining)
+            if frame is not None:
+                return frame
 
     def _register_command_progress_context(
         self,
@@ -3165,7 +3366,7 @@ class _SubprocessLlamaProxy:
             command_id = f'c{self._command_sequence}'
             # Unbounded: an authoritative result/error frame must never be
             # silently dropped under backpressure.
-            result_queue: queue.Queue = queue.Queue()
+            result_queue: queue.Queue = _CommandFrames()
             self._pending[command_id] = result_queue
             self._register_command_progress_context(
                 command_id,
@@ -3188,20 +3389,20 @@ class _SubprocessLlamaProxy:
                     break
                 except queue.Empty:
                     if deadline is None:
-                        wait_seconds = 0.05
+                        remaining = None
                     else:
                         remaining = deadline - time.monotonic()
                         if remaining <= 0:
                             raise LlamaCppRuntimeStageTimeout(stage, timeout_seconds)
-                        wait_seconds = min(remaining, 0.05)
-                    try:
-                        message = result_queue.get(timeout=wait_seconds)
+                    message = _next_command_frame(result_queue, remaining)
+                    if message is not None:
                         break
-                    except queue.Empty:
-                        continue
             if isinstance(message, BaseException):
                 raise message
-            return _validate_llama_subprocess_message(message, process=self._process, stage=stage)
+            validated = _validate_llama_subprocess_message(message, process=self._process, stage=stage)
+            if isinstance(validated.get('prefix_cache'), dict):
+                self.prefix_cache_stats = dict(validated['prefix_cache'])
+            return validated
         finally:
             with self._pending_lock:
                 self._pending.pop(command_id, None)
@@ -3241,9 +3442,11 @@ class _SubprocessLlamaProxy:
         if self._process.stdin is None:
             self._closed = True
             raise LlamaCppWorkerBrokenPipeError('llama_cpp subprocess stdin is unavailable')
+        send_lock = getattr(self, '_send_lock', None)
         try:
-            self._process.stdin.write(json.dumps(payload) + '\n')
-            self._process.stdin.flush()
+            with send_lock if send_lock is not None else contextlib.nullcontext():
+                self._process.stdin.write(json.dumps(payload) + '\n')
+                self._process.stdin.flush()
         except (BrokenPipeError, OSError) as exc:
             self._closed = True
             raise LlamaCppWorkerBrokenPipeError('llama_cpp subprocess transport write failed') from exc
@@ -3318,10 +3521,13 @@ class _SubprocessLlamaProxy:
         The progress arguments are parent-only context.  Keeping them as
         explicit keyword-only parameters ensures they are registered with the
         RPC command but never included in the child worker's generation kwargs.
+        A batching worker (``batch_sequences > 1``) schedules these commands
+        itself, so they are sent without waiting for the proxy command lock.
         """
         stderr_cursor = 0
+        batched = getattr(self, 'batch_sequences', 1) > 1
         try:
-            with self._lock:
+            with contextlib.nullcontext() if batched else self._lock:
                 stderr_cursor = self._stderr_cursor()
                 message = self._rpc(
                     {
@@ -3347,6 +3553,36 @@ class _SubprocessLlamaProxy:
         return message.get('result')
 
 
+    def cancel_request(self, request_id: str) -> bool:
+        """Drop ``request_id``'s commands from a batching worker.
+
+        Only the request's own sequence is cancelled; the other sequences in
+        the batch keep generating.  Returns False when the worker does not
+        batch or no longer holds the request, so the caller can fall back to
+        terminating the worker.
+        """
+        if getattr(self, 'batch_sequences', 1) <= 1 or not request_id:
+            return False
+        with self._pending_lock:
+            targets = [
+                command_id
+                for command_id, context in self._command_progress.items()
+                if context.get('request_id') == request_id
+            ]
+        cancelled = False
+        for command_id in targets:
+            try:
+                message = self._rpc(
+                    {'method': '__cancel__', 'target_command_id': command_id},
+                    timeout_seconds=min(self._timeout_seconds or 5.0, 5.0),
+                    stage='llama_cpp_cancel',
+                )
+            except Exception:
+                return False
+            result = message.get('result')
+            cancelled = (isinstance(result, dict) and result.get('cancelled') is True) or cancelled
+        return cancelled
+
     def apply_chat_template(self, *args, **kwargs):
         with self._lock:
             try:
@@ -3406,7 +3642,7 @@ class _SubprocessLlamaProxy:
                 command_id = f'c{self._command_sequence}'
                 # Unbounded: stream chunks and the terminal `done` frame are
                 # authoritative and must never be silently dropped under backpressure.
-                frames: queue.Queue = queue.Queue()
+                frames: queue.Queue = _CommandFrames()
                 self._pending[command_id] = frames
                 self._register_command_progress_context(
                     command_id,
@@ -3478,6 +3714,7 @@ class _SubprocessLlamaProxy:
             except Exception:
                 pass
             self._worker_tmpfile = None
+        self._close_frame_pipe()
 
     def __del__(self) -> None:
         try:
@@ -3565,7 +3802,7 @@ class _SubprocessLlamaCppModule:
 
 
 _LLAMA_CPP_RUNTIME_WORKER_CODE = """
-import importlib, inspect, json, os, re, sys, time
+import hashlib, importlib, inspect, json, mmap, os, queue, re, struct, sys, threading, time, zlib
 
 _active_command_id = None
 _active_protocol_version = None
@@ -3581,13 +3818,96 @@ def _jsonable(value):
         return [_jsonable(item) for item in value]
     return value
 
-def _emit(payload):
+def _emit(payload, command_id=None):
     frame = dict(payload)
-    if _active_protocol_version == 2:
+    if command_id is not None:
+        frame['protocol_version'] = 2
+        frame['command_id'] = command_id
+    elif _active_protocol_version == 2:
         frame['protocol_version'] = 2
         frame['command_id'] = _active_command_id
+    if _prefix_cache is not None and frame.get('status') == 'ok' and 'result' in frame:
+        frame['prefix_cache'] = _prefix_cache.stats()
+    if _frame_fd is not None:
+        _write_frame(_jsonable(frame))
+        return
     print('TOKEN_PLACE_LLAMA_CPP_JSON:' + json.dumps(_jsonable(frame)), flush=True)
 
+# Frame protocol v3 (see _read_worker_frames in the parent): once negotiated,
+# frames go to a dedicated pipe as length-prefixed records.
+_WORKER_FRAME_FD_ENV = 'TOKEN_PLACE_LLAMA_WORKER_FRAME_FD'
+_FRAME_HEADER = struct.Struct('<IBB')
+_FRAME_PROGRESS_BODY = struct.Struct('<B5I')
+_FRAME_PROGRESS_PHASES = ('preparing', 'prefill', 'generating')
+_FRAME_PROGRESS_COUNTERS = ('total_prompt_tokens', 'cached_prompt_tokens', 'processed_prompt_tokens', 'generated_tokens', 'elapsed_ms')
+_FRAME_PROGRESS_KEYS = frozenset(('type', 'phase', 'protocol_version', 'command_id') + _FRAME_PROGRESS_COUNTERS)
+_FRAME_CHUNK_KEYS = frozenset(('status', 'chunk', 'done', 'protocol_version', 'command_id'))
+_frame_fd = None
+_frame_lock = threading.Lock()
+_frame_chunk_templates = {}
+
+def _frame_pipe_fd(requested):
+    if not isinstance(requested, list) or 3 not in requested:
+        return None
+    try:
+        fd = int(os.environ.get(_WORKER_FRAME_FD_ENV, ''))
+        os.fstat(fd)
+    except (ValueError, OSError):
+        return None
+    return fd
+
+def _stream_chunk_text(frame):
+    if set(frame) != _FRAME_CHUNK_KEYS or frame.get('status') != 'ok' or frame.get('done') is not False:
+        return None
+    choices = frame['chunk'].get('choices') if isinstance(frame['chunk'], dict) else None
+    if not isinstance(choices, list) or len(choices) != 1 or not isinstance(choices[0], dict):
+        return None
+    delta = choices[0].get('delta')
+    if not isinstance(delta, dict) or set(delta) != {'content'} or not isinstance(delta['content'], str):
+        return None
+    return delta['content']
+
+def _stream_chunk_with_text(template, text):
+    return {**template, 'choices': [{**template['choices'][0], 'delta': {'content': text}}]}
+
+def _progress_frame_body(frame):
+    if set(frame) != _FRAME_PROGRESS_KEYS or frame['phase'] not in _FRAME_PROGRESS_PHASES:
+        return None
+    counters = [frame[key] for key in _FRAME_PROGRESS_COUNTERS]
+    if not all(type(value) is int and 0 <= value < 1 << 32 for value in counters):
+        return None
+    return _FRAME_PROGRESS_BODY.pack(_FRAME_PROGRESS_PHASES.index(frame['phase']), *counters)
+
+def _encode_frame(frame):
+    # Per-token frames get a packed body: progress counters, and stream chunks
+    # that only differ from the command's previous JSON chunk by their text.
+    command_id = frame.get('command_id') if isinstance(frame.get('command_id'), str) else ''
+    if frame.get('type') == 'inference_progress':
+        body = _progress_frame_body(frame)
+        if body is not None:
+            kind = 2
+        else:
+            kind, body = 1, json.dumps(frame, separators=(',', ':')).encode('utf-8')
+    else:
+        text = _stream_chunk_text(frame)
+        template = _frame_chunk_templates.get(command_id)
+        if text is not None and template is not None and _stream_chunk_with_text(template, text) == frame['chunk']:
+            kind, body = 3, text.encode('utf-8')
+        else:
+            kind, body = 1, json.dumps(frame, separators=(',', ':')).encode('utf-8')
+            if text is not None:
+                _frame_chunk_templates[command_id] = frame['chunk']
+            elif 'chunk' not in frame:
+                _frame_chunk_templates.pop(command_id, None)
+    encoded_id = command_id.encode('utf-8')
+    return _FRAME_HEADER.pack(len(body), kind, len(encoded_id)) + encoded_id + body
+
+def _write_frame(frame):
+    with _frame_lock:
+        view = memoryview(_encode_frame(frame))
+        while view:
+            view = view[os.write(_frame_fd, view):]
+
 
 
 def _classify_initialization_exception(exc):
@@ -4537,6 +4857,812 @@ def _render_testing_chat_template_fallback(args, kwargs):
         rendered_parts.append('<|im_start|>assistant\\n')
     return '\\n'.join(rendered_parts)
 
+_BATCH_SEQUENCES_ENV = 'TOKEN_PLACE_LLAMA_WORKER_BATCH_SEQUENCES'
+_BATCH_SEQUENCES_LIMIT = 64
+# Render-only commands never touch the KV cache, so they may run between two
+# batched decode steps.
+_BATCH_INTERLEAVED_METHODS = {'apply_chat_template', 'tokenize', 'render_and_tokenize_chat'}
+_BATCH_RENDER_KWARGS = {'max_tokens', 'enable_thinking', 'token_place_provider', 'token_place_template_policy'}
+# llama-cpp-python create_completion() sampling defaults, which the serial
+# rendered-prompt path relies on by passing only max_tokens.
+_BATCH_SAMPLING = {'temperature': 0.8, 'top_k': 40, 'top_p': 0.95, 'min_p': 0.05}
+
+def _batch_sequence_count():
+    try:
+        requested = int(os.environ.get(_BATCH_SEQUENCES_ENV, '1'))
+    except ValueError:
+        return 1
+    return max(1, min(requested, _BATCH_SEQUENCES_LIMIT))
+
+def _request_batch_context_params(llama_cpp, sequences):
+    # Llama() builds its context from llama_context_default_params(); ask for
+    # enough sequence slots and one KV cache shared by all of them so a single
+    # long request can still use the whole context window.
+    low_level = getattr(llama_cpp, 'llama_cpp', llama_cpp)
+    original = getattr(low_level, 'llama_context_default_params', None)
+    if not callable(original):
+        return None
+
+    def _params():
+        params = original()
+        if hasattr(params, 'n_seq_max'):
+            params.n_seq_max = max(int(params.n_seq_max or 1), sequences)
+        if hasattr(params, 'kv_unified'):
+            params.kv_unified = True
+        return params
+
+    low_level.llama_context_default_params = _params
+    return lambda: setattr(low_level, 'llama_context_default_params', original)
+
+def _resolve_batch_seq_rm(llama_cpp, ctx):
+    memory_seq_rm = getattr(llama_cpp, 'llama_memory_seq_rm', None)
+    get_memory = getattr(llama_cpp, 'llama_get_memory', None)
+    if callable(memory_seq_rm) and callable(get_memory):
+        memory = get_memory(ctx)
+        return lambda seq_id: memory_seq_rm(memory, seq_id, -1, -1)
+    for name in ('llama_kv_self_seq_rm', 'llama_kv_cache_seq_rm'):
+        seq_rm = getattr(llama_cpp, name, None)
+        if callable(seq_rm):
+            return lambda seq_id, seq_rm=seq_rm: seq_rm(ctx, seq_id, -1, -1)
+    return None
+
+def _resolve_batch_end_of_generation(llama_cpp, llama):
+    model = getattr(llama, '_model', None)
+    for owner, name, handle in (
+        (llama_cpp, 'llama_vocab_is_eog', getattr(model, 'vocab', None)),
+        (llama_cpp, 'llama_token_is_eog', getattr(model, 'model', None)),
+    ):
+        is_eog = getattr(owner, name, None)
+        if callable(is_eog) and handle is not None:
+            return lambda token, is_eog=is_eog, handle=handle: bool(is_eog(handle, token))
+    eos = llama.token_eos()
+    return lambda token: token == eos
+
+
+class _SequenceBatcher:
+    # Continuous batching over one llama context: every admitted command owns
+    # a KV sequence id, each step decodes one token for every generating
+    # sequence plus prompt chunks for sequences still in prefill, and waiting
+    # commands are admitted as soon as a sequence id and KV budget free up.
+
+    def __init__(self, llama_cpp, llama, ctx, capacity, np, seq_rm, end_of_generation):
+        self.capacity = capacity
+        self._lib = llama_cpp
+        self._llama = llama
+        self._ctx = ctx
+        self._np = np
+        self._seq_rm = seq_rm
+        self._end_of_generation = end_of_generation
+        self._n_ctx = int(llama.n_ctx())
+        self._n_batch = max(capacity, int(getattr(llama, 'n_batch', 512) or 512))
+        self._n_vocab = int(llama.n_vocab())
+        self._batch = llama_cpp.llama_batch_init(self._n_batch, 0, capacity)
+        self._rng = np.random.default_rng()
+        self._free_seq_ids = list(range(capacity))
+        self._reserved_tokens = 0
+        self._waiting = []
+        self._active = {}
+
+    @classmethod
+    def create(cls, llama_cpp, llama, requested):
+        try:
+            import numpy as np
+        except Exception:
+            return None
+        if not all(callable(getattr(llama_cpp, name, None)) for name in ('llama_batch_init', 'llama_decode', 'llama_get_logits_ith')):
+            return None
+        ctx = getattr(llama, 'ctx', None) or getattr(getattr(llama, '_ctx', None), 'ctx', None)
+        if ctx is None:
+            return None
+        capacity = requested
+        n_seq_max = getattr(llama_cpp, 'llama_n_seq_max', None)
+        try:
+            if callable(n_seq_max):
+                capacity = min(capacity, int(n_seq_max(ctx)))
+            seq_rm = _resolve_batch_seq_rm(llama_cpp, ctx)
+            if capacity < 2 or seq_rm is None:
+                return None
+            return cls(llama_cpp, llama, ctx, capacity, np, seq_rm, _resolve_batch_end_of_generation(llama_cpp, llama))
+        except Exception:
+            return None
+
+    @property
+    def busy(self):
+        return bool(self._waiting or self._active)
+
+    def prepare(self, request):
+        # Return the prompt tokens for a command this batcher can serve, or
+        # None to leave the command to the serial path (which also owns every
+        # fallback and diagnostic for unusual runtimes and options).
+        kwargs = request.get('kwargs')
+        if (
+            request.get('method') != 'create_chat_completion_from_rendered_prompt'
+            or request.get('protocol_version') != 2
+            or not isinstance(request.get('command_id'), str)
+            or not isinstance(kwargs, dict)
+            or set(kwargs) - _BATCH_RENDER_KWARGS
+        ):
+            return None
+        render_kwargs = {
+            'tokenize': False,
+            'add_generation_prompt': True,
+            'enable_thinking': kwargs.get('enable_thinking'),
+            'token_place_provider': kwargs.get('token_place_provider'),
+            'token_place_template_policy': kwargs.get('token_place_template_policy'),
+        }
+        render_kwargs = {key: value for key, value in render_kwargs.items() if value is not None}
+        try:
+            try:
+                rendered, _ = _render_chat_with_runtime_template(self._llama, request.get('args', []), render_kwargs)
+            except Exception as exc:
+                if str(exc) != 'runtime_chat_template_metadata_missing' or not _testing_render_template_fallback_allowed(_token_place_model_path):
+                    return None
+                rendered = _render_testing_chat_template_fallback(request.get('args', []), render_kwargs)
+            tokens = self._llama.tokenize(rendered.encode('utf-8'), add_bos=True, special=True)
+        except Exception:
+            return None
+        max_tokens = kwargs.get('max_tokens', 64)
+        if not isinstance(max_tokens, int) or isinstance(max_tokens, bool) or max_tokens <= 0:
+            max_tokens = 64
+        if not tokens or len(tokens) + max_tokens > self._n_ctx:
+            return None
+        return {'tokens': list(tokens), 'max_tokens': max_tokens}
+
+    def submit(self, request, prepared):
+        started = time.monotonic()
+        progress = {
+            'command_id': request['command_id'], 'started': started, 'last_emit': started,
+            'total': len(prepared['tokens']), 'cached': 0, 'processed': 0, 'generated': 0,
+            'generating': False, 'prefill_complete': False, 'cached_recorded': True,
+        }
+        self._waiting.append({
+            'request': request,
+            'command_id': request['command_id'],
+            'prompt': prepared['tokens'],
+            'max_tokens': prepared['max_tokens'],
+            'reservation': len(prepared['tokens']) + prepared['max_tokens'],
+            'output': [],
+            'progress': progress,
+        })
+        _emit_progress(progress, 'preparing')
+
+    def cancel(self, command_id):
+        for sequence in list(self._waiting):
+            if sequence['command_id'] == command_id:
+                self._waiting.remove(sequence)
+                self._fail(sequence, 'cancelled')
+                return True
+        sequence = self._active.get(command_id)
+        if sequence is None:
+            return False
+        self._release(sequence)
+        self._fail(sequence, 'cancelled')
+        return True
+
+    def _admit(self):
+        while self._waiting and self._free_seq_ids:
+            sequence = self._waiting[0]
+            if self._reserved_tokens + sequence['reservation'] > self._n_ctx:
+                return
+            self._waiting.pop(0)
+            if not self._active:
+                # The serial path may have left its own state in the context.
+                self._clear_context()
+            sequence['seq_id'] = self._free_seq_ids.pop(0)
+            sequence['position'] = 0
+            self._seq_rm(sequence['seq_id'])
+            self._reserved_tokens += sequence['reservation']
+            self._active[sequence['command_id']] = sequence
+
+    def _release(self, sequence):
+        self._active.pop(sequence['command_id'], None)
+        self._seq_rm(sequence['seq_id'])
+        self._free_seq_ids.append(sequence['seq_id'])
+        self._reserved_tokens -= sequence['reservation']
+        if not self._active:
+            self._clear_context()
+
+    def _clear_context(self):
+        self._seq_rm(-1)
+        reset = getattr(self._llama, 'reset', None)
+        if callable(reset):
+            reset()
+
+    def step(self):
+        self._admit()
+        if not self._active:
+            return
+        batch = self._batch
+        entries = []
+        for sequence in self._active.values():
+            if sequence['output'] and len(entries) < self._n_batch:
+                entries.append((sequence, sequence['output'][-1], True))
+        for sequence in self._active.values():
+            if sequence['output']:
+                continue
+            chunk = sequence['prompt'][sequence['position']:sequence['position'] + self._n_batch - len(entries)]
+            for offset, token in enumerate(chunk):
+                last = sequence['position'] + offset == len(sequence['prompt']) - 1
+                entries.append((sequence, token, last))
+        if not entries:
+            return
+        logits_rows = []
+        for index, (sequence, token, wants_logits) in enumerate(entries):
+            batch.token[index] = token
+            batch.pos[index] = sequence['position']
+            batch.n_seq_id[index] = 1
+            batch.seq_id[index][0] = sequence['seq_id']
+            batch.logits[index] = 1 if wants_logits else 0
+            sequence['position'] += 1
+            if wants_logits:
+                logits_rows.append((index, sequence))
+        batch.n_tokens = len(entries)
+        return_code = self._lib.llama_decode(self._ctx, batch)
+        if return_code != 0:
+            error = RuntimeError('llama_decode returned ' + str(return_code))
+            for sequence in list(self._active.values()):
+                self._release(sequence)
+                self._fail(sequence, 'inference_exception', exc=error, category=_decode_return_category(error) or 'backend_decode_failure')
+            return
+        now = time.monotonic()
+        for sequence in self._active.values():
+            progress = sequence['progress']
+            if not progress['prefill_complete']:
+                progress['processed'] = min(progress['total'], sequence['position'])
+                final = progress['processed'] == progress['total']
+                if final or now - progress['last_emit'] >= 0.25:
+                    progress['prefill_complete'] = final
+                    progress['last_emit'] = now
+                    _emit_progress(progress, 'prefill')
+        for index, sequence in logits_rows:
+            logits = self._np.ctypeslib.as_array(self._lib.llama_get_logits_ith(self._ctx, index), shape=(self._n_vocab,))
+            token = self._sample(logits)
+            finish_reason = None
+            if self._end_of_generation(token):
+                finish_reason = 'stop'
+            else:
+                sequence['output'].append(token)
+                if len(sequence['output']) >= sequence['max_tokens']:
+                    finish_reason = 'length'
+            progress = sequence['progress']
+            progress['generated'] = len(sequence['output'])
+            if not progress['generating'] or now - progress['last_emit'] >= 0.25:
+                progress['generating'] = True
+                progress['last_emit'] = now
+                _emit_progress(progress, 'generating')
+            if finish_reason is not None:
+                self._release(sequence)
+                self._finish(sequence, finish_reason)
+
+    def _sample(self, logits):
+        np = self._np
+        top_k = min(_BATCH_SAMPLING['top_k'], logits.shape[0])
+        candidates = np.argpartition(logits, -top_k)[-top_k:]
+        scores = logits[candidates].astype(np.float64) / _BATCH_SAMPLING['temperature']
+        order = np.argsort(-scores)
+        candidates = candidates[order]
+        probabilities = np.exp(scores[order] - scores[order][0])
+        probabilities /= probabilities.sum()
+        keep = probabilities >= _BATCH_SAMPLING['min_p'] * probabilities[0]
+        candidates = candidates[keep]
+        probabilities = probabilities[keep]
+        cutoff = int(np.searchsorted(np.cumsum(probabilities), _BATCH_SAMPLING['top_p'])) + 1
+        candidates = candidates[:cutoff]
+        probabilities = probabilities[:cutoff] / probabilities[:cutoff].sum()
+        return int(self._rng.choice(candidates, p=probabilities))
+
+    def _finish(self, sequence, finish_reason):
+        text = self._llama.detokenize(sequence['output'])
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', errors='ignore')
+        prompt_tokens = len(sequence['prompt'])
+        completion_tokens = len(sequence['output'])
+        normalized, invalid_reason = _normalize_plain_completion_result({
+            'choices': [{'text': text, 'finish_reason': finish_reason}],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        })
+        if invalid_reason is not None:
+            self._fail(sequence, invalid_reason, category=invalid_reason)
+            return
+        _emit({'status': 'ok', 'result': normalized}, command_id=sequence['command_id'])
+
+    def _fail(self, sequence, reason, *, exc=None, category=None):
+        extra = {'method': 'create_completion_batched'}
+        if category is not None:
+            extra['generation_exception_category'] = category
+        _emit(_safe_request_error(reason, request=sequence['request'], exc=exc, extra=extra), command_id=sequence['command_id'])
+
+
+_PREFIX_CACHE_BYTES_ENV = 'TOKEN_PLACE_LLAMA_PREFIX_CACHE_BYTES'
+# Prefixes are indexed at block boundaries: shorter shared prefixes are cheap
+# to re-prefill and not worth a state restore.
+_PREFIX_CACHE_BLOCK_TOKENS = 64
+_PREFIX_HASH_MODULUS = (1 << 61) - 1
+_PREFIX_HASH_BASE = 1000003
+
+
+def _prefix_block_hashes(tokens):
+    # Rolling polynomial hash of tokens[:n] for every block boundary n.
+    hashes = []
+    value = 0
+    for index, token in enumerate(tokens, start=1):
+        value = (value * _PREFIX_HASH_BASE + int(token) + 1) % _PREFIX_HASH_MODULUS
+        if index % _PREFIX_CACHE_BLOCK_TOKENS == 0:
+            hashes.append(value)
+    return hashes
+
+
+def _llama_resident_tokens(llama):
+    # Llama.input_ids is the whole n_ctx numpy buffer; only its first
+    # n_tokens entries are evaluated context.
+    input_ids = getattr(llama, 'input_ids', None)
+    if input_ids is None:
+        return []
+    n_tokens = getattr(llama, 'n_tokens', None)
+    if isinstance(n_tokens, int):
+        input_ids = input_ids[:n_tokens]
+    return input_ids.tolist() if hasattr(input_ids, 'tolist') else list(input_ids)
+
+
+class _PrefixStateCache:
+    # llama-cpp-python cache (Llama.set_cache) holding saved llama states of
+    # earlier prompts plus their completions, in RAM and optionally on disk.
+    # create_completion() looks up the prompt here, restores the returned
+    # state when it shares a longer prefix than the context already holds,
+    # and evaluates only the remainder.
+
+    def __init__(self, capacity_bytes, resident_tokens, disk=None):
+        self.capacity_bytes = capacity_bytes
+        self._resident_tokens = resident_tokens
+        self._disk = disk
+        self._entries = {}
+        self._lru = []
+        self._by_block_hash = {}
+        self._size = 0
+        self.lookups = 0
+        self.hits = 0
+        self.tokens_saved = 0
+        self.evictions = 0
+
+    @classmethod
+    def create(cls, llama_cpp, llama, init_args, init_kwargs, batch_sequences):
+        try:
+            capacity_bytes = max(0, int(os.environ.get(_PREFIX_CACHE_BYTES_ENV, '0')))
+        except ValueError:
+            capacity_bytes = 0
+        if not callable(getattr(llama, 'set_cache', None)) or not callable(getattr(llama, 'save_state', None)):
+            return None
+        disk = _PrefixStateDiskStore.create(llama_cpp, llama, init_args, init_kwargs, batch_sequences)
+        if capacity_bytes <= 0 and disk is None:
+            return None
+        cache = cls(capacity_bytes, lambda: _llama_resident_tokens(llama), disk)
+        llama.set_cache(cache)
+        return cache
+
+    def stats(self):
+        stats = {
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'tokens_saved': self.tokens_saved,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._size,
+            'capacity_bytes': self.capacity_bytes,
+        }
+        if self._disk is not None:
+            stats.update(self._disk.stats())
+        return stats
+
+    @property
+    def cache_size(self):
+        return self._size
+
+    def __bool__(self):
+        return True
+
+    def _longest_entry(self, tokens):
+        for block_hash in reversed(_prefix_block_hashes(tokens)):
+            for key in self._by_block_hash.get(block_hash, ()):
+                entry = self._entries[key]
+                matched = _common_prefix_length(entry['tokens'], tokens)
+                if matched >= _PREFIX_CACHE_BLOCK_TOKENS:
+                    return key, matched
+        return None, 0
+
+    def __contains__(self, tokens):
+        tokens = tuple(tokens)
+        return self._longest_entry(tokens)[0] is not None or (self._disk is not None and self._disk.longest(tokens)[0] is not None)
+
+    def __getitem__(self, tokens):
+        tokens = tuple(tokens)
+        self.lookups += 1
+        key, matched = self._longest_entry(tokens)
+        resident = _common_prefix_length(self._resident_tokens(), tokens)
+        if self._disk is not None:
+            path, disk_matched = self._disk.longest(tokens)
+            if path is not None and disk_matched > max(matched, resident):
+                try:
+                    state = self._disk.load(path)
+                except (OSError, ValueError, KeyError):
+                    self._disk.discard(path)
+                else:
+                    self.hits += 1
+                    self.tokens_saved += disk_matched
+                    return state
+        if key is None or matched <= resident:
+            raise KeyError(key)
+        self.hits += 1
+        self.tokens_saved += matched
+        self._lru.remove(key)
+        self._lru.append(key)
+        return self._entries[key]['state']
+
+    def __setitem__(self, tokens, state):
+        tokens = tuple(tokens)
+        if self._disk is not None:
+            self._disk.save(tokens, state)
+        size = int(getattr(state, 'llama_state_size', 0) or 0)
+        if len(tokens) < _PREFIX_CACHE_BLOCK_TOKENS or size > self.capacity_bytes:
+            return
+        # An entry whose tokens lead the new ones adds nothing the new state
+        # cannot restore.
+        for key in [key for key, entry in self._entries.items() if entry['tokens'] == tokens[:len(entry['tokens'])]]:
+            self._remove(key)
+        block_hashes = _prefix_block_hashes(tokens)
+        self._entries[tokens] = {'tokens': tokens, 'state': state, 'size': size, 'block_hashes': block_hashes}
+        self._lru.append(tokens)
+        for block_hash in block_hashes:
+            self._by_block_hash.setdefault(block_hash, []).append(tokens)
+        self._size += size
+        while self._size > self.capacity_bytes:
+            self._remove(self._lru[0])
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._lru.remove(key)
+        self._size -= entry['size']
+        for block_hash in entry['block_hashes']:
+            keys = self._by_block_hash.get(block_hash, [])
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                self._by_block_hash.pop(block_hash, None)
+
+
+_PREFIX_CACHE_DIR_ENV = 'TOKEN_PLACE_LLAMA_PREFIX_CACHE_DIR'
+_PREFIX_CACHE_DISK_BYTES_ENV = 'TOKEN_PLACE_LLAMA_PREFIX_CACHE_DISK_BYTES'
+# Prompts shorter than this prefill faster than their state loads from disk.
+_PREFIX_DISK_MIN_TOKENS = 1024
+_PREFIX_DISK_MAGIC = b'TPKVSTATE1'
+# Init kwargs that change the saved KV state layout.
+_PREFIX_DISK_PROFILE_KWARGS = ('type_k', 'type_v', 'flash_attn', 'offload_kqv', 'n_seq_max', 'kv_unified')
+
+
+def _prefix_disk_profile(llama_cpp, llama, init_args, init_kwargs, batch_sequences):
+    # A saved state only loads back into the same model and runtime profile;
+    # the fingerprint is stored in every file and checked before loading.
+    model_path = init_args[0] if isinstance(init_args, list) and init_args else init_kwargs.get('model_path')
+    stat = os.stat(model_path)
+    profile = {
+        'model': [os.path.realpath(model_path), stat.st_size, stat.st_mtime_ns],
+        'llama_cpp': str(getattr(llama_cpp, '__version__', '')),
+        'n_ctx': int(llama.n_ctx()),
+        'batch_sequences': batch_sequences,
+    }
+    for key in _PREFIX_DISK_PROFILE_KWARGS:
+        profile[key] = str(init_kwargs.get(key))
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class _PrefixStateDiskStore:
+    # Saved llama states on disk, one file per prompt-plus-completion.  Files
+    # are written by a background thread (a state can be gigabytes), read back
+    # through mmap, and evicted least recently used first to stay within the
+    # byte budget.  Files from other runtime profiles share the budget but are
+    # never indexed for lookup.
+
+    def __init__(self, directory, capacity_bytes, profile, state_type, np, n_ctx):
+        self.directory = directory
+        self.capacity_bytes = capacity_bytes
+        self._profile = profile
+        self._state_type = state_type
+        self._np = np
+        self._n_ctx = n_ctx
+        self._lock = threading.Lock()
+        self._files = {}
+        self._by_block_hash = {}
+        self._pending = queue.Queue(maxsize=2)
+        self.hits = 0
+        self.evictions = 0
+        self.skipped_writes = 0
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith('.kvstate'):
+                self._scan(os.path.join(directory, name))
+        threading.Thread(target=self._write_pending, name='llama_worker_kv_disk', daemon=True).start()
+
+    @classmethod
+    def create(cls, llama_cpp, llama, init_args, init_kwargs, batch_sequences):
+        directory = os.environ.get(_PREFIX_CACHE_DIR_ENV, '').strip()
+        try:
+            capacity_bytes = int(os.environ.get(_PREFIX_CACHE_DISK_BYTES_ENV, '0'))
+        except ValueError:
+            return None
+        state_type = getattr(getattr(llama_cpp, 'llama', llama_cpp), 'LlamaState', None)
+        if not directory or capacity_bytes <= 0 or state_type is None:
+            return None
+        try:
+            import numpy as np
+            profile = _prefix_disk_profile(llama_cpp, llama, init_args, init_kwargs, batch_sequences)
+            return cls(directory, capacity_bytes, profile, state_type, np, int(llama.n_ctx()))
+        except Exception:
+            return None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'disk_hits': self.hits,
+                'disk_evictions': self.evictions,
+                'disk_skipped_writes': self.skipped_writes,
+                'disk_entries': sum(1 for entry in self._files.values() if entry['tokens'] is not None),
+                'disk_bytes': sum(entry['size'] for entry in self._files.values()),
+                'disk_capacity_bytes': self.capacity_bytes,
+            }
+
+    def _read_header(self, handle):
+        if handle.read(len(_PREFIX_DISK_MAGIC)) != _PREFIX_DISK_MAGIC:
+            raise ValueError('not a kv state file')
+        header_length = int.from_bytes(handle.read(8), 'little')
+        header = json.loads(handle.read(header_length).decode('utf-8'))
+        header['data_offset'] = len(_PREFIX_DISK_MAGIC) + 8 + header_length
+        return header
+
+    def _scan(self, path):
+        try:
+            stat = os.stat(path)
+            with open(path, 'rb') as handle:
+                header = self._read_header(handle)
+                tokens = None
+                if header['profile'] == self._profile:
+                    raw = handle.read(header['ids_bytes'])
+                    tokens = tuple(int(token) for token in self._np.frombuffer(raw, dtype=self._np.int32))
+        except (OSError, ValueError, KeyError):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return
+        self._index(path, stat.st_size, stat.st_atime, tokens)
+
+    def _index(self, path, size, used, tokens):
+        block_hashes = _prefix_block_hashes(tokens) if tokens is not None else []
+        self._files[path] = {'size': size, 'used': used, 'tokens': tokens, 'block_hashes': block_hashes}
+        for block_hash in block_hashes:
+            self._by_block_hash.setdefault(block_hash, []).append(path)
+
+    def _unindex(self, path):
+        entry = self._files.pop(path, None)
+        for block_hash in entry['block_hashes'] if entry is not None else ():
+            paths = self._by_block_hash.get(block_hash, [])
+            if path in paths:
+                paths.remove(path)
+            if not paths:
+                self._by_block_hash.pop(block_hash, None)
+
+    def _forget(self, path):
+        self._unindex(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def longest(self, tokens):
+        with self._lock:
+            for block_hash in reversed(_prefix_block_hashes(tokens)):
+                for path in self._by_block_hash.get(block_hash, ()):
+                    matched = _common_prefix_length(self._files[path]['tokens'], tokens)
+                    if matched >= _PREFIX_CACHE_BLOCK_TOKENS:
+                        return path, matched
+        return None, 0
+
+    def discard(self, path):
+        with self._lock:
+            self._forget(path)
+
+    def load(self, path):
+        np = self._np
+        with open(path, 'rb') as handle:
+            header = self._read_header(handle)
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = header['data_offset']
+        sections = {}
+        for name in ('ids', 'scores', 'state'):
+            sections[name] = memoryview(mapped)[offset:offset + header[name + '_bytes']]
+            offset += header[name + '_bytes']
+        if (
+            header['profile'] != self._profile
+            or offset != len(mapped)
+            or zlib.crc32(sections['state']) != header['state_crc32']
+        ):
+            raise ValueError('kv state file failed its integrity check')
+        state = self._state_type.__new__(self._state_type)
+        state.__dict__.update(header['fields'])
+        # Llama.load_state() adopts input_ids as its n_ctx-long buffer and the
+        # next eval writes past n_tokens, so only the prefix holds saved ids.
+        ids = np.frombuffer(sections['ids'], dtype=np.int32)
+        state.input_ids = np.zeros((max(self._n_ctx, len(ids)),), dtype=np.intc)
+        state.input_ids[:len(ids)] = ids
+        state.scores = np.frombuffer(sections['scores'], dtype=header['scores_dtype']).reshape(header['scores_shape'])
+        state.llama_state = sections['state']
+        state.llama_state_size = header['state_bytes']
+        with self._lock:
+            self.hits += 1
+            if path in self._files:
+                self._files[path]['used'] = time.time()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return state
+
+    def save(self, tokens, state):
+        if len(tokens) < _PREFIX_DISK_MIN_TOKENS:
+            return
+        try:
+            self._pending.put_nowait((tokens, state))
+        except queue.Full:
+            with self._lock:
+                self.skipped_writes += 1
+
+    def _write_pending(self):
+        while True:
+            tokens, state = self._pending.get()
+            try:
+                self._write(tokens, state)
+            except Exception:
+                with self._lock:
+                    self.skipped_writes += 1
+
+    def _write(self, tokens, state):
+        np = self._np
+        ids = np.asarray(tokens, dtype=np.int32).tobytes()
+        scores = np.ascontiguousarray(getattr(state, 'scores', np.zeros((0,), dtype=np.float32)))
+        llama_state = memoryview(state.llama_state).cast('B')
+        header = {
+            'profile': self._profile,
+            'ids_bytes': len(ids),
+            'scores_bytes': scores.nbytes,
+            'scores_dtype': scores.dtype.str,
+            'scores_shape': list(scores.shape),
+            'state_bytes': llama_state.nbytes,
+            'state_crc32': zlib.crc32(llama_state),
+            'fields': {
+                key: value for key, value in vars(state).items()
+                if key not in {'input_ids', 'scores', 'llama_state', 'llama_state_size'}
+                and isinstance(value, (int, float, str, bool, type(None)))
+            },
+        }
+        encoded_header = json.dumps(header).encode('utf-8')
+        size = len(_PREFIX_DISK_MAGIC) + 8 + len(encoded_header) + len(ids) + scores.nbytes + llama_state.nbytes
+        if size > self.capacity_bytes:
+            with self._lock:
+                self.skipped_writes += 1
+            return
+        name = hashlib.sha256(self._profile.encode('utf-8') + ids).hexdigest()[:32] + '.kvstate'
+        path = os.path.join(self.directory, name)
+        temporary = path + '.tmp'
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(_PREFIX_DISK_MAGIC)
+            handle.write(len(encoded_header).to_bytes(8, 'little'))
+            handle.write(encoded_header)
+            handle.write(ids)
+            handle.write(scores.tobytes())
+            handle.write(llama_state)
+        os.replace(temporary, path)
+        tokens = tuple(int(token) for token in tokens)
+        with self._lock:
+            # A state whose tokens lead the new ones adds nothing the new
+            # state cannot restore.
+            for other, entry in list(self._files.items()):
+                if other != path and entry['tokens'] is not None and entry['tokens'] == tokens[:len(entry['tokens'])]:
+                    self._forget(other)
+            self._unindex(path)
+            self._index(path, size, time.time(), tokens)
+            while sum(entry['size'] for entry in self._files.values()) > self.capacity_bytes:
+                self._forget(min(self._files, key=lambda other: self._files[other]['used']))
+                self.evictions += 1
+
+
+def _common_prefix_length(left, right):
+    matched = 0
+    for a, b in zip(left, right):
+        if a != b:
+            break
+        matched += 1
+    return matched
+
+
+_prefix_cache = None
+
+_batcher = None
+
+def _request_lines():
+    # Feed the serial command loop below.  Without a batcher this is plain
+    # stdin.  With one, stdin is read on a helper thread so batched decode
+    # steps keep running while commands arrive; commands stay in arrival
+    # order, and a command that needs the whole context waits for the
+    # batch to drain.
+    if _batcher is None:
+        yield from sys.stdin
+        return
+    import queue as _queue
+    import threading as _threading
+
+    incoming = _queue.Queue()
+
+    def _read_stdin():
+        for raw_line in sys.stdin:
+            incoming.put(raw_line)
+        incoming.put(None)
+
+    _threading.Thread(target=_read_stdin, name='llama_worker_stdin', daemon=True).start()
+    ordered = []
+    stdin_closed = False
+    while True:
+        while not stdin_closed:
+            idle = not _batcher.busy and not ordered
+            try:
+                raw_line = incoming.get() if idle else incoming.get_nowait()
+            except _queue.Empty:
+                break
+            if raw_line is None:
+                stdin_closed = True
+                break
+            try:
+                request = json.loads(raw_line)
+            except json.JSONDecodeError:
+                request = None
+            if isinstance(request, dict) and request.get('method') == '__cancel__':
+                target = request.get('target_command_id')
+                cancelled = False
+                for entry in ordered:
+                    if entry[1] is not None and entry[1].get('command_id') == target:
+                        ordered.remove(entry)
+                        _emit(_safe_request_error('cancelled', request=entry[1]), command_id=target)
+                        cancelled = True
+                        break
+                if not cancelled:
+                    cancelled = _batcher.cancel(target)
+                _emit({'status': 'ok', 'result': {'cancelled': cancelled}}, command_id=request.get('command_id'))
+                continue
+            ordered.append((raw_line, request if isinstance(request, dict) else None))
+        while ordered:
+            raw_line, request = ordered[0]
+            method = request.get('method') if request is not None else None
+            if method in _BATCH_INTERLEAVED_METHODS or request is None:
+                ordered.pop(0)
+                yield raw_line
+                continue
+            prepared = _batcher.prepare(request)
+            if prepared is not None:
+                ordered.pop(0)
+                _batcher.submit(request, prepared)
+                continue
+            if _batcher.busy:
+                break
+            ordered.pop(0)
+            yield raw_line
+        if _batcher.busy:
+            _batcher.step()
+        elif stdin_closed and not ordered:
+            return
+
 try:
     init_line = sys.stdin.readline()
     if not init_line:
@@ -4547,7 +5673,14 @@ try:
     emit_import_handshake = isinstance(init_payload, dict) and init_payload.get('method') == '__import__'
     llama_cpp = importlib.import_module('llama_cpp')
     if emit_import_handshake:
-        _emit({'status': 'ok', 'module_path': getattr(llama_cpp, '__file__', None)})
+        requested_frame_fd = _frame_pipe_fd(init_payload.get('frame_protocols'))
+        if requested_frame_fd is None:
+            _emit({'status': 'ok', 'module_path': getattr(llama_cpp, '__file__', None)})
+        else:
+            # The handshake reply still goes to stdout; every frame after it
+            # uses the pipe.
+            _emit({'status': 'ok', 'module_path': getattr(llama_cpp, '__file__', None), 'frame_protocol': 3})
+            _frame_fd = requested_frame_fd
         init_line = sys.stdin.readline()
         if not init_line:
             raise RuntimeError('llama_cpp subprocess missing init payload')
@@ -4574,8 +5707,22 @@ try:
         if isinstance(_token_place_model_path, str)
         else False
     )
-    llama = llama_cpp.Llama(*init_args, **init_kwargs)
-    _emit({'status': 'ok', 'module_path': getattr(llama_cpp, '__file__', None), 'child_model_path_exists': child_model_path_exists})
+    _batch_sequences = _batch_sequence_count()
+    _restore_context_params = _request_batch_context_params(llama_cpp, _batch_sequences) if _batch_sequences > 1 else None
+    try:
+        llama = llama_cpp.Llama(*init_args, **init_kwargs)
+    finally:
+        if _restore_context_params is not None:
+            _restore_context_params()
+    if _batch_sequences > 1:
+        _batcher = _SequenceBatcher.create(getattr(llama_cpp, 'llama_cpp', llama_cpp), llama, _batch_sequences)
+    _prefix_cache = _PrefixStateCache.create(llama_cpp, llama, init_args, init_kwargs, _batch_sequences)
+    _emit({
+        'status': 'ok',
+        'module_path': getattr(llama_cpp, '__file__', None),
+        'child_model_path_exists': child_model_path_exists,
+        'batch_sequences': _batcher.capacity if _batcher is not None else 1,
+    })
 except Exception as exc:
     _emit({
         'status': 'error',
@@ -4664,6 +5811,8 @@ if callable(_original_sample):
     llama.sample = _progress_sample
 
 def _emit_progress(state, phase):
+    # Batched sequences carry their own command id; serial progress belongs
+    # to the active command.
     _emit({
         'type': 'inference_progress',
         'phase': phase,
@@ -4672,7 +5821,7 @@ def _emit_progress(state, phase):
         'processed_prompt_tokens': state['processed'],
         'generated_tokens': state['generated'],
         'elapsed_ms': max(0, int((time.monotonic() - state['started']) * 1000)),
-    })
+    }, command_id=state.get('command_id'))
 
 def _start_progress(request):
     global _progress
@@ -4705,7 +5854,7 @@ def _start_progress(request):
         # retain privacy-safe zero counters rather than estimating progress.
         pass
 
-for line in sys.stdin:
+for line in _request_lines():
     request = None
     try:
         request = json.loads(line)
@@ -5726,6 +6875,224 @@ def llama_cpp_verbose_logging_enabled() -> bool:
     )
 
 
+_HOT_STANDBY_ENV = 'TOKEN_PLACE_LLAMA_HOT_STANDBY'
+
+
+def _hot_standby_worker_enabled() -> bool:
+    """Return whether a pre-initialized standby llama worker should be kept."""
+
+    return os.getenv(_HOT_STANDBY_ENV) == '1'
+
+
+_MODEL_PREFETCH_ENV = 'TOKEN_PLACE_LLAMA_PREFETCH'
+_MODEL_MLOCK_ENV = 'TOKEN_PLACE_LLAMA_MLOCK'
+_MODEL_PREFETCH_SEGMENT_BYTES = 64 * 1024 * 1024
+_MODEL_PREFETCH_READ_BYTES = 4 * 1024 * 1024
+# Ranged model downloads fetch, and resume, the GGUF in segments of this size.
+_MODEL_DOWNLOAD_SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+@contextlib.contextmanager
+def _exclusive_download_lock(lock_path: str):
+    """Hold an exclusive OS lock on `lock_path`, waiting for any other holder.
+
+    Yields True when another process or thread held the lock first. The lock
+    file is removed on release; a waiter that wakes up holding a file that
+    was already unlinked retries on the new one.
+    """
+    waited = False
+    while True:
+        handle = open(lock_path, 'a+b')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+
+                while True:
+                    try:
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        waited = True
+                        time.sleep(0.1)
+            else:
+                import fcntl
+
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    waited = True
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                current = os.stat(lock_path)
+            except OSError:
+                current = None
+            held = os.fstat(handle.fileno())
+        except BaseException:
+            handle.close()
+            raise
+        if current is not None and (current.st_dev, current.st_ino) == (held.st_dev, held.st_ino):
+            break
+        handle.close()
+        waited = True
+    try:
+        yield waited
+    finally:
+        try:
+            os.unlink(lock_path)
+        except OSError:
+            pass
+        if os.name == 'nt':
+            import msvcrt
+
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        handle.close()
+
+
+def _hash_file_segments(
+    path: str,
+    segment_bytes: int,
+    indices: Optional[Iterable[int]] = None,
+) -> Dict[int, str]:
+    """Return the SHA-256 of each `segment_bytes` segment of `path`.
+
+    Segments are hashed on a thread pool over one shared read-only mapping;
+    hashlib releases the GIL for large buffers, so a cold multi-GB file is
+    verified at roughly disk or core-count speed rather than one core's.
+    """
+    size = os.path.getsize(path)
+    segment_count = -(-size // segment_bytes)
+    selected = list(range(segment_count)) if indices is None else [
+        index for index in indices if 0 <= index < segment_count
+    ]
+    if not selected:
+        return {}
+    with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            def _hash(index: int) -> Tuple[int, str]:
+                start = index * segment_bytes
+                return index, hashlib.sha256(view[start:start + segment_bytes]).hexdigest()
+
+            with ThreadPoolExecutor(max_workers=min(len(selected), os.cpu_count() or 1)) as pool:
+                return dict(pool.map(_hash, selected))
+        finally:
+            view.release()
+
+
+def _model_prefetch_enabled() -> bool:
+    """Return whether GGUF pages should be read ahead while a worker starts."""
+
+    return os.getenv(_MODEL_PREFETCH_ENV) == '1'
+
+
+def _model_mlock_enabled() -> bool:
+    """Return whether llama.cpp should pin the mapped model with mlock."""
+
+    return os.getenv(_MODEL_MLOCK_ENV) == '1'
+
+
+class _ModelPagePrefetch:
+    """Read a GGUF file into the page cache on background threads.
+
+    llama.cpp maps the model with mmap, so the pages read here are the very
+    pages the worker (and any standby or pooled worker) maps afterwards: a
+    cold start faults them in from a few parallel sequential reads instead
+    of one random fault at a time during the first evaluation.
+    """
+
+    def __init__(self, path: str, *, threads: Optional[int] = None) -> None:
+        self.path = path
+        self.threads = max(1, int(threads or min(4, os.cpu_count() or 1)))
+        self.method = 'fadvise+read' if hasattr(os, 'posix_fadvise') else 'read'
+        self.size = 0
+        self.elapsed_ms: Optional[int] = None
+        self.error: Optional[str] = None
+        self._offsets: Iterable[int] = iter(())
+        self._offsets_lock = Lock()
+        self._done = threading.Event()
+        self._started = time.monotonic()
+        self._plans: List[Dict[str, Any]] = []
+        self._plans_lock = Lock()
+
+    def start(self) -> '_ModelPagePrefetch':
+        threading.Thread(target=self._run, name='token-place-model-prefetch', daemon=True).start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _run(self) -> None:
+        try:
+            self.size = os.path.getsize(self.path)
+            if hasattr(os, 'posix_fadvise'):
+                # Let the kernel start readahead for the whole file at once;
+                # the reads below make sure it actually lands.
+                fd = os.open(self.path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, self.size, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            self._offsets = iter(range(0, self.size, _MODEL_PREFETCH_SEGMENT_BYTES))
+            readers = [
+                threading.Thread(target=self._read_segments, name=f'token-place-model-prefetch-{index}', daemon=True)
+                for index in range(self.threads)
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+        except OSError as exc:
+            self.error = type(exc).__name__
+        finally:
+            self.elapsed_ms = int((time.monotonic() - self._started) * 1000)
+            self._done.set()
+            with self._plans_lock:
+                for plan in self._plans:
+                    plan.update(self.diagnostics())
+
+    def _read_segments(self) -> None:
+        buffer = memoryview(bytearray(_MODEL_PREFETCH_READ_BYTES))
+        try:
+            with open(self.path, 'rb', buffering=0) as handle:
+                while True:
+                    with self._offsets_lock:
+                        offset = next(self._offsets, None)
+                    if offset is None:
+                        return
+                    handle.seek(offset)
+                    remaining = min(_MODEL_PREFETCH_SEGMENT_BYTES, self.size - offset)
+                    while remaining > 0:
+                        read = handle.readinto(buffer[:min(remaining, _MODEL_PREFETCH_READ_BYTES)])
+                        if not read:
+                            break
+                        remaining -= read
+        except OSError as exc:
+            self.error = type(exc).__name__
+
+    def diagnostics(self) -> Dict[str, Any]:
+        """Return prefetch progress without waiting for it to finish."""
+
+        done = self._done.is_set()
+        return {
+            'model_prefetch_method': self.method,
+            'model_prefetch_threads': self.threads,
+            'model_prefetch_bytes': self.size,
+            'model_prefetch_completed': done and self.error is None,
+            'model_prefetch_ms': self.elapsed_ms if done else None,
+            'model_prefetch_error': self.error,
+        }
+
+    def publish_to(self, plan: Dict[str, Any]) -> None:
+        """Write the diagnostics into ``plan`` now and again when the reads finish."""
+
+        with self._plans_lock:
+            self._plans.append(plan)
+            plan.update(self.diagnostics())
+
+
 class ModelManager:
     """
     Manages LLM model downloading, initialization, and inference.
@@ -5758,6 +7125,10 @@ class ModelManager:
         self.chunk_size_mb = config.get('model.download_chunk_size_mb', 10)
         # Network timeout for model downloads (seconds)
         self.download_timeout = config.get('model.download_timeout', 30)
+        # Parallel HTTP Range connections for servers that accept byte ranges
+        self.download_connections = config.get('model.download_connections', 4)
+        # Segments of the managed artifact that failed their manifest hash
+        self.damaged_artifact_segments: List[int] = []
         self.models_dir = config.get('paths.models_dir')
         self.model_path = os.path.join(self.models_dir, self.file_name)
 
@@ -5773,6 +7144,14 @@ class ModelManager:
         self._cleanup_barrier_generation: Optional[int] = None
         self._llm_cancel_generation_event = threading.Event()
         self._llm_cancellation_epoch = 0
+        # Optional pre-initialized worker promoted when the active one is torn
+        # down (TOKEN_PLACE_LLAMA_HOT_STANDBY). Guarded by llm_lock.
+        self._hot_standby_llm: Any = None
+        self._hot_standby_recipe: Optional[Dict[str, Any]] = None
+        self._hot_standby_warming = False
+        self.hot_standby_promotions = 0
+        self.hot_standby_memory_skips = 0
+        self.hot_standby_last_warm_ms: Optional[int] = None
         self.worker_restart_count = 0
         self.last_worker_error_code: Optional[str] = None
         self.last_worker_exit_code: Optional[int] = None
@@ -6086,6 +7465,10 @@ class ModelManager:
             'n_ctx': n_ctx,
             'verbose': llama_cpp_verbose_logging_enabled(),
         }
+        if _model_mlock_enabled() and _constructor_accepts_kwarg(llama_cls, 'use_mlock'):
+            # The model stays memory-mapped (use_mmap), so pinned pages are
+            # still the shared page-cache copy every worker maps.
+            kwargs['use_mlock'] = True
         if self.model_profile.get('provider') == 'qwen':
             if self._chat_template_mode() != 'gguf-jinja':
                 raise RuntimeError('Qwen runtime requires GGUF/Jinja chat template policy')
@@ -6325,6 +7708,13 @@ class ModelManager:
         """
         Download a file in chunks with progress reporting.
 
+        When the server accepts byte ranges and the file spans more than one
+        segment, the download continues as parallel ranged requests into a
+        persistent ``.part`` file whose manifest lets a later call resume it.
+        Only one downloader at a time owns that ``.part`` file: a concurrent
+        call waits on ``{file_path}.part.lock`` and then resumes, or reuses the
+        artifact the other downloader already verified.
+
         Args:
             file_path: The path to save the file to
             url: The URL to download from
@@ -6340,8 +7730,47 @@ class ModelManager:
         )
         expected_size = self.model_profile.get('artifact_size_bytes') if pinned_artifact else None
         expected_sha256 = self.model_profile.get('artifact_sha256') if pinned_artifact else None
+        part_path = f"{file_path}.part"
+        with contextlib.ExitStack() as stack:
+            try:
+                waited = stack.enter_context(_exclusive_download_lock(f"{part_path}.lock"))
+            except OSError as e:
+                self.log_error(f"Error: Unable to lock partial download: exception_type={type(e).__name__}")
+                return False
+            if waited:
+                self.log_info("Waited for another download of this model to finish.")
+                if (
+                    expected_sha256
+                    and os.path.exists(file_path)
+                    and self._read_artifact_verification_receipt(str(expected_sha256))
+                ):
+                    return True
+            return self._download_file_in_chunks_locked(
+                file_path, url, chunk_size_mb, part_path,
+                expected_size=expected_size, expected_sha256=expected_sha256,
+            )
+
+    def _download_file_in_chunks_locked(
+        self,
+        file_path: str,
+        url: str,
+        chunk_size_mb: int,
+        part_path: str,
+        *,
+        expected_size: Any,
+        expected_sha256: Any,
+    ) -> bool:
+        """Run `download_file_in_chunks` while holding the `.part` lock."""
         chunk_size_bytes = chunk_size_mb * 1024 * 1024  # Convert MB to bytes
+        manifest = self._read_download_manifest(part_path, url, expected_size)
+        if manifest is not None:
+            self.log_info("Resuming ranged model download.")
+            return self._download_ranged_segments(
+                file_path, url, part_path, manifest, chunk_size_bytes,
+                expected_size=expected_size, expected_sha256=expected_sha256,
+            )
         response = None
+        ranged_manifest = None
         tmp_path = f"{file_path}.tmp.{os.getpid()}.{uuid.uuid4().hex}"
 
         try:
@@ -6363,47 +7792,64 @@ class ModelManager:
                 self.log_error("Error: Content-Length header is missing or zero.")
                 return False
 
-            total_size_in_mb = total_size_in_bytes / (1024 * 1024)
-            progress = 0
-            digest = hashlib.sha256()
-            start_time = time.time()
-            times = []
-            bytes_downloaded = []
-
-            with open(tmp_path, 'wb') as file:
-                for data in response.iter_content(chunk_size=chunk_size_bytes):
-                    if not data:
-                        self.log_warning("Warning: Received empty data chunk.")
-                        continue
-
-                    file.write(data)
-                    digest.update(data)
-
-                    elapsed_time = time.time() - start_time
-                    progress += len(data)
-                    times.append(elapsed_time)
-                    bytes_downloaded.append(progress)
-
-                    # Keep only the last 10 seconds of data
-                    times = [t for t in times if elapsed_time - t <= 10]
-                    bytes_downloaded = bytes_downloaded[-len(times):]
-
-                    # Calculate speed and estimated time remaining
-                    elapsed_total = sum(times)
-                    speed = sum(bytes_downloaded) / elapsed_total if elapsed_total > 0 else 0
-                    eta = (total_size_in_bytes - progress) / speed if speed else 0
+            accept_ranges = response.headers.get('accept-ranges')
+            if (
+                isinstance(accept_ranges, str)
+                and accept_ranges.strip().lower() == 'bytes'
+                and total_size_in_bytes > _MODEL_DOWNLOAD_SEGMENT_BYTES
+                and (expected_size is None or total_size_in_bytes == int(expected_size))
+            ):
+                etag = response.headers.get('etag')
+                ranged_manifest = {
+                    'url': url,
+                    'total_size_bytes': total_size_in_bytes,
+                    'segment_bytes': _MODEL_DOWNLOAD_SEGMENT_BYTES,
+                    'etag': etag if isinstance(etag, str) else None,
+                    'completed_segments': [],
+                    'segment_sha256': {},
+                }
+            else:
+                total_size_in_mb = total_size_in_bytes / (1024 * 1024)
+                progress = 0
+                digest = hashlib.sha256()
+                start_time = time.time()
+                times = []
+                bytes_downloaded = []
+
+                with open(tmp_path, 'wb') as file:
+                    for data in response.iter_content(chunk_size=chunk_size_bytes):
+                        if not data:
+                            self.log_warning("Warning: Received empty data chunk.")
+                            continue
 
-                    downloaded_mb = progress / (1024 * 1024)
-                    done = int(50 * progress / total_size_in_bytes)
-                    if not self.config.is_production:
-                        # Progress output is cosmetic and difficult to test
-                        print(
-                            f'\r[{"=" * done}{" " * (50-done)}] {progress * 100 / total_size_in_bytes:.2f}% ({downloaded_mb:.2f}/{total_size_in_mb:.2f} MB) ETA: {eta:.2f}s',
-                            end='\r',
-                            file=sys.stderr,
-                        )  # pragma: no cover
-                file.flush()
-                os.fsync(file.fileno())
+                        file.write(data)
+                        digest.update(data)
+
+                        elapsed_time = time.time() - start_time
+                        progress += len(data)
+                        times.append(elapsed_time)
+                        bytes_downloaded.append(progress)
+
+                        # Keep only the last 10 seconds of data
+                        times = [t for t in times if elapsed_time - t <= 10]
+                        bytes_downloaded = bytes_downloaded[-len(times):]
+
+                        # Calculate speed and estimated time remaining
+                        elapsed_total = sum(times)
+                        speed = sum(bytes_downloaded) / elapsed_total if elapsed_total > 0 else 0
+                        eta = (total_size_in_bytes - progress) / speed if speed else 0
+
+                        downloaded_mb = progress / (1024 * 1024)
+                        done = int(50 * progress / total_size_in_bytes)
+                        if not self.config.is_production:
+                            # Progress output is cosmetic and difficult to test
+                            print(
+                                f'\r[{"=" * done}{" " * (50-done)}] {progress * 100 / total_size_in_bytes:.2f}% ({downloaded_mb:.2f}/{total_size_in_mb:.2f} MB) ETA: {eta:.2f}s',
+                                end='\r',
+                                file=sys.stderr,
+                            )  # pragma: no cover
+                    file.flush()
+                    os.fsync(file.fileno())
         except Exception as e:
             self.log_error(f"Error during file download: {e}")
             self._remove_partial_download(tmp_path)
@@ -6414,6 +7860,32 @@ class ModelManager:
                 if callable(close):
                     close()
 
+        if ranged_manifest is not None:
+            return self._download_ranged_segments(
+                file_path, url, part_path, ranged_manifest, chunk_size_bytes,
+                expected_size=expected_size, expected_sha256=expected_sha256, fresh=True,
+            )
+        return self._finalize_downloaded_artifact(
+            tmp_path,
+            file_path,
+            total_size_in_bytes=total_size_in_bytes,
+            sha256_hex=digest.hexdigest(),
+            expected_size=expected_size,
+            expected_sha256=expected_sha256,
+        )
+
+    def _finalize_downloaded_artifact(
+        self,
+        tmp_path: str,
+        file_path: str,
+        *,
+        total_size_in_bytes: int,
+        sha256_hex: Optional[str],
+        expected_size: Any,
+        expected_sha256: Any,
+        segment_sha256: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """Validate a fully written download and move it into place."""
         actual_size = os.path.getsize(tmp_path) if os.path.exists(tmp_path) else -1
         if expected_size is not None and actual_size != int(expected_size):
             self.log_error("Download failed artifact size validation.")
@@ -6434,7 +7906,7 @@ class ModelManager:
                 self.log_error("Download failed GGUF magic validation.")
                 self._remove_partial_download(tmp_path)
                 return False
-        if expected_sha256 and digest.hexdigest().lower() != str(expected_sha256).lower():
+        if expected_sha256 and str(sha256_hex or '').lower() != str(expected_sha256).lower():
             self.log_error("Download failed SHA-256 validation.")
             self._remove_partial_download(tmp_path)
             return False
@@ -6444,6 +7916,7 @@ class ModelManager:
                 os.replace(tmp_path, file_path)
                 if expected_sha256:
                     self._write_artifact_verification_receipt(str(expected_sha256))
+                    self._record_artifact_segment_manifest(str(expected_sha256), segment_sha256)
                 self.log_info(f"File Size Immediately After Download: {os.path.getsize(file_path)} bytes")
                 return True
             except OSError as e:
@@ -6463,6 +7936,217 @@ class ModelManager:
         except OSError:
             pass
 
+    def _read_download_manifest(self, part_path: str, url: str, expected_size: Any) -> Optional[Dict[str, Any]]:
+        """Return the resumable segment manifest for `part_path`, if it still applies."""
+        try:
+            with open(f"{part_path}.json", 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+            part_size = os.path.getsize(part_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        if not isinstance(manifest, dict) or manifest.get('url') != url:
+            return None
+        total_size = manifest.get('total_size_bytes')
+        segment_bytes = manifest.get('segment_bytes')
+        completed = manifest.get('completed_segments')
+        segment_sha256 = manifest.get('segment_sha256')
+        if (
+            not isinstance(total_size, int) or total_size <= 0 or part_size != total_size
+            or not isinstance(segment_bytes, int) or segment_bytes <= 0
+            or not isinstance(completed, list) or not isinstance(segment_sha256, dict)
+            or (expected_size is not None and total_size != int(expected_size))
+        ):
+            return None
+        segment_count = -(-total_size // segment_bytes)
+        if not all(isinstance(index, int) and 0 <= index < segment_count for index in completed):
+            return None
+        return manifest
+
+    def _write_download_manifest(self, part_path: str, manifest: Dict[str, Any]) -> None:
+        manifest_path = f"{part_path}.json"
+        tmp_manifest = f"{manifest_path}.tmp.{os.getpid()}.{uuid.uuid4().hex}"
+        try:
+            with open(tmp_manifest, 'w', encoding='utf-8') as manifest_file:
+                json.dump(manifest, manifest_file, sort_keys=True)
+                manifest_file.flush()
+                os.fsync(manifest_file.fileno())
+            os.replace(tmp_manifest, manifest_path)
+        except OSError:
+            self._remove_partial_download(tmp_manifest)
+
+    def _discard_ranged_download(self, part_path: str) -> None:
+        self._remove_partial_download(part_path)
+        self._remove_partial_download(f"{part_path}.json")
+
+    def _fetch_download_segment(
+        self,
+        url: str,
+        part_path: str,
+        manifest: Dict[str, Any],
+        index: int,
+        chunk_size_bytes: int,
+    ) -> Tuple[str, Optional[str]]:
+        """Fetch one byte range into the partial file.
+
+        Returns ('ok', segment_sha256), ('failed', None) for a retryable
+        error, or ('stale', None) when the server no longer serves the same
+        ranges of the same file and the partial download must start over.
+        """
+        total_size = manifest['total_size_bytes']
+        start = index * manifest['segment_bytes']
+        end = min(total_size, start + manifest['segment_bytes']) - 1
+        try:
+            response = requests.get(
+                url,
+                headers={'Range': f'bytes={start}-{end}'},
+                stream=True,
+                timeout=self.download_timeout,
+            )
+        except requests.RequestException:
+            return 'failed', None
+        try:
+            if response.status_code in (200, 416):
+                return 'stale', None
+            if response.status_code != 206:
+                return 'failed', None
+            content_range = response.headers.get('content-range')
+            etag = response.headers.get('etag')
+            if content_range != f'bytes {start}-{end}/{total_size}' or (
+                manifest.get('etag') and isinstance(etag, str) and etag != manifest['etag']
+            ):
+                return 'stale', None
+            digest = hashlib.sha256()
+            written = 0
+            with open(part_path, 'r+b') as part_file:
+                part_file.seek(start)
+                for data in response.iter_content(chunk_size=chunk_size_bytes):
+                    part_file.write(data)
+                    digest.update(data)
+                    written += len(data)
+                part_file.flush()
+                os.fsync(part_file.fileno())
+            if written != end - start + 1:
+                return 'failed', None
+            return 'ok', digest.hexdigest()
+        except (requests.RequestException, OSError, ValueError):
+            return 'failed', None
+        finally:
+            close = getattr(response, 'close', None)
+            if callable(close):
+                close()
+
+    def _download_ranged_segments(
+        self,
+        file_path: str,
+        url: str,
+        part_path: str,
+        manifest: Dict[str, Any],
+        chunk_size_bytes: int,
+        *,
+        expected_size: Any,
+        expected_sha256: Any,
+        fresh: bool = False,
+    ) -> bool:
+        """Download the missing segments of `manifest` in parallel, then finalize.
+
+        Completed segments are recorded in the manifest as they land, so an
+        interrupted download keeps its progress. The whole-file SHA-256 is
+        still computed in order, over the contiguous prefix of finished
+        segments, while later segments are downloading.
+        """
+        total_size = manifest['total_size_bytes']
+        segment_bytes = manifest['segment_bytes']
+        segment_count = -(-total_size // segment_bytes)
+        try:
+            if fresh:
+                with open(part_path, 'wb') as part_file:
+                    part_file.truncate(total_size)
+                self._write_download_manifest(part_path, manifest)
+        except OSError as e:
+            self.log_error(f"Error: Unable to create partial download: exception_type={type(e).__name__}")
+            self._discard_ranged_download(part_path)
+            return False
+
+        manifest_lock = Lock()
+        completed = set(manifest['completed_segments'])
+        pending = [index for index in range(segment_count) if index not in completed]
+        connections = max(1, int(getattr(self, 'download_connections', 4) or 1))
+        digest = hashlib.sha256() if expected_sha256 else None
+        hashed_segments = 0
+        outcomes = []
+
+        def _hash_completed_prefix() -> None:
+            nonlocal hashed_segments
+            if digest is None:
+                return
+            while hashed_segments < segment_count:
+                with manifest_lock:
+                    if hashed_segments not in completed:
+                        return
+                with open(part_path, 'rb') as part_file:
+                    part_file.seek(hashed_segments * segment_bytes)
+                    remaining = min(segment_bytes, total_size - hashed_segments * segment_bytes)
+                    while remaining > 0:
+                        data = part_file.read(min(remaining, 1024 * 1024))
+                        if not data:
+                            raise OSError('partial download is shorter than its manifest')
+                        digest.update(data)
+                        remaining -= len(data)
+                hashed_segments += 1
+
+        def _fetch(index: int) -> str:
+            outcome, segment_sha256 = self._fetch_download_segment(
+                url, part_path, manifest, index, chunk_size_bytes
+            )
+            if outcome == 'ok':
+                with manifest_lock:
+                    completed.add(index)
+                    manifest['completed_segments'] = sorted(completed)
+                    manifest['segment_sha256'][str(index)] = segment_sha256
+                    self._write_download_manifest(part_path, manifest)
+            return outcome
+
+        try:
+            _hash_completed_prefix()
+            with ThreadPoolExecutor(max_workers=max(1, min(connections, len(pending)))) as pool:
+                futures = [pool.submit(_fetch, index) for index in pending]
+                for future in as_completed(futures):
+                    outcomes.append(future.result())
+                    _hash_completed_prefix()
+                    if not self.config.is_production:
+                        # Progress output is cosmetic and difficult to test
+                        print(
+                            f'\r{len(completed)}/{segment_count} segments downloaded',
+                            end='\r',
+                            file=sys.stderr,
+                        )  # pragma: no cover
+        except OSError as e:
+            self.log_error(f"Error during ranged download: exception_type={type(e).__name__}")
+            return False
+
+        if 'stale' in outcomes:
+            self.log_error("Download source changed or stopped serving byte ranges; discarding partial download.")
+            self._discard_ranged_download(part_path)
+            return False
+        if len(completed) != segment_count:
+            self.log_error(
+                f"Download interrupted; {len(completed)}/{segment_count} segments kept for resume."
+            )
+            return False
+        finalized = self._finalize_downloaded_artifact(
+            part_path,
+            file_path,
+            total_size_in_bytes=total_size,
+            sha256_hex=digest.hexdigest() if digest is not None else None,
+            expected_size=expected_size,
+            expected_sha256=expected_sha256,
+            segment_sha256=(
+                manifest['segment_sha256'] if segment_bytes == _MODEL_DOWNLOAD_SEGMENT_BYTES else None
+            ),
+        )
+        self._remove_partial_download(f"{part_path}.json")
+        return finalized
+
     def _is_managed_canonical_model_path(self) -> bool:
         return (
             self.profile_id == 'qwen3-8b-q4-k-m'
@@ -6515,7 +8199,157 @@ class ModelManager:
             except OSError:
                 pass
 
+    def _artifact_segment_manifest_path(self) -> str:
+        return f"{self.model_path}.segments.json"
+
+    def _read_artifact_segment_manifest(self, expected_sha256: str) -> Optional[Tuple[int, List[str]]]:
+        """Return (segment_bytes, segment hashes) recorded for the pinned artifact."""
+        try:
+            with open(self._artifact_segment_manifest_path(), 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+            size_bytes = os.path.getsize(self.model_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        if not isinstance(manifest, dict):
+            return None
+        segment_bytes = manifest.get('segment_bytes')
+        segment_sha256 = manifest.get('segment_sha256')
+        if (
+            manifest.get('profile_id') != self.profile_id
+            or manifest.get('artifact_sha256') != str(expected_sha256).lower()
+            or manifest.get('size_bytes') != size_bytes
+            or not isinstance(segment_bytes, int) or segment_bytes <= 0
+            or not isinstance(segment_sha256, list)
+            or len(segment_sha256) != -(-size_bytes // segment_bytes)
+            or not all(isinstance(value, str) for value in segment_sha256)
+        ):
+            return None
+        return segment_bytes, segment_sha256
+
+    def _write_artifact_segment_manifest(self, expected_sha256: str, segment_bytes: int, segment_sha256: List[str]) -> None:
+        """Record per-segment hashes of an artifact whose full SHA-256 just matched."""
+        manifest_path = self._artifact_segment_manifest_path()
+        tmp_manifest = f"{manifest_path}.tmp.{os.getpid()}.{uuid.uuid4().hex}"
+        try:
+            manifest = {
+                'profile_id': self.profile_id,
+                'artifact_sha256': str(expected_sha256).lower(),
+                'size_bytes': os.path.getsize(self.model_path),
+                'segment_bytes': segment_bytes,
+                'segment_sha256': segment_sha256,
+            }
+            with open(tmp_manifest, 'w', encoding='utf-8') as manifest_file:
+                json.dump(manifest, manifest_file, sort_keys=True)
+                manifest_file.flush()
+                os.fsync(manifest_file.fileno())
+            os.replace(tmp_manifest, manifest_path)
+        except OSError:
+            self._remove_partial_download(tmp_manifest)
+
+    def _record_artifact_segment_manifest(
+        self,
+        expected_sha256: str,
+        known_segment_sha256: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Write the segment manifest for a freshly downloaded artifact.
+
+        Hashes already taken while downloading are reused; the rest are read
+        back from the (still cached) file.
+        """
+        segment_bytes = _MODEL_DOWNLOAD_SEGMENT_BYTES
+        known = known_segment_sha256 if isinstance(known_segment_sha256, dict) else {}
+        try:
+            segment_count = -(-os.path.getsize(self.model_path) // segment_bytes)
+            missing = [index for index in range(segment_count) if not isinstance(known.get(str(index)), str)]
+            computed = _hash_file_segments(self.model_path, segment_bytes, missing)
+        except (OSError, ValueError):
+            return
+        self._write_artifact_segment_manifest(
+            expected_sha256,
+            segment_bytes,
+            [computed[index] if index in computed else known[str(index)] for index in range(segment_count)],
+        )
+
+    def _repair_artifact_segments(self, damaged_segments: List[int]) -> bool:
+        """Re-fetch only the damaged segments of the managed artifact.
+
+        The active, standby or pooled workers may have the artifact mapped, so
+        the ranges are written into a copy that replaces it only after its
+        full SHA-256 matches the pinned one. The copy is made under the same
+        ``.part.lock`` as downloads of this artifact.
+        """
+        expected_sha256 = self.model_profile.get('artifact_sha256')
+        if not expected_sha256 or not damaged_segments:
+            return False
+        with contextlib.ExitStack() as stack:
+            try:
+                waited = stack.enter_context(_exclusive_download_lock(f"{self.model_path}.part.lock"))
+            except OSError as e:
+                self.log_error(f"Error: Unable to lock model artifact for repair: exception_type={type(e).__name__}")
+                return False
+            if waited and self._read_artifact_verification_receipt(str(expected_sha256)):
+                return True
+            repair_path = f"{self.model_path}.repair"
+            try:
+                return self._repair_artifact_segments_locked(str(expected_sha256), damaged_segments, repair_path)
+            finally:
+                self._remove_partial_download(repair_path)
+
+    def _repair_artifact_segments_locked(self, expected_sha256: str, damaged_segments: List[int], repair_path: str) -> bool:
+        segment_manifest = self._read_artifact_segment_manifest(expected_sha256)
+        if segment_manifest is None:
+            return False
+        segment_bytes, segment_sha256 = segment_manifest
+        try:
+            size_bytes = os.path.getsize(self.model_path)
+            shutil.copyfile(self.model_path, repair_path)
+        except OSError as e:
+            self.log_error(f"Error: Unable to copy model artifact for repair: exception_type={type(e).__name__}")
+            return False
+        range_manifest = {'total_size_bytes': size_bytes, 'segment_bytes': segment_bytes, 'etag': None}
+        chunk_size_bytes = self.chunk_size_mb * 1024 * 1024
+        connections = max(1, int(getattr(self, 'download_connections', 4) or 1))
+        self.log_warning(
+            f"Managed model artifact has {len(damaged_segments)}/{len(segment_sha256)} damaged segments; "
+            "re-fetching only those ranges."
+        )
+        with ThreadPoolExecutor(max_workers=min(connections, len(damaged_segments))) as pool:
+            results = list(pool.map(
+                lambda index: self._fetch_download_segment(
+                    self.url, repair_path, range_manifest, index, chunk_size_bytes
+                ),
+                damaged_segments,
+            ))
+        for index, (outcome, fetched_sha256) in zip(damaged_segments, results):
+            if outcome != 'ok' or fetched_sha256 != segment_sha256[index]:
+                self.log_error(f"Segment repair failed for segment {index}: outcome={outcome}")
+                return False
+        # segments.json is no more trusted than the receipt, so the repaired
+        # copy must match the pinned whole-file hash before it is used.
+        digest = hashlib.sha256()
+        try:
+            with open(repair_path, 'r+b') as repaired:
+                for chunk in iter(lambda: repaired.read(1024 * 1024), b''):
+                    digest.update(chunk)
+                os.fsync(repaired.fileno())
+        except OSError as e:
+            self.log_error(f"Error: Unable to verify repaired model artifact: exception_type={type(e).__name__}")
+            return False
+        if digest.hexdigest().lower() != expected_sha256.lower():
+            self.log_error("Segment repair failed: repaired artifact does not match the pinned SHA-256")
+            return False
+        try:
+            # Workers that mapped the old file keep its inode until they exit.
+            os.replace(repair_path, self.model_path)
+        except OSError as e:
+            self.log_error(f"Error: Unable to replace repaired model artifact: exception_type={type(e).__name__}")
+            return False
+        self._write_artifact_verification_receipt(expected_sha256)
+        self.damaged_artifact_segments = []
+        return True
+
     def _validate_existing_model_artifact(self, *, hash_if_suspect: bool = False) -> tuple[bool, str]:
+        self.damaged_artifact_segments = []
         if not os.path.exists(self.model_path):
             return False, 'missing'
         expected_size = self.model_profile.get('artifact_size_bytes')
@@ -6533,14 +8367,45 @@ class ModelManager:
                     and expected_sha256
                     and (hash_if_suspect or not self._read_artifact_verification_receipt(str(expected_sha256)))
                 )
-                if needs_checksum:
+                segment_manifest = (
+                    self._read_artifact_segment_manifest(str(expected_sha256)) if needs_checksum else None
+                )
+                if segment_manifest is not None:
+                    # The manifest was taken from a file whose full SHA-256
+                    # matched, so matching every segment is equivalent - and
+                    # the segments can be hashed in parallel.
+                    segment_bytes, segment_sha256 = segment_manifest
+                    actual = _hash_file_segments(self.model_path, segment_bytes)
+                    self.damaged_artifact_segments = [
+                        index for index, expected in enumerate(segment_sha256)
+                        if actual.get(index) != expected
+                    ]
+                    if self.damaged_artifact_segments:
+                        return False, 'checksum_mismatch'
+                    self._write_artifact_verification_receipt(str(expected_sha256))
+                elif needs_checksum:
                     file.seek(0)
                     digest = hashlib.sha256()
-                    for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    segment_bytes = _MODEL_DOWNLOAD_SEGMENT_BYTES
+                    segment_digest = hashlib.sha256()
+                    segment_filled = 0
+                    segment_sha256 = []
+                    # Reads never straddle a segment boundary, so the same
+                    # pass also yields the segment manifest.
+                    for chunk in iter(lambda: file.read(min(1024 * 1024, segment_bytes - segment_filled)), b''):
                         digest.update(chunk)
+                        segment_digest.update(chunk)
+                        segment_filled += len(chunk)
+                        if segment_filled == segment_bytes:
+                            segment_sha256.append(segment_digest.hexdigest())
+                            segment_digest = hashlib.sha256()
+                            segment_filled = 0
+                    if segment_filled:
+                        segment_sha256.append(segment_digest.hexdigest())
                     if digest.hexdigest().lower() != str(expected_sha256).lower():
                         return False, 'checksum_mismatch'
                     self._write_artifact_verification_receipt(str(expected_sha256))
+                    self._write_artifact_segment_manifest(str(expected_sha256), segment_bytes, segment_sha256)
         except OSError:
             return False, 'unavailable'
         return True, 'valid'
@@ -6581,6 +8446,10 @@ class ModelManager:
             self.log_info(f"Model file {self.file_name} already exists.")
             return True
         if self._is_managed_canonical_model_path():
+            damaged_segments = list(getattr(self, 'damaged_artifact_segments', None) or [])
+            if reason == 'checksum_mismatch' and damaged_segments and self._repair_artifact_segments(damaged_segments):
+                self.log_info("Repaired damaged model artifact segments.")
+                return True
             self.log_warning(f"Managed model artifact invalid ({reason}); attempting one bounded repair download.")
             if self.download_file_in_chunks(self.model_path, self.url, self.chunk_size_mb):
                 return True
@@ -6773,6 +8642,9 @@ class ModelManager:
                     # block replacement until that generation's cleanup succeeds.
                     if self._cleanup_barrier_generation is not None:
                         return None
+                    promoted = self._promote_hot_standby_locked()
+                    if promoted is not None:
+                        return promoted
                     if not os.path.exists(self.model_path):
                         self.log_error("Error: Model file does not exist. LLM not initialized.")
                         return None
@@ -6792,6 +8664,7 @@ class ModelManager:
                             )
                             Llama = llama_cpp.Llama
 
+                            model_prefetch = self._start_model_prefetch()
                             self.log_info("Selecting compute plan for model initialization...")
                             compute_plan = self._resolve_compute_plan()
                             self.log_info(
@@ -6871,6 +8744,7 @@ class ModelManager:
                             llm_instance = None
                             runtime_kwargs = {}
                             runtime_profile_cursor = 0
+                            worker_init_started = time.monotonic()
                             while runtime_profile_cursor < len(runtime_profiles):
                                 runtime_profile = runtime_profiles[runtime_profile_cursor]
                                 runtime_kwargs = self._runtime_init_kwargs(Llama, n_gpu_layers, llama_cpp, runtime_profile)
@@ -7097,6 +8971,13 @@ class ModelManager:
                                 compute_plan['llama_cpp_child_capability_reprobe_skipped_reason'] = yarn_diagnostics.get('child_probe_reprobe_skipped_reason')
                                 compute_plan['llama_cpp_constructor_signature_inspectable'] = yarn_diagnostics.get('constructor_signature_inspectable')
                                 compute_plan['llama_cpp_qwen_64k_yarn_support'] = yarn_diagnostics.get('support_classification')
+                            compute_plan['worker_init_ms'] = int((time.monotonic() - worker_init_started) * 1000)
+                            compute_plan['model_mlock_requested'] = bool(runtime_kwargs.get('use_mlock'))
+                            compute_plan['model_prefetch_enabled'] = model_prefetch is not None
+                            if model_prefetch is not None:
+                                # The prefetch usually outlives worker init; it
+                                # fills in its timing here once it finishes.
+                                model_prefetch.publish_to(compute_plan)
                             self.last_compute_diagnostics = compute_plan
                             if compute_plan['requested_mode'] == 'cpu':
                                 runtime_identity = {
@@ -7123,6 +9004,7 @@ class ModelManager:
                             self.last_worker_error_code = None
                             self.last_worker_exit_code = None
                             self.log_info("desktop.llama_cpp_worker.initialized event=worker_initialization worker_state=ready worker_generation=%s worker_restart_count=%s" % (self._llm_generation, self.worker_restart_count))
+                            self._record_hot_standby_recipe(Llama, runtime_kwargs, compute_plan, llm_instance)
                             self.log_info("Llama init completed successfully.")
                             self.log_info("Llama model initialized successfully.")
                         except Exception as e:
@@ -7249,6 +9131,7 @@ class ModelManager:
                     if isinstance(next_diagnostics, dict):
                         next_diagnostics['fallback_reason'] = fallback_reason
         self._close_llm_proxy(failed_runtime)
+        self._discard_hot_standby()
         if exhausted:
             return None
         return self.get_llm_instance()
@@ -7291,6 +9174,7 @@ class ModelManager:
                 }
                 self._qwen_64k_first_readiness_failure_diagnostics.setdefault('category', category)
         self._close_llm_proxy(failed_runtime)
+        self._discard_hot_standby()
 
 
     def cancellation_generation_snapshot(self) -> tuple[int, threading.Event, int]:
@@ -7314,6 +9198,22 @@ class ModelManager:
                 or (self._llm_generation != generation and cancel_event.is_set())
             )
 
+    def cancel_batched_request(self, request_id: str) -> bool:
+        """Cancel one request on a batching worker without restarting it.
+
+        Returns True only when the worker dropped the request's sequence; any
+        other outcome leaves recovery to terminate_active_worker_for_cancellation.
+        """
+        with self.llm_lock:
+            llm = self.llm
+        cancel = getattr(llm, 'cancel_request', None)
+        if not callable(cancel):
+            return False
+        try:
+            return cancel(request_id) is True
+        except Exception:
+            return False
+
     def terminate_active_worker_for_cancellation(self, *, reason: str = 'cancelled', recreate: bool = True, fatal_callback: Optional[Callable] = None) -> bool:
         """Terminate the active subprocess-backed llama worker and require clean recreation."""
         safe_reason = reason if isinstance(reason, str) and re.fullmatch(r'[A-Za-z0-9_.:-]{1,64}', reason) else 'cancelled'
@@ -7374,6 +9274,151 @@ class ModelManager:
             self.log_warning("desktop.llama_cpp_worker.recreation_after_cancellation_failed safe_error_code=%s" % safe_reason)
             return False
 
+    def unload_worker(self) -> bool:
+        """Stop an idle worker to release its memory; the next request loads it again.
+
+        Unlike a cancellation this is not a failure: no restart is counted and
+        the worker state returns to 'stopped'.
+        """
+        self._discard_hot_standby()
+        with self.llm_lock:
+            llm = self.llm
+            if llm is None:
+                return True
+            cleanup_gen = self._llm_generation
+            self.llm = None
+            self._llm_generation += 1
+            self._cleanup_barrier_generation = cleanup_gen
+        stopped = self._close_llm_proxy(llm, terminate_process=True)
+        with self.llm_lock:
+            if self._cleanup_barrier_generation == cleanup_gen:
+                if stopped:
+                    self._cleanup_barrier_generation = None
+                    self.worker_state = 'stopped'
+                else:
+                    self.worker_state = 'failed'
+        self.log_info("desktop.llama_cpp_worker.unloaded stopped=%s" % stopped)
+        return stopped
+
+    def _start_model_prefetch(self) -> Optional[_ModelPagePrefetch]:
+        """Start reading the model into the page cache if prefetch is enabled.
+
+        Runs alongside compute-plan selection and worker start-up; it never
+        delays initialization and a failed read only shows up in diagnostics.
+        """
+        if not _model_prefetch_enabled() or not os.path.isfile(self.model_path):
+            return None
+        self.log_info("desktop.llama_cpp_worker.model_prefetch_started")
+        return _ModelPagePrefetch(self.model_path).start()
+
+    def _record_hot_standby_recipe(self, factory: Any, runtime_kwargs: Dict[str, Any], compute_plan: Dict[str, Any], llm_instance: Any) -> None:
+        """Remember how the ready worker was built and start warming its standby.
+
+        Called with `llm_lock` held. Only subprocess workers get a standby:
+        it is a second worker process with its own copy of the model.
+        """
+        if not _hot_standby_worker_enabled() or not isinstance(llm_instance, _SubprocessLlamaProxy):
+            return
+        memory_profile = getattr(self, 'last_qwen_64k_memory_profile_diagnostics', None)
+        memory_estimate = memory_profile.get('memory_estimate') if isinstance(memory_profile, dict) else None
+        try:
+            required_bytes = os.path.getsize(self.model_path)
+        except OSError:
+            required_bytes = 0
+        if isinstance(memory_estimate, dict):
+            required_bytes = max(required_bytes, int(memory_estimate.get('estimated_total_runtime_bytes') or 0))
+        self._hot_standby_recipe = {
+            'factory': factory,
+            'kwargs': dict(runtime_kwargs),
+            'compute_plan': dict(compute_plan),
+            'required_bytes': required_bytes,
+            'gpu_offload': int(compute_plan.get('n_gpu_layers') or 0) != 0,
+        }
+        self._schedule_hot_standby_locked()
+
+    def _schedule_hot_standby_locked(self) -> None:
+        recipe = getattr(self, '_hot_standby_recipe', None)
+        if recipe is None or getattr(self, '_hot_standby_llm', None) is not None or getattr(self, '_hot_standby_warming', False):
+            return
+        self._hot_standby_warming = True
+        threading.Thread(
+            target=self._warm_hot_standby, args=(recipe,), name='llama_cpp_hot_standby', daemon=True
+        ).start()
+
+    def _hot_standby_fits(self, recipe: Dict[str, Any]) -> bool:
+        # Measured after the active worker has loaded, so available memory
+        # already excludes it.
+        required_bytes = recipe['required_bytes']
+        if not resource_monitor.can_allocate_system_memory(required_bytes, headroom_percent=self.gpu_headroom_percent):
+            return False
+        if recipe['gpu_offload'] and self.enforce_gpu_headroom:
+            return resource_monitor.can_allocate_gpu_memory(required_bytes, headroom_percent=self.gpu_headroom_percent)
+        return True
+
+    def _warm_hot_standby(self, recipe: Dict[str, Any]) -> None:
+        started = time.monotonic()
+        standby = None
+        fits = self._hot_standby_fits(recipe)
+        if fits:
+            try:
+                standby = recipe['factory'](**recipe['kwargs'])
+            except Exception as exc:
+                self.log_warning(
+                    "desktop.llama_cpp_worker.hot_standby_failed safe_error_code=%s" % _safe_worker_error_code(exc)
+                )
+        warm_ms = int((time.monotonic() - started) * 1000)
+        with self.llm_lock:
+            self._hot_standby_warming = False
+            if not fits:
+                self.hot_standby_memory_skips += 1
+            if standby is not None and self._hot_standby_recipe is recipe:
+                self._hot_standby_llm = standby
+                self.hot_standby_last_warm_ms = warm_ms
+                standby = None
+        if standby is not None:
+            # The recipe changed while this worker loaded.
+            self._close_llm_proxy(standby, terminate_process=True)
+        elif fits:
+            self.log_info("desktop.llama_cpp_worker.hot_standby_ready warm_ms=%s" % warm_ms)
+        else:
+            self.log_warning("desktop.llama_cpp_worker.hot_standby_skipped reason=insufficient_memory")
+
+    def _promote_hot_standby_locked(self) -> Any:
+        """Make the standby worker current; called with `llm_lock` held and no active worker."""
+        standby = getattr(self, '_hot_standby_llm', None)
+        if standby is None:
+            return None
+        self._hot_standby_llm = None
+        if not self._llm_is_usable(standby):
+            threading.Thread(
+                target=self._close_llm_proxy, args=(standby,), kwargs={'terminate_process': True},
+                name='llama_cpp_hot_standby_close', daemon=True,
+            ).start()
+            return None
+        self.llm = standby
+        self.child_model_path_exists = bool(getattr(standby, 'child_model_path_exists', False))
+        self.last_compute_diagnostics = dict(self._hot_standby_recipe['compute_plan'])
+        self.last_runtime_init_error = None
+        self.worker_state = 'ready'
+        self.last_worker_error_code = None
+        self.last_worker_exit_code = None
+        self.hot_standby_promotions += 1
+        self.log_info(
+            "desktop.llama_cpp_worker.hot_standby_promoted worker_generation=%s hot_standby_promotions=%s"
+            % (self._llm_generation, self.hot_standby_promotions)
+        )
+        self._schedule_hot_standby_locked()
+        return standby
+
+    def _discard_hot_standby(self) -> None:
+        """Drop the standby and its recipe once the runtime profile changes."""
+        with self.llm_lock:
+            standby = getattr(self, '_hot_standby_llm', None)
+            self._hot_standby_llm = None
+            self._hot_standby_recipe = None
+        if standby is not None:
+            self._close_llm_proxy(standby, terminate_process=True)
+
     def _close_llm_proxy(self, llm: Any, *, terminate_process: bool = False, fatal_callback: Optional[Callable] = None) -> bool:
         cleanup_started_at = time.monotonic()
         process = getattr(llm, '_process', None)
@@ -7537,9 +9582,19 @@ class ModelManager:
             last_exit_code = self.last_worker_exit_code
             last_restart_at_ms = self.last_worker_restart_at_ms
             last_eval_return_code = self.last_plain_completion_eval_return_code
+            hot_standby_ready = getattr(self, '_hot_standby_llm', None) is not None
+            hot_standby_promotions = getattr(self, 'hot_standby_promotions', 0)
+            hot_standby_memory_skips = getattr(self, 'hot_standby_memory_skips', 0)
+            hot_standby_last_warm_ms = getattr(self, 'hot_standby_last_warm_ms', None)
         alive = self._llm_is_usable(llm) if llm is not None else False
         if llm is None and state not in {'failed', 'recovering', 'starting'}:
             state = 'stopped'
+        first_token_ms = getattr(llm, 'first_token_ms', None)
+        prefix_cache = getattr(llm, 'prefix_cache_stats', None)
+        if not isinstance(prefix_cache, dict):
+            prefix_cache = {}
+        lookups = int(prefix_cache.get('lookups', 0) or 0)
+        hits = int(prefix_cache.get('hits', 0) or 0)
         return {
             'worker_state': state,
             'worker_generation': generation,
@@ -7549,6 +9604,26 @@ class ModelManager:
             'last_worker_exit_code': last_exit_code,
             'last_worker_restart_at_ms': last_restart_at_ms,
             'last_plain_completion_eval_return_code': last_eval_return_code,
+            'worker_first_token_ms': first_token_ms if isinstance(first_token_ms, int) else None,
+            # Counters of the current worker's prompt-prefix KV cache; they
+            # start over with each worker generation.
+            'prefix_cache_enabled': bool(prefix_cache),
+            'prefix_cache_lookups': lookups,
+            'prefix_cache_hits': hits,
+            'prefix_cache_hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'prefix_cache_tokens_saved': int(prefix_cache.get('tokens_saved', 0) or 0),
+            'prefix_cache_evictions': int(prefix_cache.get('evictions', 0) or 0),
+            'prefix_cache_entries': int(prefix_cache.get('entries', 0) or 0),
+            'prefix_cache_bytes': int(prefix_cache.get('bytes', 0) or 0),
+            'prefix_cache_disk_hits': int(prefix_cache.get('disk_hits', 0) or 0),
+            'prefix_cache_disk_evictions': int(prefix_cache.get('disk_evictions', 0) or 0),
+            'prefix_cache_disk_entries': int(prefix_cache.get('disk_entries', 0) or 0),
+            'prefix_cache_disk_bytes': int(prefix_cache.get('disk_bytes', 0) or 0),
+            'hot_standby_enabled': _hot_standby_worker_enabled(),
+            'hot_standby_ready': hot_standby_ready,
+            'hot_standby_promotions': hot_standby_promotions,
+            'hot_standby_memory_skips': hot_standby_memory_skips,
+            'hot_standby_last_warm_ms': hot_standby_last_warm_ms,
         }
 
     def _invalidate_llm_if_current(self, failed_llm: Any, error: Any = None) -> int:
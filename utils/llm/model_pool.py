@@ -0,0 +1,282 @@
+"""Demand-driven residency for several model profiles on one compute node.
+
+A compute node normally serves the single profile its ``ModelManager`` was
+configured with.  A :class:`ModelPool` adds further profiles from
+``MODEL_PROFILES``, each with its own ``ModelManager`` and llama worker, and
+keeps as many of them loaded as a RAM budget allows.  A request for a cold
+model admits it into the budget, evicting idle models least recently used
+first; its worker then loads on the request's own thread.  When every other
+resident model is busy the cold request waits for one to go idle.  Requests
+for warm models only touch the pool's bookkeeping lock, which is never held
+while a worker loads or unloads, so they never wait on another model's load.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.llm.model_profiles import MODEL_PROFILES, ModelProfile, get_model_profile
+from utils.system import resource_monitor
+
+logger = logging.getLogger(__name__)
+
+_POOL_PROFILES_ENV = 'TOKEN_PLACE_MODEL_POOL_PROFILES'
+_POOL_MEMORY_BYTES_ENV = 'TOKEN_PLACE_MODEL_POOL_MEMORY_BYTES'
+# Config keys that select a profile's artifact; pooled profiles always use
+# their own profile values instead of overrides meant for the primary model.
+_PROFILE_ARTIFACT_KEYS = ('model.filename', 'model.url', 'model.canonical_family_url')
+
+
+class _ProfileConfig:
+    """Read-only view of the node config with another model profile selected."""
+
+    def __init__(self, config: Any, profile: ModelProfile) -> None:
+        self._config = config
+        self._overrides: Dict[str, Any] = {
+            'model.profile_id': profile['profile_id'],
+            'model.api_model_id': profile['api_model_id'],
+            'model.context_size': profile['default_context_tokens'],
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._overrides:
+            return self._overrides[key]
+        if key in _PROFILE_ARTIFACT_KEYS:
+            from utils.config_schema import DEFAULT_CONFIG
+
+            return DEFAULT_CONFIG['model'].get(key.split('.', 1)[1], default)
+        return self._config.get(key, default)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._config, name)
+
+
+def _profile_model_manager(primary: Any, profile: ModelProfile) -> Any:
+    """Build a ModelManager for ``profile`` that inherits the primary's settings."""
+    from utils.llm.model_manager import ModelManager
+
+    manager = ModelManager(config=_ProfileConfig(primary.config, profile))
+    for attribute in ('requested_compute_mode', 'default_n_gpu_layers'):
+        if hasattr(primary, attribute):
+            setattr(manager, attribute, getattr(primary, attribute))
+    return manager
+
+
+def _lookup_profile(selection: str) -> Optional[ModelProfile]:
+    """Return the profile named by a profile id or API model id, else None."""
+    normalized = selection.strip().lower()
+    for profile_id, profile in MODEL_PROFILES.items():
+        if normalized in {profile_id.lower(), profile['api_model_id'].lower()}:
+            return get_model_profile(profile_id)
+    return None
+
+
+class _PoolEntry:
+    __slots__ = ('manager', 'in_flight', 'last_used', 'resident', 'unloading')
+
+    def __init__(self, manager: Any, *, resident: bool) -> None:
+        self.manager = manager
+        self.in_flight = 0
+        self.last_used = 0
+        # Admitted into the memory budget: loaded, or loading for a request.
+        self.resident = resident
+        # Set while an eviction stops the worker.
+        self.unloading = False
+
+    def model_ids(self) -> set[str]:
+        return {
+            str(value).strip().lower()
+            for value in (
+                getattr(self.manager, 'api_model_id', None),
+                getattr(self.manager, 'profile_id', None),
+                getattr(self.manager, 'file_name', None),
+            )
+            if value
+        }
+
+
+class ModelPool:
+    """Keep several model profiles resident within a memory budget.
+
+    ``memory_budget_bytes`` bounds the summed GGUF sizes of resident models.
+    Without a budget a cold model is admitted when available system memory
+    covers its size, after evicting idle models as needed.  The primary
+    manager starts resident and may be evicted like any other model.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        profile_ids: List[str],
+        *,
+        memory_budget_bytes: int = 0,
+        manager_factory: Optional[Callable[[Any, ModelProfile], Any]] = None,
+    ) -> None:
+        self.primary = primary
+        self.memory_budget_bytes = max(int(memory_budget_bytes), 0)
+        self.loads = 0
+        self.evictions = 0
+        self.admission_failures = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._clock = itertools.count(1)
+        self._entries: List[_PoolEntry] = [_PoolEntry(primary, resident=True)]
+        factory = manager_factory or _profile_model_manager
+        for selection in profile_ids:
+            profile = _lookup_profile(selection)
+            if profile is None or not profile.get('runnable', False):
+                logger.warning("model_pool.profile_skipped selection=%r", selection)
+                continue
+            if any(profile['profile_id'] == getattr(entry.manager, 'profile_id', None) for entry in self._entries):
+                continue
+            self._entries.append(_PoolEntry(factory(primary, profile), resident=False))
+
+    @classmethod
+    def from_environment(cls, primary: Any) -> Optional['ModelPool']:
+        """Return the pool configured by ``TOKEN_PLACE_MODEL_POOL_PROFILES``, if any.
+
+        The variable lists extra profile ids or API model ids, comma separated;
+        ``TOKEN_PLACE_MODEL_POOL_MEMORY_BYTES`` sets the memory budget.
+        """
+        profile_ids = [item.strip() for item in os.environ.get(_POOL_PROFILES_ENV, '').split(',') if item.strip()]
+        if not profile_ids or primary is None:
+            return None
+        try:
+            memory_budget_bytes = int(os.environ.get(_POOL_MEMORY_BYTES_ENV, '0'))
+        except ValueError:
+            memory_budget_bytes = 0
+        pool = cls(primary, profile_ids, memory_budget_bytes=memory_budget_bytes)
+        return pool if len(pool._entries) > 1 else None
+
+    def _entry_for(self, model_id: Any) -> _PoolEntry:
+        # Ids no pooled profile names (aliases included) stay with the primary.
+        normalized = model_id.strip().lower() if isinstance(model_id, str) else ''
+        for entry in self._entries:
+            if normalized in entry.model_ids():
+                return entry
+        return self._entries[0]
+
+    @staticmethod
+    def _model_bytes(manager: Any) -> int:
+        try:
+            return os.path.getsize(manager.model_path)
+        except (AttributeError, OSError, TypeError):
+            profile = getattr(manager, 'model_profile', None) or {}
+            return int(profile.get('artifact_size_bytes') or 0)
+
+    def model_states(self) -> Dict[str, str]:
+        """Map each servable API model id to 'warm' (loaded) or 'cold'.
+
+        Cold models are only listed when their model file is on disk, since a
+        request must not wait for a multi-gigabyte download.
+        """
+        states: Dict[str, str] = {}
+        for entry in self._entries:
+            model_id = str(getattr(entry.manager, 'api_model_id', '') or '').strip().lower()
+            if not model_id:
+                continue
+            if getattr(entry.manager, 'llm', None) is not None:
+                states[model_id] = 'warm'
+            elif getattr(entry.manager, 'use_mock_llm', False) is True or os.path.exists(
+                str(getattr(entry.manager, 'model_path', ''))
+            ):
+                states[model_id] = 'cold'
+        return states
+
+    def acquire(self, model_id: Any) -> Optional[Any]:
+        """Return the manager serving ``model_id`` and hold it resident.
+
+        Ids that no pooled profile names are served by the primary manager.
+        Returns None only when the model cannot fit even with every other
+        model evicted.  Each manager returned must be handed back through
+        :meth:`release`.
+        """
+        entry = self._entry_for(model_id)
+        with self._lock:
+            entry.in_flight += 1
+            entry.last_used = next(self._clock)
+            if entry.resident:
+                return entry.manager
+        try:
+            admitted = self._admit(entry)
+        except BaseException:
+            self.release(entry.manager)
+            raise
+        if not admitted:
+            self.release(entry.manager)
+            return None
+        return entry.manager
+
+    def release(self, manager: Any) -> None:
+        with self._changed:
+            for entry in self._entries:
+                if entry.manager is manager:
+                    entry.in_flight = max(entry.in_flight - 1, 0)
+                    entry.last_used = next(self._clock)
+            self._changed.notify_all()
+
+    def _fits(self, required_bytes: int, resident_bytes: int) -> bool:
+        if self.memory_budget_bytes:
+            return resident_bytes + required_bytes <= self.memory_budget_bytes
+        return resource_monitor.can_allocate_system_memory(
+            required_bytes, headroom_percent=getattr(self.primary, 'gpu_headroom_percent', 0.1)
+        )
+
+    def _admit(self, entry: _PoolEntry) -> bool:
+        required_bytes = self._model_bytes(entry.manager)
+        while True:
+            with self._changed:
+                victim = self._admit_or_choose_victim_locked(entry, required_bytes)
+                if victim is None:
+                    return entry.resident
+                victim.resident = False
+                victim.unloading = True
+                self.evictions += 1
+            logger.info("model_pool.evicting model=%s", getattr(victim.manager, 'api_model_id', None))
+            try:
+                unload = getattr(victim.manager, 'unload_worker', None)
+                if callable(unload):
+                    unload()
+            finally:
+                with self._changed:
+                    victim.unloading = False
+                    self._changed.notify_all()
+
+    def _admit_or_choose_victim_locked(self, entry: _PoolEntry, required_bytes: int) -> Optional[_PoolEntry]:
+        """Admit ``entry`` or return an idle model to evict first.
+
+        Returns None once ``entry`` is resident, or when it can never fit.
+        Waits while the only candidates are busy or still unloading.
+        """
+        while True:
+            # A model being evicted must finish unloading before it reloads.
+            if entry.resident:
+                return None
+            if entry.unloading:
+                self._changed.wait()
+                continue
+            resident_bytes = sum(self._model_bytes(other.manager) for other in self._entries if other.resident)
+            if self._fits(required_bytes, resident_bytes):
+                entry.resident = True
+                self.loads += 1
+                logger.info(
+                    "model_pool.admitted model=%s required_bytes=%s resident_bytes=%s",
+                    getattr(entry.manager, 'api_model_id', None), required_bytes, resident_bytes,
+                )
+                return None
+            others = [other for other in self._entries if other is not entry and (other.resident or other.unloading)]
+            idle = [other for other in others if other.resident and other.in_flight == 0]
+            if idle:
+                return min(idle, key=lambda other: other.last_used)
+            if not others:
+                self.admission_failures += 1
+                logger.warning(
+                    "model_pool.admission_refused model=%s required_bytes=%s",
+                    getattr(entry.manager, 'api_model_id', None), required_bytes,
+                )
+                return None
+            self._changed.wait()
@@ -16,8 +16,9 @@ import sys
 import threading
 import time
 import tempfile
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
-from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 from pathlib import Path
 
 from utils.processing_result import RelayProcessingResult
@@ -25,6 +26,7 @@ from urllib.parse import urlparse, urlunparse
 
 from utils.networking.http_requests_compat import requests
 from utils.context_profiles import DEFAULT_CONTEXT_TIER, get_context_profile, normalize_context_tier
+from utils.llm.model_pool import ModelPool
 from utils.llm.model_profiles import build_model_aliases
 
 # Configure logging
@@ -46,6 +48,11 @@ _API_V1_CLEANUP_BUDGET_SECONDS = 5.0
 # the control executor thread completes before executor.shutdown(wait=True).
 _API_V1_MAX_CONTROL_TIMEOUT_SECONDS = _API_V1_CLEANUP_BUDGET_SECONDS - 1.0
 _API_V1_PROGRESS_INTERVAL_SECONDS = 1.0
+# The relay rejects capability payloads advertising more than this.
+_API_V1_MAX_CONCURRENCY_LIMIT = 128
+# Work slots share one llama worker; a generation cut short because a sibling
+# slot restarted that worker is run again at most this many times.
+_API_V1_SIBLING_RESTART_RETRIES = 2
 _API_V1_PROGRESS_FIELDS = (
     "phase", "total_prompt_tokens", "cached_prompt_tokens",
     "processed_prompt_tokens", "generated_tokens", "elapsed_ms",
@@ -261,6 +268,77 @@ class _PostApiV1Outcome(NamedTuple):
     suppressed_code: Optional[str] = None
 
 
+class _ThreadScopedAttribute:
+    """Instance attribute whose value belongs to the thread that assigned it.
+
+    Concurrent work slots run one request per thread, so per-request scratch
+    state such as the last runtime-health summary must not leak across slots.
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        scope = instance.__dict__.get("_api_v1_thread_scope")
+        try:
+            return getattr(scope, self._name)
+        except AttributeError:
+            raise AttributeError(self._name) from None
+
+    def __set__(self, instance, value) -> None:
+        scope = instance.__dict__.get("_api_v1_thread_scope")
+        if scope is None:
+            scope = instance.__dict__.setdefault("_api_v1_thread_scope", threading.local())
+        setattr(scope, self._name, value)
+
+
+class _ApiV1WorkSlots:
+    """Bounded pool that runs claimed API v1 requests on up to ``size`` threads."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="api_v1_slot")
+
+    def wait_for_free(self, stopped, *, poll_seconds: float = 0.25) -> int:
+        """Block until a slot is free or ``stopped()`` is true; return the free count."""
+
+        with self._condition:
+            while self._in_use >= self.size and not stopped():
+                self._condition.wait(poll_seconds)
+            return self.size - self._in_use
+
+    def submit(self, fn, *args: Any) -> None:
+        with self._condition:
+            self._in_use += 1
+        try:
+            self._executor.submit(self._run, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+
+    def shutdown(self) -> None:
+        """Wait for every running request to settle."""
+
+        self._executor.shutdown(wait=True)
+
+    def _run(self, fn, *args: Any) -> None:
+        try:
+            fn(*args)
+        except Exception as exc:
+            log_error("API v1 work slot failed: exc_type={}", type(exc).__name__)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify_all()
+
+
 def _is_llama_cpp_inference_request_error(exc: BaseException) -> bool:
     """Return True for request-scoped llama.cpp inference validation failures."""
 
@@ -946,6 +1024,22 @@ def _max_poll_failures_before_stop() -> Optional[int]:
     return None
 
 
+def _api_v1_max_concurrency() -> int:
+    """Return how many API v1 requests a compute node runs at once.
+
+    ``TOKEN_PLACE_API_V1_MAX_CONCURRENCY`` is advertised to the relay as the
+    node's ``max_concurrency`` and sizes the local work-slot pool.
+    """
+    raw_value = os.environ.get("TOKEN_PLACE_API_V1_MAX_CONCURRENCY")
+    if raw_value is None:
+        return 1
+    try:
+        parsed = int(raw_value)
+    except ValueError:
+        return 1
+    return min(max(parsed, 1), _API_V1_MAX_CONCURRENCY_LIMIT)
+
+
 def _normalize_client_public_key_b64(client_public_key_b64: Any) -> Optional[str]:
     """Normalize relay metadata key format for consistent decode/binding checks."""
     if not isinstance(client_public_key_b64, str):
@@ -1094,6 +1188,10 @@ class RelayClient:
         ```
     """
 
+    # Written while generating and read back by the same request's slot.
+    _last_api_v1_runtime_health = _ThreadScopedAttribute()
+    _last_api_v1_invalid_model_output_reason = _ThreadScopedAttribute()
+
     _API_V1_LOCAL_MODEL_ALIASES = build_model_aliases()
     _API_V1_LOCAL_ADAPTER_BASE_MODELS = {}
     _API_V1_ALLOWED_MESSAGE_ROLES = {"system", "user", "assistant"}
@@ -1133,6 +1231,7 @@ class RelayClient:
         *,
         include_configured_servers: bool = True,
         explicit_relay_urls: Optional[Sequence[str]] = None,
+        model_pool: Optional[ModelPool] = None,
     ):
         """
         Initialize the RelayClient.
@@ -1147,11 +1246,14 @@ class RelayClient:
                 and relay cluster-only mode. When False, use only the explicit base relay.
             explicit_relay_urls: Additional explicit relay URLs supplied by the desktop
                 start request. These are included even when configured fallbacks are disabled.
+            model_pool: Optional pool serving extra model profiles next to
+                ``model_manager``; defaults to ``ModelPool.from_environment``.
         """
         self.base_url = base_url
         self.port = port
         self.crypto_manager = crypto_manager
         self.model_manager = model_manager
+        self.model_pool = model_pool if model_pool is not None else ModelPool.from_environment(model_manager)
         self._api_v1_generation_kwarg_cache: Dict[Tuple[Any, ...], Dict[str, Set[str]]] = {}
         self.stop_polling = True  # Flag to control polling loop - starts as True so loop won't run until explicitly started
         self._polling_stopped_by_request = False
@@ -1256,6 +1358,9 @@ class RelayClient:
         self._api_v1_registered_relays: Set[str] = set()
         self._api_v1_last_heartbeat_at: Dict[str, float] = {}
         self._api_v1_relay_wait_hints: Dict[str, Dict[str, Any]] = {}
+        # Envelopes claimed by a batched poll that have not been handed out yet:
+        # (relay_url, received_monotonic, envelope).
+        self._api_v1_claimed_backlog: Deque[Tuple[str, float, Dict[str, Any]]] = deque()
         self._api_v1_control_credentials_by_relay: Dict[str, str] = {}
         self._api_v1_relay_capabilities: Dict[str, Dict[str, bool]] = {}
         self._api_v1_control_credentials_lock = threading.Lock()
@@ -1268,6 +1373,13 @@ class RelayClient:
         self._api_v1_mutation_lock = threading.Condition()
         self._api_v1_mutation_count = 0
         self._api_v1_mutation_latched = False
+        self._api_v1_max_concurrency = _api_v1_max_concurrency()
+        # Requests running on work slots record which relay supplied them here.
+        self._api_v1_request_scope = threading.local()
+        self._api_v1_active_requests = 0
+        self._api_v1_active_requests_lock = threading.Lock()
+        # Worker restarts made by our own supervisors; see _api_v1_generation_cancelled().
+        self._api_v1_supervisor_restarts = 0
 
 
     def _api_v1_start_heartbeat_worker(self) -> None:
@@ -1291,6 +1403,27 @@ class RelayClient:
             self._api_v1_heartbeat_thread = thread
             thread.start()
 
+    def _api_v1_enter_request(self) -> None:
+        """Count one running API v1 request and keep the lease refresher up for it."""
+
+        lock = getattr(self, "_api_v1_active_requests_lock", None)
+        if lock is not None:
+            with lock:
+                self._api_v1_active_requests += 1
+        if getattr(self, "_api_v1_registered_relays", set()):
+            self._api_v1_start_heartbeat_worker()
+
+    def _api_v1_exit_request(self) -> None:
+        """Stop the lease refresher once no API v1 request is running."""
+
+        lock = getattr(self, "_api_v1_active_requests_lock", None)
+        if lock is not None:
+            with lock:
+                self._api_v1_active_requests = max(0, self._api_v1_active_requests - 1)
+                if self._api_v1_active_requests:
+                    return
+        self._api_v1_stop_heartbeat_worker()
+
     def _api_v1_latch_shutdown(self) -> None:
         """Prevent new API v1 polling/heartbeat work without waiting on workers."""
 
@@ -1585,6 +1718,38 @@ class RelayClient:
 
         return tuple(self._relay_urls)
 
+    @property
+    def model_manager(self) -> Any:
+        """Return the manager serving this thread's API v1 request.
+
+        With a model pool attached, an API v1 request runs against the pooled
+        manager for its model; everything else uses the configured manager.
+        """
+
+        scoped = getattr(self.__dict__.get('_api_v1_request_scope'), 'model_manager', None)
+        return scoped if scoped is not None else self.__dict__.get('_model_manager')
+
+    @model_manager.setter
+    def model_manager(self, manager: Any) -> None:
+        self.__dict__['_model_manager'] = manager
+
+    def _api_v1_enter_model_scope(self, model_id: Any) -> None:
+        """Serve this thread's API v1 request from the pooled manager for ``model_id``."""
+
+        pool = getattr(self, 'model_pool', None)
+        scope = getattr(self, '_api_v1_request_scope', None)
+        if pool is None or scope is None:
+            return
+        scope.model_manager = pool.acquire(model_id)
+
+    def _api_v1_exit_model_scope(self) -> None:
+        scope = getattr(self, '_api_v1_request_scope', None)
+        manager = getattr(scope, 'model_manager', None)
+        if manager is None:
+            return
+        scope.model_manager = None
+        self.model_pool.release(manager)
+
     def _auth_headers(self) -> Dict[str, str]:
         """Return authentication headers when a registration token is configured."""
 
@@ -1616,6 +1781,8 @@ class RelayClient:
             self._api_v1_registered_relays.clear()
             self._api_v1_last_heartbeat_at.clear()
             getattr(self, "_api_v1_relay_wait_hints", {}).clear()
+            # The relay settles claims of a torn-down registration itself.
+            getattr(self, "_api_v1_claimed_backlog", deque()).clear()
 
     def start(self):
         """Start the polling loop by setting stop_polling to False."""
@@ -2213,6 +2380,9 @@ class RelayClient:
             }
         else:
             model_ids.update(self._api_v1_catalogue_ids_for_configured_runtime(model_ids))
+        pool = getattr(self, "model_pool", None)
+        if pool is not None:
+            model_ids.update(pool.model_states())
         return sorted(model_id for model_id in model_ids if not model_id.endswith(".gguf"))
 
     def _api_v1_compute_node_capabilities(self) -> Dict[str, Any]:
@@ -2229,7 +2399,7 @@ class RelayClient:
             ).strip().lower()
         if backend_class not in {"cpu", "cuda", "metal", "vulkan", "gpu", "unknown"}:
             backend_class = "unknown"
-        return {
+        capabilities = {
             "api_version": "v1",
             "supported_model_ids": self._api_v1_supported_model_ids(),
             "active_context_tier": profile.profile_id,
@@ -2239,9 +2409,13 @@ class RelayClient:
                 profile.default_output_reservation_tokens,
                 self._API_V1_MAX_TOKENS_LIMIT,
             ),
-            "max_concurrency": 1,
+            "max_concurrency": getattr(self, "_api_v1_max_concurrency", 1),
             "backend_class": backend_class,
         }
+        pool = getattr(self, "model_pool", None)
+        if pool is not None:
+            capabilities["model_residency"] = pool.model_states()
+        return capabilities
 
     @staticmethod
     def _build_api_v1_url(relay_url: str, route: str) -> str:
@@ -2286,8 +2460,12 @@ class RelayClient:
             normalised = float(self._request_timeout)
         return normalised
 
-    def poll_api_v1_encrypted_work(self) -> Dict[str, Any]:
-        """Poll API v1 relay routes for encrypted work with lease-aware registration."""
+    def poll_api_v1_encrypted_work(self, *, max_items: Optional[int] = None) -> Dict[str, Any]:
+        """Poll API v1 relay routes for encrypted work with lease-aware registration.
+
+        ``max_items`` bounds how many envelopes one relay round-trip may claim;
+        it defaults to the advertised ``max_concurrency``.
+        """
 
         stopped_result = {
             'error': 'Relay polling stopped',
@@ -2297,6 +2475,10 @@ class RelayClient:
         if getattr(self, "_polling_stopped_by_request", False):
             return stopped_result
 
+        claimed = self._pop_api_v1_claimed_backlog()
+        if claimed is not None:
+            return claimed
+
         last_error: Optional[Dict[str, Any]] = None
         relay_wait_hints = getattr(self, "_api_v1_relay_wait_hints", {})
         self._api_v1_relay_wait_hints = relay_wait_hints
@@ -2386,10 +2568,12 @@ class RelayClient:
                         self._api_v1_public_key_fingerprint(current_public_key),
                     )
 
+                capabilities = self._api_v1_compute_node_capabilities()
                 request_kwargs: Dict[str, Any] = {
                     'json': {
                         'server_public_key': self.crypto_manager.public_key_b64,
-                        'capabilities': self._api_v1_compute_node_capabilities(),
+                        'capabilities': capabilities,
+                        'max_items': max_items or capabilities.get('max_concurrency', 1),
                     },
                     'timeout': self._api_v1_poll_timeout_seconds(poll_wait),
                 }
@@ -2519,10 +2703,16 @@ class RelayClient:
                     round(next_refresh, 3),
                     self._api_v1_public_key_fingerprint(current_public_key),
                 )
+                batch = payload.pop('batch', None)
+                if isinstance(batch, list):
+                    self._stash_api_v1_claimed_backlog(candidate_url, batch[1:])
+                    if getattr(self, "_api_v1_claimed_backlog", None):
+                        payload['next_ping_in_x_seconds'] = 0
                 log_info(
-                    "API v1 relay poll route=/api/v1/relay/servers/poll api_v1_payload={} request_id={}",
+                    "API v1 relay poll route=/api/v1/relay/servers/poll api_v1_payload={} request_id={} batch_size={}",
                     payload.get('protocol') == 'tokenplace_api_v1_relay_e2ee',
                     payload.get('request_id', 'none'),
+                    len(batch) if isinstance(batch, list) else 1,
                 )
                 return payload
             except Exception as exc:
@@ -2548,6 +2738,47 @@ class RelayClient:
         }
 
 
+    def _stash_api_v1_claimed_backlog(self, relay_url: str, envelopes: List[Any]) -> None:
+        """Keep the rest of a batched claim to hand out from later polls."""
+
+        backlog = getattr(self, "_api_v1_claimed_backlog", None)
+        if backlog is None:
+            backlog = self._api_v1_claimed_backlog = deque()
+        received = time.monotonic()
+        for envelope in envelopes:
+            if isinstance(envelope, dict):
+                backlog.append((relay_url, received, envelope))
+
+    def _pop_api_v1_claimed_backlog(self) -> Optional[Dict[str, Any]]:
+        """Return the next already-claimed envelope, with its deadline hints rebased to now.
+
+        Envelopes whose relay deadline passed while they waited are dropped; the
+        relay expires their claim on its own.
+        """
+
+        backlog = getattr(self, "_api_v1_claimed_backlog", None)
+        while backlog:
+            relay_url, received, envelope = backlog.popleft()
+            elapsed = time.monotonic() - received
+            expired = False
+            for key in ('request_deadline_remaining_seconds', 'request_ttl_seconds'):
+                remaining = self._api_v1_valid_relative_seconds(envelope.get(key))
+                if remaining is None:
+                    continue
+                envelope[key] = remaining - elapsed
+                expired = expired or envelope[key] <= 0
+            if expired:
+                log_warning(
+                    "api_v1.claimed_backlog_expired relay={} request_id={}",
+                    _sanitize_relay_target(relay_url),
+                    envelope.get('request_id', 'none'),
+                )
+                continue
+            self._last_api_v1_work_relay_url = relay_url
+            envelope['next_ping_in_x_seconds'] = 0
+            return envelope
+        return None
+
     @staticmethod
     def _api_v1_valid_relative_seconds(value: Any) -> Optional[float]:
         if isinstance(value, bool):
@@ -2644,7 +2875,25 @@ class RelayClient:
         response_payload = response.json()
         return response_payload if isinstance(response_payload, dict) else {'status': 'unavailable'}
 
+    def _cancel_batched_llama_request(self, request_id: str) -> bool:
+        # A batching worker can drop just this request's sequence; the requests
+        # sharing the worker keep running and no restart is counted.
+        manager = getattr(self, 'model_manager', None)
+        cancel = getattr(manager, 'cancel_batched_request', None)
+        if not callable(cancel):
+            return False
+        try:
+            return cancel(request_id) is True
+        except Exception:
+            return False
+
     def _terminate_current_llama_worker(self, reason: str, *, recreate: bool = True) -> bool:
+        # Counted before the restart so a sibling slot that sees the new
+        # cancellation epoch always sees this restart too.
+        restarts_lock = getattr(self, '_api_v1_active_requests_lock', None)
+        if restarts_lock is not None:
+            with restarts_lock:
+                self._api_v1_supervisor_restarts = getattr(self, '_api_v1_supervisor_restarts', 0) + 1
         manager = getattr(self, 'model_manager', None)
         terminate = getattr(manager, 'terminate_active_worker_for_cancellation', None)
         if callable(terminate):
@@ -2715,15 +2964,31 @@ class RelayClient:
                 pass
             return True
 
+        # The runtime-health summary is thread-scoped; carry the inference
+        # thread's copy back to this supervisor.
+        runtime_health: Dict[str, Any] = {}
+        # The inference thread serves the same pooled model as this request.
+        request_scope = getattr(self, '_api_v1_request_scope', None)
+        request_model_manager = getattr(request_scope, 'model_manager', None)
+
         def _generate() -> Dict[str, Any]:
-            return self._generate_api_v1_response_with_runtime_model(
-                request_id=request_id,
-                model_id=api_v1_request_payload['model'],
-                messages=api_v1_request_payload['messages'],
-                options=dict(api_v1_request_payload['options']),
-                requested_context_tier=api_v1_request_payload['routing']['context_tier'],
-                progress_observer=progress_observer,
-            )
+            if request_model_manager is not None:
+                request_scope.model_manager = request_model_manager
+            try:
+                return self._generate_api_v1_response_with_runtime_model(
+                    request_id=request_id,
+                    model_id=api_v1_request_payload['model'],
+                    messages=api_v1_request_payload['messages'],
+                    options=dict(api_v1_request_payload['options']),
+                    requested_context_tier=api_v1_request_payload['routing']['context_tier'],
+                    progress_observer=progress_observer,
+                )
+            finally:
+                observed_health = getattr(self, "_last_api_v1_runtime_health", {})
+                if isinstance(observed_health, dict):
+                    runtime_health.update(observed_health)
+                if request_model_manager is not None:
+                    request_scope.model_manager = None
 
         executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api_v1_inference')
         control_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api_v1_control') if control_available else None
@@ -2902,7 +3167,12 @@ class RelayClient:
                         'api_v1.worker_terminate_signal elapsed_ms={}',
                         max(0, int((terminate_started_at - supervisor_started_at) * 1000)),
                     )
-                    recovery_succeeded = self._terminate_current_llama_worker(
+                    # An inference failure may have broken the worker itself, and
+                    # an operator stop tears it down regardless.
+                    recovery_succeeded = (
+                        terminal_status not in {'inference_failure', 'operator_stop'}
+                        and self._cancel_batched_llama_request(request_id)
+                    ) or self._terminate_current_llama_worker(
                         terminal_reason, recreate=terminal_status != 'operator_stop'
                     )
                     # `_terminate_current_llama_worker` may recreate a replacement
@@ -2985,9 +3255,6 @@ class RelayClient:
                 executor.shutdown(wait=True, cancel_futures=True)
             if control_executor is not None and control_done:
                 control_executor.shutdown(wait=True, cancel_futures=True)
-        runtime_health = getattr(self, "_last_api_v1_runtime_health", {})
-        if not isinstance(runtime_health, dict):
-            runtime_health = {}
         return _ApiV1SupervisorOutcome(
             response_envelope=future_result,
             runtime_healthy=bool(runtime_health.get("runtime_healthy", True)),
@@ -3005,6 +3272,10 @@ class RelayClient:
     def _api_v1_response_relay_url(self) -> str:
         """Return the relay URL that supplied the current API v1 work item."""
 
+        scope = getattr(self, "_api_v1_request_scope", None)
+        scoped_relay_url = getattr(scope, "relay_url", None)
+        if scoped_relay_url:
+            return scoped_relay_url
         return self._last_api_v1_work_relay_url or self.relay_url
 
     @staticmethod
@@ -3037,6 +3308,84 @@ class RelayClient:
             "api_v1_response": api_v1_response,
         }
 
+    def _api_v1_cancel_snapshot(self) -> Optional[Tuple[Any, ...]]:
+        snapshot_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_snapshot', None)
+        if not callable(snapshot_fn):
+            return None
+        candidate_snapshot = snapshot_fn()
+        # Accept both 2-part (generation, event) legacy shapes and
+        # the current 3-part (generation, event, epoch) shape; the
+        # token is forwarded opaquely to cancellation_generation_cancelled().
+        if (
+            isinstance(candidate_snapshot, tuple)
+            and len(candidate_snapshot) >= 2
+            and hasattr(candidate_snapshot[1], 'is_set')
+        ):
+            return candidate_snapshot
+        return None
+
+    def _api_v1_sibling_restart_interrupted(
+        self,
+        supervisor_outcome: _ApiV1SupervisorOutcome,
+        cancel_snapshot: Optional[Tuple[Any, ...]],
+        *,
+        deadline: float,
+    ) -> bool:
+        """Return whether a sibling slot's worker restart failed this generation.
+
+        The restart only replaced the shared worker: this request was neither
+        cancelled nor expired, so its slot runs the generation again instead of
+        answering the client with the sibling's failure.
+        """
+
+        response_envelope = supervisor_outcome.response_envelope
+        if response_envelope is None or cancel_snapshot is None or len(cancel_snapshot) < 3:
+            return False
+        api_v1_response = response_envelope.get("api_v1_response", {})
+        error = api_v1_response.get("error") if isinstance(api_v1_response, dict) else None
+        if not isinstance(error, dict) or error.get("code") not in {
+            "compute_node_internal_error",
+            "compute_node_process_failed",
+        }:
+            return False
+        if (
+            getattr(self, "_api_v1_mutation_latched", False)
+            or getattr(self, '_polling_stopped_by_request', False)
+            or time.monotonic() >= deadline
+        ):
+            return False
+        restarts_at_start = getattr(getattr(self, '_api_v1_request_scope', None), 'restarts_at_start', None)
+        snapshot_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_snapshot', None)
+        if restarts_at_start is None or not callable(snapshot_fn):
+            return False
+        try:
+            epochs_elapsed = int(snapshot_fn()[2]) - int(cancel_snapshot[2])
+        except Exception:
+            return False
+        return epochs_elapsed > 0 and not self._api_v1_generation_cancelled(cancel_snapshot)
+
+    def _api_v1_generation_cancelled(self, cancel_snapshot: Optional[Tuple[Any, ...]]) -> bool:
+        """Return whether the request that took ``cancel_snapshot`` was cancelled.
+
+        Work slots share one llama worker, so a restart made by a sibling
+        slot's supervisor also moves the cancellation epoch.  That replaces the
+        generation without cancelling this request; the slot records the
+        restart count next to its snapshot so those restarts can be told apart.
+        """
+
+        cancelled_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_cancelled', None)
+        if cancel_snapshot is None or not callable(cancelled_fn) or cancelled_fn(cancel_snapshot) is not True:
+            return False
+        restarts_at_start = getattr(getattr(self, '_api_v1_request_scope', None), 'restarts_at_start', None)
+        snapshot_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_snapshot', None)
+        if restarts_at_start is None or not callable(snapshot_fn) or len(cancel_snapshot) < 3:
+            return True
+        try:
+            epochs_elapsed = int(snapshot_fn()[2]) - int(cancel_snapshot[2])
+        except Exception:
+            return True
+        return epochs_elapsed > getattr(self, '_api_v1_supervisor_restarts', 0) - restarts_at_start
+
     def _post_api_v1_response(
         self,
         response_envelope: Dict[str, Any],
@@ -3102,12 +3451,7 @@ class RelayClient:
                 "/relay/responses",
             )
             relay_target = _sanitize_relay_target(response_relay_url)
-            cancelled_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_cancelled', None)
-            request_cancelled = bool(
-                cancel_snapshot is not None
-                and callable(cancelled_fn)
-                and cancelled_fn(cancel_snapshot) is True
-            )
+            request_cancelled = self._api_v1_generation_cancelled(cancel_snapshot)
             operator_stopped = getattr(self, '_polling_stopped_by_request', False)
             deadline_expired = local_deadline is not None and time.monotonic() >= local_deadline
             if operator_stopped or deadline_expired or request_cancelled:
@@ -5514,22 +5858,9 @@ class RelayClient:
                 client_pub_key_b64,
             )
             if api_v1_request_payload is not None:
+                self._api_v1_enter_request()
                 try:
-                    cancel_snapshot = None
-                    snapshot_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_snapshot', None)
-                    if callable(snapshot_fn):
-                        candidate_snapshot = snapshot_fn()
-                        # Accept both 2-part (generation, event) legacy shapes and
-                        # the current 3-part (generation, event, epoch) shape; the
-                        # token is forwarded opaquely to cancellation_generation_cancelled().
-                        if (
-                            isinstance(candidate_snapshot, tuple)
-                            and len(candidate_snapshot) >= 2
-                            and hasattr(candidate_snapshot[1], 'is_set')
-                        ):
-                            cancel_snapshot = candidate_snapshot
-                    if getattr(self, "_api_v1_registered_relays", set()):
-                        self._api_v1_start_heartbeat_worker()
+                    self._api_v1_enter_model_scope(api_v1_request_payload['model'])
                     progress_publisher = None
                     progress_relay_url = self._api_v1_response_relay_url()
                     with self._api_v1_control_credentials_lock:
@@ -5547,11 +5878,25 @@ class RelayClient:
                             progress_publisher.submit(event)
 
                     try:
-                        supervisor_outcome = self._supervise_api_v1_inference(
-                            api_v1_request_payload,
-                            local_deadline=outer_api_v1_deadline,
-                            progress_observer=request_progress_observer,
-                        )
+                        for attempt in range(_API_V1_SIBLING_RESTART_RETRIES + 1):
+                            cancel_snapshot = self._api_v1_cancel_snapshot()
+                            supervisor_outcome = self._supervise_api_v1_inference(
+                                api_v1_request_payload,
+                                local_deadline=outer_api_v1_deadline,
+                                progress_observer=request_progress_observer,
+                            )
+                            if attempt == _API_V1_SIBLING_RESTART_RETRIES or not self._api_v1_sibling_restart_interrupted(
+                                supervisor_outcome, cancel_snapshot, deadline=outer_api_v1_deadline
+                            ):
+                                break
+                            log_info(
+                                'api_v1.generation_retry_after_sibling_restart request_id={} attempt={}',
+                                api_v1_request_payload['request_id'],
+                                attempt + 1,
+                            )
+                            scope = self._api_v1_request_scope
+                            with self._api_v1_active_requests_lock:
+                                scope.restarts_at_start = self._api_v1_supervisor_restarts
                     finally:
                         if progress_publisher is not None:
                             progress_publisher.stop()
@@ -5577,12 +5922,7 @@ class RelayClient:
                         "compute_node_process_failed",
                     }:
                         runtime_healthy = True
-                    cancelled_fn = getattr(getattr(self, 'model_manager', None), 'cancellation_generation_cancelled', None)
-                    request_cancelled = bool(
-                        cancel_snapshot is not None
-                        and callable(cancelled_fn)
-                        and cancelled_fn(cancel_snapshot) is True
-                    )
+                    request_cancelled = self._api_v1_generation_cancelled(cancel_snapshot)
                     shutdown_latched = getattr(self, "_api_v1_mutation_latched", False)
                     operator_stopped = getattr(self, '_polling_stopped_by_request', False)
                     deadline_expired = time.monotonic() >= outer_api_v1_deadline
@@ -5659,7 +5999,8 @@ class RelayClient:
                         recovery_succeeded=recovery_succeeded,
                     )
                 finally:
-                    self._api_v1_stop_heartbeat_worker()
+                    self._api_v1_exit_model_scope()
+                    self._api_v1_exit_request()
 
             chat_history = _extract_chat_history_and_validate_key_binding(
                 decrypted_chat_history,
@@ -5793,58 +6134,100 @@ class RelayClient:
         return normalised_wait
 
     def poll_api_v1_encrypted_work_continuously(self):  # pragma: no cover
-        """Continuously poll API v1 E2EE relay routes and process encrypted work."""
+        """Continuously poll API v1 E2EE relay routes and process encrypted work.
+
+        With ``max_concurrency`` above one, claimed requests run on a bounded
+        pool of work slots and the loop only claims as many envelopes as there
+        are free slots.
+        """
 
         self.start()
         consecutive_failures = 0
         max_failures = _max_poll_failures_before_stop()
-        log_info("Starting API v1 E2EE relay polling loop")
-        while not self.stop_polling:
-            try:
-                relay_response = self.poll_api_v1_encrypted_work()
-                if not isinstance(relay_response, dict):
+        slot_count = getattr(self, "_api_v1_max_concurrency", 1)
+        work_slots = _ApiV1WorkSlots(slot_count) if slot_count > 1 else None
+        log_info("Starting API v1 E2EE relay polling loop work_slots={}", slot_count)
+        if work_slots is not None:
+            # Hold one request reference for the pool's lifetime so the lease
+            # refresher keeps running while every slot is busy.
+            self._api_v1_enter_request()
+        try:
+            while not self.stop_polling:
+                try:
+                    if work_slots is not None:
+                        free_slots = work_slots.wait_for_free(lambda: self.stop_polling)
+                        if self.stop_polling:
+                            break
+                        relay_response = self.poll_api_v1_encrypted_work(max_items=free_slots)
+                    else:
+                        relay_response = self.poll_api_v1_encrypted_work()
+                    if not isinstance(relay_response, dict):
+                        consecutive_failures += 1
+                        if max_failures is not None and consecutive_failures >= max_failures:
+                            log_error(
+                                "Stopping API v1 E2EE relay polling after {} consecutive invalid responses.",
+                                consecutive_failures,
+                            )
+                            self.stop_polling = True
+                            break
+                        time.sleep(self._request_timeout)
+                        continue
+
+                    wait_seconds = relay_response.get('next_ping_in_x_seconds', self._request_timeout)
+                    wait_seconds = self._normalise_poll_wait_seconds(wait_seconds)
+                    relay_error = relay_response.get('error')
+                    if relay_error:
+                        consecutive_failures += 1
+                        log_error("Error from API v1 E2EE relay poll: {}", relay_error)
+                        if max_failures is not None and consecutive_failures >= max_failures:
+                            log_error(
+                                "Stopping API v1 E2EE relay polling after {} consecutive relay errors.",
+                                consecutive_failures,
+                            )
+                            self.stop_polling = True
+                            break
+                        time.sleep(wait_seconds)
+                        continue
+
+                    consecutive_failures = 0
+                    if relay_response.get('protocol') == 'tokenplace_api_v1_relay_e2ee':
+                        if work_slots is not None:
+                            work_slots.submit(
+                                self._process_api_v1_request_on_slot,
+                                relay_response,
+                                self._api_v1_response_relay_url(),
+                            )
+                            continue
+                        self.process_client_request(relay_response)
+                    time.sleep(wait_seconds)
+                except Exception as e:
                     consecutive_failures += 1
+                    log_error("Exception during API v1 E2EE polling loop: {}", str(e), exc_info=True)
                     if max_failures is not None and consecutive_failures >= max_failures:
                         log_error(
-                            "Stopping API v1 E2EE relay polling after {} consecutive invalid responses.",
+                            "Stopping API v1 E2EE relay polling after {} consecutive failures.",
                             consecutive_failures,
                         )
                         self.stop_polling = True
                         break
                     time.sleep(self._request_timeout)
-                    continue
+        finally:
+            if work_slots is not None:
+                work_slots.shutdown()
+                self._api_v1_exit_request()
 
-                wait_seconds = relay_response.get('next_ping_in_x_seconds', self._request_timeout)
-                wait_seconds = self._normalise_poll_wait_seconds(wait_seconds)
-                relay_error = relay_response.get('error')
-                if relay_error:
-                    consecutive_failures += 1
-                    log_error("Error from API v1 E2EE relay poll: {}", relay_error)
-                    if max_failures is not None and consecutive_failures >= max_failures:
-                        log_error(
-                            "Stopping API v1 E2EE relay polling after {} consecutive relay errors.",
-                            consecutive_failures,
-                        )
-                        self.stop_polling = True
-                        break
-                    time.sleep(wait_seconds)
-                    continue
+    def _process_api_v1_request_on_slot(self, request_data: Dict[str, Any], relay_url: str) -> RelayProcessingResult:
+        """Run one claimed request on a work slot, answering the relay that supplied it."""
 
-                consecutive_failures = 0
-                if relay_response.get('protocol') == 'tokenplace_api_v1_relay_e2ee':
-                    self.process_client_request(relay_response)
-                time.sleep(wait_seconds)
-            except Exception as e:
-                consecutive_failures += 1
-                log_error("Exception during API v1 E2EE polling loop: {}", str(e), exc_info=True)
-                if max_failures is not None and consecutive_failures >= max_failures:
-                    log_error(
-                        "Stopping API v1 E2EE relay polling after {} consecutive failures.",
-                        consecutive_failures,
-                    )
-                    self.stop_polling = True
-                    break
-                time.sleep(self._request_timeout)
+        scope = self._api_v1_request_scope
+        scope.relay_url = relay_url
+        with self._api_v1_active_requests_lock:
+            scope.restarts_at_start = self._api_v1_supervisor_restarts
+        try:
+            return self.process_client_request_result(request_data)
+        finally:
+            scope.relay_url = None
+            scope.restarts_at_start = None
 
     def poll_relay_continuously(self):  # pragma: no cover
         """
@@ -158,6 +158,31 @@ def can_allocate_gpu_memory(required_bytes: float, *, headroom_percent: float =
             pass
 
 
+def can_allocate_system_memory(required_bytes: float, *, headroom_percent: float = 0.1) -> bool:
+    """Return ``True`` when available system memory covers ``required_bytes``.
+
+    Unlike :func:`can_allocate_gpu_memory` this fails closed: when psutil cannot
+    report available memory the allocation is refused.
+    """
+
+    try:
+        requirement = float(required_bytes)
+    except Exception:
+        requirement = 0.0
+
+    if requirement <= 0.0:
+        return True
+
+    try:
+        if psutil is None:
+            raise RuntimeError("psutil unavailable")
+        available_bytes = float(getattr(psutil.virtual_memory(), 'available'))
+    except Exception:
+        return False
+
+    return available_bytes >= requirement * _gpu_headroom_multiplier(headroom_percent)
+
+
 def _cpu_interval_for_platform(platform: str) -> float | None:
     """Return the psutil sampling interval tuned for the active platform."""
 